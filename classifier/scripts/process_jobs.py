@@ -15,6 +15,7 @@ Funcionalidades:
 """
 
 import sys
+import io
 import json
 import logging
 import argparse
@@ -48,6 +49,25 @@ except ImportError:
     OLLAMA_AVAILABLE = False
     print(f"{Colors.GRAY}ollama_classifier no disponible - Use --ollama requiere instalación{Colors.RESET}")
 
+# Exportación columnar de all_jobs.json (scrapper/unify_jobs.py): permite leer solo las columnas usadas
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# all_jobs.jsonl.zst (scrapper/jsonl_zstd.py): JSONL en frames zstd
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Campos de cada empleo que usa la clasificación y el CSV de salida
+JOB_COLUMNS = ['Id Interno', 'titulo', 'descripcion', 'Empresa', 'Fuente', 'Tipo Portal', 'url', 'Pais',
+               'Ubicacion', 'ubicacion', 'ubicacion_pais', 'ubicacion_provincia', 'ubicacion_ciudad',
+               'Categoria Portal', 'Subcategoria Portal', 'hash Descripcion', 'fecha']
+
 def validate_ai_requirement(requirement_text):
     """
     Valida que un requisito extraído por AI sea apropiado para crear un patrón regex.
@@ -120,6 +140,7 @@ Ejemplos de uso:
   python process_jobs.py --habilidades duro                     # Solo habilidades técnicas
   python process_jobs.py --ollama --habilidades soft            # Ollama + soft skills
   python process_jobs.py --directorio /other/path               # Usar otro directorio
+  python process_jobs.py --fuente Computrabajo --desde 2026-10-12  # Solo esas particiones del corpus
         """
     )
     
@@ -143,6 +164,25 @@ Ejemplos de uso:
         help='Directorio donde está all_jobs.json (por defecto: ../../../Base de Datos Tablas)'
     )
     
+    parser.add_argument(
+        '--fuente',
+        action='append',
+        default=None,
+        help='Procesar solo empleos de esta fuente (se puede repetir); usa el corpus particionado si existe'
+    )
+    
+    parser.add_argument(
+        '--desde',
+        type=str,
+        help='Fecha mínima de los empleos (YYYY-MM o YYYY-MM-DD)'
+    )
+    
+    parser.add_argument(
+        '--hasta',
+        type=str,
+        help='Fecha máxima de los empleos (YYYY-MM o YYYY-MM-DD)'
+    )
+    
     parser.add_argument(
         '--output',
         type=str,
@@ -205,16 +245,102 @@ def classify_with_regex(description_text):
     result['total_found'] = total
     return result
 
-def process_and_insert_jobs(json_filepath):
-    """Procesa el archivo JSON de empleos con clasificación híbrida (regex + Ollama)."""
+def iter_jsonl(path):
+    """Empleos de un .jsonl o .jsonl.zst, línea por línea"""
+    if str(path).endswith('.zst'):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard no instalado (pip install zstandard)")
+        with open(path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            for line in io.TextIOWrapper(reader, encoding='utf-8'):
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def fecha_iso(fecha):
+    """DD/MM/YYYY (formato de los scrapers) -> YYYY-MM-DD, para comparar con --desde / --hasta"""
+    try:
+        return datetime.strptime(fecha or '', "%d/%m/%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return fecha or ''
+
+def load_empleos_particionados(corpus_dir, fuentes=None, desde=None, hasta=None):
+    """
+    Empleos del corpus particionado (scrapper/partitioned_corpus.py): con el catálogo se abren
+    solo las particiones fuente=.../fecha=YYYY-MM que coinciden con los filtros. desde / hasta
+    son YYYY-MM o YYYY-MM-DD; con día se filtran también los empleos de los meses de los extremos.
+    """
+    with open(Path(corpus_dir) / "_catalog.json", 'r', encoding='utf-8') as f:
+        catalogo = json.load(f)
+    particiones = [
+        p for p in catalogo.get('partitions', [])
+        if (not fuentes or p['fuente'] in fuentes)
+        and not ((desde or hasta) and p['mes'] == 'desconocida')
+        and (not desde or p['mes'] >= desde[:7])
+        and (not hasta or p['mes'] <= hasta[:7])
+    ]
+    print(f"  Particiones: {len(particiones)} de {len(catalogo.get('partitions', []))} "
+          f"({sum(p['jobs'] for p in particiones):,} de {catalogo.get('jobs', 0):,} empleos)")
+    empleos = []
+    for particion in particiones:
+        for empleo in iter_jsonl(Path(corpus_dir) / particion['path']):
+            fecha = fecha_iso(empleo.get('fecha'))
+            if (desde and len(desde) > 7 and fecha < desde) or (hasta and len(hasta) > 7 and fecha > hasta):
+                continue
+            empleos.append(empleo)
+    return empleos
+
+def load_empleos(json_filepath):
+    """
+    Carga los empleos de all_jobs.json. Si junto a él está all_jobs.parquet (al menos tan nuevo)
+    y pyarrow está instalado, lee de ahí solo JOB_COLUMNS en lugar de parsear todo el JSON.
+    Un .jsonl.zst se descomprime en streaming, línea por línea.
+    """
+    if str(json_filepath).endswith('.zst'):
+        return list(iter_jsonl(json_filepath))
+    parquet_path = Path(json_filepath).with_suffix('.parquet')
+    if PYARROW_AVAILABLE and parquet_path.exists() and parquet_path.stat().st_mtime >= Path(json_filepath).stat().st_mtime:
+        try:
+            names = pq.ParquetFile(parquet_path).schema_arrow.names
+            table = pq.read_table(parquet_path, columns=[c for c in JOB_COLUMNS if c in names], memory_map=True)
+            print(f"  Leyendo {parquet_path.name} ({table.num_columns} columnas)")
+            # Los valores nulos de la exportación equivalen a campos ausentes en el JSON
+            return [{k: v for k, v in row.items() if v is not None} for row in table.to_pylist()]
+        except Exception as e:
+            print(f"{Colors.YELLOW}Error leyendo {parquet_path.name}, se usa el JSON: {e}{Colors.RESET}")
+    with open(json_filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def process_and_insert_jobs(json_filepath, filtros=None):
+    """
+    Procesa el archivo JSON de empleos con clasificación híbrida (regex + Ollama).
+    filtros: dict con fuentes / desde / hasta; si junto al archivo está el corpus particionado
+    (corpus/_catalog.json) se leen solo las particiones que coinciden, si no se filtra el archivo completo.
+    """
     global classification_stats
     
     # Crear directorio de resultados
     Path('database').mkdir(exist_ok=True)
     
     try:
-        with open(json_filepath, 'r', encoding='utf-8') as f:
-            empleos = json.load(f)
+        corpus_dir = Path(json_filepath).parent / "corpus"
+        if filtros and (corpus_dir / "_catalog.json").exists():
+            empleos = load_empleos_particionados(corpus_dir, **filtros)
+        else:
+            empleos = load_empleos(json_filepath)
+            if filtros:
+                print(f"{Colors.YELLOW}  Sin corpus particionado: se filtra {Path(json_filepath).name} completo{Colors.RESET}")
+                desde, hasta = filtros.get('desde'), filtros.get('hasta')
+                empleos = [
+                    e for e in empleos
+                    if (not filtros.get('fuentes') or e.get('Fuente') in filtros['fuentes'])
+                    and (not desde or fecha_iso(e.get('fecha'))[:len(desde)] >= desde)
+                    and (not hasta or fecha_iso(e.get('fecha'))[:len(hasta)] <= hasta)
+                ]
     except Exception as e:
         print(f"{Colors.RED}Error leyendo {json_filepath}: {e}{Colors.RESET}")
         return
@@ -337,7 +463,11 @@ def process_and_insert_jobs(json_filepath):
             'Tipo_Portal': empleo.get('Tipo Portal', ''),
             'URL': empleo.get('url', ''),
             'Pais': empleo.get('Pais', ''),
-            'Ubicacion': empleo.get('Ubicacion', ''),
+            'Ubicacion': empleo.get('Ubicacion', '') or empleo.get('ubicacion', ''),
+            # Normalizadas al unificar (gazetteer.py)
+            'Pais_Normalizado': empleo.get('ubicacion_pais') or '',
+            'Provincia': empleo.get('ubicacion_provincia') or '',
+            'Ciudad': empleo.get('ubicacion_ciudad') or '',
             'Categoria_Portal': empleo.get('Categoria Portal', ''),
             'Subcategoria_Portal': empleo.get('Subcategoria Portal', ''),
             'Hash_Descripcion': empleo.get('hash Descripcion', ''),
@@ -552,25 +682,35 @@ def main():
     
     print(f"\n{Colors.CYAN}  Directorio de entrada: {Colors.RESET}{args.directorio}")
     
-    # Hardcodear la ruta del archivo all_jobs.json
+    # Hardcodear la ruta del archivo all_jobs.json (o su versión comprimida, si es la única)
     all_jobs_path = f"{args.directorio}/all_jobs.json"
-    
-    try:
-        # Intentar abrir el archivo directamente
-        with open(all_jobs_path, 'r', encoding='utf-8') as f:
-            test_load = json.load(f)
-        file_size = len(str(test_load)) / (1024 * 1024)  # MB aproximado
-        print(f"{Colors.GREEN}Archivo encontrado: {Colors.RESET}all_jobs.json ({Colors.CYAN}{file_size:.2f} MB{Colors.RESET})")
-    except FileNotFoundError:
-        print(f"{Colors.RED}Error: No se encontró all_jobs.json en {args.directorio}{Colors.RESET}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"{Colors.RED}Error leyendo all_jobs.json: {e}{Colors.RESET}")
-        sys.exit(1)
+    if not Path(all_jobs_path).exists() and Path(f"{args.directorio}/all_jobs.jsonl.zst").exists():
+        all_jobs_path = f"{args.directorio}/all_jobs.jsonl.zst"
+    
+    # Filtros de partición: con el corpus particionado no hace falta all_jobs.json
+    filtros = None
+    if args.fuente or args.desde or args.hasta:
+        filtros = {'fuentes': args.fuente, 'desde': args.desde, 'hasta': args.hasta}
+        print(f"  Filtros: fuente={','.join(args.fuente) if args.fuente else 'todas'} "
+              f"desde={args.desde or '-'} hasta={args.hasta or '-'}")
+    
+    if filtros and Path(f"{args.directorio}/corpus/_catalog.json").exists():
+        print(f"{Colors.GREEN}Corpus particionado encontrado: {Colors.RESET}{args.directorio}/corpus")
+    else:
+        try:
+            # Solo verificar que exista: el archivo se parsea una vez, al procesarlo
+            file_size = Path(all_jobs_path).stat().st_size / (1024 * 1024)
+            print(f"{Colors.GREEN}Archivo encontrado: {Colors.RESET}{Path(all_jobs_path).name} ({Colors.CYAN}{file_size:.2f} MB{Colors.RESET})")
+        except FileNotFoundError:
+            print(f"{Colors.RED}Error: No se encontró all_jobs.json en {args.directorio}{Colors.RESET}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"{Colors.RED}Error leyendo all_jobs.json: {e}{Colors.RESET}")
+            sys.exit(1)
     
     # Procesar archivo all_jobs.json
-    print(f"\n{Colors.BOLD}{Colors.GREEN}Procesando: all_jobs.json{Colors.RESET}")
-    process_and_insert_jobs(all_jobs_path)
+    print(f"\n{Colors.BOLD}{Colors.GREEN}Procesando: {Path(all_jobs_path).name}{Colors.RESET}")
+    process_and_insert_jobs(all_jobs_path, filtros)
     
     # Imprimir estadísticas finales
     print_final_statistics()
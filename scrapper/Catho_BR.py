@@ -15,6 +15,13 @@ import json
 import os
 from datetime import date
 import sys
+from incremental import IncrementalCrawl, add_incremental_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
+from crawl_frontier import CrawlFrontier, CrawlBudget, add_frontier_arguments
+from tab_pipeline import TabPipeline, add_tab_arguments
+from listing_cards import ListingCards, add_card_arguments
+from work_queue import (add_queue_arguments, default_worker_id, open_queue, run_worker,
+                        seed_areas, worker_output_dir)
 import argparse
 import builtins
 import signal
@@ -49,6 +56,11 @@ builtins.print = print
 parser = argparse.ArgumentParser(description='Script de scraping para Catho Brasil')
 parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
 parser.add_argument('--start-from', type=str, help='Iniciar desde una categoría específica')
+add_incremental_arguments(parser)
+add_frontier_arguments(parser)
+add_tab_arguments(parser)
+add_card_arguments(parser)
+add_queue_arguments(parser)
 args = parser.parse_args()
 
 def debug_print(*mensaje, **kwargs):
@@ -80,12 +92,20 @@ jobs_this_session = 0
 EMPLEOS = []
 HASHES_GLOBALES = set()
 current_category = ""
+incremental = None
+frontier = None
+OUTPUT_DIR = "output_jobs"  # en modo worker: output_jobs/workers/<worker_id>
+rango_pendiente = None  # en modo worker: siguiente rango de páginas del área actual
 
 def signal_handler(sig, frame):
     print(f"\n\nInterrupción detectada (CTRL+C)")
     if EMPLEOS:
         print(f"Guardando {len(EMPLEOS)} empleos pendientes...")
         guardar_datos_incremental(EMPLEOS, current_category or "partial")
+    if incremental:
+        incremental.save()
+    if frontier:
+        frontier.save()
     if driver:
         try:
             driver.quit()
@@ -101,24 +121,23 @@ def calcular_hash(texto):
         return None
     return hashlib.sha256(texto.encode('utf-8')).hexdigest()
 
-def guardar_datos_incremental(empleos, area, archivo_base="output_jobs/Catho_BR"):
-    os.makedirs("output_jobs", exist_ok=True)
+def guardar_datos_incremental(empleos, area, archivo_base=None):
+    archivo_base = archivo_base or os.path.join(OUTPUT_DIR, "Catho_BR")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     timestamp = date.today().strftime("%Y%m%d")
-    nombre_archivo = f"{archivo_base}_{area}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{area}_{timestamp}{JOBS_EXTENSION}"
     
     empleos_existentes = []
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes del archivo")
         except:
             print("Archivo existente pero no se pudo leer, creando nuevo")
     
     todos_empleos = empleos_existentes + empleos
     
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"\nGuardado: {nombre_archivo}")
     print(f"  - Empleos nuevos: {len(empleos)}")
@@ -338,33 +357,40 @@ def close_popups(driver):
     except:
         pass
 
-def extract_job_details(driver, job_url):
-    """Extrae los detalles de una vaga específica - versión"""
+def extract_job_details(driver, job_url, cargada=False, tarjeta=None):
+    """
+    Extrae los detalles de una vaga específica - versión (cargada: la página ya está abierta, modo pestañas).
+    tarjeta: campos leídos de la tarjeta del listado; con título no se busca el h1
+    """
+    tarjeta = tarjeta or {}
     try:
-        try:
-            driver.get(job_url)
-            WebDriverWait(driver, 0.3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a.js-o-link")))
+        if not cargada:
+            try:
+                driver.get(job_url)
+                WebDriverWait(driver, 0.3).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "a.js-o-link")))
 
-        except:
-            driver.execute_script("window.stop();")
+            except:
+                driver.execute_script("window.stop();")
         
         details = {
-            'titulo': '',
-            'empresa': '',
-            'ubicacion': 'Brasil',
+            'titulo': tarjeta.get('titulo', ''),
+            'empresa': tarjeta.get('empresa', ''),
+            'ubicacion': tarjeta.get('ubicacion', 'Brasil'),
             'salario': '',
             'descripcion': ''
         }
         
-        # Título - h1
-        try:
-            h1 = driver.find_element(By.TAG_NAME, "h1")
-            details['titulo'] = h1.text.strip()
-        except:
-            pass
+        # Título - h1 (solo si la tarjeta no lo trajo: sin h1 la espera implícita cuesta 3s)
+        if not details['titulo']:
+            try:
+                h1 = driver.find_element(By.TAG_NAME, "h1")
+                details['titulo'] = h1.text.strip()
+            except:
+                pass
         
-        # Extraer datos del JSON embebido
+        # Extraer datos del JSON embebido (empresa y ubicación del JSON pisan las de la tarjeta:
+        # son las que entran en el hash y así coinciden con los archivos anteriores)
         try:
             elem = driver.find_element(By.ID, "__NEXT_DATA__").get_attribute("innerHTML")
             data = json.loads(elem)
@@ -416,26 +442,34 @@ def extract_job_details(driver, job_url):
         debug_print(f"Error extrayendo: {str(e)}")
         return None
 
-def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
-    """Scrape una categoría completa"""
-    global total_jobs_scraped, jobs_this_session, EMPLEOS, HASHES_GLOBALES, current_category
+def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats, pagina_inicio=1, pagina_fin=None,
+                     total_paginas=None):
+    """Scrape una categoría completa (o solo el rango de páginas de una tarea de la cola)"""
+    global total_jobs_scraped, jobs_this_session, EMPLEOS, HASHES_GLOBALES, current_category, rango_pendiente
     
     current_category = url_cat
+    rango_pendiente = None
+    
+    # Deadline: no empezar categorías que el plan dejó fuera del presupuesto
+    if not budget.allows_area(nombre_cat):
+        return 0
     
     print(f"\n{'='*80}")
     print(f"PROCESANDO CATEGORÍA {cat_index}/{total_cats}: {nombre_cat}")
     print(f"{'='*80}")
     
-    # Obtener total de páginas
-    total_paginas = obtener_total_paginas(driver, url_cat)
+    # Obtener total de páginas (las tareas de la cola lo traen de la tarea anterior)
+    if total_paginas is None:
+        total_paginas = obtener_total_paginas(driver, url_cat)
     print(f"Encontradas {total_paginas} páginas para {nombre_cat}")
     print("Comenzando extracción de vagas...")
     
     cat_jobs = 0
-    pagina = 1
+    pagina = pagina_inicio
+    ultima_pagina = min(total_paginas, pagina_fin) if pagina_fin else total_paginas
     consecutive_empty = 0
     
-    while pagina <= total_paginas and consecutive_empty < 3:
+    while pagina <= ultima_pagina and consecutive_empty < 3:
         url = build_url(url_cat, pagina)
         
         print(f"\nProcesando página {pagina}/{total_paginas} de {nombre_cat}")
@@ -448,6 +482,7 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
             
             # Extraer jobs de la página
             jobs = extract_valid_job_urls(driver)
+            tarjetas.harvest(driver)
             
             if len(jobs) == 0:
                 consecutive_empty += 1
@@ -456,13 +491,22 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
             
             consecutive_empty = 0
             
+            # Modo incremental: no volver a abrir empleos ya conocidos
+            empleos_listados = len(jobs)
+            urls_nuevas = set(incremental.filter_urls(nombre_cat, [job.get('url', '') for job in jobs]))
+            jobs = [job for job in jobs if job.get('url', '') in urls_nuevas]
+            nuevos_pagina = 0
+            
             # Mostrar jobs encontrados
             # print(f"{len(jobs)} vagas encontradas:")
             # for idx, job in enumerate(jobs):
             #     print(f"{idx} - {job['titulo'][:60]}")
             
             # Procesar cada job
-            for i, job in enumerate(jobs):
+            for i, job in tabs.iterate(driver, jobs, url_of=lambda job: job.get('url', ''),
+                                       health=recrear_driver_si_necesario):
+                # Sesión verificada antes de cada empleo (recreada si se perdió)
+                driver = tabs.driver
                 try:
                     job_url = job.get('url', '')
                     titulo = job.get('titulo', 'Sin título')
@@ -472,13 +516,11 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     
                     print(f"  Procesando {i+1}/{len(jobs)}: {titulo[:40]}...")
                     
-                    # Recrear driver si es necesario
-                    driver = recrear_driver_si_necesario(driver)
-                    
                     # Obtener detalles con timeout de seguridad
                     details = None
+                    tarjeta = tarjetas.get(job_url)
                     try:
-                        details = extract_job_details(driver, job_url)
+                        details = extract_job_details(driver, job_url, cargada=tabs.enabled, tarjeta=tarjeta)
                     except Exception as e:
                         debug_print(f"  Error en extract_job_details: {e}")
                     
@@ -486,8 +528,8 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                         debug_print(f"  Usando datos básicos para {titulo[:30]}")
                         details = {
                             'titulo': titulo,
-                            'empresa': 'N/A',
-                            'ubicacion': 'Brasil',
+                            'empresa': tarjeta.get('empresa', 'N/A'),
+                            'ubicacion': tarjeta.get('ubicacion', 'Brasil'),
                             'salario': 'N/A',
                             'descripcion': f"Vaga: {titulo} - Categoria: {nombre_cat}"
                         }
@@ -500,6 +542,7 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     
                     if hash_empleo in HASHES_GLOBALES:
                         print(f"  ^ [DUPLICADO]")
+                        incremental.mark_seen(job_url, hash_empleo)
                         continue
                     
                     EMPLEOS.append({
@@ -522,6 +565,8 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     })
                     
                     HASHES_GLOBALES.add(hash_empleo)
+                    incremental.mark_seen(job_url, hash_empleo)
+                    nuevos_pagina += 1
                     total_jobs_scraped += 1
                     jobs_this_session += 1
                     cat_jobs += 1
@@ -530,6 +575,12 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     debug_print(f"Error procesando vaga {i+1}: {str(e)}")
                     continue
             
+            frontier.record_page(nombre_cat, pagina, nuevos_pagina)
+            if budget.after_page(nombre_cat, pagina):
+                break
+            if incremental.page_done(nombre_cat, pagina, empleos_listados, nuevos_pagina):
+                break
+            
             pagina += 1
             # Sin sleep entre páginas
             
@@ -549,6 +600,15 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
     if EMPLEOS:
         guardar_datos_incremental(EMPLEOS, url_cat)
         EMPLEOS = []
+    incremental.finish_area(nombre_cat)
+    frontier.finish_area(nombre_cat)
+    
+    # Modo worker: si el rango terminó sin agotar la categoría queda otro rango por encolar
+    if pagina_fin and pagina > pagina_fin and pagina <= total_paginas and consecutive_empty < 3:
+        rango_pendiente = {"next_page": pagina, "payload": {"total_paginas": total_paginas}}
+    elif pagina_fin and budget.exhausted and pagina < total_paginas:
+        # Cortada por el deadline: el resto del rango vuelve a la cola
+        rango_pendiente = {"next_page": pagina + 1, "payload": {"total_paginas": total_paginas}}
     
     return cat_jobs
 
@@ -571,19 +631,34 @@ if __name__ == "__main__":
     print("Cargando hashes existentes...")
     for nombre, url_cat in CATEGORIAS:
         timestamp = date.today().strftime("%Y%m%d")
-        archivo = f"output_jobs/Catho_BR_{url_cat}_{timestamp}.json"
+        archivo = f"output_jobs/Catho_BR_{url_cat}_{timestamp}{JOBS_EXTENSION}"
         if os.path.exists(archivo):
             try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    for empleo in json.load(f):
-                        h = empleo.get("hash Descripcion")
-                        if h:
-                            HASHES_GLOBALES.add(h)
+                for empleo in load_jobs(archivo):
+                    h = empleo.get("hash Descripcion")
+                    if h:
+                        HASHES_GLOBALES.add(h)
             except:
                 pass
     
     print(f"Cargados {len(HASHES_GLOBALES)} hashes existentes")
     
+    # Índice persistente de empleos conocidos (modo incremental)
+    incremental = IncrementalCrawl.from_args("catho_br", "catho.com.br", args)
+    if args.incremental:
+        print(f"Modo incremental: se corta cada categoría tras {args.incremental_k} páginas sin novedades (margen: {args.margen})")
+    
+    # Categorías ordenadas por rendimiento histórico; con --start-from se reutiliza el orden de la corrida anterior
+    frontier = CrawlFrontier.from_args("catho_br", args)
+    CATEGORIAS = frontier.order_areas(CATEGORIAS, key=lambda c: c[0], resume=bool(args.start_from))
+    budget = CrawlBudget.from_args(frontier, args)
+    if not args.cola:
+        budget.plan(CATEGORIAS, key=lambda c: c[0])
+    
+    # Pestañas: se precarga la próxima vaga mientras se extrae la actual (el JSON embebido marca la página lista)
+    tabs = TabPipeline("catho_br", depth=args.pestanas, interval=1.0, ready=(By.ID, "__NEXT_DATA__"))
+    tarjetas = ListingCards.from_args("catho_br", args)
+    
     # Determinar categorías a procesar
     start_index = 0
     if args.start_from:
@@ -599,17 +674,39 @@ if __name__ == "__main__":
     driver = create_driver()
     
     try:
-        for idx, (nombre_cat, url_cat) in enumerate(categorias_to_process, start_index + 1):
-            try:
-                scrape_categoria(driver, nombre_cat, url_cat, idx, len(CATEGORIAS))
-            except Exception as e:
-                print(f"Error crítico en categoría {nombre_cat}: {str(e)}")
-                driver = recrear_driver_si_necesario(driver)
-                continue
+        if args.cola:
+            # Modo worker: las categorías se reparten en tareas (categoría, rango de páginas) de una cola compartida
+            worker_id = args.worker_id or default_worker_id()
+            OUTPUT_DIR = worker_output_dir(worker_id)
+            cola = open_queue(args.cola)
+            nombres = [nombre for nombre, _ in CATEGORIAS]
+            seed_areas(cola, "catho_br", nombres, args.paginas_por_tarea)
+            
+            def procesar_tarea(tarea):
+                nombre_cat = tarea["area"]
+                scrape_categoria(driver, nombre_cat, dict(CATEGORIAS)[nombre_cat], nombres.index(nombre_cat) + 1,
+                                 len(CATEGORIAS), pagina_inicio=tarea["page_start"], pagina_fin=tarea["page_end"],
+                                 total_paginas=tarea["payload"].get("total_paginas"))
+                return rango_pendiente
             
-            # Sin sleep entre categorías
+            run_worker(cola, "catho_br", procesar_tarea, worker_id=worker_id,
+                       visibility=args.visibilidad, pages_per_task=args.paginas_por_tarea,
+                       should_stop=lambda: budget.exhausted)
+        else:
+            for idx, (nombre_cat, url_cat) in enumerate(categorias_to_process, start_index + 1):
+                try:
+                    scrape_categoria(driver, nombre_cat, url_cat, idx, len(CATEGORIAS))
+                    if budget.exhausted:
+                        break
+                except Exception as e:
+                    print(f"Error crítico en categoría {nombre_cat}: {str(e)}")
+                    driver = recrear_driver_si_necesario(driver)
+                    continue
+                
+                # Sin sleep entre categorías
             
     finally:
+        incremental.save()
         try:
             driver.quit()
         except:
@@ -619,5 +716,6 @@ if __name__ == "__main__":
     print(f"SCRAPING COMPLETADO!")
     print(f"Vagas recolectadas en esta sesión: {jobs_this_session}")
     print(f"Total de vagas: {total_jobs_scraped}")
-    print(f"Archivos guardados en: output_jobs/")
+    print(tarjetas.summary())
+    print(f"Archivos guardados en: {OUTPUT_DIR}/")
     print(f"{'='*60}\n")
\ No newline at end of file
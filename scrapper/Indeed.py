@@ -25,6 +25,7 @@ import builtins
 import signal
 import tempfile
 import shutil
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
 
 # Colores ANSI - Naranja/Amarillo para Indeed
 YELLOW = '\033[1;33m'
@@ -112,21 +113,19 @@ def guardar_datos_incremental(empleos, categoria, archivo_base="output_jobs/Inde
     # Limpiar nombre de categoría para archivo
     categoria_limpia = categoria.replace(" ", "_").replace("/", "-")
     timestamp = date.today().strftime("%Y%m%d")
-    nombre_archivo = f"{archivo_base}_{categoria_limpia}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{categoria_limpia}_{timestamp}{JOBS_EXTENSION}"
     
     empleos_existentes = []
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes")
         except:
             pass
     
     todos_empleos = empleos_existentes + empleos
     
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"\nGuardado: {nombre_archivo}")
     print(f"  - Empleos nuevos: {len(empleos)}")
@@ -520,14 +519,13 @@ if __name__ == "__main__":
     timestamp = date.today().strftime("%Y%m%d")
     for cat in CATEGORIAS:
         cat_limpia = cat.replace(" ", "_").replace("/", "-")
-        archivo = f"output_jobs/Indeed_{cat_limpia}_{timestamp}.json"
+        archivo = f"output_jobs/Indeed_{cat_limpia}_{timestamp}{JOBS_EXTENSION}"
         if os.path.exists(archivo):
             try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    for empleo in json.load(f):
-                        h = empleo.get("hash Descripcion")
-                        if h:
-                            HASHES_GLOBALES.add(h)
+                for empleo in load_jobs(archivo):
+                    h = empleo.get("hash Descripcion")
+                    if h:
+                        HASHES_GLOBALES.add(h)
             except:
                 pass
     print(f"Cargados {len(HASHES_GLOBALES)} hashes existentes")
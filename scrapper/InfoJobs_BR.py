@@ -22,6 +22,8 @@ import signal
 import time
 import hashlib
 import re
+from tab_pipeline import TabPipeline, add_tab_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
 
 sys.stdout.reconfigure(line_buffering=True)
 
@@ -49,6 +51,7 @@ parser = argparse.ArgumentParser(description='Script de scraping para InfoJobs B
 parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
 parser.add_argument('--start-from', type=str, help='Iniciar desde una categoría específica')
 parser.add_argument('--max-scroll', type=int, default=100, help='Máximo de scrolls por categoría (fallback si no se detecta total)')
+add_tab_arguments(parser)
 args = parser.parse_args()
 
 def debug_print(*mensaje, **kwargs):
@@ -126,21 +129,19 @@ def calcular_hash(texto):
 def guardar_datos_incremental(empleos, categoria, archivo_base="output_jobs/InfoJobs_BR"):
     os.makedirs("output_jobs", exist_ok=True)
     timestamp = date.today().strftime("%Y%m%d")
-    nombre_archivo = f"{archivo_base}_{categoria}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{categoria}_{timestamp}{JOBS_EXTENSION}"
     
     empleos_existentes = []
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes")
         except:
             pass
     
     todos_empleos = empleos_existentes + empleos
     
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"Guardado: {nombre_archivo} ({len(empleos)} nuevos, {len(todos_empleos)} total)")
     return nombre_archivo
@@ -309,16 +310,17 @@ def scroll_and_load(driver, target_jobs=None, max_scrolls=100):
     
     return all_jobs
 
-def extract_job_details(driver, job_url):
-    """Extrae detalles de una vaga"""
+def extract_job_details(driver, job_url, cargada=False):
+    """Extrae detalles de una vaga (cargada: la página ya está abierta, modo pestañas)"""
     try:
-        try:
-            driver.get(job_url)
-            WebDriverWait(driver, 1).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a.js-o-link"))
-            )
-        except:
-            driver.execute_script("window.stop();")
+        if not cargada:
+            try:
+                driver.get(job_url)
+                WebDriverWait(driver, 1).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "a.js-o-link"))
+                )
+            except:
+                driver.execute_script("window.stop();")
         
         details = {
             'titulo': '',
@@ -452,7 +454,10 @@ def scrape_categoria(driver, nombre_cat, slug_cat, cat_index, total_cats):
     
     cat_jobs = 0
     
-    for i, job in enumerate(jobs):
+    for i, job in tabs.iterate(driver, jobs, url_of=lambda job: job.get('url', ''),
+                               health=recrear_driver_si_necesario):
+        # Sesión verificada antes de cada empleo (recreada si se perdió)
+        driver = tabs.driver
         try:
             job_url = job.get('url', '')
             titulo = job.get('titulo', 'Sin título')
@@ -462,9 +467,7 @@ def scrape_categoria(driver, nombre_cat, slug_cat, cat_index, total_cats):
             
             print(f"  {i+1}/{len(jobs)}: {titulo[:50]}...")
             
-            driver = recrear_driver_si_necesario(driver)
-            
-            details = extract_job_details(driver, job_url)
+            details = extract_job_details(driver, job_url, cargada=tabs.enabled)
             
             if not details:
                 details = {
@@ -545,14 +548,13 @@ if __name__ == "__main__":
     print("\nCargando hashes existentes...")
     for nombre, slug in CATEGORIAS:
         timestamp = date.today().strftime("%Y%m%d")
-        archivo = f"output_jobs/InfoJobs_BR_{slug}_{timestamp}.json"
+        archivo = f"output_jobs/InfoJobs_BR_{slug}_{timestamp}{JOBS_EXTENSION}"
         if os.path.exists(archivo):
             try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    for empleo in json.load(f):
-                        h = empleo.get("hash Descripcion")
-                        if h:
-                            HASHES_GLOBALES.add(h)
+                for empleo in load_jobs(archivo):
+                    h = empleo.get("hash Descripcion")
+                    if h:
+                        HASHES_GLOBALES.add(h)
             except:
                 pass
     
@@ -567,6 +569,9 @@ if __name__ == "__main__":
                 break
         print(f"Iniciando desde: {CATEGORIAS[start_index][0]}")
     
+    # Pestañas: se precarga la próxima vaga mientras se extrae la actual
+    tabs = TabPipeline("infojobs_br", depth=args.pestanas, interval=1.0, ready=(By.TAG_NAME, "h1"))
+    
     # Crear driver
     print("\nIniciando navegador...")
     driver = create_driver()
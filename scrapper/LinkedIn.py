@@ -4,7 +4,6 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import json
 import os
 from datetime import date
 import sys
@@ -13,7 +12,18 @@ import builtins
 import signal
 import time
 import hashlib
-from checkpoint_manager import CheckpointManager, LinkedInCheckpoint, get_resume_info
+import re
+from checkpoint_manager import CheckpointManager, LinkedInCheckpoint, add_resume_arguments, get_resume_info
+from rate_limiter import get_rate_limiter
+from incremental import IncrementalCrawl, add_incremental_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
+from crawl_frontier import CrawlFrontier, CrawlBudget, add_frontier_arguments
+
+# Adaptador HTTP para los endpoints guest (requiere requests y lxml)
+try:
+    from linkedin_guest import LinkedInGuestClient, GUEST_AVAILABLE, MAX_FAILURES
+except ImportError:
+    GUEST_AVAILABLE = False
 
 # Colores ANSI - Azul para LinkedIn
 BLUE = '\033[0;34m'
@@ -28,6 +38,11 @@ builtins.print = print
 parser = argparse.ArgumentParser(description='Script de scraping para LinkedIn Jobs Argentina')
 parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
 parser.add_argument('--start-from', type=str, help='Iniciar desde una categorÃ­a especÃ­fica')
+parser.add_argument('--modo', choices=['http', 'browser'], default='http',
+                    help='http: endpoints guest con navegador solo como fallback; browser: solo Selenium')
+add_incremental_arguments(parser)
+add_frontier_arguments(parser)
+add_resume_arguments(parser)
 args = parser.parse_args()
 
 def debug_print(*mensaje, **kwargs):
@@ -64,8 +79,16 @@ AREAS = {
     "support": "sup",
 }
 
+MAX_PAGINAS = 40  # LinkedIn no muestra mas de 1000 resultados por busqueda
+
+# Limitador compartido entre el cliente HTTP y el navegador (mismo host)
+LIMITER = get_rate_limiter("linkedin", rate=0.5, jitter=0.5)
+
 # Global variables
 driver = None
+guest_client = None
+incremental = None
+frontier = None
 checkpoint_manager = None
 total_jobs_scraped = 0
 jobs_this_session = 0
@@ -87,6 +110,11 @@ def signal_handler(sig, frame):
         checkpoint_manager.save_checkpoint(checkpoint_data)
         print("Checkpoint guardado exitosamente")
     
+    if incremental:
+        incremental.save()
+    if frontier:
+        frontier.save()
+    
     if EMPLEOS:
         print(f"Guardando {len(EMPLEOS)} empleos pendientes...")
         guardar_datos_incremental(EMPLEOS, current_area)
@@ -113,21 +141,19 @@ def guardar_datos_incremental(empleos, area, archivo_base="output_jobs/LinkedIn"
     os.makedirs("output_jobs", exist_ok=True)
     
     timestamp = date.today().strftime("%Y%m%d")
-    nombre_archivo = f"{archivo_base}_{area}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{area}_{timestamp}{JOBS_EXTENSION}"
     
     empleos_existentes = []
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes del archivo")
         except:
             print("Archivo existente pero no se pudo leer, creando nuevo")
     
     todos_empleos = empleos_existentes + empleos
     
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"\nGuardado: {nombre_archivo}")
     print(f"  - Empleos nuevos: {len(empleos)}")
@@ -168,6 +194,17 @@ def recrear_driver_si_necesario(driver):
         return create_driver()
     return driver
 
+def asegurar_driver(driver_actual):
+    """Devuelve un driver activo; en modo http se crea recien cuando hace falta el fallback"""
+    global driver
+    if driver_actual is None:
+        print("Iniciando navegador para fallback...")
+        driver_actual = create_driver()
+    else:
+        driver_actual = recrear_driver_si_necesario(driver_actual)
+    driver = driver_actual
+    return driver_actual
+
 def scroll_and_load_jobs(driver, max_jobs=50):
     last_count = 0
     attempts = 0
@@ -274,6 +311,59 @@ def get_job_urls_from_page(driver):
     
     return list(dict.fromkeys(job_urls))
 
+def extraer_id_empleo(job_url):
+    match = re.search(r'(\d+)/?$', job_url)
+    return match.group(1) if match else None
+
+def cliente_guest():
+    """El cliente guest, o None si no se usa o si fallo MAX_FAILURES veces seguidas (pasa al navegador)"""
+    global guest_client
+    if guest_client and guest_client.disabled:
+        print(f"Endpoint guest falló {MAX_FAILURES} veces seguidas: se sigue solo con el navegador")
+        guest_client.close()
+        guest_client = None
+    return guest_client
+
+def listar_empleos_pagina(driver, area_code, page):
+    """
+    Devuelve (urls, driver) para una pagina del listado, o (None, driver) si ya no hay resultados.
+    Usa el endpoint guest y cae al navegador si la peticion falla.
+    """
+    start = (page - 1) * 25
+    if cliente_guest():
+        cards = guest_client.search_page(area_code, start)
+        if cards is not None:
+            return ([card['url'] for card in cards] or None), driver
+        print("Endpoint guest sin respuesta, usando navegador para el listado")
+    
+    driver = asegurar_driver(driver)
+    url = f"https://www.linkedin.com/jobs/search/?f_F={area_code}&geoId=100446943&location=Argentina&start={start}"
+    LIMITER.acquire()
+    driver.get(url)
+    time.sleep(3)
+    
+    try:
+        driver.find_element(By.CSS_SELECTOR, 'div.no-results, h1.no-results__header')
+        return None, driver
+    except:
+        pass
+    
+    scroll_and_load_jobs(driver, max_jobs=25)
+    return get_job_urls_from_page(driver), driver
+
+def obtener_detalles_empleo(driver, job_url):
+    """Devuelve (detalles, driver). Primero el endpoint guest, luego el navegador"""
+    if cliente_guest():
+        job_id = extraer_id_empleo(job_url)
+        details = guest_client.fetch_job(job_id) if job_id else None
+        if details:
+            return details, driver
+        debug_print(f"Fallback a navegador para {job_url}")
+    
+    driver = asegurar_driver(driver)
+    LIMITER.acquire()
+    return extract_job_details(driver, job_url), driver
+
 def obtener_total_paginas(driver, area_code):
     """Estima el total de pÃ¡ginas para un Ã¡rea"""
     url = f"https://www.linkedin.com/jobs/search/?f_F={area_code}&geoId=100446943&location=Argentina"
@@ -298,7 +388,11 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
     
     print(f"Analizando Ã¡rea: {area_name}")
     
-    total_paginas = obtener_total_paginas(driver, area_code)
+    if cliente_guest():
+        # El endpoint guest no informa el total: se recorre hasta quedarse sin resultados
+        total_paginas = MAX_PAGINAS
+    else:
+        total_paginas = obtener_total_paginas(driver, area_code)
     print(f"Encontradas {total_paginas} pÃ¡ginas para {area_name}")
     print("Comenzando extracciÃ³n de empleos...")
     
@@ -307,10 +401,6 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
     consecutive_empty = 0
     
     while current_page <= total_paginas:
-        start = (current_page - 1) * 25
-        url = f"https://www.linkedin.com/jobs/search/?f_F={area_code}&geoId=100446943&location=Argentina&start={start}"
-        
-
         # Save checkpoint before each page
         checkpoint_data = LinkedInCheckpoint.create_checkpoint_data(
             area_index, current_page, list(areas_completed), total_jobs_scraped
@@ -319,19 +409,11 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
         print(f"\nðŸ” Procesando pÃ¡gina {current_page}/{total_paginas} de {area_name}")
         
         try:
-            driver.get(url)
-            time.sleep(3)
-            
-            try:
-                no_results = driver.find_element(By.CSS_SELECTOR, 'div.no-results, h1.no-results__header')
+            job_urls, driver = listar_empleos_pagina(driver, area_code, current_page)
+            if job_urls is None:
                 print(f"No se encontraron empleos en la pÃ¡gina {current_page}")
                 break
-            except:
-                pass
-            
-            scroll_and_load_jobs(driver, max_jobs=25)
             
-            job_urls = get_job_urls_from_page(driver)
             print(f"PÃ¡gina {current_page}/{total_paginas} - {len(job_urls)} empleos encontrados:")
             
             if len(job_urls) == 0:
@@ -343,11 +425,14 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
             
             consecutive_empty = 0
             
+            # Modo incremental: no volver a pedir empleos ya conocidos
+            empleos_listados = len(job_urls)
+            job_urls = incremental.filter_urls(area_name, job_urls)
+            nuevos_pagina = 0
+            
             for i, job_url in enumerate(job_urls):
                 try:
-                    driver = recrear_driver_si_necesario(driver)
-                    
-                    details = extract_job_details(driver, job_url)
+                    details, driver = obtener_detalles_empleo(driver, job_url)
                     if not details:
                         continue
                     
@@ -355,6 +440,7 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
                     
                     if hash_empleo in HASHES_GLOBALES:
                         print(f"{i} - [DUPLICADO] Saltando...")
+                        incremental.mark_seen(job_url, hash_empleo)
                         continue
                     
                     print(f"{i} - {details['titulo']}")
@@ -378,22 +464,28 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
                     })
                     
                     HASHES_GLOBALES.add(hash_empleo)
+                    incremental.mark_seen(job_url, hash_empleo)
+                    nuevos_pagina += 1
                     total_jobs_scraped += 1
                     jobs_this_session += 1
                     area_jobs += 1
                     
-                    time.sleep(1.5)
-                    
                 except Exception as e:
                     print(f"Error procesando empleo {i+1}: {str(e)}")
                     continue
             
+            frontier.record_page(area_name, current_page, nuevos_pagina)
+            if budget.after_page(area_name, current_page):
+                break
+            if incremental.page_done(area_name, current_page, empleos_listados, nuevos_pagina):
+                break
+            
             current_page += 1
-            time.sleep(2)
             
         except Exception as e:
             print(f"Error en pÃ¡gina {current_page}: {str(e)}")
-            driver = recrear_driver_si_necesario(driver)
+            if driver:
+                driver = recrear_driver_si_necesario(driver)
             current_page += 1
             continue
     
@@ -407,6 +499,13 @@ def scrape_area(driver, area_name, area_code, area_index, total_areas, start_pag
     if EMPLEOS:
         guardar_datos_incremental(EMPLEOS, area_name)
         EMPLEOS = []
+    incremental.finish_area(area_name)
+    frontier.finish_area(area_name)
+    
+    # Deadline: el area queda a medias y el checkpoint apunta a la pagina siguiente para reanudar
+    if budget.exhausted:
+        checkpoint_manager.save_checkpoint(LinkedInCheckpoint.create_checkpoint_data(
+            area_index, current_page + 1, list(areas_completed), total_jobs_scraped))
     
     return area_jobs
 
@@ -422,22 +521,27 @@ if __name__ == "__main__":
     print("Cargando hashes existentes para evitar duplicados entre categorÃ­as...")
     timestamp = date.today().strftime("%Y%m%d")
     for area_name in AREAS.keys():
-        archivo = f"output_jobs/LinkedIn_{area_name}_{timestamp}.json"
+        archivo = f"output_jobs/LinkedIn_{area_name}_{timestamp}{JOBS_EXTENSION}"
         if os.path.exists(archivo):
             try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    for empleo in json.load(f):
-                        h = empleo.get("hash Descripcion")
-                        if h:
-                            HASHES_GLOBALES.add(h)
+                for empleo in load_jobs(archivo):
+                    h = empleo.get("hash Descripcion")
+                    if h:
+                        HASHES_GLOBALES.add(h)
             except:
                 pass
     print(f"Cargados {len(HASHES_GLOBALES)} hashes existentes")
     
+    # Indice persistente de empleos conocidos (modo incremental)
+    incremental = IncrementalCrawl.from_args("linkedin", "linkedin.com/jobs/view", args)
+    if args.incremental:
+        print(f"Modo incremental: se corta cada area tras {args.incremental_k} paginas sin novedades (margen: {args.margen})")
+    frontier = CrawlFrontier.from_args("linkedin", args)
+    
     # =============================================================================
     # SISTEMA DE CHECKPOINT - REANUDAR SESIÃ"N INTERRUMPIDA
     # =============================================================================
-    should_resume, checkpoint_data, checkpoint_manager = get_resume_info("linkedin")
+    should_resume, checkpoint_data, checkpoint_manager = get_resume_info("linkedin", args.resume)
     
     if should_resume:
         print("Reanudando desde checkpoint...")
@@ -456,7 +560,11 @@ if __name__ == "__main__":
         checkpoint_manager = CheckpointManager("linkedin")
     
     # Determinar desde quÃ© Ã¡rea comenzar
-    areas_list = list(AREAS.items())
+    # Orden por rendimiento historico; al reanudar se reutiliza el orden guardado para que los indices del checkpoint sigan valiendo
+    areas_list = frontier.order_areas(list(AREAS.items()), key=lambda a: a[0],
+                                      resume=should_resume or bool(args.start_from))
+    budget = CrawlBudget.from_args(frontier, args)
+    budget.plan(areas_list, key=lambda a: a[0])
     start_index = start_area_index  # Use checkpoint if available
     
     # Only use --start-from if not resuming from checkpoint
@@ -472,7 +580,13 @@ if __name__ == "__main__":
     areas_to_process = areas_list[start_index:]
     print(f"Procesando {len(areas_to_process)} Ã¡reas restantes...")
     
-    driver = create_driver()
+    if args.modo == 'http' and GUEST_AVAILABLE:
+        guest_client = LinkedInGuestClient()
+        print("Modo HTTP: endpoints guest de LinkedIn (navegador solo como fallback)")
+    else:
+        if args.modo == 'http':
+            print("requests/lxml no disponibles, usando solo el navegador")
+        driver = create_driver()
     
     try:
         for idx, (area_name, area_code) in enumerate(areas_to_process):
@@ -481,6 +595,10 @@ if __name__ == "__main__":
                 print(f"Saltando Ã¡rea ya completada: {area_name}")
                 continue
             
+            # Deadline: no empezar areas que el plan dejo fuera del presupuesto
+            if not budget.allows_area(area_name):
+                continue
+            
             current_area = area_name
             current_area_index = start_index + idx
             
@@ -489,23 +607,33 @@ if __name__ == "__main__":
                 current_start_page = start_page if (start_index + idx == start_area_index) else 1
                 
                 scrape_area(driver, area_name, area_code, current_area_index + 1, len(AREAS), current_start_page)
+                if budget.exhausted:
+                    break
                 areas_completed.add(area_name)
                 
             except Exception as e:
                 print(f"Error crÃ­tico en Ã¡rea {area_name}: {str(e)}")
                 print("Intentando continuar con la siguiente Ã¡rea...")
-                driver = recrear_driver_si_necesario(driver)
+                if driver:
+                    driver = recrear_driver_si_necesario(driver)
                 continue
             
             time.sleep(3)
     finally:
-        try:
-            driver.quit()
-        except:
-            pass
+        incremental.save()
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+        if guest_client:
+            guest_client.close()
     
-    # Clear checkpoint after successful completion
-    checkpoint_manager.clear_checkpoint()
+    # Clear checkpoint after successful completion (si corto el deadline queda para reanudar)
+    if budget.exhausted:
+        print("Deadline alcanzado: checkpoint guardado, usa el mismo comando para continuar")
+    else:
+        checkpoint_manager.clear_checkpoint()
     
     print(f"\nðŸŽ‰ SCRAPING COMPLETADO EXITOSAMENTE!")
     print(f"ðŸ“Š Resumen de la sesiÃ³n:")
@@ -513,5 +641,7 @@ if __name__ == "__main__":
     print(f"   - Total de jobs recolectados: {total_jobs_scraped}")
     print(f"   - Ãreas completadas: {len(areas_completed)}/{len(AREAS)}")
     print(f"   - Todos los datos guardados en: output_jobs/")
+    limiter_stats = LIMITER.stats()
+    print(f"   - Peticiones: {limiter_stats['requests']} (espera por rate limit: {limiter_stats['waited_seconds']}s)")
     print(f"Archivos guardados en: output_jobs/")
     print(f"{'='*60}\n")
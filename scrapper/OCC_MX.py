@@ -11,10 +11,14 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import json
 import os
 from datetime import date
 import sys
+from incremental import IncrementalCrawl, add_incremental_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
+from crawl_frontier import CrawlFrontier, CrawlBudget, add_frontier_arguments
+from work_queue import (add_queue_arguments, default_worker_id, open_queue, run_worker,
+                        seed_areas, worker_output_dir)
 import argparse
 import builtins
 import signal
@@ -49,6 +53,9 @@ builtins.print = print
 parser = argparse.ArgumentParser(description='Script de scraping para OCC Mundial México')
 parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
 parser.add_argument('--start-from', type=str, help='Iniciar desde una categoría específica')
+add_incremental_arguments(parser)
+add_frontier_arguments(parser)
+add_queue_arguments(parser)
 args = parser.parse_args()
 
 def debug_print(*mensaje, **kwargs):
@@ -62,6 +69,10 @@ jobs_this_session = 0
 EMPLEOS = []
 HASHES_GLOBALES = set()
 current_category = ""
+incremental = None
+frontier = None
+OUTPUT_DIR = "output_jobs"  # en modo worker: output_jobs/workers/<worker_id>
+rango_pendiente = None  # en modo worker: siguiente rango de páginas del área actual
 
 def signal_handler(sig, frame):
     print(f"\n\nInterrupción detectada (CTRL+C)")
@@ -71,6 +82,11 @@ def signal_handler(sig, frame):
         print(f"Guardando {len(EMPLEOS)} empleos pendientes...")
         guardar_datos_incremental(EMPLEOS, current_category)
     
+    if incremental:
+        incremental.save()
+    if frontier:
+        frontier.save()
+    
     if driver:
         try:
             driver.quit()
@@ -82,24 +98,23 @@ def signal_handler(sig, frame):
 
 signal.signal(signal.SIGINT, signal_handler)
 
-def guardar_datos_incremental(empleos, categoria, archivo_base="output_jobs/OCC_Mundial"):
-    os.makedirs("output_jobs", exist_ok=True)
+def guardar_datos_incremental(empleos, categoria, archivo_base=None):
+    archivo_base = archivo_base or os.path.join(OUTPUT_DIR, "OCC_Mundial")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     timestamp = date.today().strftime("%Y%m%d")
     cat_safe = re.sub(r'[^a-zA-Z0-9]', '_', categoria)[:50]
-    nombre_archivo = f"{archivo_base}_{cat_safe}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{cat_safe}_{timestamp}{JOBS_EXTENSION}"
     
     empleos_existentes = []
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes del archivo")
         except:
             print("Archivo existente pero no se pudo leer, creando nuevo")
     
     todos_empleos = empleos_existentes + empleos
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"\nGuardado: {nombre_archivo}")
     print(f"  - Empleos nuevos: {len(empleos)}")
@@ -618,26 +633,34 @@ def extract_job_details(driver, job_url):
         debug_print(f"Error extrayendo detalles: {str(e)}")
         return None
 
-def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
-    """Scrape una categoría completa"""
-    global total_jobs_scraped, jobs_this_session, EMPLEOS, HASHES_GLOBALES, current_category
+def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats, pagina_inicio=1, pagina_fin=None,
+                     total_paginas=None):
+    """Scrape una categoría completa (o solo el rango de páginas de una tarea de la cola)"""
+    global total_jobs_scraped, jobs_this_session, EMPLEOS, HASHES_GLOBALES, current_category, rango_pendiente
     
     current_category = nombre_cat
+    rango_pendiente = None
+    
+    # Deadline: no empezar categorías que el plan dejó fuera del presupuesto
+    if not budget.allows_area(nombre_cat):
+        return 0
     
     print(f"\n{'='*80}")
     print(f"PROCESANDO CATEGORÍA {cat_index}/{total_cats}: {nombre_cat}")
     print(f"{'='*80}")
     
-    # Obtener total de páginas
-    total_paginas = obtener_total_paginas(driver, url_cat)
+    # Obtener total de páginas (las tareas de la cola lo traen de la tarea anterior)
+    if total_paginas is None:
+        total_paginas = obtener_total_paginas(driver, url_cat)
     print(f"Encontradas {total_paginas} páginas para {nombre_cat}")
     print("Comenzando extracción de empleos...")
     
     cat_jobs = 0
-    pagina = 1
+    pagina = pagina_inicio
+    ultima_pagina = min(total_paginas, pagina_fin) if pagina_fin else total_paginas
     consecutive_empty = 0
     
-    while pagina <= total_paginas and consecutive_empty < 3:
+    while pagina <= ultima_pagina and consecutive_empty < 3:
         url = f"{COUNTRY_CONFIG['base_url']}/empleos/{url_cat}/?page={pagina}"
         
         print(f"\nProcesando página {pagina}/{total_paginas} de {nombre_cat}", flush=True)
@@ -696,6 +719,13 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
             
             consecutive_empty = 0
             
+            # Modo incremental: no volver a abrir empleos ya conocidos
+            # (las tarjetas del fallback no tienen URL propia y nunca se filtran)
+            empleos_listados = len(jobs_found)
+            urls_nuevas = set(incremental.filter_urls(nombre_cat, [job.get('url', '') for job in jobs_found]))
+            jobs_found = [job for job in jobs_found if job.get('url', '') in urls_nuevas]
+            nuevos_pagina = 0
+            
             for i, job_info in enumerate(jobs_found):
                 try:
                     titulo = job_info.get('titulo', 'Sin título')
@@ -728,6 +758,7 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     hash_empleo = calcular_hash(hash_content)
                     
                     if hash_empleo in HASHES_GLOBALES:
+                        incremental.mark_seen(job_url if '/empleo/' in job_url else None, hash_empleo)
                         continue
                     
                     EMPLEOS.append({
@@ -750,6 +781,8 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     })
                     
                     HASHES_GLOBALES.add(hash_empleo)
+                    incremental.mark_seen(job_url if '/empleo/' in job_url else None, hash_empleo)
+                    nuevos_pagina += 1
                     total_jobs_scraped += 1
                     jobs_this_session += 1
                     cat_jobs += 1
@@ -758,6 +791,12 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
                     debug_print(f"Error procesando empleo {i+1}: {str(e)}")
                     continue
             
+            frontier.record_page(nombre_cat, pagina, nuevos_pagina)
+            if budget.after_page(nombre_cat, pagina):
+                break
+            if incremental.page_done(nombre_cat, pagina, empleos_listados, nuevos_pagina):
+                break
+            
             pagina += 1
             time.sleep(random.uniform(0.5, 1))
             
@@ -777,6 +816,15 @@ def scrape_categoria(driver, nombre_cat, url_cat, cat_index, total_cats):
     if EMPLEOS:
         guardar_datos_incremental(EMPLEOS, nombre_cat)
         EMPLEOS = []
+    incremental.finish_area(nombre_cat)
+    frontier.finish_area(nombre_cat)
+    
+    # Modo worker: si el rango terminó sin agotar la categoría queda otro rango por encolar
+    if pagina_fin and pagina > pagina_fin and pagina <= total_paginas and consecutive_empty < 3:
+        rango_pendiente = {"next_page": pagina, "payload": {"total_paginas": total_paginas}}
+    elif pagina_fin and budget.exhausted and pagina < total_paginas:
+        # Cortada por el deadline: el resto del rango vuelve a la cola
+        rango_pendiente = {"next_page": pagina + 1, "payload": {"total_paginas": total_paginas}}
     
     return cat_jobs
 
@@ -796,18 +844,29 @@ if __name__ == "__main__":
     timestamp = date.today().strftime("%Y%m%d")
     for nombre_cat, url_cat in CATEGORIAS:
         cat_safe = re.sub(r'[^a-zA-Z0-9]', '_', nombre_cat)[:50]
-        archivo = f"output_jobs/OCC_Mundial_{cat_safe}_{timestamp}.json"
+        archivo = f"output_jobs/OCC_Mundial_{cat_safe}_{timestamp}{JOBS_EXTENSION}"
         if os.path.exists(archivo):
             try:
-                with open(archivo, 'r', encoding='utf-8') as f:
-                    for empleo in json.load(f):
-                        h = empleo.get("hash Descripcion")
-                        if h:
-                            HASHES_GLOBALES.add(h)
+                for empleo in load_jobs(archivo):
+                    h = empleo.get("hash Descripcion")
+                    if h:
+                        HASHES_GLOBALES.add(h)
             except:
                 pass
     print(f"Cargados {len(HASHES_GLOBALES)} hashes existentes")
     
+    # Índice persistente de empleos conocidos (modo incremental)
+    incremental = IncrementalCrawl.from_args("occ_mx", "occ.com.mx", args)
+    if args.incremental:
+        print(f"Modo incremental: se corta cada categoría tras {args.incremental_k} páginas sin novedades (margen: {args.margen})")
+    
+    # Categorías ordenadas por rendimiento histórico; con --start-from se reutiliza el orden de la corrida anterior
+    frontier = CrawlFrontier.from_args("occ_mx", args)
+    CATEGORIAS = frontier.order_areas(CATEGORIAS, key=lambda c: c[0], resume=bool(args.start_from))
+    budget = CrawlBudget.from_args(frontier, args)
+    if not args.cola:
+        budget.plan(CATEGORIAS, key=lambda c: c[0])
+    
     # Determinar desde qué categoría comenzar
     start_index = 0
     if args.start_from:
@@ -823,17 +882,39 @@ if __name__ == "__main__":
     driver = create_driver()
     
     try:
-        for idx, (nombre_cat, url_cat) in enumerate(categories_to_process):
-            try:
-                scrape_categoria(driver, nombre_cat, url_cat, start_index + idx + 1, len(CATEGORIAS))
-            except Exception as e:
-                print(f"Error crítico en categoría {nombre_cat}: {str(e)}")
-                print("Intentando continuar con la siguiente categoría...")
-                driver = recrear_driver_si_necesario(driver)
-                continue
+        if args.cola:
+            # Modo worker: las categorías se reparten en tareas (categoría, rango de páginas) de una cola compartida
+            worker_id = args.worker_id or default_worker_id()
+            OUTPUT_DIR = worker_output_dir(worker_id)
+            cola = open_queue(args.cola)
+            nombres = [nombre for nombre, _ in CATEGORIAS]
+            seed_areas(cola, "occ_mx", nombres, args.paginas_por_tarea)
             
-            time.sleep(random.uniform(1, 2))
+            def procesar_tarea(tarea):
+                nombre_cat = tarea["area"]
+                scrape_categoria(driver, nombre_cat, dict(CATEGORIAS)[nombre_cat], nombres.index(nombre_cat) + 1,
+                                 len(CATEGORIAS), pagina_inicio=tarea["page_start"], pagina_fin=tarea["page_end"],
+                                 total_paginas=tarea["payload"].get("total_paginas"))
+                return rango_pendiente
+            
+            run_worker(cola, "occ_mx", procesar_tarea, worker_id=worker_id,
+                       visibility=args.visibilidad, pages_per_task=args.paginas_por_tarea,
+                       should_stop=lambda: budget.exhausted)
+        else:
+            for idx, (nombre_cat, url_cat) in enumerate(categories_to_process):
+                try:
+                    scrape_categoria(driver, nombre_cat, url_cat, start_index + idx + 1, len(CATEGORIAS))
+                    if budget.exhausted:
+                        break
+                except Exception as e:
+                    print(f"Error crítico en categoría {nombre_cat}: {str(e)}")
+                    print("Intentando continuar con la siguiente categoría...")
+                    driver = recrear_driver_si_necesario(driver)
+                    continue
+                
+                time.sleep(random.uniform(1, 2))
     finally:
+        incremental.save()
         try:
             driver.quit()
         except:
@@ -844,5 +925,5 @@ if __name__ == "__main__":
     print(f"   - Jobs recolectados en esta sesión: {jobs_this_session}")
     print(f"   - Total de jobs recolectados: {total_jobs_scraped}")
     print(f"   - Categorías procesadas: {len(categories_to_process)}")
-    print(f"   - Todos los datos guardados en: output_jobs/")
+    print(f"   - Todos los datos guardados en: {OUTPUT_DIR}/")
     print(f"{'='*60}\n")
\ No newline at end of file
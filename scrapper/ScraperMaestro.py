@@ -2,15 +2,38 @@
 """
 Script Maestro para ejecutar múltiples scrapers en paralelo
 Ejecuta ZonaJobs, Workana, Computrabajo y LinkedIn usando threads
+
+Con --daemon queda corriendo en lugar de depender de cron: cada portal tiene una
+corrida rápida (--incremental, solo lo nuevo) según su cadencia y una completa
+cada --completo-cada horas, y el estado queda en un archivo de salud/métricas.
+Los portales de Computrabajo no se lanzan por corrida: los atiende un solo
+computrabajo_engine.py --daemon que queda vivo con navegadores e índices en memoria.
 """
 
 import threading
 import subprocess
+import signal
 import sys
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import argparse
+import json
 import os
+from collections import deque
+
+from crawl_frontier import parse_deadline
+from circuit_breaker import EXIT_PARKED, parked_until
+from checkpoint_manager import checkpoint_catalog
+
+# Margen para que cada scraper guarde datos y checkpoint tras el deadline antes de cortarlo
+GRACIA_DEADLINE = timedelta(minutes=5)
+
+# Modo daemon: horas entre corridas completas de cada portal y archivo de salud/métricas
+HORAS_COMPLETO = 24
+HEALTH_FILE = os.path.join("checkpoints", "maestro_health.json")
+# Modo daemon: worker de larga vida de los portales con 'motor' (país de computrabajo_engine.py)
+MOTOR_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "computrabajo_engine.py")
+MOTOR_HEALTH_FILE = os.path.join("checkpoints", "computrabajo_engine_health.json")
 
 # Colores para la terminal
 class Colors:
@@ -34,11 +57,19 @@ class ScraperThread(threading.Thread):
         'LinkedIn': Colors.OKBLUE       # Azul
     }
     
-    def __init__(self, nombre, script_path, debug=False):
+    def __init__(self, nombre, script_path, debug=False, deadline=None, portal=None, extra_args=None, tipo=None,
+                 aislado=False, clave=None):
         threading.Thread.__init__(self)
         self.nombre = nombre
+        self.portal = portal  # nombre del circuito (checkpoints/circuit_{portal}.json)
+        self.clave = clave    # clave en scrapers_config
         self.script_path = script_path
         self.debug = debug
+        self.deadline = deadline
+        self.extra_args = extra_args or []
+        self.tipo = tipo
+        self.aislado = aislado  # sesión propia: el CTRL+C de la terminal no llega directo al scraper
+        self.process = None
         self.inicio = None
         self.fin = None
         self.exitcode = None
@@ -61,16 +92,20 @@ class ScraperThread(threading.Thread):
             cmd = [sys.executable, '-u', self.script_path]
             if self.debug:
                 cmd.append("--debug")
+            if self.deadline:
+                cmd.extend(["--deadline", self.deadline.isoformat(timespec='seconds')])
+            cmd.extend(self.extra_args)
             
             # Ejecutar el scraper con salida en tiempo real
-            process = subprocess.Popen(
+            process = self.process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
                 bufsize=1,
                 universal_newlines=True,
-                env={**os.environ, 'PYTHONUNBUFFERED': '1'}
+                env={**os.environ, 'PYTHONUNBUFFERED': '1'},
+                start_new_session=self.aislado
             )
             
             # Leer y mostrar salida en tiempo real
@@ -85,6 +120,8 @@ class ScraperThread(threading.Thread):
             
             if self.exitcode == 0:
                 self.print_output(f"{Colors.OKGREEN}✓ Completado exitosamente{Colors.ENDC}")
+            elif self.exitcode == EXIT_PARKED:
+                self.print_output(f"{Colors.WARNING}⏸ Portal estacionado por errores, se libera el lugar{Colors.ENDC}")
             else:
                 self.print_output(f"{Colors.FAIL}✗ Error en ejecución (código: {self.exitcode}){Colors.ENDC}")
                 
@@ -96,6 +133,16 @@ class ScraperThread(threading.Thread):
         finally:
             self.fin = datetime.now()
     
+    def detener(self, forzar=False, motivo=None):
+        """Pide al scraper que guarde y termine (SIGINT); con forzar lo mata"""
+        if self.process and self.process.poll() is None:
+            if forzar:
+                self.print_output(f"{Colors.FAIL}{motivo or 'Deadline excedido'}: proceso terminado{Colors.ENDC}")
+                self.process.kill()
+            else:
+                self.print_output(f"{Colors.WARNING}{motivo or 'Deadline alcanzado'}: guardando checkpoint...{Colors.ENDC}")
+                self.process.send_signal(signal.SIGINT)
+    
     def duracion(self):
         """Retorna la duración de ejecución"""
         if self.inicio and self.fin:
@@ -103,6 +150,273 @@ class ScraperThread(threading.Thread):
             return delta.total_seconds()
         return 0
 
+def _iso(valor):
+    return valor.isoformat(timespec='seconds') if valor else None
+
+
+def catalogo_checkpoints(scrapers_config, scrapers_a_ejecutar):
+    """Checkpoint catalog of the scrapers to run, keyed by scraper key"""
+    nombres = [scrapers_config[key]['checkpoint'] for key in scrapers_a_ejecutar]
+    catalogo = checkpoint_catalog(names=nombres)
+    return {key: catalogo[scrapers_config[key]['checkpoint']] for key in scrapers_a_ejecutar}
+
+
+def imprimir_plan(scrapers_config, catalogo, resume):
+    """Qué portales reanudan y cuánto trabajo les queda, antes de lanzar nada"""
+    print(f"{Colors.BOLD}Plan de checkpoints (--resume {resume}):{Colors.ENDC}")
+    for key, entrada in catalogo.items():
+        if entrada['resume'] and resume == 'auto':
+            area = f"{entrada['area_index'] + 1}" + (f"/{entrada['areas_total']}" if entrada['areas_total'] else "")
+            detalle = (f"reanuda área {area}, página {entrada['page']} "
+                       f"({entrada['jobs_scraped']} empleos, checkpoint de hace {entrada['age_hours']} h)")
+        elif entrada['resume']:
+            detalle = "descarta el checkpoint y empieza de cero"
+        else:
+            detalle = "sin checkpoint, empieza de cero"
+        if entrada['seconds_left'] is not None and (resume == 'auto' or not entrada['resume']):
+            detalle += f", ~{entrada['seconds_left'] / 60:.0f} min de trabajo"
+        print(f"  {scrapers_config[key]['nombre']:15} {detalle}")
+    print()
+
+
+def escribir_salud(path, data):
+    """Escribe el archivo de salud/métricas del daemon de forma atómica"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_file = path + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, path)
+
+
+def ejecutar_daemon(args, scrapers_config, scrapers_a_ejecutar, max_paralelo):
+    """
+    Corre hasta SIGINT/SIGTERM. Cada portal tiene una corrida rápida (--incremental con deadline
+    igual a su cadencia, así no se pisa con la siguiente) y una completa cada --completo-cada
+    horas; un portal con checkpoint pendiente empieza por la completa. Un portal estacionado
+    espera su pausa; una corrida fallida se reintenta tras la cadencia.
+    Los portales con 'motor' (Computrabajo) no arrancan en frío cada vez: los corre un solo
+    computrabajo_engine.py --daemon que ocupa un lugar todo el tiempo y se relanza si termina.
+    """
+    completo_cada = timedelta(hours=args.completo_cada)
+    motor = [key for key in scrapers_a_ejecutar if scrapers_config[key].get('motor')]
+    scrapers_a_ejecutar = [key for key in scrapers_a_ejecutar if key not in motor]
+    if motor:
+        max_paralelo = max(1, max_paralelo - 1)
+    catalogo = catalogo_checkpoints(scrapers_config, scrapers_a_ejecutar)
+    imprimir_plan(scrapers_config, catalogo, args.resume)
+    try:
+        with open(args.estado, 'r', encoding='utf-8') as f:
+            anterior = json.load(f).get('portales', {})
+    except (FileNotFoundError, ValueError):
+        anterior = {}
+
+    inicio = datetime.now()
+    portales = {}
+    for key in scrapers_a_ejecutar:
+        ultimo_completo = anterior.get(key, {}).get('ultimo_completo')
+        ultimo_completo = datetime.fromisoformat(ultimo_completo) if ultimo_completo else None
+        # Un checkpoint pendiente es una corrida completa interrumpida: se retoma primero
+        if catalogo[key]['resume']:
+            ultimo_completo = None
+        portales[key] = {
+            'cadencia': timedelta(minutes=args.cada or scrapers_config[key]['cadencia']),
+            'estado': 'esperando',
+            'proximo_rapido': inicio,
+            # La primera corrida es completa salvo que la última completa sea reciente
+            'proximo_completo': ultimo_completo + completo_cada if ultimo_completo else inicio,
+            'ultimo_completo': ultimo_completo,
+            'corridas': {'rapida': 0, 'completa': 0},
+            'fallos': 0,
+            'ultima_corrida': None,
+        }
+
+    detenido = threading.Event()
+    activos = {}
+    # Worker de Computrabajo: un solo proceso para todos los portales con 'motor'
+    worker = {
+        'thread': None,
+        'paises': [scrapers_config[key]['motor'] for key in motor],
+        'reinicio': timedelta(minutes=min((args.cada or scrapers_config[key]['cadencia']) for key in motor)) if motor else None,
+        'proximo': inicio,
+        'lanzamientos': 0,
+        'ultimo_codigo': None,
+    }
+
+    def signal_handler(sig, frame):
+        if detenido.is_set():
+            print(f"\n{Colors.FAIL}Segunda interrupción: se terminan los scrapers sin esperar{Colors.ENDC}")
+            for thread in list(activos.values()) + ([worker['thread']] if worker['thread'] else []):
+                thread.detener(forzar=True, motivo="Daemon detenido")
+            sys.exit(1)
+        print(f"\n{Colors.WARNING}Deteniendo el daemon: los scrapers en curso guardan su checkpoint...{Colors.ENDC}")
+        detenido.set()
+
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    def salud(estado):
+        escribir_salud(args.estado, {
+            'pid': os.getpid(),
+            'estado': estado,
+            'inicio': _iso(inicio),
+            'actualizado': _iso(datetime.now()),
+            'activos': sorted(activos),
+            'portales': {
+                key: {
+                    'nombre': scrapers_config[key]['nombre'],
+                    'estado': st['estado'],
+                    'cadencia_min': st['cadencia'].total_seconds() / 60,
+                    'proximo_rapido': _iso(st['proximo_rapido']),
+                    'proximo_completo': _iso(st['proximo_completo']),
+                    'ultimo_completo': _iso(st['ultimo_completo']),
+                    'corridas': st['corridas'],
+                    'fallos': st['fallos'],
+                    'ultima_corrida': st['ultima_corrida'],
+                } for key, st in portales.items()
+            },
+            'motor_computrabajo': {
+                'portales': motor,
+                'paises': worker['paises'],
+                'estado': 'corriendo' if worker['thread'] and worker['thread'].is_alive() else 'esperando',
+                'lanzamientos': worker['lanzamientos'],
+                'ultimo_codigo': worker['ultimo_codigo'],
+                'salud': MOTOR_HEALTH_FILE,
+            } if motor else None
+        })
+
+    def lanzar_motor():
+        """computrabajo_engine.py --daemon: hace él mismo las rápidas y completas de sus países"""
+        extra_args = ['--daemon', '--paises', *worker['paises'], '--completo-cada', f"{args.completo_cada:g}",
+                      '--resume', args.resume, '--estado', MOTOR_HEALTH_FILE]
+        if args.cada:
+            extra_args += ['--cada', f"{args.cada:g}"]
+        thread = ScraperThread(
+            nombre=scrapers_config[motor[0]]['nombre'] if len(motor) == 1 else 'Computrabajo',
+            script_path=MOTOR_SCRIPT,
+            debug=args.debug,
+            portal=scrapers_config[motor[0]]['portal'],
+            clave=motor[0],
+            extra_args=extra_args,
+            tipo='motor',
+            aislado=True
+        )
+        thread.print_output(f"Worker de larga vida para {', '.join(p.upper() for p in worker['paises'])}")
+        worker['lanzamientos'] += 1
+        thread.start()
+        return thread
+
+    def lanzar(key, completo):
+        config = scrapers_config[key]
+        st = portales[key]
+        tipo = 'completa' if completo else 'rapida'
+        thread = ScraperThread(
+            nombre=config['nombre'],
+            script_path=config['script'],
+            debug=args.debug,
+            deadline=None if completo else datetime.now() + st['cadencia'],
+            portal=config['portal'],
+            clave=key,
+            # La rápida empieza siempre desde la primera página: lo más nuevo está al principio
+            extra_args=['--resume', args.resume] if completo else ['--incremental', '--resume', 'fresh'],
+            tipo=tipo,
+            aislado=True
+        )
+        thread.print_output(f"Corrida {tipo}")
+        st['estado'] = f"corrida {tipo}"
+        thread.start()
+        return thread
+
+    def registrar(key, thread):
+        st = portales[key]
+        st['corridas'][thread.tipo] += 1
+        st['ultima_corrida'] = {
+            'tipo': thread.tipo,
+            'inicio': _iso(thread.inicio),
+            'fin': _iso(thread.fin),
+            'duracion_min': round(thread.duracion() / 60, 2),
+            'codigo': thread.exitcode,
+        }
+        st['proximo_rapido'] = thread.fin + st['cadencia']
+        if thread.exitcode == 0 and thread.tipo == 'completa':
+            st['ultimo_completo'] = thread.fin
+            st['proximo_completo'] = thread.fin + completo_cada
+        elif thread.exitcode not in (0, EXIT_PARKED):
+            st['fallos'] += 1
+            if thread.tipo == 'completa':
+                st['proximo_completo'] = thread.fin + st['cadencia']
+        st['estado'] = 'esperando'
+
+    print(f"{Colors.BOLD}Modo daemon (máximo {max_paralelo} a la vez{' más el worker de Computrabajo' if motor else ''}), "
+          f"completas cada {args.completo_cada:g} h{Colors.ENDC}")
+    for key, st in portales.items():
+        print(f"  {scrapers_config[key]['nombre']:15} rápida cada {st['cadencia'].total_seconds() / 60:g} min, "
+              f"próxima completa {st['proximo_completo'].strftime('%Y-%m-%d %H:%M')}")
+    if motor:
+        print(f"  {', '.join(scrapers_config[key]['nombre'] for key in motor)}: computrabajo_engine.py --daemon "
+              f"({', '.join(p.upper() for p in worker['paises'])}), estado en {MOTOR_HEALTH_FILE}")
+    print(f"Estado en {args.estado}\n")
+
+    while not detenido.is_set():
+        ahora = datetime.now()
+        for key, thread in list(activos.items()):
+            if thread.is_alive():
+                if thread.deadline and ahora > thread.deadline + GRACIA_DEADLINE:
+                    thread.detener(forzar=True)
+                continue
+            del activos[key]
+            registrar(key, thread)
+
+        # Lanzar primero lo más atrasado
+        vencidos = [key for key, st in portales.items()
+                    if key not in activos and ahora >= min(st['proximo_rapido'], st['proximo_completo'])]
+        vencidos.sort(key=lambda k: min(portales[k]['proximo_rapido'], portales[k]['proximo_completo']))
+        for key in vencidos:
+            if len(activos) >= max_paralelo:
+                break
+            st = portales[key]
+            hasta = parked_until(scrapers_config[key]['portal'])
+            if hasta:
+                st['estado'] = 'estacionado'
+                st['proximo_rapido'] = max(st['proximo_rapido'], hasta)
+                st['proximo_completo'] = max(st['proximo_completo'], hasta)
+                continue
+            activos[key] = lanzar(key, completo=ahora >= st['proximo_completo'])
+
+        # El worker de Computrabajo no tiene corridas: si terminó (error, todos estacionados) se relanza
+        if motor and not (worker['thread'] and worker['thread'].is_alive()):
+            if worker['thread']:
+                worker['ultimo_codigo'] = worker['thread'].exitcode
+                worker['proximo'] = worker['thread'].fin + worker['reinicio']
+                worker['thread'] = None
+            if ahora >= worker['proximo']:
+                worker['thread'] = lanzar_motor()
+
+        salud('corriendo')
+        detenido.wait(5)
+
+    # Apagado: cada scraper guarda su checkpoint; pasada la gracia se lo mata
+    for thread in activos.values():
+        thread.detener(motivo="Daemon detenido")
+    if worker['thread']:
+        worker['thread'].detener(motivo="Daemon detenido")
+    limite = time.monotonic() + GRACIA_DEADLINE.total_seconds()
+    for key, thread in activos.items():
+        thread.join(timeout=max(0.0, limite - time.monotonic()))
+        if thread.is_alive():
+            thread.detener(forzar=True, motivo="Daemon detenido")
+            thread.join()
+        registrar(key, thread)
+    activos.clear()
+    if worker['thread']:
+        worker['thread'].join(timeout=max(0.0, limite - time.monotonic()))
+        if worker['thread'].is_alive():
+            worker['thread'].detener(forzar=True, motivo="Daemon detenido")
+            worker['thread'].join()
+        worker['ultimo_codigo'] = worker['thread'].exitcode
+    salud('detenido')
+    print(f"{Colors.BOLD}Daemon detenido: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Ejecuta múltiples scrapers en paralelo')
     parser.add_argument('--debug', action='store_true', help='Activa el modo debug en todos los scrapers')
@@ -110,7 +424,24 @@ def main():
                         choices=['zonajobs', 'workana', 'computrabajo', 'linkedin', 'all'],
                         default=['all'],
                         help='Scrapers a ejecutar (default: all)')
+    parser.add_argument('--deadline', type=str, default=None,
+                        help='Hora límite para todos los scrapers: "06:30", "+2h", "+90m" o ISO "2026-01-30T06:30"')
+    parser.add_argument('--max-paralelo', type=int, default=None,
+                        help='Scrapers corriendo a la vez (default: todos); cuando un portal se estaciona su lugar pasa al siguiente')
+    parser.add_argument('--resume', choices=['auto', 'fresh'], default='auto',
+                        help='Checkpoints previos de los scrapers: auto = reanudarlos, fresh = empezar de cero (default: auto)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Quedarse corriendo: corridas rápidas por portal según su cadencia y completas periódicas')
+    parser.add_argument('--cada', type=float, default=None,
+                        help='Modo daemon: minutos entre corridas rápidas (default: la cadencia de cada portal)')
+    parser.add_argument('--completo-cada', type=float, default=HORAS_COMPLETO,
+                        help=f'Modo daemon: horas entre corridas completas (default: {HORAS_COMPLETO})')
+    parser.add_argument('--estado', type=str, default=HEALTH_FILE,
+                        help=f'Modo daemon: archivo de salud/métricas (default: {HEALTH_FILE})')
     args = parser.parse_args()
+    if args.daemon and args.deadline:
+        parser.error('--deadline no se usa con --daemon (las corridas rápidas usan su cadencia como deadline)')
+    deadline = parse_deadline(args.deadline)
     
     # Banner
     print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*60}")
@@ -119,28 +450,47 @@ def main():
     
     inicio_total = datetime.now()
     print(f"Inicio: {inicio_total.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Modo debug: {Colors.OKGREEN if args.debug else Colors.WARNING}{'Activado' if args.debug else 'Desactivado'}{Colors.ENDC}\n")
+    print(f"Modo debug: {Colors.OKGREEN if args.debug else Colors.WARNING}{'Activado' if args.debug else 'Desactivado'}{Colors.ENDC}")
+    if deadline:
+        print(f"Deadline: {Colors.WARNING}{deadline.strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")
+    print()
     
     # Obtener el directorio donde está este script
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
-    # Definir scrapers disponibles con rutas absolutas
+    # Definir scrapers disponibles con rutas absolutas (cadencia: minutos entre corridas rápidas del daemon,
+    # checkpoint: nombre con el que cada script guarda su checkpoint, portal: nombre de su circuito (el
+    # estado de pausa en checkpoints/circuit_{portal}.json), motor: país de computrabajo_engine.py
+    # que en modo daemon lo atiende el worker de larga vida en lugar de corridas en frío)
     scrapers_config = {
         'zonajobs': {
             'nombre': 'ZonaJobs',
-            'script': os.path.join(script_dir, 'ZonaJobs.py')
+            'script': os.path.join(script_dir, 'ZonaJobs.py'),
+            'cadencia': 30,
+            'checkpoint': 'zonajobs',
+            'portal': 'zonajobs'
         },
         'workana': {
             'nombre': 'Workana',
-            'script': os.path.join(script_dir, 'Workana.py')
+            'script': os.path.join(script_dir, 'Workana.py'),
+            'cadencia': 60,
+            'checkpoint': 'computrabajo_mx',
+            'portal': 'computrabajo_mx'
         },
         'computrabajo': {
             'nombre': 'Computrabajo',
-            'script': os.path.join(script_dir, 'Computrabajo.py')
+            'script': os.path.join(script_dir, 'Computrabajo.py'),
+            'cadencia': 30,
+            'checkpoint': 'computrabajo',
+            'portal': 'computrabajo',
+            'motor': 'ar'
         },
         'linkedin': {
             'nombre': 'LinkedIn',
-            'script': os.path.join(script_dir, 'LinkedIn.py')
+            'script': os.path.join(script_dir, 'LinkedIn.py'),
+            'cadencia': 60,
+            'checkpoint': 'linkedin',
+            'portal': 'linkedin'
         }
     }
     
@@ -152,19 +502,28 @@ def main():
     
     print(f"Scrapers a ejecutar: {Colors.OKCYAN}{', '.join([scrapers_config[s]['nombre'] for s in scrapers_a_ejecutar])}{Colors.ENDC}\n")
     
-    # Crear threads para cada scraper
-    threads = []
-    for scraper_key in scrapers_a_ejecutar:
+    def crear_thread(scraper_key):
         config = scrapers_config[scraper_key]
         thread = ScraperThread(
             nombre=config['nombre'],
             script_path=config['script'],
-            debug=args.debug
+            debug=args.debug,
+            deadline=deadline,
+            portal=config['portal'],
+            clave=scraper_key,
+            # Con la salida entubada un input() dejaría el lugar ocupado: la política va por argumento
+            extra_args=['--resume', args.resume]
         )
-        threads.append(thread)
+        return thread
+    
+    max_paralelo = args.max_paralelo or len(scrapers_a_ejecutar)
+    
+    if args.daemon:
+        ejecutar_daemon(args, scrapers_config, scrapers_a_ejecutar, max_paralelo)
+        return
     
     # Iniciar todos los threads
-    print(f"{Colors.BOLD}Iniciando scrapers en paralelo...{Colors.ENDC}")
+    print(f"{Colors.BOLD}Iniciando scrapers en paralelo (máximo {max_paralelo} a la vez)...{Colors.ENDC}")
     print(f"{Colors.BOLD}Leyenda de colores:{Colors.ENDC}")
     print(f"  {Colors.OKGREEN}[ZonaJobs     ]{Colors.ENDC} - Verde")
     print(f"  {Colors.OKCYAN}[Workana      ]{Colors.ENDC} - Cyan")
@@ -172,11 +531,68 @@ def main():
     print(f"  {Colors.OKBLUE}[LinkedIn     ]{Colors.ENDC} - Azul")
     print(f"\n{Colors.BOLD}{'='*60}{Colors.ENDC}\n")
     
-    for thread in threads:
-        thread.start()
-        time.sleep(0.5)  # Pequeña pausa entre inicios
+    # Catálogo de checkpoints: qué portales reanudan y cuánto les queda. Con menos lugares que
+    # portales se lanzan primero los de más trabajo (los de duración desconocida antes que todos)
+    catalogo = catalogo_checkpoints(scrapers_config, scrapers_a_ejecutar)
+    imprimir_plan(scrapers_config, catalogo, args.resume)
+    restante = {key: (e['seconds_left'] if e['seconds_left'] is not None and (args.resume == 'auto' or not e['resume'])
+                      else float('inf')) for key, e in catalogo.items()}
+    orden = sorted(scrapers_a_ejecutar, key=lambda key: restante[key], reverse=True)
+    
+    # Cola de scrapers por lanzar. Un portal estacionado (circuito abierto demasiadas veces) cede su
+    # lugar a los sanos y se reintenta una vez al final de la cola, cuando termine su pausa
+    pendientes = deque(crear_thread(key) for key in orden)
+    reintentados = set()
+    activos = []
+    threads = []
+    estacionados = []
     
-    # Esperar a que terminen todos
+    # Esperar a que terminen todos. Cada scraper planifica su trabajo con el deadline y corta solo;
+    # si alguno sigue vivo pasado el deadline se le pide que guarde (SIGINT) y luego se lo mata
+    avisados = False
+    while pendientes or activos:
+        ahora = datetime.now()
+        vencido = deadline and ahora > deadline
+        
+        # Lanzar scrapers mientras haya lugar
+        for _ in range(len(pendientes)):
+            if vencido or len(activos) >= max_paralelo:
+                break
+            thread = pendientes.popleft()
+            hasta = parked_until(thread.portal)
+            if hasta:
+                if activos or any(not parked_until(t.portal) for t in pendientes):
+                    pendientes.append(thread)  # todavía en pausa: probar más tarde
+                    continue
+                print(f"{thread.color}{thread.nombre}{Colors.ENDC} sigue estacionado hasta {hasta.strftime('%H:%M')}, se omite")
+                estacionados.append(thread)
+                continue
+            thread.start()
+            activos.append(thread)
+            threads.append(thread)
+            time.sleep(0.5)  # Pequeña pausa entre inicios
+        if vencido and pendientes:
+            estacionados.extend(pendientes)
+            pendientes.clear()
+        
+        if deadline and not avisados and vencido:
+            for thread in activos:
+                thread.detener()
+            avisados = True
+        elif deadline and avisados and ahora > deadline + GRACIA_DEADLINE:
+            for thread in activos:
+                thread.detener(forzar=True)
+            break
+        
+        for thread in activos:
+            thread.join(timeout=1)
+        for thread in [t for t in activos if not t.is_alive()]:
+            activos.remove(thread)
+            if thread.exitcode == EXIT_PARKED and thread.clave not in reintentados:
+                reintentados.add(thread.clave)
+                pendientes.append(crear_thread(thread.clave))
+        if not activos and pendientes:
+            time.sleep(1)
     for thread in threads:
         thread.join()
     
@@ -191,15 +607,21 @@ def main():
     exitosos = 0
     fallidos = 0
     
-    for thread in threads:
+    for thread in threads + estacionados:
         duracion_mins = thread.duracion() / 60
-        estado_color = Colors.OKGREEN if thread.exitcode == 0 else Colors.FAIL
-        estado_texto = "✓ EXITOSO" if thread.exitcode == 0 else "✗ FALLIDO"
+        if thread.exitcode == 0:
+            estado_color, estado_texto = Colors.OKGREEN, "✓ EXITOSO"
+        elif thread.exitcode == EXIT_PARKED or thread in estacionados:
+            estado_color, estado_texto = Colors.WARNING, "⏸ ESTACIONADO"
+        else:
+            estado_color, estado_texto = Colors.FAIL, "✗ FALLIDO"
         
         print(f"{thread.color}{thread.nombre:15}{Colors.ENDC} - {estado_color}{estado_texto}{Colors.ENDC} - Duración: {duracion_mins:.2f} mins")
         
         if thread.exitcode == 0:
             exitosos += 1
+        elif thread.exitcode == EXIT_PARKED or thread in estacionados:
+            continue
         else:
             fallidos += 1
             if thread.error:
@@ -209,6 +631,7 @@ def main():
     print(f"  Total scrapers: {len(threads)}")
     print(f"  {Colors.OKGREEN}Exitosos: {exitosos}{Colors.ENDC}")
     print(f"  {Colors.FAIL}Fallidos: {fallidos}{Colors.ENDC}")
+    print(f"  {Colors.WARNING}Estacionados: {len(threads) + len(estacionados) - exitosos - fallidos}{Colors.ENDC}")
     print(f"  Duración total: {Colors.OKCYAN}{duracion_total/60:.2f} minutos{Colors.ENDC}")
     
     print(f"\n{Colors.BOLD}Finalizado: {fin_total.strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}\n")
@@ -5,87 +5,25 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import date
-import json
 import time
 import random
 import argparse
+from cloudflare_manager import CloudflareManager
+from jsonl_zstd import JOBS_EXTENSION, save_jobs
 
 # Variable global para modo debug
 DEBUG_MODE = False
 
+# Manejo compartido de Cloudflare (se inicializa en main)
+CF_MANAGER = None
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+
 def debug_print(message):
     """Imprime mensaje solo si el modo debug está activado"""
     if DEBUG_MODE:
         print(message)
 
-def handle_cloudflare_checkbox(driver, timeout=10):
-    """
-    Intenta hacer clic en el checkbox de verificación de Cloudflare
-    Retorna True si tuvo éxito, False en caso contrario
-    """
-    try:
-        debug_print("Buscando checkbox de Cloudflare...")
-        
-        # Esperar un poco para que cargue el challenge
-        time.sleep(2)
-        
-        # Buscar todos los iframes
-        iframes = driver.find_elements(By.TAG_NAME, "iframe")
-        debug_print(f"Encontrados {len(iframes)} iframes")
-        
-        for idx, iframe in enumerate(iframes):
-            try:
-                # Cambiar al iframe
-                driver.switch_to.frame(iframe)
-                debug_print(f"Revisando iframe {idx + 1}/{len(iframes)}")
-                
-                # Intentar diferentes selectores para el checkbox
-                checkbox_selectors = [
-                    "input[type='checkbox']",
-                    ".cb-lb",
-                    "#challenge-stage input",
-                    "span.mark",
-                    ".ctp-checkbox-label"
-                ]
-                
-                for selector in checkbox_selectors:
-                    try:
-                        checkbox = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                        debug_print(f"Checkbox encontrado con: {selector}")
-                        
-                        # Hacer clic
-                        checkbox.click()
-                        print("Checkbox de Cloudflare clickeado!")
-                        time.sleep(3)
-                        
-                        # Volver al contenido principal
-                        driver.switch_to.default_content()
-                        return True
-                        
-                    except:
-                        continue
-                
-                # Si no encontramos nada en este iframe, volver al contenido principal
-                driver.switch_to.default_content()
-                
-            except Exception as e:
-                debug_print(f"Error procesando iframe {idx + 1}: {e}")
-                driver.switch_to.default_content()
-                continue
-        
-        debug_print("No se encontró checkbox de Cloudflare")
-        return False
-        
-    except Exception as e:
-        debug_print(f"Error en handle_cloudflare_checkbox: {e}")
-        try:
-            driver.switch_to.default_content()
-        except:
-            pass
-        return False
-
 def verificar_pagina_existe(driver, url, page_num):
     """
     Verifica si una página contiene trabajos válidos
@@ -102,57 +40,8 @@ def verificar_pagina_existe(driver, url, page_num):
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # Verificar si Cloudflare está bloqueando - MEJORADO
-            cloudflare_detectado = False
-            try:
-                # Buscar indicadores de Cloudflare
-                page_text = driver.page_source.lower()
-                cloudflare_indicators = [
-                    "verify you are human",
-                    "checking your browser",
-                    "just a moment",
-                    "cloudflare"
-                ]
-                
-                for indicator in cloudflare_indicators:
-                    if indicator in page_text:
-                        cloudflare_detectado = True
-                        break
-                
-                if cloudflare_detectado:
-                    print(f"\nCloudflare detectado en página {page_num}!")
-                    print("Intentando resolver automáticamente...")
-                    
-                    # Intentar clickear el checkbox hasta 3 veces
-                    for cf_intento in range(3):
-                        if handle_cloudflare_checkbox(driver):
-                            print(f"Intento {cf_intento + 1}: Checkbox clickeado. Esperando verificación...")
-                            time.sleep(8)
-                            
-                            # Verificar si pasamos
-                            page_text_nuevo = driver.page_source.lower()
-                            if not any(ind in page_text_nuevo for ind in cloudflare_indicators):
-                                print("Cloudflare superado exitosamente!")
-                                break
-                        else:
-                            print(f"Intento {cf_intento + 1}: No se encontró checkbox")
-                            time.sleep(5)
-                            
-                            if cf_intento < 2:
-                                print("Refrescando página...")
-                                driver.refresh()
-                                time.sleep(5)
-                    
-                    # Si después de 3 intentos seguimos bloqueados, pedir intervención manual
-                    page_text_final = driver.page_source.lower()
-                    if any(ind in page_text_final for ind in cloudflare_indicators):
-                        print("\nNo se pudo resolver automáticamente.")
-                        print("Por favor, resuelve la verificación manualmente en el navegador.")
-                        print("Presiona Enter cuando hayas completado la verificación...")
-                        input()
-                        
-            except Exception as e:
-                debug_print(f"Error verificando Cloudflare: {e}")
+            # Verificar si Cloudflare está bloqueando
+            CF_MANAGER.ensure_passed(f"en página {page_num}")
             
             # Verificar si hay mensaje de "no hay resultados"
             try:
@@ -278,7 +167,7 @@ def obtener_total_paginas(driver, categoria):
         return 1
 
 def main():
-    global DEBUG_MODE
+    global DEBUG_MODE, CF_MANAGER
     
     # Configurar argumentos
     parser = argparse.ArgumentParser(description='Scraper de trabajos de Upwork')
@@ -315,8 +204,10 @@ def main():
     options.add_argument('--disable-web-security')
     options.add_argument('--disable-features=IsolateOrigins,site-per-process')
     
-    # User agent realista
-    options.add_argument('user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36')
+    # User agent realista: si hay una clearance guardada hay que usar el mismo con el que se obtuvo
+    CF_MANAGER = CloudflareManager("upwork.com", debug_print=debug_print)
+    user_agent = CF_MANAGER.user_agent or DEFAULT_USER_AGENT
+    options.add_argument(f'user-agent={user_agent}')
     
     # Preferencias adicionales
     options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
@@ -334,7 +225,7 @@ def main():
     
     # Modificar propiedades de navegador para evitar detección
     driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-        "userAgent": 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+        "userAgent": user_agent
     })
     
     # Eliminar propiedades que indican automatización
@@ -346,10 +237,13 @@ def main():
     print("La verificación aparecerá al acceder a las páginas de búsqueda.")
     print("El script intentará resolverla automáticamente...\n")
     
+    CF_MANAGER.attach(driver)
+    
     # Primera carga simple - NO intentar resolver Cloudflare aquí
     try:
         print("Cargando Upwork...")
-        driver.get("https://www.upwork.com")
+        if not CF_MANAGER.apply_clearance("https://www.upwork.com"):
+            driver.get("https://www.upwork.com")
         time.sleep(3)
         print("Página inicial cargada.\n")
         
@@ -381,29 +275,7 @@ def main():
                 time.sleep(random.uniform(4, 7))
                 
                 # Verificar Cloudflare en el bucle principal también
-                try:
-                    page_text = driver.page_source.lower()
-                    if "verify you are human" in page_text or "checking your browser" in page_text:
-                        print(f"\nCloudflare detectado en página {pagina}!")
-                        print("Intentando resolver...")
-                        
-                        for cf_intento in range(2):
-                            if handle_cloudflare_checkbox(driver):
-                                print("Checkbox clickeado. Esperando...")
-                                time.sleep(8)
-                                break
-                            else:
-                                if cf_intento == 0:
-                                    print("Reintentando...")
-                                    time.sleep(5)
-                        
-                        # Verificar si pasamos
-                        if "verify you are human" in driver.page_source.lower():
-                            print("Por favor, completa la verificación manualmente.")
-                            print("Presiona Enter cuando termines...")
-                            input()
-                except:
-                    pass
+                CF_MANAGER.ensure_passed(f"en página {pagina}")
 
                 # Esperar que carguen los trabajos
                 try:
@@ -493,14 +365,14 @@ def main():
             print(f"\nCategoría '{categoria}' completada: {len([t for t in TRABAJOS if t['categoria'] == categoria])} trabajos extraídos")
         
         # Guardar todos los trabajos en un archivo JSON
-        nombre_archivo = f"output_jobs/Upwork_multiple_categorias_{pagina_inicio}a{total_paginas}.json"
-        with open(nombre_archivo, 'w', encoding='utf-8') as file:
-            json.dump(TRABAJOS, file, ensure_ascii=False, indent=4)
+        nombre_archivo = f"output_jobs/Upwork_multiple_categorias_{pagina_inicio}a{total_paginas}{JOBS_EXTENSION}"
+        save_jobs(nombre_archivo, TRABAJOS)
         
         print(f"\n{'='*60}")
         print(f"Scraping completado exitosamente")
         print(f"Total de trabajos extraídos: {len(TRABAJOS)}")
         print(f"Archivo guardado: {nombre_archivo}")
+        CF_MANAGER.print_summary()
         print(f"{'='*60}\n")
 
     except Exception as e:
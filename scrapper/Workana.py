@@ -7,7 +7,6 @@ from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 import tempfile
 import time
-import json
 import shutil
 import os
 from datetime import date
@@ -18,7 +17,11 @@ import re
 import builtins
 import signal
 import sys
-from checkpoint_manager import CheckpointManager, ComputrabajoCheckpoint, get_resume_info
+from incremental import IncrementalCrawl, add_incremental_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
+from crawl_frontier import CrawlFrontier, CrawlBudget, add_frontier_arguments
+from checkpoint_manager import CheckpointManager, ComputrabajoCheckpoint, add_resume_arguments, get_resume_info
+from cloudflare_manager import CloudflareManager
 
 # Colores ANSI para tmux - Amarillo para Computrabajo México
 YELLOW = '\033[0;33m'
@@ -35,6 +38,9 @@ builtins.print = print
 # Configurar argumentos de línea de comandos
 parser = argparse.ArgumentParser(description='Script de scraping para Computrabajo México')
 parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
+add_incremental_arguments(parser)
+add_frontier_arguments(parser)
+add_resume_arguments(parser)
 args = parser.parse_args()
 
 def debug_print(*mensaje, **kwargs):
@@ -48,6 +54,8 @@ current_area_index = 0
 current_page = 1
 areas_completed = set()
 total_jobs_scraped = 0
+incremental = None
+frontier = None
 
 def signal_handler(sig, frame):
     """Handle CTRL+C gracefully by saving checkpoint"""
@@ -61,6 +69,11 @@ def signal_handler(sig, frame):
         checkpoint_manager.save_checkpoint(checkpoint_data)
         print(" Checkpoint guardado exitosamente")
     
+    if incremental:
+        incremental.save()
+    if frontier:
+        frontier.save()
+    
     if driver:
         try:
             driver.quit()
@@ -83,15 +96,14 @@ def guardar_datos_incremental(empleos, area, archivo_base="output_jobs/Computrab
     
     # Nombre del archivo
     timestamp = date.today().strftime("%Y%m%d")
-    nombre_archivo = f"{archivo_base}_{area}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{area}_{timestamp}{JOBS_EXTENSION}"
     
     # Leer datos existentes si el archivo existe
     empleos_existentes = []
     
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes del archivo")
         except Exception as ex:
             print(f"Archivo existente pero no se pudo leer ({ex}), creando nuevo")
@@ -99,8 +111,7 @@ def guardar_datos_incremental(empleos, area, archivo_base="output_jobs/Computrab
     # Combinar y guardar
     todos_empleos = empleos_existentes + empleos
     
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"\n Guardado: {nombre_archivo}")
     print(f"  - Empleos nuevos: {len(empleos)}")
@@ -120,7 +131,8 @@ def verificar_pagina_existe(driver, url, intentos=3):
     for intento in range(intentos):
         try:
             driver.get(url)
-            driver.delete_all_cookies()
+            cf_manager.ensure_passed(f"en página {page_num}")
+            cf_manager.reset_cookies()
             time.sleep(random.uniform(1, 2))
             
             # Esperar a que cargue la página
@@ -242,9 +254,16 @@ chrome_options.add_argument("--disable-extensions")
 chrome_options.add_argument("--disable-gpu")
 chrome_options.add_argument("--no-sandbox")
 
+# Clearance de Cloudflare: el perfil es temporal, así que se reutiliza la guardada en sesiones previas
+cf_manager = CloudflareManager("computrabajo.com", debug_print=debug_print)
+if cf_manager.user_agent:
+    chrome_options.add_argument(f"--user-agent={cf_manager.user_agent}")
+
 service = Service(ChromeDriverManager().install())
 driver = webdriver.Chrome(service=service, options=chrome_options)
 driver.maximize_window()
+cf_manager.attach(driver)
+cf_manager.apply_clearance("https://mx.computrabajo.com")
 
 EMPLEOS = []
 
@@ -312,24 +331,29 @@ HASHES_GLOBALES = set()
 print(" Cargando hashes existentes para evitar duplicados entre categorías...")
 for area in areas:
     timestamp = date.today().strftime("%Y%m%d")
-    archivo_existente = f"output_jobs/Computrabajo_MX_{area}_{timestamp}.json"
+    archivo_existente = f"output_jobs/Computrabajo_MX_{area}_{timestamp}{JOBS_EXTENSION}"
     if os.path.exists(archivo_existente):
         try:
-            with open(archivo_existente, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
-                for empleo in empleos_existentes:
-                    h = empleo.get("hash Descripcion")
-                    if h:
-                        HASHES_GLOBALES.add(h)
+            empleos_existentes = load_jobs(archivo_existente)
+            for empleo in empleos_existentes:
+                h = empleo.get("hash Descripcion")
+                if h:
+                    HASHES_GLOBALES.add(h)
         except:
             pass
 
 print(f" Cargados {len(HASHES_GLOBALES)} hashes existentes")
 
+# Índice persistente de empleos conocidos (modo incremental)
+incremental = IncrementalCrawl.from_args("computrabajo_mx", "mx.computrabajo.com", args)
+if args.incremental:
+    print(f"Modo incremental: se corta cada área tras {args.incremental_k} páginas sin novedades (margen: {args.margen})")
+frontier = CrawlFrontier.from_args("computrabajo_mx", args)
+
 # =============================================================================
 # SISTEMA DE CHECKPOINT - REANUDAR SESIÓN INTERRUMPIDA
 # =============================================================================
-should_resume, checkpoint_data, checkpoint_manager = get_resume_info("computrabajo_mx")
+should_resume, checkpoint_data, checkpoint_manager = get_resume_info("computrabajo_mx", args.resume)
 
 if should_resume:
     print(" Reanudando desde checkpoint...")
@@ -353,6 +377,12 @@ current_page = start_page
 
 jobs_this_session = 0
 
+# Áreas ordenadas por rendimiento histórico; al reanudar se reutiliza el orden guardado
+# para que los índices del checkpoint sigan apuntando a las mismas áreas
+areas = frontier.order_areas(areas, resume=should_resume)
+budget = CrawlBudget.from_args(frontier, args)
+budget.plan(areas)
+
 try:
     for area_index, area in enumerate(areas):
         # Skip areas that were already completed
@@ -363,6 +393,10 @@ try:
         if area in areas_completed:
             print(f"⏭  Saltando área ya completada: {area}")
             continue
+        
+        # Deadline: no empezar áreas que el plan dejó fuera del presupuesto
+        if not budget.allows_area(area):
+            continue
             
         # Update global variables for signal handler
         current_area_index = area_index
@@ -395,7 +429,8 @@ try:
             debug_print(f"\nAccediendo a URL: {url}")
             
             driver.get(url)
-            driver.delete_all_cookies()
+            cf_manager.ensure_passed(f"en página {pagina}")
+            cf_manager.reset_cookies()
             time.sleep(random.uniform(1, 3))
 
             # Esperar que carguen los enlaces de empleo
@@ -412,12 +447,18 @@ try:
             # Filtrar solo URLs válidas de empleos de México
             links_empleos = [url for url in links_empleos if url and 'mx.computrabajo.com' in url and '/ofertas-de-trabajo/oferta-de-trabajo-de-' in url]
             
+            # Modo incremental: no volver a abrir empleos ya conocidos
+            empleos_listados = len(links_empleos)
+            links_empleos = incremental.filter_urls(area, links_empleos)
+            nuevos_pagina = 0
+            
             if not args.debug:
-                print(f"\nPágina {pagina}/{total_paginas} - {len(links_empleos)} empleos encontrados:")
+                print(f"\nPágina {pagina}/{total_paginas} - {empleos_listados} empleos encontrados ({len(links_empleos)} por procesar):")
 
             for i, url_empleo in enumerate(links_empleos):
                 debug_print(f"\nProcesando empleo {i+1}: {url_empleo}")
                 driver.get(url_empleo)
+                cf_manager.ensure_passed()
 
                 # --- DETECCIÓN TEMPRANA DE DUPLICADOS ---
                 try:
@@ -442,6 +483,7 @@ try:
                     debug_print(f"    [DUPLICADO TEMPRANO] Saltando empleo {i+1} - ya existe")
                     if not args.debug:
                         print(f"  {i} - [DUPLICADO]  Saltando (ahorrando ~6s)...")
+                    incremental.mark_seen(url_empleo, hash_empleo)
                     continue
                 
                 # Si no es duplicado, extraer el resto de los datos
@@ -489,11 +531,19 @@ try:
                     "fecha": today
                 })
                 HASHES_GLOBALES.add(hash_empleo)
+                incremental.mark_seen(url_empleo, hash_empleo)
+                nuevos_pagina += 1
                 debug_print(f"    [NUEVO]  Empleo agregado")
                 
                 # Update job counts for checkpoint
                 jobs_this_session += 1
                 total_jobs_scraped += 1
+            
+            frontier.record_page(area, pagina, nuevos_pagina)
+            if budget.after_page(area, pagina):
+                break
+            if incremental.page_done(area, pagina, empleos_listados, nuevos_pagina):
+                break
         
         # Guardado incremental por área
         print(f"\n{'='*60}")
@@ -502,6 +552,15 @@ try:
         guardar_datos_incremental(EMPLEOS, area)
         EMPLEOS = []  # Limpiar lista después de guardar
         
+        incremental.finish_area(area)
+        frontier.finish_area(area)
+        
+        # Deadline: el área queda a medias y el checkpoint apunta a la página siguiente para reanudar
+        if budget.exhausted:
+            checkpoint_manager.save_checkpoint(ComputrabajoCheckpoint.create_checkpoint_data(
+                area_index, pagina + 1, list(areas_completed), total_jobs_scraped))
+            break
+        
         # Mark this area as completed
         areas_completed.add(area)
         print(f" Área completada: {area}")
@@ -520,8 +579,11 @@ try:
     print(f" Total jobs procesados: {total_jobs_scraped}")
     print(f" Áreas procesadas: {len(areas)}")
     
-    # Clear checkpoint since we completed successfully
-    checkpoint_manager.clear_checkpoint()
+    # Clear checkpoint since we completed successfully (si cortó el deadline queda para reanudar)
+    if budget.exhausted:
+        print(" Deadline alcanzado: checkpoint guardado, usa el mismo comando para continuar")
+    else:
+        checkpoint_manager.clear_checkpoint()
     
 except KeyboardInterrupt:
     print(f"\n  Scraping interrumpido por el usuario")
@@ -538,9 +600,11 @@ except KeyboardInterrupt:
     sys.exit(0)
 
 finally:
+    incremental.save()
     driver.quit()
     shutil.rmtree(temp_profile_dir, ignore_errors=True)
 
 print(f"\n Proceso completado - Todos los datos guardados por área en output_jobs/")
+cf_manager.print_summary()
 print(f" Archivos: Computrabajo_MX_[area]_[fecha].json")
 print(f" Fuente: https://mx.computrabajo.com/")
\ No newline at end of file
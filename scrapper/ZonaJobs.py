@@ -4,14 +4,19 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import json
 import os
 from datetime import date
 import sys
 import argparse
 import builtins
 import signal
-from checkpoint_manager import CheckpointManager, ZonaJobsCheckpoint, get_resume_info
+from checkpoint_manager import CheckpointManager, ZonaJobsCheckpoint, add_resume_arguments, get_resume_info
+from incremental import IncrementalCrawl, add_incremental_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
+from crawl_frontier import CrawlFrontier, CrawlBudget, add_frontier_arguments
+from tab_pipeline import TabPipeline, add_tab_arguments
+from listing_cards import ListingCards, add_card_arguments
+from circuit_breaker import CircuitBreaker, CooldownInterrupted, PortalParked, EXIT_PARKED, parked_until
 
 # Colores ANSI para tmux - Verde para ZonaJobs
 GREEN = '\033[0;32m'
@@ -29,6 +34,11 @@ builtins.print = print
 parser = argparse.ArgumentParser(description='Script de scraping para ZonaJobs')
 parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
 parser.add_argument('--start-from', type=str, help='Iniciar desde una área específica (ej: tecnologia-sistemas-y-telecomunicaciones)')
+add_incremental_arguments(parser)
+add_frontier_arguments(parser)
+add_tab_arguments(parser)
+add_card_arguments(parser)
+add_resume_arguments(parser)
 args = parser.parse_args()
 
 def colorize(text):
@@ -50,6 +60,8 @@ current_area_index = 0
 current_page = 1
 areas_completed = set()
 total_jobs_scraped = 0
+incremental = None
+frontier = None
 
 def signal_handler(sig, frame):
     """Handle CTRL+C gracefully by saving checkpoint"""
@@ -63,6 +75,11 @@ def signal_handler(sig, frame):
         checkpoint_manager.save_checkpoint(checkpoint_data)
         print("Checkpoint guardado exitosamente")
     
+    if incremental:
+        incremental.save()
+    if frontier:
+        frontier.save()
+    
     if driver:
         try:
             driver.quit()
@@ -125,6 +142,9 @@ def recrear_driver_si_necesario(driver):
         return create_driver()
     return driver
 
+# Circuito por portal/área: si ZonaJobs está bloqueando se pausa en vez de seguir insistiendo
+breaker = CircuitBreaker("zonajobs")
+
 driver = create_driver()
 import hashlib
 
@@ -142,15 +162,14 @@ def guardar_datos_incremental(empleos, area, archivo_base="output_jobs/ZonaJobs"
     
     # Nombre del archivo
     timestamp = date.today().strftime("%Y%m%d")
-    nombre_archivo = f"{archivo_base}_{area}_{timestamp}.json"
+    nombre_archivo = f"{archivo_base}_{area}_{timestamp}{JOBS_EXTENSION}"
     
     # Leer datos existentes si el archivo existe
     empleos_existentes = []
     
     if os.path.exists(nombre_archivo):
         try:
-            with open(nombre_archivo, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
+            empleos_existentes = load_jobs(nombre_archivo)
             print(f"Cargados {len(empleos_existentes)} empleos existentes del archivo")
         except:
             print("Archivo existente pero no se pudo leer, creando nuevo")
@@ -158,8 +177,7 @@ def guardar_datos_incremental(empleos, area, archivo_base="output_jobs/ZonaJobs"
     # Combinar y guardar (los duplicados ya fueron filtrados antes)
     todos_empleos = empleos_existentes + empleos
     
-    with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(todos_empleos, f, ensure_ascii=False, indent=4)
+    save_jobs(nombre_archivo, todos_empleos)
     
     print(f"\nGuardado: {nombre_archivo}")
     print(f"  - Empleos nuevos: {len(empleos)}")
@@ -199,8 +217,10 @@ areas = [
 #categoria_slug = "tecnologia-sistemas-y-telecomunicaciones"  # Para nombre archivo
 EMPLEOS = []
 
-def verificar_pagina_existe(driver, url, page_num):
+def verificar_pagina_existe(driver, url, page_num, area=None):
     test_url = f"{url}?page={page_num}"
+    # Si el portal está bloqueando, esperar la pausa del circuito (o estacionarlo)
+    breaker.before_request(area)
     driver.get(test_url)
     intentos = 3  # Número de intentos en caso de error
     
@@ -210,6 +230,7 @@ def verificar_pagina_existe(driver, url, page_num):
             WebDriverWait(driver, 3).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, '#listado-avisos'))
             )
+            breaker.success(area)
             
             # Esperar un poco más para asegurar que los empleos se carguen
             driver.implicitly_wait(2)
@@ -292,8 +313,11 @@ def verificar_pagina_existe(driver, url, page_num):
             return tiene_empleos
             
         except Exception as e:
-            if intento < intentos - 1:
+            breaker.failure(area)
+            # Los reintentos salen de un presupuesto global que solo se recarga con pedidos exitosos
+            if intento < intentos - 1 and breaker.can_retry():
                 print(f"Intento {intento + 1} falló, reintentando...")
+                breaker.before_request(area)
                 driver.refresh()
                 continue
             else:
@@ -321,7 +345,7 @@ def obtener_total_paginas(driver, area):
         debug_print(f"Título de la página: {driver.title}")
         
         # Verificar que la primera página tiene contenido
-        if not verificar_pagina_existe(driver, url, 1):
+        if not verificar_pagina_existe(driver, url, 1, area=area):
             print("No se encontraron empleos en la primera página")
             return 1
 
@@ -331,7 +355,7 @@ def obtener_total_paginas(driver, area):
         ultima_valida = 1
         
         for pagina in paginas_prueba:
-            if verificar_pagina_existe(driver, url, pagina):
+            if verificar_pagina_existe(driver, url, pagina, area=area):
                 ultima_valida = pagina
             else:
                 break
@@ -360,7 +384,7 @@ def obtener_total_paginas(driver, area):
             pagina_actual = mid
             debug_print(f"\nProbando página {mid}...")
             
-            if verificar_pagina_existe(driver, url, mid):
+            if verificar_pagina_existe(driver, url, mid, area=area):
                 ultima_pagina_valida = mid
                 left = mid + 1
             else:
@@ -373,7 +397,7 @@ def obtener_total_paginas(driver, area):
         
         pagina = ultima_pagina_valida
         while paginas_verificadas < max_paginas_secuencial:
-            if not verificar_pagina_existe(driver, url, pagina + 1):
+            if not verificar_pagina_existe(driver, url, pagina + 1, area=area):
                 debug_print(f"Encontrada última página válida: {pagina}")
                 return pagina
             
@@ -387,7 +411,7 @@ def obtener_total_paginas(driver, area):
 
     except Exception as e:
         print(f"\nError al obtener total de páginas: {str(e)}")
-        if verificar_pagina_existe(driver, url, 1):
+        if verificar_pagina_existe(driver, url, 1, area=area):
             print("Usando valor conservador de 50 páginas")
             return 50
         return 1
@@ -406,24 +430,29 @@ HASHES_GLOBALES = set()
 print("Cargando hashes existentes para evitar duplicados entre categorías...")
 for area in areas:
     timestamp = date.today().strftime("%Y%m%d")
-    archivo_existente = f"output_jobs/ZonaJobs_{area}_{timestamp}.json"
+    archivo_existente = f"output_jobs/ZonaJobs_{area}_{timestamp}{JOBS_EXTENSION}"
     if os.path.exists(archivo_existente):
         try:
-            with open(archivo_existente, 'r', encoding='utf-8') as f:
-                empleos_existentes = json.load(f)
-                for empleo in empleos_existentes:
-                    h = empleo.get("hash Descripcion")
-                    if h:
-                        HASHES_GLOBALES.add(h)
+            empleos_existentes = load_jobs(archivo_existente)
+            for empleo in empleos_existentes:
+                h = empleo.get("hash Descripcion")
+                if h:
+                    HASHES_GLOBALES.add(h)
         except:
             pass
 
 print(f"Cargados {len(HASHES_GLOBALES)} hashes existentes")
 
+# Índice persistente de empleos conocidos (modo incremental)
+incremental = IncrementalCrawl.from_args("zonajobs", "zonajobs.com.ar", args)
+if args.incremental:
+    print(f"Modo incremental: se corta cada área tras {args.incremental_k} páginas sin novedades (margen: {args.margen})")
+frontier = CrawlFrontier.from_args("zonajobs", args)
+
 # =============================================================================
 # SISTEMA DE CHECKPOINT - REANUDAR SESIÓN INTERRUMPIDA
 # =============================================================================
-should_resume, checkpoint_data, checkpoint_manager = get_resume_info("zonajobs")
+should_resume, checkpoint_data, checkpoint_manager = get_resume_info("zonajobs", args.resume)
 
 if should_resume:
     print("Reanudando desde checkpoint...")
@@ -447,6 +476,18 @@ current_page = start_page
 
 jobs_this_session = 0
 
+# Áreas ordenadas por rendimiento histórico; al reanudar se reutiliza el orden guardado
+# para que los índices del checkpoint sigan apuntando a las mismas áreas
+areas = frontier.order_areas(areas, resume=should_resume or bool(args.start_from))
+budget = CrawlBudget.from_args(frontier, args)
+budget.plan(areas)
+# Una pausa del circuito que terminaría después del deadline no se espera
+breaker.deadline = budget.deadline
+
+# Pestañas: se precarga el próximo empleo mientras se extrae el actual (como mucho una navegación por segundo)
+tabs = TabPipeline("zonajobs", depth=args.pestanas, interval=1.0, ready=(By.CSS_SELECTOR, "h1"))
+tarjetas = ListingCards.from_args("zonajobs", args)
+
 # Determinar desde qué área comenzar (combinando checkpoint con --start-from si está presente)
 start_index = start_area_index
 if args.start_from and not should_resume:
@@ -462,11 +503,27 @@ print(f"Procesando {len(areas_to_process)} áreas restantes...")
 
 import time  # Add import for time
 
+# Portal estacionado por una corrida anterior: no se recorre nada y se sale con EXIT_PARKED
+hasta = parked_until("zonajobs")
+estacionado = bool(hasta)
+if estacionado:
+    print(f"ZonaJobs está estacionado hasta {hasta.strftime('%H:%M')} (demasiados errores seguidos)")
+    areas_to_process = []
+
 for area_index, area in enumerate(areas_to_process, start_index):
     # Skip areas that were already completed
     if area in areas_completed:
         print(f"Saltando área ya completada: {area}")
         continue
+    
+    # Deadline: no empezar áreas que el plan dejó fuera del presupuesto
+    if not budget.allows_area(area):
+        continue
+    
+    # Circuito abierto para esta área: se saltea hasta que termine su pausa
+    if not breaker.allow(area):
+        print(f"Saltando área con demasiados errores: {area}")
+        continue
         
     # Update global variables for signal handler
     current_area_index = area_index
@@ -505,6 +562,7 @@ for area_index, area in enumerate(areas_to_process, start_index):
             url = f"https://www.zonajobs.com.ar/empleos-area-{area}.html?page={pagina}"
 
             try:
+                breaker.before_request(area)
                 driver.get(url)
 
                 # Esperar a que carguen los links de empleo
@@ -512,8 +570,10 @@ for area_index, area in enumerate(areas_to_process, start_index):
                     WebDriverWait(driver, 5).until(
                         EC.presence_of_all_elements_located((By.CSS_SELECTOR, '#listado-avisos > div > a'))
                     )
+                    breaker.success(area)
                 except:
                     print(f"No se encontraron empleos en la página {pagina}")
+                    breaker.failure(area)
                     continue
 
                 # Extraer URLs de todos los empleos para no invalidar elementos
@@ -528,31 +588,41 @@ for area_index, area in enumerate(areas_to_process, start_index):
                         texto and 
                         texto.lower() != 'buscando ofertas de empleo'):
                         urls_empleos.append(href)
+                tarjetas.harvest(driver)
+                
+                # Modo incremental: no volver a abrir empleos ya conocidos
+                empleos_listados = len(urls_empleos)
+                urls_empleos = incremental.filter_urls(area, urls_empleos)
+                nuevos_pagina = 0
                 
                 # Mostrar progreso
                 if not args.debug:
-                    print(f"\nPágina {pagina}/{total_paginas} - {len(urls_empleos)} empleos encontrados:")
+                    print(f"\nPágina {pagina}/{total_paginas} - {empleos_listados} empleos encontrados ({len(urls_empleos)} por procesar):")
 
                 # Procesar empleos con manejo de errores mejorado
-                for i, url_empleo in enumerate(urls_empleos):
+                for i, url_empleo in tabs.iterate(driver, urls_empleos, health=recrear_driver_si_necesario):
+                    # Sesión verificada antes de cada empleo (recreada si se perdió)
+                    driver = tabs.driver
                     try:
-                        # Verificar sesión antes de procesar cada empleo
-                        driver = recrear_driver_si_necesario(driver)
-                        
                         if args.debug:
                             debug_print(f"Procesando empleo {i+1} en página {pagina}/{total_paginas}: {url_empleo}")
                         elif i == 0 and pagina % 10 == 0:
                             print(f"Página {pagina}/{total_paginas}: Procesando {len(urls_empleos)} empleos...")
 
                         # Navegar directamente a la URL del empleo en la ventana actual
-                        driver.get(url_empleo)
-                        
-                        WebDriverWait(driver, 3).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
-                        )
+                        # (con pestañas ya viene cargada en segundo plano)
+                        if not tabs.enabled:
+                            driver.get(url_empleo)
                         
-                        # OPTIMIZED: Reduced sleep from 1 to 0.3 seconds
-                        time.sleep(0.3)
+                        # Con la tarjeta del listado la única espera es la de la descripción
+                        tarjeta = tarjetas.get(url_empleo)
+                        if not tarjeta.get("titulo"):
+                            WebDriverWait(driver, 3).until(
+                                EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
+                            )
+                            
+                            # OPTIMIZED: Reduced sleep from 1 to 0.3 seconds
+                            time.sleep(0.3)
                         
                         # --- DETECCIÓN TEMPRANA DE DUPLICADOS ---
                         # Primero extraer solo descripción para verificar duplicados
@@ -571,78 +641,90 @@ for area_index, area in enumerate(areas_to_process, start_index):
                             debug_print(f"    [DUPLICADO TEMPRANO] Saltando empleo {i+1} - ya existe")
                             if not args.debug:
                                 print(f"{i} - [DUPLICADO] Saltando...")
+                            incremental.mark_seen(url_empleo, hash_empleo)
                             continue
                         
-                        # Si no es duplicado, extraer el resto de los datos
-                        try:
-                            tituloPuesto = WebDriverWait(driver, 2).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
-                            ).text
-                            if not args.debug:  # En modo normal, mostrar cada empleo
-                                print(f"{i} - {tituloPuesto}")
-                        except:
-                            tituloPuesto = "Título no disponible"
+                        # Si no es duplicado, extraer el resto de los datos (del detalle solo lo que la tarjeta no trajo)
+                        if tarjeta.get("titulo"):
+                            tituloPuesto = tarjeta["titulo"]
                             if not args.debug:
-                                print(f"{i} - [Título no disponible]")
-
-                        try:
-                            ubicacion = WebDriverWait(driver, 3).until(
-                                EC.presence_of_element_located((By.XPATH, '//*[@id="ficha-detalle"]/div[2]/div/div[1]/div[1]/div[2]/div/div'))
-                            ).find_element(By.TAG_NAME, "h2").text
-                        except:
-                            ubicacion = "Ubicación no disponible"
-
-                        try:
-                            # Buscar el elemento de empresa con múltiples selectores
-                            empresa_element = None
-                            empresa_selectors = [
-                                '//*[@id="root"]/div/div[2]/div[2]/div/div[2]/div[2]/div[3]/div/div/div[2]',
-                                '//div[contains(@class, "company")]//span',
-                                '//div[contains(text(), "Empresa")]/following-sibling::div',
-                                '//span[contains(@class, "company-name")]'
-                            ]
+                                print(f"{i} - {tituloPuesto}")
+                        else:
+                            try:
+                                tituloPuesto = WebDriverWait(driver, 2).until(
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
+                                ).text
+                                if not args.debug:  # En modo normal, mostrar cada empleo
+                                    print(f"{i} - {tituloPuesto}")
+                            except:
+                                tituloPuesto = "Título no disponible"
+                                if not args.debug:
+                                    print(f"{i} - [Título no disponible]")
+
+                        if tarjeta.get("ubicacion"):
+                            ubicacion = tarjeta["ubicacion"]
+                        else:
+                            try:
+                                ubicacion = WebDriverWait(driver, 3).until(
+                                    EC.presence_of_element_located((By.XPATH, '//*[@id="ficha-detalle"]/div[2]/div/div[1]/div[1]/div[2]/div/div'))
+                                ).find_element(By.TAG_NAME, "h2").text
+                            except:
+                                ubicacion = "Ubicación no disponible"
+
+                        if tarjeta.get("empresa"):
+                            empresa = tarjeta["empresa"]
+                        else:
+                            try:
+                                # Buscar el elemento de empresa con múltiples selectores
+                                empresa_element = None
+                                empresa_selectors = [
+                                    '//*[@id="root"]/div/div[2]/div[2]/div/div[2]/div[2]/div[3]/div/div/div[2]',
+                                    '//div[contains(@class, "company")]//span',
+                                    '//div[contains(text(), "Empresa")]/following-sibling::div',
+                                    '//span[contains(@class, "company-name")]'
+                                ]
                             
-                            for selector in empresa_selectors:
-                                try:
-                                    empresa_element = WebDriverWait(driver, 1).until(
-                                        EC.presence_of_element_located((By.XPATH, selector))
-                                    )
-                                    break
-                                except:
-                                    continue
+                                for selector in empresa_selectors:
+                                    try:
+                                        empresa_element = WebDriverWait(driver, 1).until(
+                                            EC.presence_of_element_located((By.XPATH, selector))
+                                        )
+                                        break
+                                    except:
+                                        continue
                             
-                            if not empresa_element:
-                                empresa = "NA/NA"
-                            else:
-                                max_attempts = 3
-                                empresa = ""
+                                if not empresa_element:
+                                    empresa = "NA/NA"
+                                else:
+                                    max_attempts = 3
+                                    empresa = ""
                                 
-                                for attempt in range(max_attempts):
-                                    try:
-                                        empresa = empresa_element.text.strip()
+                                    for attempt in range(max_attempts):
+                                        try:
+                                            empresa = empresa_element.text.strip()
                                         
-                                        # Verificar si el contenido se ha cargado correctamente
-                                        if (empresa and 
-                                            empresa != "Loading..." and 
-                                            empresa != "" and
-                                            len(empresa) > 0 and
-                                            not empresa.startswith("Loading")):
-                                            debug_print(f"Empresa encontrada: '{empresa}' (intento {attempt + 1})")
-                                            break
+                                            # Verificar si el contenido se ha cargado correctamente
+                                            if (empresa and 
+                                                empresa != "Loading..." and 
+                                                empresa != "" and
+                                                len(empresa) > 0 and
+                                                not empresa.startswith("Loading")):
+                                                debug_print(f"Empresa encontrada: '{empresa}' (intento {attempt + 1})")
+                                                break
                                             
-                                    except Exception:
-                                        pass
+                                        except Exception:
+                                            pass
                                     
-                                    time.sleep(0.3)
+                                        time.sleep(0.3)
                                 
-                                # Si después de todo sigue siendo Loading o vacío, usar NA/NA
-                                if not empresa or empresa == "Loading..." or empresa.startswith("Loading"):
-                                    empresa = "NA/NA"
+                                    # Si después de todo sigue siendo Loading o vacío, usar NA/NA
+                                    if not empresa or empresa == "Loading..." or empresa.startswith("Loading"):
+                                        empresa = "NA/NA"
                                 
-                        except Exception as e:
-                            debug_print(f"Error extrayendo empresa: {str(e)}")
-                            empresa = "NA/NA"
-                            
+                            except Exception as e:
+                                debug_print(f"Error extrayendo empresa: {str(e)}")
+                                empresa = "NA/NA"
+
                         try:
                             categoria_portal = WebDriverWait(driver, 0.5).until(
                                 EC.presence_of_element_located((By.XPATH, '//*[@id="root"]/div/div[2]/div[1]/div/div/div/h2/a[2]'))
@@ -678,6 +760,8 @@ for area_index, area in enumerate(areas_to_process, start_index):
                             "fecha":today 
                         })
                         HASHES_GLOBALES.add(hash_empleo)
+                        incremental.mark_seen(url_empleo, hash_empleo)
+                        nuevos_pagina += 1
                         total_jobs_scraped += 1
                         jobs_this_session += 1
                         debug_print(f"    [NUEVO] Empleo agregado (Total: {total_jobs_scraped})")
@@ -685,6 +769,12 @@ for area_index, area in enumerate(areas_to_process, start_index):
                     except Exception as e:
                         print(f"Error procesando empleo {i+1}: {str(e)}")
                         continue
+                
+                frontier.record_page(area, pagina, nuevos_pagina)
+                if budget.after_page(area, pagina):
+                    break
+                if incremental.page_done(area, pagina, empleos_listados, nuevos_pagina):
+                    break
                         
             except Exception as e:
                 print(f"Error en página {pagina}: {str(e)}")
@@ -701,6 +791,14 @@ for area_index, area in enumerate(areas_to_process, start_index):
         
         guardar_datos_incremental(EMPLEOS, area)
         EMPLEOS = []  # Limpiar lista después de guardar
+        incremental.finish_area(area)
+        frontier.finish_area(area)
+        
+        # Deadline: el área queda a medias y el checkpoint apunta a la página siguiente para reanudar
+        if budget.exhausted:
+            checkpoint_manager.save_checkpoint(ZonaJobsCheckpoint.create_checkpoint_data(
+                area_index, pagina + 1, list(areas_completed), total_jobs_scraped))
+            break
         
         # Mark area as completed
         areas_completed.add(area)
@@ -708,26 +806,55 @@ for area_index, area in enumerate(areas_to_process, start_index):
         # Reset start_page for next area
         start_page = 1
         
+    except PortalParked as e:
+        # El checkpoint de la página en curso ya está guardado: la próxima corrida sigue desde ahí
+        print(f"\nPortal estacionado ({e}): se guarda lo recolectado y se libera el lugar para otro scraper")
+        if EMPLEOS:
+            guardar_datos_incremental(EMPLEOS, f"{area}_partial")
+            EMPLEOS = []
+        estacionado = True
+        break
+        
+    except CooldownInterrupted as e:
+        # Igual que al llegar al deadline: el checkpoint de la página en curso queda para reanudar
+        print(f"\nPausa del circuito interrumpida ({e}): se guarda lo recolectado")
+        if EMPLEOS:
+            guardar_datos_incremental(EMPLEOS, f"{area}_partial")
+            EMPLEOS = []
+        budget.exhausted = True
+        break
+        
     except Exception as e:
         print(f"Error crítico en área {area}: {str(e)}")
         print("Intentando continuar con la siguiente área...")
         driver = recrear_driver_si_necesario(driver)
         continue
 
-# Final cleanup
+# Final cleanup: el índice de conocidos y la frontera se guardan una vez, termine como termine
+incremental.save()
+frontier.save()
 try:
     driver.quit()
 except:
     pass
 
-# Clear checkpoint after successful completion
-checkpoint_manager.clear_checkpoint()
+if estacionado:
+    print(breaker.summary())
+    sys.exit(EXIT_PARKED)
+
+# Clear checkpoint after successful completion (si cortó el deadline queda para reanudar)
+if budget.exhausted:
+    print("Deadline alcanzado: checkpoint guardado, usa el mismo comando para continuar")
+else:
+    checkpoint_manager.clear_checkpoint()
 
 print(f"\n SCRAPING COMPLETADO EXITOSAMENTE!")
 print(f" Resumen de la sesión:")
 print(f"   - Jobs recolectados en esta sesión: {jobs_this_session}")
 print(f"   - Total de jobs recolectados: {total_jobs_scraped}")
 print(f"   - Áreas completadas: {len(areas_completed)}/{len(areas)}")
+print(f"   - {breaker.summary()}")
+print(f"   - {tarjetas.summary()}")
 print(f"   - Todos los datos guardados en: output_jobs/")
 print(f"Archivos guardados en: output_jobs/")
 print(f"{'='*60}\n")
\ No newline at end of file
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
 JSON Beautifier - Replaces newlines in JSON string values with spaces.
+Also rewrites .jsonl and .jsonl.zst job files, keeping their format.
 
 Usage:
     python beautifier.py <path_to_json_file_or_folder>
 """
 
 import json
+import os
 import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import JOB_FILE_PATTERNS, job_files, load_jobs, save_jobs
+
+JOB_FILE_EXTENSIONS = tuple(pattern[1:] for pattern in JOB_FILE_PATTERNS)
+
 
 def fix_newlines(obj):
     """Recursively replace newlines with spaces in all string values."""
@@ -28,6 +36,11 @@ def beautify_json_file(filepath: Path):
     """Read, fix, and overwrite a JSON file with proper newlines."""
     print(f"Processing: {filepath}")
     
+    if filepath.suffix.lower() != ".json":
+        save_jobs(str(filepath), fix_newlines(load_jobs(str(filepath))), indent=2)
+        print("  ✓ Done")
+        return
+    
     with open(filepath, "r", encoding="utf-8") as f:
         data = json.load(f)
     
@@ -51,16 +64,16 @@ def main():
         sys.exit(1)
     
     if path.is_file():
-        if path.suffix.lower() == ".json":
+        if path.name.lower().endswith(JOB_FILE_EXTENSIONS):
             beautify_json_file(path)
         else:
-            print(f"Error: '{path}' is not a .json file.")
+            print(f"Error: '{path}' is not a .json, .jsonl or .jsonl.zst file.")
             sys.exit(1)
     
     elif path.is_dir():
-        json_files = list(path.glob("*.json"))
+        json_files = [Path(p) for p in job_files(str(path))]
         if not json_files:
-            print(f"No .json files found in '{path}'")
+            print(f"No .json, .jsonl or .jsonl.zst files found in '{path}'")
             sys.exit(1)
         
         print(f"Found {len(json_files)} JSON file(s)\n")
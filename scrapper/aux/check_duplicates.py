@@ -3,18 +3,21 @@
 Diagnóstico de duplicados - Verifica si los duplicados son reales
 """
 
-import json
 import hashlib
+import os
 from collections import Counter, defaultdict
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import load_jobs
+
 def analyze_duplicates(filepath):
     print("=" * 70)
     print("  DIAGNÓSTICO DE DUPLICADOS")
     print("=" * 70)
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        jobs = json.load(f)
+    jobs = load_jobs(filepath)
     
     print(f"\nTotal empleos: {len(jobs):,}")
     
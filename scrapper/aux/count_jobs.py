@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """
 Script simple para contar empleos en archivos JSON
-Cuenta por Fuente, por Área y total
+Cuenta por Fuente, por Área y total (.json, .jsonl y .jsonl.zst)
 """
 
-import json
-import glob
 import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import job_files, load_jobs
+
 # Colores para output
 class Colors:
     RESET = '\033[0m'
@@ -28,10 +31,10 @@ def count_jobs_in_files():
     # Buscar archivos JSON en output_jobs
     input_dir = '.'
     
-    json_files = glob.glob(f'{input_dir}/*.json')
+    json_files = job_files(input_dir)
     
     if not json_files:
-        print(f"{Colors.RED}No se encontraron archivos .json en '{input_dir}'{Colors.RESET}")
+        print(f"{Colors.RED}No se encontraron archivos de empleos (.json, .jsonl, .jsonl.zst) en '{input_dir}'{Colors.RESET}")
         return
     
     # Contadores
@@ -45,8 +48,7 @@ def count_jobs_in_files():
     # Procesar cada archivo
     for json_file in json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                jobs_data = json.load(f)
+            jobs_data = load_jobs(json_file)
             
             file_count = len(jobs_data)
             filename = os.path.basename(json_file)
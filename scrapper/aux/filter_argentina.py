@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Script para filtrar trabajos y quedarse solo con los de Argentina
-Procesa archivos JSON y elimina trabajos de otros países
+Procesa archivos JSON (.json, .jsonl y .jsonl.zst) y elimina trabajos de otros países
 
 Uso:
     python filter_argentina.py                     # Procesa todos los JSON en output_jobs/
@@ -11,12 +11,16 @@ Uso:
 """
 
 import json
-import glob
 import os
 import sys
 import argparse
+import shutil
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import job_files, load_jobs, save_jobs
+
 def normalizar_ubicacion(texto):
     """Normaliza el texto de ubicación para comparación"""
     if not texto or not isinstance(texto, str):
@@ -27,7 +31,11 @@ def es_argentina(empleo):
     """
     Verifica si un empleo es de Argentina
     Revisa múltiples campos: Pais, Ubicacion, ubicacion
+    Si el empleo ya pasó por unify_jobs.py usa su país normalizado (ubicacion_pais)
     """
+    if empleo.get('ubicacion_pais'):
+        return empleo['ubicacion_pais'] == "Argentina"
+    
     # Lista de variantes de "Argentina"
     variantes_argentina = [
         "argentina",
@@ -117,11 +125,7 @@ def procesar_archivo(filepath, dry_run=False, verbose=False):
     Procesa un archivo JSON y retorna estadísticas
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            empleos = json.load(f)
-        
-        if not isinstance(empleos, list):
-            return None, None, 0, 0, "No es una lista"
+        empleos = load_jobs(filepath)
         
         total_original = len(empleos)
         empleos_argentina = []
@@ -181,16 +185,16 @@ Ejemplos:
         archivos = [args.archivo]
         print(f"Procesando archivo: {args.archivo}")
     else:
-        # Buscar archivos JSON en output_jobs
+        # Buscar archivos de empleos en output_jobs
         posibles_paths = [
-            "output_jobs/*.json",
-            "../output_jobs/*.json",
-            "/mnt/project/output_jobs/*.json",
+            "output_jobs",
+            "../output_jobs",
+            "/mnt/project/output_jobs",
         ]
         
         archivos = []
         for path in posibles_paths:
-            archivos = glob.glob(path)
+            archivos = job_files(path)
             if archivos:
                 print(f"Buscando en: {path}")
                 break
@@ -258,9 +262,7 @@ Ejemplos:
             # Backup del archivo original
             backup_dir = "output_jobs_backup"
             backup_path = os.path.join(backup_dir, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                with open(backup_path, 'w', encoding='utf-8') as bf:
-                    bf.write(f.read())
+            shutil.copy2(filepath, backup_path)
             
             # Determinar archivo de salida
             if args.output and len(archivos) == 1:
@@ -268,9 +270,8 @@ Ejemplos:
             else:
                 output_path = filepath
             
-            # Guardar archivo filtrado
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(empleos_filtrados, f, ensure_ascii=False, indent=2)
+            # Guardar archivo filtrado (en el formato de su extensión)
+            save_jobs(output_path, empleos_filtrados, indent=2)
         
         total_original_global += total_orig
         total_filtrado_global += len(empleos_filtrados)
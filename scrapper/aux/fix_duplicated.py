@@ -8,9 +8,14 @@ import json
 import hashlib
 import os
 import shutil
+import sys
 from datetime import datetime
 from collections import Counter
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import load_jobs, save_jobs
+
 def generate_unique_id(job, source, hash_short, date_str):
     """Genera un Id Interno verdaderamente único"""
     return f"{source}-{date_str}-{hash_short}"
@@ -33,8 +38,7 @@ def fix_duplicates(filepath):
     print(f"   Tamaño: {file_size_mb:.2f} MB")
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            jobs = json.load(f)
+        jobs = load_jobs(filepath)
     except json.JSONDecodeError as e:
         print(f"❌ Error leyendo JSON: {e}")
         return False
@@ -137,7 +141,8 @@ def fix_duplicates(filepath):
     
     # Backup original
     backup_dir = os.path.dirname(filepath) or "."
-    backup_name = os.path.basename(filepath).replace(".json", f"_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    name, dot, extension = os.path.basename(filepath).partition(".")
+    backup_name = f"{name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}{dot}{extension}"
     backup_path = os.path.join(backup_dir, backup_name)
     
     print(f"\n💾 Creando backup: {backup_name}")
@@ -145,8 +150,7 @@ def fix_duplicates(filepath):
     
     # Save cleaned file
     print(f"💾 Guardando archivo limpio...")
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(unique_jobs, f, ensure_ascii=False, indent=2)
+    save_jobs(filepath, unique_jobs, indent=2)
     
     new_size_mb = os.path.getsize(filepath) / (1024*1024)
     print(f"   Nuevo tamaño: {new_size_mb:.2f} MB")
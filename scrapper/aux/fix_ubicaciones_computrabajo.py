@@ -5,10 +5,13 @@ Corrige ubicaciones que tienen nombres de empresas/consultoras en lugar de ubica
 Extrae la ubicación correcta desde la URL del empleo.
 """
 
-import json
 import re
 import os
-import glob
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import job_files, load_jobs, save_jobs
 
 # Ubicaciones incorrectas específicas a corregir (match exacto, case-insensitive)
 UBICACIONES_A_CORREGIR = [
@@ -198,16 +201,11 @@ def procesar_archivo_json(archivo_json, modo_dry_run=True):
     print(f"\n  Procesando: {os.path.basename(archivo_json)}")
     
     try:
-        with open(archivo_json, 'r', encoding='utf-8') as f:
-            empleos = json.load(f)
+        empleos = load_jobs(archivo_json)
     except Exception as e:
         print(f"    ERROR leyendo archivo: {e}")
         return 0, 0, 0
     
-    if not isinstance(empleos, list):
-        print(f"    ERROR: no es una lista de empleos")
-        return 0, 0, 0
-    
     # Filtrar solo Computrabajo
     empleos_computrabajo = [e for e in empleos if e.get('Fuente') == 'Computrabajo']
     
@@ -249,8 +247,7 @@ def procesar_archivo_json(archivo_json, modo_dry_run=True):
     
     # Guardar si no es dry run y hubo cambios
     if not modo_dry_run and corregidos > 0:
-        with open(archivo_json, 'w', encoding='utf-8') as f:
-            json.dump(empleos, f, ensure_ascii=False, indent=2)
+        save_jobs(archivo_json, empleos, indent=2)
         print(f"    ✓ Guardado")
     
     return len(empleos), len(empleos_computrabajo), corregidos
@@ -259,9 +256,8 @@ def procesar_archivo_json(archivo_json, modo_dry_run=True):
 def procesar_carpeta(carpeta, modo_dry_run=True):
     """Procesa todos los archivos JSON en una carpeta"""
     
-    # Buscar archivos JSON
-    patron = os.path.join(carpeta, "*.json")
-    archivos = glob.glob(patron)
+    # Buscar archivos de empleos (.json, .jsonl, .jsonl.zst)
+    archivos = job_files(carpeta)
     
     if not archivos:
         print(f"No se encontraron archivos JSON en: {carpeta}")
@@ -1,24 +1,23 @@
 #!/usr/bin/env python3
 """
 Lista todas las ubicaciones únicas de archivos JSON de empleos
-Soporta archivo individual o carpeta con múltiples JSONs
+Soporta archivo individual o carpeta con múltiples JSONs (.json, .jsonl y .jsonl.zst)
 """
 
-import json
 import os
-import glob
+import sys
 import argparse
 from collections import Counter
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonl_zstd import job_files, load_jobs
+
 
 def cargar_empleos_de_archivo(archivo):
     """Carga empleos de un archivo JSON"""
     try:
-        with open(archivo, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
+        return load_jobs(archivo)
     except Exception as e:
         print(f"Error leyendo {archivo}: {e}")
         return []
@@ -26,8 +25,7 @@ def cargar_empleos_de_archivo(archivo):
 
 def cargar_empleos_de_carpeta(carpeta):
     """Carga empleos de todos los JSONs en una carpeta"""
-    patron = os.path.join(carpeta, "*.json")
-    archivos = glob.glob(patron)
+    archivos = job_files(carpeta)
     
     if not archivos:
         print(f"No se encontraron archivos JSON en: {carpeta}")
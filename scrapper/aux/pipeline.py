@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Pipeline de utilidades en una sola pasada
+Aplica en cadena los arreglos y reportes de las herramientas de aux/ leyendo cada
+archivo una sola vez (en streaming, con ijson si está instalado; también .jsonl.zst) y
+escribiéndolo una sola vez al final, en el mismo formato, en lugar de que cada script vuelva a leer y reescribir los mismos
+archivos de cientos de MB.
+
+Pasos (se aplican en el orden indicado; los reportes ven los empleos ya transformados):
+    saltos        reemplaza saltos de línea en los textos (beautifier.py)
+    argentina     descarta empleos de otros países (filter_argentina.py)
+    ubicaciones   corrige ubicaciones de Computrabajo desde la URL (fix_ubicaciones_computrabajo.py)
+    dedup         descarta duplicados por 'hash Descripcion' entre todos los archivos (fix_duplicated.py)
+    conteo        empleos por fuente y por archivo (count_jobs.py)
+    lista         ubicaciones únicas por fuente (listar_ubicaciones.py)
+    duplicados    hashes repetidos dentro de cada fuente y entre fuentes (check_duplicates.py)
+
+Uso:
+    python pipeline.py output_jobs/ --pasos saltos,argentina,ubicaciones,dedup,conteo
+    python pipeline.py all_jobs.json --pasos ubicaciones,lista --aplicar --backup backup/
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unify_jobs import JsonArrayWriter, JSON_ERRORS, generate_unique_id, job_hash_of, open_jobs
+from jsonl_zstd import ZstdJsonlWriter, is_zstd
+from beautifier import fix_newlines
+from filter_argentina import es_argentina, obtener_pais
+from fix_ubicaciones_computrabajo import es_ubicacion_a_corregir, extraer_ubicacion_de_url
+from listar_ubicaciones import obtener_ubicacion
+
+
+class Saltos:
+    modifica = True
+
+    def __init__(self, args):
+        self.cambiados = 0
+
+    def aplicar(self, empleo, archivo):
+        limpio = fix_newlines(empleo)
+        if limpio != empleo:
+            self.cambiados += 1
+        return limpio
+
+    def resumen(self):
+        print(f"Saltos de línea: {self.cambiados} empleos con textos corregidos")
+
+
+class Argentina:
+    modifica = True
+
+    def __init__(self, args):
+        self.eliminados = Counter()
+
+    def aplicar(self, empleo, archivo):
+        if es_argentina(empleo):
+            return empleo
+        self.eliminados[obtener_pais(empleo)] += 1
+        return None
+
+    def resumen(self):
+        print(f"Filtro Argentina: {sum(self.eliminados.values())} empleos de otros países eliminados")
+        for pais, count in self.eliminados.most_common(15):
+            print(f"   - {pais}: {count:,}")
+
+
+class Ubicaciones:
+    modifica = True
+
+    def __init__(self, args):
+        self.computrabajo = 0
+        self.corregidos = 0
+        self.ejemplos = []
+
+    def aplicar(self, empleo, archivo):
+        if empleo.get('Fuente') != 'Computrabajo':
+            return empleo
+        self.computrabajo += 1
+        ubicacion_original = empleo.get('ubicacion', '')
+        if es_ubicacion_a_corregir(ubicacion_original):
+            ubicacion_nueva = extraer_ubicacion_de_url(empleo.get('url', ''))
+            if ubicacion_nueva:
+                empleo['ubicacion'] = ubicacion_nueva
+                empleo['ubicacion_original'] = ubicacion_original
+                self.corregidos += 1
+                if len(self.ejemplos) < 3:
+                    self.ejemplos.append((ubicacion_original, ubicacion_nueva))
+        return empleo
+
+    def resumen(self):
+        print(f"Ubicaciones Computrabajo: {self.corregidos}/{self.computrabajo} corregidas desde la URL")
+        for original, corregida in self.ejemplos:
+            print(f"   '{original[:40]}' → '{corregida}'")
+
+
+class Dedup:
+    modifica = True
+
+    def __init__(self, args):
+        self.vistos = set()
+        self.duplicados = Counter()
+
+    def aplicar(self, empleo, archivo):
+        job_hash = job_hash_of(empleo, len(self.vistos))
+        if job_hash in self.vistos:
+            self.duplicados[empleo.get("Fuente", "Unknown")] += 1
+            return None
+        self.vistos.add(job_hash)
+        empleo["hash Descripcion"] = job_hash
+        empleo["Id Interno"] = generate_unique_id(empleo, len(self.vistos))
+        return empleo
+
+    def resumen(self):
+        print(f"Dedup: {sum(self.duplicados.values())} duplicados eliminados, {len(self.vistos)} empleos únicos")
+        for fuente, count in self.duplicados.most_common():
+            print(f"   - {fuente}: {count:,}")
+
+
+class Conteo:
+    modifica = False
+
+    def __init__(self, args):
+        self.por_fuente = Counter()
+        self.por_archivo = Counter()
+
+    def aplicar(self, empleo, archivo):
+        self.por_fuente[empleo.get('Fuente', '') or empleo.get('fuente', 'Desconocido')] += 1
+        self.por_archivo[os.path.basename(archivo)] += 1
+        return empleo
+
+    def resumen(self):
+        total = sum(self.por_fuente.values())
+        print(f"Conteo: {total:,} empleos en {len(self.por_archivo)} archivos")
+        for fuente, count in self.por_fuente.most_common():
+            print(f"   {fuente:<30s} {count:>8,} empleos ({count / max(total, 1) * 100:.1f}%)")
+
+
+class Lista:
+    modifica = False
+
+    def __init__(self, args):
+        self.top = args.top
+        self.fuente = args.fuente.lower() if args.fuente else None
+        self.ubicaciones = Counter()
+
+    def aplicar(self, empleo, archivo):
+        fuente = empleo.get('Fuente', '')
+        if self.fuente is None or fuente.lower() == self.fuente:
+            ubicacion = obtener_ubicacion(empleo)
+            if ubicacion:
+                self.ubicaciones[(ubicacion, fuente)] += 1
+        return empleo
+
+    def resumen(self):
+        print(f"Ubicaciones únicas: {len(self.ubicaciones)}")
+        print(f"   {'UBICACIÓN':<40} {'FUENTE':<15} {'CANTIDAD':>8}")
+        for (ubicacion, fuente), count in self.ubicaciones.most_common(self.top or None):
+            print(f"   {ubicacion[:40]:<40} {fuente:<15} {count:>8}")
+
+
+class Duplicados:
+    modifica = False
+
+    def __init__(self, args):
+        # Solo hashes en memoria: hash -> empleos por fuente
+        self.fuentes_por_hash = defaultdict(Counter)
+        self.sin_hash = Counter()
+
+    def aplicar(self, empleo, archivo):
+        job_hash = empleo.get("hash Descripcion", "")
+        if job_hash:
+            self.fuentes_por_hash[job_hash][empleo.get("Fuente", "Unknown")] += 1
+        else:
+            self.sin_hash[empleo.get("Fuente", "Unknown")] += 1
+        return empleo
+
+    def resumen(self):
+        repetidos_por_fuente = Counter()
+        entre_fuentes = 0
+        for fuentes in self.fuentes_por_hash.values():
+            for fuente, count in fuentes.items():
+                if count > 1:
+                    repetidos_por_fuente[fuente] += count - 1
+            if len(fuentes) > 1:
+                entre_fuentes += 1
+        print(f"Duplicados: {sum(repetidos_por_fuente.values())} entradas repetidas dentro de una fuente, "
+              f"{entre_fuentes} hashes en más de una fuente")
+        for fuente, count in repetidos_por_fuente.most_common():
+            print(f"   - {fuente}: {count:,} repetidas")
+        for fuente, count in self.sin_hash.most_common():
+            print(f"   ⚠️  {fuente}: {count:,} empleos sin hash")
+
+
+class JsonlWriter:
+    """Misma interfaz que JsonArrayWriter para archivos .jsonl (un empleo por línea)"""
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self._f = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def write(self, item):
+        self._f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self._f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._f.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+PASOS = {
+    "saltos": Saltos,
+    "argentina": Argentina,
+    "ubicaciones": Ubicaciones,
+    "dedup": Dedup,
+    "conteo": Conteo,
+    "lista": Lista,
+    "duplicados": Duplicados,
+}
+
+
+def archivos_de(rutas):
+    """Archivos .json/.jsonl/.jsonl.zst de las rutas (las carpetas se recorren sin subcarpetas)"""
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            archivos += sorted(os.path.join(ruta, nombre) for nombre in os.listdir(ruta)
+                               if nombre.endswith((".json", ".jsonl", ".jsonl.zst")))
+        elif os.path.exists(ruta):
+            archivos.append(ruta)
+        else:
+            print(f"❌ No existe: {ruta}")
+    return archivos
+
+
+def procesar_archivo(archivo, pasos, escribir, backup_dir=None):
+    """
+    Pasa cada empleo del archivo por la cadena de pasos. Con escribir=True el resultado se
+    escribe en un temporal que reemplaza al archivo solo si algún paso cambió algo (antes se
+    copia el original a backup_dir, si se indicó).
+    Devuelve (leídos, escritos) o None si el archivo no se pudo leer.
+    """
+    writer = None
+    if escribir:
+        if is_zstd(archivo):
+            writer = ZstdJsonlWriter(archivo)
+        else:
+            writer = JsonlWriter(archivo) if archivo.endswith(".jsonl") else JsonArrayWriter(archivo)
+    leidos = escritos = 0
+    cambios = False
+    try:
+        kind, empleos = open_jobs(archivo)
+        if kind is None:
+            raise ValueError("formato inesperado")
+        for empleo in empleos:
+            leidos += 1
+            original = empleo.copy() if writer else None
+            for paso in pasos:
+                empleo = paso.aplicar(empleo, archivo)
+                if empleo is None:
+                    break
+            if empleo is None:
+                cambios = True
+                continue
+            escritos += 1
+            if writer:
+                cambios = cambios or empleo != original
+                writer.write(empleo)
+    except (JSON_ERRORS + (OSError, ValueError)) as e:
+        if writer:
+            writer.abort()
+        print(f"❌ {os.path.basename(archivo)}: {e}")
+        return None
+    if writer and cambios:
+        if backup_dir:
+            os.makedirs(backup_dir, exist_ok=True)
+            shutil.copy2(archivo, os.path.join(backup_dir, os.path.basename(archivo)))
+        writer.close()
+    elif writer:
+        writer.abort()
+    return leidos, escritos
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Aplica en una sola pasada los arreglos y reportes de aux/',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Pasos: " + ", ".join(PASOS)
+    )
+    parser.add_argument('rutas', nargs='*', help='Archivos o carpetas (default: all_jobs.json u output_jobs/)')
+    parser.add_argument('--pasos', type=str, required=True, help='Pasos separados por coma, en orden')
+    parser.add_argument('--aplicar', action='store_true',
+                        help='Guardar los cambios (por defecto solo muestra qué haría)')
+    parser.add_argument('--backup', type=str, default=None,
+                        help='Con --aplicar, copiar aquí los archivos originales que se modifiquen')
+    parser.add_argument('--fuente', type=str, help='Paso lista: filtrar por fuente')
+    parser.add_argument('--top', type=int, default=0, help='Paso lista: mostrar solo las N más frecuentes')
+    args = parser.parse_args()
+
+    nombres = [nombre.strip() for nombre in args.pasos.split(",") if nombre.strip()]
+    desconocidos = [nombre for nombre in nombres if nombre not in PASOS]
+    if desconocidos:
+        parser.error(f"Pasos desconocidos: {', '.join(desconocidos)} (disponibles: {', '.join(PASOS)})")
+    pasos = [PASOS[nombre](args) for nombre in nombres]
+    modifica = any(paso.modifica for paso in pasos)
+
+    rutas = args.rutas or (['all_jobs.json'] if os.path.exists('all_jobs.json') else ['output_jobs'])
+    archivos = archivos_de(rutas)
+    if not archivos:
+        print("No se encontraron archivos JSON")
+        sys.exit(1)
+
+    print("=" * 70)
+    print(f"   PIPELINE: {' → '.join(nombres)}")
+    if modifica and not args.aplicar:
+        print("   ⚠️  MODO DRY-RUN - NO SE MODIFICARÁN ARCHIVOS (usa --aplicar)")
+    print("=" * 70)
+
+    total_leidos = total_escritos = errores = 0
+    for archivo in archivos:
+        resultado = procesar_archivo(archivo, pasos, escribir=modifica and args.aplicar, backup_dir=args.backup)
+        if resultado is None:
+            errores += 1
+            continue
+        leidos, escritos = resultado
+        total_leidos += leidos
+        total_escritos += escritos
+        print(f"✓  {os.path.basename(archivo)}: {leidos:,} → {escritos:,} empleos")
+
+    print("-" * 70)
+    for paso in pasos:
+        paso.resumen()
+    print("-" * 70)
+    print(f"Archivos: {len(archivos) - errores} procesados, {errores} con error")
+    print(f"Empleos: {total_leidos:,} leídos, {total_escritos:,} quedan")
+    if modifica and not args.aplicar:
+        print("⚠️  MODO DRY-RUN: No se modificó ningún archivo")
+
+
+if __name__ == "__main__":
+    main()
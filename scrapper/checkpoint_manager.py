@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 """
 Checkpoint Manager for Web Scrapers
-Handles saving and loading checkpoint data for resuming interrupted scraping sessions
+Handles saving and loading checkpoint data for resuming interrupted scraping sessions.
+The resume policy (--resume auto|fresh|ask) decides what to do with a leftover
+checkpoint without a prompt, and the checkpoint catalog lets ScraperMaestro see
+up front which portals will resume and how much work they have left.
 """
 
 import json
 import os
+import sys
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from crawl_frontier import CrawlFrontier
+
+CHECKPOINT_SUFFIX = "_checkpoint.json"
+
+# auto: reanudar si hay checkpoint; fresh: descartarlo y empezar de cero; ask: preguntar (solo con terminal)
+RESUME_POLICIES = ("auto", "fresh", "ask")
+
 class CheckpointManager:
     def __init__(self, scraper_name: str, checkpoint_dir: str = "checkpoints"):
         self.scraper_name = scraper_name
@@ -157,9 +168,11 @@ def ask_user_resume_choice(checkpoint_data: Dict[str, Any], scraper_name: str) -
             print("Por favor responde 's' para sí o 'n' para no")
 
 
-def get_resume_info(scraper_name: str) -> tuple:
+def get_resume_info(scraper_name: str, policy: str = "ask") -> tuple:
     """
     Get resume information for any scraper
+    policy: "auto" resumes, "fresh" discards the checkpoint, "ask" prompts the user
+            (without a terminal on stdin, e.g. under ScraperMaestro, it behaves like "auto")
     Returns: (should_resume, checkpoint_data, checkpoint_manager)
     """
     checkpoint_manager = CheckpointManager(scraper_name)
@@ -171,10 +184,102 @@ def get_resume_info(scraper_name: str) -> tuple:
     if not checkpoint_data:
         return False, None, checkpoint_manager
     
-    should_resume = ask_user_resume_choice(checkpoint_data, scraper_name)
+    if policy == "ask" and not (sys.stdin and sys.stdin.isatty()):
+        print(" Sin terminal para preguntar: se reanuda el checkpoint (--resume auto)")
+        policy = "auto"
+    if policy == "ask":
+        should_resume = ask_user_resume_choice(checkpoint_data, scraper_name)
+    else:
+        should_resume = policy == "auto"
+        print(f" Checkpoint de {scraper_name}: {'se reanuda' if should_resume else 'se descarta'} (--resume {policy})")
     
     if not should_resume:
         checkpoint_manager.clear_checkpoint()
         return False, None, checkpoint_manager
     
-    return True, checkpoint_data, checkpoint_manager
\ No newline at end of file
+    return True, checkpoint_data, checkpoint_manager
+
+def describe_checkpoint(scraper_name: str, checkpoint_dir: str = "checkpoints",
+                        portal: Optional[str] = None) -> Dict[str, Any]:
+    """
+    What a run of this scraper would do now: whether it resumes, the progress its checkpoint
+    records, and from the frontier files (area order and page-band timings of `portal`,
+    by default the scraper name) the areas and estimated seconds of work left.
+    Unknown values are None.
+    """
+    path = os.path.join(checkpoint_dir, f"{scraper_name}{CHECKPOINT_SUFFIX}")
+    checkpoint: Dict[str, Any] = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            checkpoint = {}
+    data = checkpoint.get("data") or {}
+
+    entry: Dict[str, Any] = {
+        "scraper": scraper_name,
+        "resume": bool(data),
+        "saved": checkpoint.get("timestamp"),
+        "age_hours": None,
+        "area_index": None,
+        "page": None,
+        "areas_completed": 0,
+        "jobs_scraped": 0,
+        "areas_total": None,
+        "areas_left": None,
+        "seconds_left": None,
+    }
+    if data:
+        completed = data.get("areas_completed", data.get("categories_completed", []))
+        entry.update({
+            "area_index": data.get("current_area_index", data.get("current_category_index", 0)),
+            "page": data.get("current_page", 1),
+            "areas_completed": len(completed),
+            "jobs_scraped": data.get("total_jobs_scraped", 0),
+        })
+        try:
+            saved = datetime.fromisoformat(checkpoint["timestamp"])
+            entry["age_hours"] = round((datetime.now() - saved).total_seconds() / 3600, 1)
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    frontier = CrawlFrontier(portal or scraper_name, stats_dir=checkpoint_dir)
+    areas = frontier.saved_order()
+    if areas:
+        entry["areas_total"] = len(areas)
+        first_page = 1
+        if data:
+            # El checkpoint apunta a posiciones del orden guardado: lo que sigue desde el área actual
+            done = set(data.get("areas_completed", data.get("categories_completed", [])))
+            areas = [a for a in areas[entry["area_index"]:] if a not in done]
+            first_page = entry["page"]
+        entry["areas_left"] = len(areas)
+        entry["seconds_left"] = frontier.remaining_seconds(areas, first_page)
+    return entry
+
+
+def checkpoint_catalog(checkpoint_dir: str = "checkpoints", names: Optional[List[str]] = None,
+                       portals: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    describe_checkpoint() for the given scrapers (default: every checkpoint in checkpoint_dir).
+    portals maps scraper names to frontier portal names when they differ.
+    """
+    portals = portals or {}
+    if names is None:
+        names = sorted(f[:-len(CHECKPOINT_SUFFIX)] for f in os.listdir(checkpoint_dir)
+                       if f.endswith(CHECKPOINT_SUFFIX)) if os.path.isdir(checkpoint_dir) else []
+    return {name: describe_checkpoint(name, checkpoint_dir, portals.get(name)) for name in names}
+
+
+def add_resume_arguments(parser) -> None:
+    """Common CLI flag for the resume policy"""
+    parser.add_argument('--resume', choices=RESUME_POLICIES, default='ask',
+                        help='Checkpoint previo: auto = reanudar, fresh = empezar de cero, '
+                             'ask = preguntar (sin terminal se reanuda) (default: ask)')
+
+
+if __name__ == "__main__":
+    # Catálogo de checkpoints: qué portales reanudarían y cuánto trabajo les queda
+    for name, entry in checkpoint_catalog().items():
+        print(json.dumps(entry, ensure_ascii=False))
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker for Web Scrapers
+Tracks the error rate of listing requests per portal and per area. When the error
+rate over the last requests crosses the threshold the circuit opens: the portal
+waits an exponentially growing cool-down before a probe request, an area is
+skipped until its cool-down ends. Retries come from a global budget that only
+refills with successful requests, so a portal that blocks us stops getting
+hammered. After too many trips the portal is parked (state file read by
+ScraperMaestro) and the scraper exits with EXIT_PARKED.
+
+Cool-downs are slept in short steps: a stop request or a cool-down that would end
+after the deadline raises CooldownInterrupted so the scraper can save and checkpoint
+instead of being killed in the middle of the pause.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+# Código de salida de un scraper cuyo portal quedó estacionado (EX_TEMPFAIL)
+EXIT_PARKED = 75
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+PARKED = "parked"
+
+# Segundos entre verificaciones de stop durante una pausa
+SLEEP_STEP = 1.0
+
+
+class PortalParked(BaseException):
+    """
+    The portal tripped too many times in a row; stop scraping it for now.
+    BaseException (like KeyboardInterrupt) so the scrapers' broad `except Exception`
+    handlers around page loads don't swallow it.
+    """
+
+
+class CooldownInterrupted(BaseException):
+    """
+    A portal cool-down was cut short: stop was requested or it would end after the
+    deadline. The caller saves what it has and keeps the checkpoint, as at the deadline.
+    """
+
+
+class _Circuit:
+    """Sliding window of outcomes plus open/half-open state for one key"""
+
+    def __init__(self, window: int):
+        self.outcomes = deque(maxlen=window)
+        self.state = CLOSED
+        self.trips = 0
+        self.open_until = 0.0
+        self.successes_since_close = 0
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class CircuitBreaker:
+    def __init__(self, portal: str, window: int = 20, min_calls: int = 6, threshold: float = 0.5,
+                 cooldown: float = 30.0, max_cooldown: float = 900.0, max_trips: int = 4,
+                 retry_ratio: float = 0.2, retry_min: int = 10, state_dir: str = "checkpoints",
+                 should_stop: Optional[Callable[[], bool]] = None, deadline: Optional[datetime] = None):
+        """
+        window/min_calls/threshold: the circuit opens when at least min_calls of the last
+                                    `window` requests were made and error rate >= threshold
+        cooldown/max_cooldown: first cool-down and its cap (doubles on every trip)
+        max_trips: consecutive portal trips before parking it (parked for max_cooldown)
+        retry_ratio/retry_min: retry budget, starts at retry_min and every success adds
+                               retry_ratio retries (at most retry_min stored)
+        should_stop: checked during cool-downs (e.g. threading.Event.is_set of a threaded crawler)
+        deadline: cool-downs that would end after it are not waited out (CrawlBudget.deadline)
+        """
+        self.portal = portal
+        self.window = window
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self.retry_ratio = retry_ratio
+        self.retry_min = retry_min
+        self.retry_tokens = float(retry_min)
+        self.should_stop = should_stop
+        self.deadline = deadline
+        self.state_file = os.path.join(state_dir, f"circuit_{portal}.json")
+        self._portal = _Circuit(window)
+        self._areas: Dict[str, _Circuit] = {}
+        self.stats = {"success": 0, "failure": 0, "retries": 0, "retries_denied": 0, "trips": 0, "waited": 0.0}
+
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _area(self, area: Optional[str]) -> Optional[_Circuit]:
+        if area is None:
+            return None
+        return self._areas.setdefault(area, _Circuit(self.window))
+
+    def _cooldown(self, trips: int) -> float:
+        return min(self.cooldown * (2 ** max(0, trips - 1)), self.max_cooldown)
+
+    def _trip(self, circuit: _Circuit, name: str) -> None:
+        circuit.trips += 1
+        circuit.state = OPEN
+        circuit.successes_since_close = 0
+        wait = self._cooldown(circuit.trips)
+        circuit.open_until = time.time() + wait
+        circuit.outcomes.clear()
+        self.stats["trips"] += 1
+        print(f" Circuito abierto para {name}: {circuit.trips}° corte, pausa de {wait:.0f}s")
+
+    def _save_state(self, state: str, parked_until: Optional[float] = None) -> None:
+        data = {
+            "portal": self.portal,
+            "state": state,
+            "trips": self._portal.trips,
+            "error_rate": round(self._portal.error_rate(), 3),
+            "parked_until": datetime.fromtimestamp(parked_until).isoformat() if parked_until else None,
+            "updated": datetime.now().isoformat()
+        }
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def allow(self, area: str) -> bool:
+        """False while the area circuit is open (the caller skips the area for now)"""
+        circuit = self._area(area)
+        if circuit.state == OPEN:
+            if time.time() < circuit.open_until:
+                return False
+            circuit.state = HALF_OPEN
+        return True
+
+    def before_request(self, area: Optional[str] = None) -> None:
+        """
+        Call before each listing request. Waits out the portal cool-down (the next request
+        is the probe) and raises PortalParked when the portal tripped max_trips times, or
+        CooldownInterrupted if stop is requested or the deadline comes before the end of the pause.
+        """
+        circuit = self._portal
+        if circuit.state != OPEN:
+            return
+        if circuit.trips >= self.max_trips:
+            parked_until = time.time() + self.max_cooldown
+            self._save_state(PARKED, parked_until)
+            raise PortalParked(f"{self.portal}: {circuit.trips} cortes seguidos")
+        wait = circuit.open_until - time.time()
+        if wait > 0:
+            if self.deadline and datetime.now() + timedelta(seconds=wait) >= self.deadline:
+                raise CooldownInterrupted(f"{self.portal}: la pausa de {wait:.0f}s termina después del deadline")
+            print(f" Esperando {wait:.0f}s antes de volver a probar {self.portal}...")
+            start = time.time()
+            try:
+                while time.time() < circuit.open_until:
+                    if self.should_stop and self.should_stop():
+                        raise CooldownInterrupted(f"{self.portal}: detenido durante la pausa")
+                    time.sleep(min(SLEEP_STEP, max(0.0, circuit.open_until - time.time())))
+            finally:
+                self.stats["waited"] += time.time() - start
+        circuit.state = HALF_OPEN
+
+    def success(self, area: Optional[str] = None) -> None:
+        self.stats["success"] += 1
+        self.retry_tokens = min(self.retry_tokens + self.retry_ratio, float(self.retry_min))
+        for circuit in (self._portal, self._area(area)):
+            if circuit is None:
+                continue
+            circuit.outcomes.append(True)
+            if circuit.state == HALF_OPEN:
+                circuit.state = CLOSED
+                if circuit is self._portal:
+                    self._save_state(CLOSED)
+            circuit.successes_since_close += 1
+            # Una ventana completa sana después de cerrar: los cortes dejan de ser consecutivos
+            if circuit.successes_since_close >= self.window:
+                circuit.trips = 0
+
+    def failure(self, area: Optional[str] = None) -> None:
+        self.stats["failure"] += 1
+        for circuit, name in ((self._portal, self.portal), (self._area(area), f"{self.portal}/{area}")):
+            if circuit is None:
+                continue
+            circuit.outcomes.append(False)
+            circuit.successes_since_close = 0
+            # La sonda de un circuito semiabierto falló: vuelve a abrirse con más pausa
+            if circuit.state == HALF_OPEN or (len(circuit.outcomes) >= self.min_calls
+                                              and circuit.error_rate() >= self.threshold):
+                self._trip(circuit, name)
+                if circuit is self._portal:
+                    self._save_state(OPEN)
+
+    def can_retry(self) -> bool:
+        """Take one retry from the global budget"""
+        if self.retry_tokens >= 1:
+            self.retry_tokens -= 1
+            self.stats["retries"] += 1
+            return True
+        self.stats["retries_denied"] += 1
+        return False
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Circuito {self.portal}: {s['success']} ok, {s['failure']} errores, {s['trips']} cortes, "
+                f"{s['retries']} reintentos ({s['retries_denied']} denegados), {s['waited']:.0f}s en pausa")
+
+
+def parked_until(portal: str, state_dir: str = "checkpoints") -> Optional[datetime]:
+    """When the portal stops being parked, or None if it is not parked"""
+    state_file = os.path.join(state_dir, f"circuit_{portal}.json")
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            data: Dict[str, Any] = json.load(f)
+    except Exception:
+        return None
+    if data.get("state") != PARKED or not data.get("parked_until"):
+        return None
+    until = datetime.fromisoformat(data["parked_until"])
+    return until if until > datetime.now() else None
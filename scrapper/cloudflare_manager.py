@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Cloudflare Manager for Web Scrapers
+Detects and solves Cloudflare challenges in a Selenium driver, persists the clearance
+(cf_clearance cookies + user agent) in an encrypted local store and reuses it across
+pages and runs until it expires. Keeps track of the time spent in challenges.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Any
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# El store cifrado necesita cryptography; sin ella la clearance solo vive en memoria
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    CRYPTO_AVAILABLE = True
+except ImportError:
+    CRYPTO_AVAILABLE = False
+
+# "cloudflare" a secas no sirve: aparece en los scripts de páginas normales servidas por su CDN
+CLOUDFLARE_INDICATORS = [
+    "verify you are human",
+    "checking your browser",
+    "just a moment"
+]
+
+CHECKBOX_SELECTORS = [
+    "input[type='checkbox']",
+    ".cb-lb",
+    "#challenge-stage input",
+    "span.mark",
+    ".ctp-checkbox-label"
+]
+
+# Cookies que forman parte de la clearance (el resto se puede limpiar libremente)
+CLEARANCE_COOKIES = ("cf_clearance", "__cf_bm", "__cflb")
+
+DEFAULT_TTL = 30 * 60  # si la cookie no informa expiración
+
+
+class ClearanceStore:
+    """Encrypted on-disk store: {domain: {cookies, user_agent, expires, saved}}"""
+
+    def __init__(self, store_dir: str = "checkpoints", filename: str = "cloudflare_clearance.enc"):
+        self.store_file = os.path.join(store_dir, filename)
+        self.key_file = os.path.join(store_dir, ".cloudflare_clearance.key")
+        self.enabled = CRYPTO_AVAILABLE
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._fernet = None
+
+        if self.enabled:
+            os.makedirs(store_dir, exist_ok=True)
+            self._fernet = Fernet(self._load_key())
+            self._memory = self._read()
+        else:
+            print("Nota: cryptography no disponible, la clearance de Cloudflare no se guardará entre sesiones")
+
+    def _load_key(self) -> bytes:
+        env_key = os.environ.get("SCRAPER_CLEARANCE_KEY")
+        if env_key:
+            return env_key.encode()
+        if os.path.exists(self.key_file):
+            with open(self.key_file, 'rb') as f:
+                return f.read().strip()
+        key = Fernet.generate_key()
+        with open(self.key_file, 'wb') as f:
+            f.write(key)
+        os.chmod(self.key_file, 0o600)
+        return key
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.store_file):
+            return {}
+        try:
+            with open(self.store_file, 'rb') as f:
+                return json.loads(self._fernet.decrypt(f.read()).decode('utf-8'))
+        except (InvalidToken, ValueError) as e:
+            print(f" Store de clearance ilegible, se descarta: {e}")
+            return {}
+
+    def _write(self) -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps(self._memory).encode('utf-8')
+        tmp_file = self.store_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(self._fernet.encrypt(payload))
+        os.replace(tmp_file, self.store_file)
+
+    def get(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Return the stored clearance for a domain if it has not expired"""
+        entry = self._memory.get(domain)
+        if not entry:
+            return None
+        if entry.get("expires", 0) <= time.time():
+            self.delete(domain)
+            return None
+        return entry
+
+    def save(self, domain: str, cookies: List[Dict[str, Any]], user_agent: str) -> None:
+        expiries = [c["expiry"] for c in cookies if c.get("name") == "cf_clearance" and c.get("expiry")]
+        expires = min(expiries) if expiries else time.time() + DEFAULT_TTL
+        self._memory[domain] = {
+            "cookies": cookies,
+            "user_agent": user_agent,
+            "expires": expires,
+            "saved": time.time()
+        }
+        self._write()
+
+    def delete(self, domain: str) -> None:
+        if self._memory.pop(domain, None) is not None:
+            self._write()
+
+
+class CloudflareManager:
+    def __init__(self, domain: str, store: Optional[ClearanceStore] = None,
+                 debug_print: Optional[Callable[..., None]] = None, manual_fallback: bool = True):
+        """
+        domain: base domain whose clearance is managed (e.g. "upwork.com")
+        manual_fallback: ask the user to solve the challenge by hand (only with a TTY)
+        """
+        self.domain = domain
+        self.store = store or ClearanceStore()
+        self.debug_print = debug_print or (lambda *a, **k: None)
+        self.manual_fallback = manual_fallback
+        self.driver = None
+
+        self.challenges_seen = 0
+        self.challenges_solved = 0
+        self.clearances_reused = 0
+        self.seconds_in_challenges = 0.0
+
+    @property
+    def user_agent(self) -> Optional[str]:
+        """User agent tied to the stored clearance; create the driver with it"""
+        entry = self.store.get(self.domain)
+        return entry["user_agent"] if entry else None
+
+    def attach(self, driver) -> None:
+        self.driver = driver
+
+    # -------------------------------------------------------------------------
+    # Reutilización de clearance
+    # -------------------------------------------------------------------------
+    def apply_clearance(self, base_url: str) -> bool:
+        """
+        Load the stored clearance into the driver. Must be called with the driver
+        on any page; it navigates to base_url so cookies can be set for the domain.
+        """
+        entry = self.store.get(self.domain)
+        if not entry:
+            return False
+
+        try:
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": entry["user_agent"]})
+        except Exception as e:
+            self.debug_print(f"No se pudo fijar el user agent: {e}")
+
+        self.driver.get(base_url)
+        self._add_cookies(entry["cookies"])
+        self.clearances_reused += 1
+        print(f"Clearance de Cloudflare reutilizada para {self.domain}")
+        return True
+
+    def _add_cookies(self, cookies: List[Dict[str, Any]]) -> None:
+        for cookie in cookies:
+            cookie = {k: v for k, v in cookie.items() if k in ("name", "value", "domain", "path", "expiry", "secure", "httpOnly")}
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                self.debug_print(f"Cookie {cookie.get('name')} rechazada: {e}")
+
+    def reset_cookies(self) -> None:
+        """Drop all cookies but keep the Cloudflare clearance ones"""
+        try:
+            keep = [c for c in self.driver.get_cookies() if c.get("name") in CLEARANCE_COOKIES]
+            self.driver.delete_all_cookies()
+            self._add_cookies(keep)
+        except Exception as e:
+            self.debug_print(f"Error limpiando cookies: {e}")
+
+    def _save_clearance(self) -> None:
+        try:
+            cookies = [c for c in self.driver.get_cookies() if c.get("name") in CLEARANCE_COOKIES]
+            if not cookies:
+                return
+            user_agent = self.driver.execute_script("return navigator.userAgent")
+            self.store.save(self.domain, cookies, user_agent)
+            self.debug_print(f"Clearance guardada para {self.domain}")
+        except Exception as e:
+            self.debug_print(f"No se pudo guardar la clearance: {e}")
+
+    # -------------------------------------------------------------------------
+    # Detección y resolución de challenges
+    # -------------------------------------------------------------------------
+    def is_challenge(self) -> bool:
+        try:
+            page_text = self.driver.page_source.lower()
+        except Exception:
+            return False
+        return any(indicator in page_text for indicator in CLOUDFLARE_INDICATORS)
+
+    def _wait_until_cleared(self, timeout: float) -> bool:
+        """Poll instead of sleeping the whole timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.is_challenge():
+                return True
+            time.sleep(0.5)
+        return not self.is_challenge()
+
+    def click_checkbox(self) -> bool:
+        """Try to click the Cloudflare checkbox inside any iframe"""
+        try:
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            self.debug_print(f"Encontrados {len(iframes)} iframes")
+
+            for idx, iframe in enumerate(iframes):
+                try:
+                    self.driver.switch_to.frame(iframe)
+                    for selector in CHECKBOX_SELECTORS:
+                        try:
+                            checkbox = WebDriverWait(self.driver, 3).until(
+                                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                            )
+                            checkbox.click()
+                            print("Checkbox de Cloudflare clickeado!")
+                            return True
+                        except Exception:
+                            continue
+                except Exception as e:
+                    self.debug_print(f"Error procesando iframe {idx + 1}: {e}")
+                finally:
+                    self.driver.switch_to.default_content()
+
+            self.debug_print("No se encontró checkbox de Cloudflare")
+            return False
+        except Exception as e:
+            self.debug_print(f"Error buscando checkbox de Cloudflare: {e}")
+            return False
+
+    def solve(self, label: str = "", attempts: int = 3) -> bool:
+        """Solve the challenge currently shown. Returns True if the page is clear afterwards"""
+        self.challenges_seen += 1
+        started = time.monotonic()
+        print(f"\nCloudflare detectado{' en ' + label if label else ''}!")
+        print("Intentando resolver automáticamente...")
+
+        # A veces el challenge no interactivo se resuelve solo en unos segundos
+        solved = self._wait_until_cleared(5)
+
+        for attempt in range(attempts):
+            if solved:
+                break
+            if self.click_checkbox():
+                print(f"Intento {attempt + 1}: Checkbox clickeado. Esperando verificación...")
+                solved = self._wait_until_cleared(10)
+            else:
+                print(f"Intento {attempt + 1}: No se encontró checkbox")
+                if attempt < attempts - 1:
+                    self.driver.refresh()
+                    solved = self._wait_until_cleared(5)
+
+        if not solved and self.manual_fallback and sys.stdin.isatty():
+            print("\nNo se pudo resolver automáticamente.")
+            print("Por favor, resuelve la verificación manualmente en el navegador.")
+            print("Presiona Enter cuando hayas completado la verificación...")
+            input()
+            solved = not self.is_challenge()
+
+        elapsed = time.monotonic() - started
+        self.seconds_in_challenges += elapsed
+
+        if solved:
+            self.challenges_solved += 1
+            print(f"Cloudflare superado en {elapsed:.1f}s")
+            self._save_clearance()
+        else:
+            print(f"Cloudflare no superado tras {elapsed:.1f}s")
+            self.store.delete(self.domain)
+        return solved
+
+    def ensure_passed(self, label: str = "") -> bool:
+        """Call after each driver.get(): solves the challenge only if there is one"""
+        if not self.is_challenge():
+            return True
+        return self.solve(label)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "challenges": self.challenges_seen,
+            "solved": self.challenges_solved,
+            "clearances_reused": self.clearances_reused,
+            "seconds_in_challenges": round(self.seconds_in_challenges, 1)
+        }
+
+    def print_summary(self) -> None:
+        s = self.stats()
+        print(f"Cloudflare ({self.domain}): {s['challenges']} challenges, {s['solved']} resueltos, "
+              f"{s['clearances_reused']} clearances reutilizadas, {s['seconds_in_challenges']}s en challenges")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Columnar Export of the Unified Corpus
+Writes database/all_jobs.json as a Parquet file (or an Arrow IPC file) so the
+classifier and the visualizer can memory-map it and read only the columns they
+need instead of parsing the whole pretty-printed JSON. Low-cardinality columns
+(Fuente, Pais, Categoria Portal...) are dictionary-encoded. The source is read
+in streaming (open_jobs) and written in batches of rows; keys outside the
+known columns are kept as a JSON object in the `extra` column.
+
+Usage:
+    python columnar_export.py [--formato parquet|arrow] [--entrada ../database/all_jobs.json]
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+FORMATS = ("parquet", "arrow")
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+BATCH_ROWS = 10000
+
+# Columnas de los empleos que arman los scrapers, en el orden de all_jobs.json, y las de ubicación normalizada
+COLUMNS = ("Id Interno", "titulo", "descripcion", "responsabilidades", "requisitos", "Empresa",
+           "Fuente", "Tipo Portal", "url", "Pais", "ubicacion", "salario", "Categoria Portal",
+           "Subcategoria Portal", "Categorria", "Subcategoria", "hash Descripcion", "fecha",
+           "ubicacion_pais", "ubicacion_provincia", "ubicacion_ciudad")
+# Pocas distintas y repetidas en cada fila: se guardan como índice a un diccionario
+DICTIONARY_COLUMNS = ("Fuente", "Tipo Portal", "Pais", "Categoria Portal", "Subcategoria Portal",
+                      "Categorria", "Subcategoria", "fecha", "ubicacion_pais", "ubicacion_provincia",
+                      "ubicacion_ciudad")
+EXTRA_COLUMN = "extra"
+
+
+def output_path_for(source: str, fmt: str) -> str:
+    """all_jobs.json -> all_jobs.parquet / all_jobs.arrow next to it"""
+    return os.path.splitext(source)[0] + EXTENSIONS[fmt]
+
+
+def corpus_schema() -> "pa.Schema":
+    fields = [pa.field(name, pa.dictionary(pa.int32(), pa.string()) if name in DICTIONARY_COLUMNS else pa.string())
+              for name in COLUMNS]
+    fields += [pa.field("revision", pa.int32()), pa.field(EXTRA_COLUMN, pa.string())]
+    return pa.schema(fields)
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _batch(rows: List[Dict[str, Any]], schema: "pa.Schema") -> "pa.RecordBatch":
+    columns = {name: [_text(row.get(name)) for row in rows] for name in COLUMNS}
+    columns["revision"] = [row.get("revision") for row in rows]
+    known = set(COLUMNS) | {"revision"}
+    extras = []
+    for row in rows:
+        extra = {key: value for key, value in row.items() if key not in known}
+        extras.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+    columns[EXTRA_COLUMN] = extras
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _batches(jobs: Iterable[Dict[str, Any]], schema: "pa.Schema", batch_rows: int):
+    rows = []
+    for job in jobs:
+        rows.append(job)
+        if len(rows) >= batch_rows:
+            yield _batch(rows, schema)
+            rows = []
+    if rows:
+        yield _batch(rows, schema)
+
+
+def export_jobs(jobs: Iterable[Dict[str, Any]], path: str, fmt: str = "parquet",
+                batch_rows: int = BATCH_ROWS) -> int:
+    """
+    Write the jobs to `path` (through a .tmp file, replaced at the end). Parquet is written
+    batch by batch, one row group each; the Arrow IPC file keeps the batches in memory so every
+    dictionary column ends up with a single dictionary, which the IPC file format requires.
+    Returns the number of rows.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow no instalado (pip install pyarrow)")
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt}")
+    schema = corpus_schema()
+    tmp_path = path + ".tmp"
+    rows = 0
+    try:
+        if fmt == "parquet":
+            with pq.ParquetWriter(tmp_path, schema, compression="zstd",
+                                  use_dictionary=list(DICTIONARY_COLUMNS)) as writer:
+                for batch in _batches(jobs, schema, batch_rows):
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+        else:
+            table = pa.Table.from_batches(list(_batches(jobs, schema, batch_rows)), schema=schema)
+            table = table.unify_dictionaries().combine_chunks()
+            rows = table.num_rows
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                writer.write_table(table, max_chunksize=batch_rows)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return rows
+
+
+def read_columns(path: str, columns: Optional[Sequence[str]] = None) -> "pa.Table":
+    """Memory-mapped read of only `columns` (all of them when None) of a corpus export"""
+    if path.endswith(EXTENSIONS["arrow"]):
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.select(list(columns)) if columns else table
+    return pq.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+
+
+def main():
+    from jsonl_zstd import open_jobs
+
+    parser = argparse.ArgumentParser(description='Exportar all_jobs.json a Parquet / Arrow')
+    parser.add_argument('--entrada', type=str, default="../database/all_jobs.json")
+    parser.add_argument('--formato', choices=FORMATS, default="parquet")
+    parser.add_argument('--salida', type=str, default=None, help='Default: junto a la entrada (all_jobs.parquet / .arrow)')
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        print("ERROR: pyarrow no instalado (pip install pyarrow)")
+        raise SystemExit(1)
+    salida = args.salida or output_path_for(args.entrada, args.formato)
+    _, jobs = open_jobs(args.entrada)
+    rows = export_jobs(jobs or [], salida, args.formato)
+    print(f"{rows} empleos exportados a {salida} ({os.path.getsize(salida) / (1024*1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
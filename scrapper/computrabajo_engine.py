@@ -0,0 +1,1444 @@
+#!/usr/bin/env python3
+"""
+Computrabajo Multi-Country Engine
+One crawler for every Computrabajo country site. What changes between countries
+(host, areas, output files, record fields, detail-page extraction, pacing) lives
+in COUNTRY_CONFIG; the countries are crawled concurrently, one thread each,
+taking browsers from a shared pool, with a rate limiter per country and a single
+dedup index for all of them.
+
+The single-country scripts (Computrabajo.py, Computrabajo_MX.py and
+Computrabajo_CO.py) only run this engine with --pais ar|mx|co. Workana.py, which
+also crawls Computrabajo México but with its own areas, files and Fuente, stays
+a standalone script. Output files, checkpoint, circuit breaker, rate limiter,
+seen-index and frontier stats of a country are all named after its "portal", so
+every way of crawling a country shares them.
+
+Optional stages, for the countries whose portal has rules for them: sitemap
+discovery (--descubrimiento sitemap), listing cards, lxml parse workers
+(--parse-workers) and tab pipelining (--pestanas). With --cola a country takes
+(area, page range) tasks from a shared work queue instead of walking its areas.
+
+With --daemon the engine keeps running: browsers, dedup hashes and seen-indexes
+stay in memory, every country gets a quick sweep (first listing pages, known
+URLs skipped) on its own cadence and a full sweep less often, and the state of
+each country is written to a health/metrics file.
+
+Usage:
+    python computrabajo_engine.py --paises ar mx co --drivers 2
+    python computrabajo_engine.py --pais co --cola sqlite:checkpoints/work_queue.db
+    python computrabajo_engine.py --daemon --cada 30 --completo-cada 24
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+from checkpoint_manager import CheckpointManager, ComputrabajoCheckpoint, add_resume_arguments, get_resume_info
+from circuit_breaker import EXIT_PARKED, CircuitBreaker, CooldownInterrupted, PortalParked, parked_until
+from crawl_frontier import CrawlBudget, CrawlFrontier, add_frontier_arguments
+from incremental import IncrementalCrawl, add_incremental_arguments
+from jsonl_zstd import JOBS_EXTENSION, load_jobs, save_jobs
+from listing_cards import ListingCards, add_card_arguments
+from parse_pipeline import add_parse_arguments, create_parse_pool
+from rate_limiter import get_rate_limiter
+from sitemap_discovery import SitemapDiscovery, add_sitemap_arguments
+from tab_pipeline import TabPipeline, add_tab_arguments
+from work_queue import (add_queue_arguments, default_worker_id, open_queue, run_worker,
+                        seed_areas, worker_output_dir)
+
+RESET = '\033[0m'
+OUTPUT_DIR = "output_jobs"
+JOB_PATH = '/ofertas-de-trabajo/oferta-de-trabajo-de-'
+REQUERIMIENTOS_XPATH = "//*[contains(text(),'Requerimientos')]/following::ul[1]"
+# Miga de pan del detalle: enlace al listado del área del empleo (/trabajo-de-<area>)
+BREADCRUMB_XPATH = "//*[contains(@class,'breadcrumb')]//a[contains(@href,'/trabajo-de-')]"
+_AREA_HREF_RE = re.compile(r'/trabajo-de-([a-z0-9-]+)')
+HEALTH_FILE = "checkpoints/computrabajo_engine_health.json"
+
+# Modo daemon: páginas por área del barrido rápido y horas entre barridos completos
+PAGINAS_RAPIDAS = 3
+HORAS_COMPLETO = 24
+
+# Empleos del sitemap: se procesan en lotes (las "páginas" del frontier/deadline) y van a un
+# archivo e Id Interno propios; su "Categoria Portal" sale de la miga de pan del detalle
+EMPLEOS_POR_LOTE_SITEMAP = 20
+AREA_SITEMAP = "sitemap"
+
+DEBUG = False
+
+# Un solo lock para la consola y otro para los archivos compartidos entre países
+# (crawl_yield.json, incremental_stops.json)
+_PRINT_LOCK = threading.Lock()
+_IO_LOCK = threading.Lock()
+
+
+def calcular_hash(texto):
+    if not isinstance(texto, str):
+        return None
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _texto(driver, by: str, selector: str, defecto: str) -> str:
+    """Text of the first match, or `defecto` if there is none"""
+    try:
+        return driver.find_element(by, selector).text.strip()
+    except WebDriverException:
+        return defecto
+
+
+def _esperar_texto(driver, locator: Tuple[str, str], defecto: Optional[str], timeout: float = 10) -> Optional[str]:
+    try:
+        return WebDriverWait(driver, timeout).until(EC.presence_of_element_located(locator)).text.strip()
+    except TimeoutException:
+        return defecto
+
+
+def categoria_de_enlace(href: Optional[str], areas) -> str:
+    """Area slug of a /trabajo-de-<area> link, only if it is one of `areas`; "" otherwise"""
+    match = _AREA_HREF_RE.search(href or "")
+    return match.group(1) if match and match.group(1) in areas else ""
+
+
+def categoria_breadcrumb(driver, areas) -> str:
+    """Area of the job page the driver is on, from its breadcrumb ("" if it has none we know)"""
+    try:
+        enlaces = driver.find_elements(By.XPATH, BREADCRUMB_XPATH)
+        for enlace in enlaces:
+            categoria = categoria_de_enlace(enlace.get_attribute("href"), areas)
+            if categoria:
+                return categoria
+    except WebDriverException:
+        pass
+    return ""
+
+
+# =============================================================================
+# EXTRACCIÓN POR PAÍS
+# Cada extractor recibe el driver parado en la página del empleo, un callable
+# `duplicado(hash)` y los campos de la tarjeta del listado (vacío si el portal del
+# país no tiene reglas de tarjetas); devuelve (hash, campos) con campos None si el
+# empleo ya existe. Los campos y el texto del hash son los mismos que generaba cada
+# script, así los hashes siguen coincidiendo con los archivos ya guardados.
+# Un "parser" hace lo mismo con los campos que extrajo parse_pipeline (lxml).
+# =============================================================================
+
+def _empresa_ubicacion_ar(texto: Optional[str]) -> Tuple[str, str]:
+    if not texto:
+        return "Empresa no disponible", "Ubicación no disponible"
+    partes = texto.split('-')
+    return partes[0].strip(), partes[1].strip() if len(partes) > 1 else "Ubicación no disponible"
+
+
+def extraer_ar(driver, duplicado: Callable[[str], bool], tarjeta: Dict[str, str]):
+    descripcion = _texto(driver, By.XPATH, "/html/body/main/div[2]/div/div[2]/div[4]/p[1]", "Requisitos no disponibles")
+    requisitominimo = _texto(driver, By.XPATH, REQUERIMIENTOS_XPATH, "Requisitos no disponibles")
+    desc_completa = descripcion + "\n\n" + requisitominimo
+    hash_empleo = calcular_hash(desc_completa)
+
+    # Duplicado temprano: no esperar título ni empresa
+    if duplicado(hash_empleo):
+        return hash_empleo, None
+
+    # Del detalle solo lo que la tarjeta del listado no trajo
+    titulo = tarjeta.get("titulo") or _esperar_texto(driver, (By.TAG_NAME, "h1"), "Título no disponible")
+    if tarjeta.get("empresa") and tarjeta.get("ubicacion"):
+        nombre_empresa, ubicacion = tarjeta["empresa"], tarjeta["ubicacion"]
+    else:
+        nombre_empresa, ubicacion = _empresa_ubicacion_ar(
+            _esperar_texto(driver, (By.XPATH, "/html/body/main/div[1]/p"), None))
+
+    return hash_empleo, {"titulo": titulo, "descripcion": desc_completa, "extras": {},
+                         "Empresa": nombre_empresa, "ubicacion": ubicacion}
+
+
+def parsear_ar(campos: Dict[str, Optional[str]], duplicado: Callable[[str], bool]):
+    desc_completa = (campos["descripcion"] or "Requisitos no disponibles") + "\n\n" + \
+        (campos["requisitos"] or "Requisitos no disponibles")
+    hash_empleo = calcular_hash(desc_completa)
+    if duplicado(hash_empleo):
+        return hash_empleo, None
+
+    nombre_empresa, ubicacion = _empresa_ubicacion_ar(campos["empresa_ubicacion"])
+    return hash_empleo, {"titulo": campos["titulo"] or "Título no disponible", "descripcion": desc_completa,
+                         "extras": {}, "Empresa": nombre_empresa, "ubicacion": ubicacion}
+
+
+def extraer_mx(driver, duplicado: Callable[[str], bool], tarjeta: Dict[str, str]):
+    titulo = _esperar_texto(driver, (By.TAG_NAME, "h1"), "Título no disponible")
+
+    nombre_empresa, ubicacion = "Empresa no disponible", "México"
+    for selector in ("/html/body/main/div[1]/p", "//p[contains(@class, 'company')]",
+                     "//div[contains(@class, 'company')]//p", "//main//p[1]"):
+        texto = _texto(driver, By.XPATH, selector, "")
+        if texto:
+            partes = texto.split('-')
+            nombre_empresa = partes[0].strip()
+            ubicacion = partes[1].strip() if len(partes) > 1 else "México"
+            break
+
+    descripcion = ""
+    for selector in ("/html/body/main/div[2]/div/div[2]/div[4]/p[1]", "//div[contains(@class, 'box_detail')]//p",
+                     "//div[contains(@class, 'description')]//p", "//article//p"):
+        descripcion = _texto(driver, By.XPATH, selector, "")
+        if descripcion:
+            break
+    if not descripcion:
+        descripcion = _texto(driver, By.CSS_SELECTOR, "div.box_detail, div.description, article",
+                             "Descripción no disponible")
+
+    requisitominimo = _texto(driver, By.XPATH, REQUERIMIENTOS_XPATH, "")
+    desc_completa = descripcion
+    if requisitominimo:
+        desc_completa += "\n\nRequerimientos:\n" + requisitominimo
+    desc_completa = desc_completa.replace('\n', ' ').replace('\r', ' ')
+    hash_empleo = calcular_hash(desc_completa)
+
+    if duplicado(hash_empleo):
+        return hash_empleo, None
+
+    aptitudes = ", ".join(elem.text.strip() for elem in driver.find_elements(By.CSS_SELECTOR, "span[data-skill-id]")
+                          if elem.text.strip())
+    palabras_clave = _texto(driver, By.XPATH, "//p[contains(text(), 'Palabras clave')]", "")
+    if "Palabras clave:" in palabras_clave:
+        palabras_clave = palabras_clave.split("Palabras clave:")[-1].strip()
+
+    return hash_empleo, {"titulo": titulo, "descripcion": desc_completa,
+                         "extras": {"aptitudes": aptitudes or "No especificado",
+                                    "palabras_clave": palabras_clave or "No especificado"},
+                         "Empresa": nombre_empresa, "ubicacion": ubicacion}
+
+
+def extract_job_details_structured(driver):
+    """
+    Extrae datos del empleo y retorna diccionario con campos SEPARADOS
+    (descripcion, requerimientos, aptitudes)
+    """
+    try:
+        result = {
+            'descripcion': '',
+            'requerimientos': '',
+            'aptitudes': ''
+        }
+
+        # 1. DESCRIPCIÓN PRINCIPAL
+        try:
+            main_desc_selectors = [
+                "//div[contains(@class, 'box_detail')]//p",
+                "//main//div[contains(@class, 'fs16')]//p",
+                "//div[contains(@class, 'fs16')]//p"
+            ]
+
+            paragraphs = []
+            for selector in main_desc_selectors:
+                try:
+                    elements = driver.find_elements(By.XPATH, selector)
+                    if elements:
+                        for elem in elements[:5]:
+                            text = elem.text.strip()
+                            if len(text) > 20:
+                                paragraphs.append(text)
+                        if paragraphs:
+                            break
+                except:
+                    continue
+
+            if paragraphs:
+                desc = '\n\n'.join(paragraphs).strip()
+                # Eliminar timestamps como "Hace 12 horas (actualizada)" o variantes
+                desc = re.sub(r'\s*Hace\s+\d+\s+\w+.*$', '', desc, flags=re.IGNORECASE)
+                # Normalizar líneas en blanco múltiples
+                result['descripcion'] = re.sub(r'\n{3,}', '\n\n', desc).strip()
+        except:
+            pass
+
+        if not result['descripcion']:
+            try:
+                all_p = driver.find_elements(By.TAG_NAME, "p")
+                for p in all_p:
+                    text = p.text.strip()
+                    if len(text) > 100:
+                        text = re.sub(r'\s*Hace\s+\d+\s+\w+.*$', '', text, flags=re.IGNORECASE)
+                        result['descripcion'] = text.strip()
+                        break
+
+            except:
+                result['descripcion'] = "Descripción no disponible"
+
+
+        # 2. REQUERIMIENTOS
+        try:
+            req_xpath_options = [
+                "//*[contains(text(),'Requerimientos')]",
+                "//*[contains(text(),'Requisitos')]"
+            ]
+
+            requerimientos_text = ""
+            for xpath in req_xpath_options:
+                try:
+                    elements = driver.find_elements(By.XPATH, xpath)
+                    if elements:
+                        for elem in elements:
+                            text = elem.text.strip()
+                            if len(text) < 50 and 'requerimientos' in text.lower():
+                                content_xpaths = [
+                                    "//*[contains(text(),'Requerimientos')]/following::ul[1]",
+                                    "//*[contains(text(),'Requerimientos')]/following-sibling::*[1]",
+                                    "//*[contains(text(),'Requerimientos')]/following::*[self::ul or self::div or self::p][1]"
+                                ]
+
+                                for content_xpath in content_xpaths:
+                                    try:
+                                        content_elem = driver.find_element(By.XPATH, content_xpath)
+                                        if content_elem:
+                                            content_text = content_elem.text.strip()
+                                            if len(content_text) > 10:
+                                                requerimientos_text = content_text
+                                                break
+                                    except:
+                                        continue
+
+                                if requerimientos_text:
+                                    break
+
+                        if requerimientos_text:
+                            break
+                except:
+                    continue
+
+            result['requerimientos'] = requerimientos_text if requerimientos_text else "No especificado"
+
+        except:
+            result['requerimientos'] = "No especificado"
+
+        # 3. APTITUDES
+        try:
+            apt_xpath_options = [
+                "//*[contains(text(),'Aptitudes')]",
+                "//*[contains(text(),'aptitudes')]"
+            ]
+
+            aptitudes_text = ""
+            for xpath in apt_xpath_options:
+                try:
+                    elements = driver.find_elements(By.XPATH, xpath)
+                    if elements:
+                        for elem in elements:
+                            text = elem.text.strip()
+                            if 'aptitud' in text.lower() and len(text) < 100:
+                                content_xpaths = [
+                                    "//*[contains(text(),'Aptitudes')]/following::ul[1]",
+                                    "//*[contains(text(),'Aptitudes')]/following-sibling::*[1]",
+                                    "//*[contains(text(),'Aptitudes')]/following::div[contains(@class, 'tag')][1]/parent::*",
+                                    "//*[contains(text(),'Aptitudes')]/following::*[self::ul or self::div][1]"
+                                ]
+
+                                for content_xpath in content_xpaths:
+                                    try:
+                                        content_elem = driver.find_element(By.XPATH, content_xpath)
+                                        if content_elem:
+                                            content_text = content_elem.text.strip()
+                                            if len(content_text) > 5:
+                                                aptitudes_text = content_text
+                                                break
+                                    except:
+                                        continue
+
+                                if aptitudes_text:
+                                    break
+
+                        if aptitudes_text:
+                            break
+                except:
+                    continue
+
+            result['aptitudes'] = aptitudes_text if aptitudes_text else "No especificado"
+
+        except:
+            result['aptitudes'] = "No especificado"
+
+        result['descripcion'] = re.sub(r'\n{2,}', '\n\n', result['descripcion']).strip()
+
+        return result
+
+    except Exception as e:
+        debug_print(f"Error en extract_job_details_structured: {e}")
+        try:
+            body = driver.find_element(By.TAG_NAME, "body")
+            body_text = body.text[:3000]
+            return {
+                'descripcion': body_text,
+                'requerimientos': 'No especificado',
+                'aptitudes': 'No especificado'
+            }
+        except:
+            return {
+                'descripcion': 'Descripción no disponible',
+                'requerimientos': 'No especificado',
+                'aptitudes': 'No especificado'
+            }
+
+
+def extraer_co(driver, duplicado: Callable[[str], bool], tarjeta: Dict[str, str]):
+    titulo = _texto(driver, By.TAG_NAME, "h1", "Sin título")
+    details = extract_job_details_structured(driver)
+
+    empresa, ubicacion = "N/A", "Colombia"
+    texto = _texto(driver, By.CSS_SELECTOR, "p.fs16", "")
+    if '-' in texto:
+        partes = texto.split('-')
+        empresa = partes[0].strip()
+        ubicacion = partes[1].strip()
+
+    hash_empleo = calcular_hash(details['descripcion'] + "|" + ubicacion + "|" + empresa)
+    if duplicado(hash_empleo):
+        return hash_empleo, None
+
+    return hash_empleo, {"titulo": titulo, "descripcion": details['descripcion'],
+                         "extras": {"requerimientos": details['requerimientos'],
+                                    "aptitudes": details['aptitudes']},
+                         "Empresa": empresa if empresa != "N/A" else "Confidencial", "ubicacion": ubicacion}
+
+
+# =============================================================================
+# CONFIGURACIÓN POR PAÍS
+# =============================================================================
+
+AREAS_CO = {
+    "servicio-al-cliente": "Servicio al Cliente",
+    "auxiliar-de-bodega": "Auxiliar de Bodega",
+    "auxiliar-de-cocina": "Auxiliar de Cocina",
+    "auxiliar-administrativo": "Auxiliar Administrativo",
+    "auxiliar-logistico": "Auxiliar Logístico",
+    "asesor-comercial": "Asesor Comercial",
+    "call-center": "Call Center",
+    "auxiliar-de-enfermeria": "Auxiliar de Enfermería",
+    "asesor-de-ventas": "Asesor de Ventas",
+    "analista": "Analista",
+    "conductor": "Conductor",
+    "atencion-a-clientes": "Atención a Clientes",
+    "auxiliar-contable": "Auxiliar Contable",
+    "operario": "Operario",
+    "mercaderista": "Mercaderista",
+    "auxiliar": "Auxiliar",
+    "ejecutivo-comercial": "Ejecutivo Comercial",
+    "coordinador": "Coordinador",
+    "asesores-comerciales": "Asesores Comerciales",
+}
+
+# portal: nombre del checkpoint, circuito, rate limiter, índice de conocidos y frontier del país
+# archivo: prefijo de los archivos en output_jobs/
+# parser: campos de parse_pipeline -> (hash, campos) para --parse-workers (None: sin reglas lxml)
+# ritmo: segundos promedio entre navegaciones al portal del país
+# cadencia: minutos entre barridos rápidos en modo daemon
+COUNTRY_CONFIG: Dict[str, Dict[str, Any]] = {
+    "ar": {
+        "nombre": "Argentina",
+        "host": "ar.computrabajo.com",
+        "portal": "computrabajo",
+        "archivo": "Computrabajo",
+        "fuente": "Computrabajo",
+        "pais": "Argentina",
+        "id_prefijo": "",
+        "subcategoria": "No disponible",
+        "ritmo": 2.0,
+        "cadencia": 30,
+        "color": '\033[0;35m',
+        "extractor": extraer_ar,
+        "parser": parsear_ar,
+        "areas": [
+            "vendedor",
+            "operario",
+            "vendedores",
+            "administrativo",
+            "asesor-comercial",
+            "operario-de-deposito",
+            "analista",
+            "ayudante-de-cocina",
+            "tecnico-de-mantenimiento",
+            "tecnico",
+        ],
+    },
+    "mx": {
+        "nombre": "México",
+        "host": "mx.computrabajo.com",
+        "portal": "computrabajo_mx",
+        "archivo": "ComputrabajoMX",
+        "fuente": "ComputrabajoMX",
+        "pais": "México",
+        "id_prefijo": "MX-",
+        "subcategoria": "",
+        "ritmo": 3.0,
+        "cadencia": 45,
+        "color": '\033[0;95m',
+        "extractor": extraer_mx,
+        "parser": None,
+        # Basado en "Empleos más demandados" de mx.computrabajo.com
+        "areas": [
+            "asesor-de-ventas",
+            "ejecutivo-de-ventas",
+            "atencion-al-cliente",
+            "atencion-a-clientes",
+            "auxiliar-administrativo",
+            "gestor-de-cobranza",
+            "auxiliar-de-almacen",
+            "auxiliar",
+            "asesor",
+            "auxiliar-contable",
+            "almacenista",
+            "vendedor",
+            "ayudante-general",
+            "agente-de-ventas",
+            "chofer-de-reparto",
+            "asesor-de-credito",
+            "chofer",
+            "supervisor",
+            "recepcionista",
+            "cajero",
+            "operador-de-produccion",
+            "promotor",
+            "contador",
+            "ingeniero",
+            "analista",
+        ],
+    },
+    "co": {
+        "nombre": "Colombia",
+        "host": "co.computrabajo.com",
+        "portal": "computrabajo_co",
+        "archivo": "Computrabajo_CO",
+        "fuente": "Computrabajo Colombia",
+        "pais": "Colombia",
+        "id_prefijo": "CO-",
+        "subcategoria": "",
+        "ritmo": 1.0,
+        "cadencia": 20,
+        "color": '\033[0;33m',
+        "extractor": extraer_co,
+        "parser": None,
+        "areas": list(AREAS_CO),
+    },
+}
+
+
+def log(code: str, *mensaje) -> None:
+    color = COUNTRY_CONFIG[code]["color"]
+    with _PRINT_LOCK:
+        print(f"{color}[{code.upper()}] {' '.join(map(str, mensaje))}{RESET}", flush=True)
+
+
+def debug_print(*mensaje) -> None:
+    if DEBUG:
+        with _PRINT_LOCK:
+            print(' '.join(map(str, mensaje)), flush=True)
+
+
+# =============================================================================
+# RECURSOS COMPARTIDOS
+# =============================================================================
+
+def create_driver():
+    """Chrome con perfil temporal propio (se borra en DriverPool.close)"""
+    profile_dir = tempfile.mkdtemp()
+    options = webdriver.ChromeOptions()
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument("--incognito")
+    options.add_argument("--log-level=3")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+    service = Service(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(30)
+    driver.profile_dir = profile_dir
+    return driver
+
+
+class DriverPool:
+    """
+    Browsers shared by the country threads. A thread holds one for a whole area and
+    gives it back; drivers are created lazily up to `size`, a broken one is replaced.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], Any] = create_driver):
+        self.size = max(1, size)
+        self.factory = factory
+        self._idle: "queue.Queue" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all: List[Any] = []
+
+    def acquire(self, stop: Optional[threading.Event] = None):
+        """A free driver (blocks while all are in use). None if `stop` was set while waiting"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = None
+            if driver is not None:
+                # En modo daemon un navegador puede quedar ocioso mucho tiempo: verificar que siga vivo
+                if self._alive(driver):
+                    return driver
+                self.release(driver, broken=True)
+                continue
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    crear = True
+                else:
+                    crear = False
+            if crear:
+                try:
+                    driver = self.factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._all.append(driver)
+                return driver
+            try:
+                driver = self._idle.get(timeout=1)
+            except queue.Empty:
+                if stop is not None and stop.is_set():
+                    return None
+                continue
+            if self._alive(driver):
+                return driver
+            self.release(driver, broken=True)
+
+    def release(self, driver, broken: bool = False) -> None:
+        if not broken:
+            self._idle.put(driver)
+            return
+        self._quit(driver)
+        with self._lock:
+            self._created -= 1
+            if driver in self._all:
+                self._all.remove(driver)
+
+    @staticmethod
+    def _alive(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": self.size, "created": self._created, "idle": self._idle.qsize()}
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        profile_dir = getattr(driver, "profile_dir", None)
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def close(self) -> None:
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._created = 0
+        for driver in drivers:
+            self._quit(driver)
+
+
+class SharedDedup:
+    """Description hashes seen by any country in this run (plus today's output files)"""
+
+    def __init__(self):
+        self._hashes = set()
+        self._lock = threading.Lock()
+
+    def load_today(self, output_dir: str = OUTPUT_DIR) -> int:
+        timestamp = date.today().strftime("%Y%m%d")
+        for config in COUNTRY_CONFIG.values():
+            for archivo in glob.glob(os.path.join(output_dir, f"{config['archivo']}_*_{timestamp}{JOBS_EXTENSION}")):
+                try:
+                    for empleo in load_jobs(archivo):
+                        h = empleo.get("hash Descripcion")
+                        if h:
+                            self._hashes.add(h)
+                except Exception:
+                    pass
+        return len(self._hashes)
+
+    def contains(self, job_hash: Optional[str]) -> bool:
+        with self._lock:
+            return job_hash in self._hashes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hashes)
+
+    def claim(self, job_hash: Optional[str]) -> bool:
+        """Register the hash; False if another page (or country) already had it"""
+        with self._lock:
+            if job_hash in self._hashes:
+                return False
+            self._hashes.add(job_hash)
+            return True
+
+
+def guardar_datos_incremental(empleos, archivo_base, area):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    timestamp = date.today().strftime("%Y%m%d")
+    nombre_archivo = f"{archivo_base}_{area}_{timestamp}{JOBS_EXTENSION}"
+
+    empleos_existentes = []
+    if os.path.exists(nombre_archivo):
+        try:
+            empleos_existentes = load_jobs(nombre_archivo)
+        except Exception:
+            pass
+
+    todos_empleos = empleos_existentes + empleos
+    save_jobs(nombre_archivo, todos_empleos)
+    return nombre_archivo, len(todos_empleos)
+
+
+class DaemonHealth:
+    """
+    Health/metrics file of the daemon mode: process, shared browsers and dedup, and per
+    country its state, next sweeps and counters. Rewritten after every sweep and
+    periodically by the main thread; the previous file gives the last full sweeps on restart.
+    """
+
+    def __init__(self, path: str, pool: DriverPool, dedup: SharedDedup):
+        self.path = path
+        self.pool = pool
+        self.dedup = dedup
+        self.crawls: List["CountryCrawl"] = []
+        self.inicio = datetime.now()
+        self.estado = "corriendo"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._anterior: Dict[str, Any] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._anterior = {}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def ultimo_completo(self, code: str) -> Optional[datetime]:
+        valor = self._anterior.get("paises", {}).get(code, {}).get("ultimo_completo")
+        return datetime.fromisoformat(valor) if valor else None
+
+    def write(self) -> None:
+        data = {
+            "pid": os.getpid(),
+            "estado": self.estado,
+            "inicio": self.inicio.isoformat(timespec='seconds'),
+            "actualizado": datetime.now().isoformat(timespec='seconds'),
+            "navegadores": self.pool.stats(),
+            "hashes_en_memoria": len(self.dedup),
+            "paises": {crawl.code: crawl.metrics() for crawl in self.crawls}
+        }
+        with _IO_LOCK:
+            tmp_file = self.path + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.path)
+
+
+# =============================================================================
+# CRAWL DE UN PAÍS
+# =============================================================================
+
+class CountryCrawl:
+    def __init__(self, code: str, pool: DriverPool, dedup: SharedDedup, args, stop: threading.Event):
+        self.code = code
+        self.config = COUNTRY_CONFIG[code]
+        self.pool = pool
+        self.dedup = dedup
+        self.stop = stop
+        self.base_url = f"https://{self.config['host']}"
+        self.archivo_base = os.path.join(OUTPUT_DIR, self.config["archivo"])
+
+        portal = self.config["portal"]
+        self.portal = portal
+        self.limiter = get_rate_limiter(portal, rate=1.0 / self.config["ritmo"], jitter=0.5)
+        self.incremental = IncrementalCrawl.from_args(portal, self.config["host"], args)
+        self.frontier = CrawlFrontier.from_args(portal, args)
+        self.breaker = CircuitBreaker(portal, should_stop=stop.is_set)
+        self.checkpoint = CheckpointManager(portal)
+        self.tarjetas = ListingCards.from_args(portal, args)
+        # Con pestañas el próximo empleo se precarga mientras se extrae el actual, al ritmo del país
+        self.tabs = TabPipeline(portal, depth=args.pestanas, interval=self.config["ritmo"], ready=(By.TAG_NAME, "h1"))
+        # Parseo desacoplado: el navegador solo navega y toma el HTML, los workers extraen con lxml
+        self.parse_pool = create_parse_pool(portal, args.parse_workers) if self.config["parser"] else None
+        self.args = args
+        self.incremental_base = self.incremental.enabled
+        self.paginas_rapidas = getattr(args, 'paginas_rapidas', PAGINAS_RAPIDAS)
+
+        # Páginas de cada área según el último barrido completo (pista para el siguiente)
+        self.total_conocido: Dict[str, int] = {}
+        self.empleos: List[Dict[str, Any]] = []
+        self.jobs_session = 0
+        self.duplicados = 0
+        self.barridos = {"rapido": 0, "completo": 0}
+        self.ultimo_barrido: Optional[Dict[str, Any]] = None
+        self.ultimo_completo: Optional[datetime] = None
+        self.estado = "iniciando"
+        self.proximo_rapido: Optional[datetime] = None
+        self.proximo_completo: Optional[datetime] = None
+        self.completo = True
+        self.estacionado = False
+        self.terminado = False
+        self.sitemap: Optional[SitemapDiscovery] = None
+        self.sitemap_urls: Optional[List[str]] = None
+
+    def preparar(self, completo: bool = True, politica: str = "auto", cola: bool = False) -> None:
+        """
+        Set up a sweep. A full sweep walks every page of every area and, following the resume
+        policy, resumes the checkpoint of an interrupted one; a quick sweep (daemon mode) only
+        walks the first `paginas_rapidas` pages of each area skipping known URLs, and never
+        touches the checkpoint. With `cola` (queue worker mode) the areas come from the queue:
+        no checkpoint and no deadline plan.
+        """
+        self.completo = completo
+        self.incremental.enabled = self.incremental_base if completo else True
+        self.incremental.start_run()
+        self.frontier.reset_clock()
+
+        data = None
+        if completo and not cola:
+            _, data, _ = get_resume_info(self.portal, politica)
+        self.start_index = data.get('current_area_index', 0) if data else 0
+        self.start_page = data.get('current_page', 1) if data else 1
+        self.areas_completed = set(data.get('areas_completed', [])) if data else set()
+        self.total_jobs = data.get('total_jobs_scraped', 0) if data else 0
+        if data:
+            log(self.code, f"Reanudando desde área #{self.start_index + 1}, página {self.start_page}")
+
+        # Al reanudar (o con --start-from) se reutiliza el orden guardado para que el índice siga valiendo
+        desde = getattr(self.args, 'start_from', None) if completo and not data else None
+        self.areas = self.frontier.order_areas(list(self.config["areas"]), resume=bool(data or desde))
+        if desde:
+            for i, area in enumerate(self.areas):
+                if desde.lower() in area.lower():
+                    self.start_index = i
+                    log(self.code, f"Iniciando desde: {area}")
+                    break
+        self.budget = CrawlBudget.from_args(self.frontier, self.args)
+        if not cola:
+            self.budget.plan(self.areas)
+        self.breaker.deadline = self.budget.deadline
+
+        # Descubrimiento por sitemap (solo barridos completos): si funciona reemplaza la paginación
+        self.sitemap, self.sitemap_urls = None, None
+        if completo and not cola and getattr(self.args, 'descubrimiento', 'listado') == 'sitemap':
+            self.sitemap = SitemapDiscovery(self.portal, self.incremental.index, max_age_days=self.args.sitemap_dias)
+            self.sitemap_urls = self.sitemap.discover()
+
+        self.area_index = self.start_index
+        self.pagina = self.start_page
+        self.estacionado = False
+        self.terminado = False
+
+    # -------------------------------------------------------------------------
+    # Listados
+    # -------------------------------------------------------------------------
+    def _links(self, driver) -> List[str]:
+        elementos = driver.find_elements(By.CSS_SELECTOR, "a.js-o-link")
+        if not elementos:
+            elementos = driver.find_elements(By.CSS_SELECTOR, f"a[href*='{JOB_PATH}']")
+        links = [a.get_attribute("href") for a in elementos]
+        return list(dict.fromkeys(u for u in links if u and self.config["host"] in u and JOB_PATH in u))
+
+    def _abrir_listado(self, driver, area: str, pagina: int, timeout: float) -> Optional[List[str]]:
+        """Links of a listing page, or None if the page did not load"""
+        self.breaker.before_request(area)
+        self.limiter.acquire()
+        try:
+            driver.get(f"{self.base_url}/trabajo-de-{area}?p={pagina}")
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, f"a.js-o-link, a[href*='{JOB_PATH}']")))
+        except TimeoutException:
+            # Página vacía (pasamos la última) o portal lento: solo cuenta como error si no cargó nada
+            try:
+                driver.find_element(By.TAG_NAME, "body")
+                self.breaker.success(area)
+            except WebDriverException:
+                self.breaker.failure(area)
+                return None
+            return []
+        except WebDriverException:
+            self.breaker.failure(area)
+            return None
+        self.breaker.success(area)
+        return self._links(driver)
+
+    def _existe(self, driver, area: str, pagina: int) -> bool:
+        links = self._abrir_listado(driver, area, pagina, timeout=3)
+        return bool(links)
+
+    def total_paginas(self, driver, area: str, pista: Optional[int] = None) -> int:
+        """
+        Exponential search in steps of 50, then binary search for the last page with jobs.
+        `pista` (the total of the previous sweep) is tried first and, if it still exists,
+        the search starts from it.
+        """
+        if not self._existe(driver, area, 1):
+            return 0
+        ultima_valida, salto = 1, 50
+        derecha = salto
+        if pista and pista > 1 and self._existe(driver, area, pista):
+            ultima_valida, derecha = pista, pista + salto
+        while not self.stop.is_set() and self._existe(driver, area, derecha):
+            ultima_valida = derecha
+            derecha += salto
+        izquierda = ultima_valida
+        while not self.stop.is_set() and izquierda < derecha - 1:
+            medio = (izquierda + derecha) // 2
+            if self._existe(driver, area, medio):
+                izquierda = medio
+            else:
+                derecha = medio
+        return izquierda
+
+    # -------------------------------------------------------------------------
+    # Empleos
+    # -------------------------------------------------------------------------
+    def _registro(self, area: str, pagina: int, i: int, url: str, hash_empleo: str, campos: Dict[str, Any],
+                  categoria: Optional[str] = None) -> Dict[str, Any]:
+        registro = {
+            "Id Interno": f"{self.config['id_prefijo']}{area}-{pagina}-{i+1}",
+            "titulo": campos["titulo"],
+            "descripcion": campos["descripcion"],
+        }
+        registro.update(campos["extras"])
+        registro.update({
+            "Empresa": campos["Empresa"],
+            "Fuente": self.config["fuente"],
+            "Tipo Portal": "Tradicional",
+            "url": url,
+            "Pais": self.config["pais"],
+            "ubicacion": campos["ubicacion"],
+            "Categoria Portal": area if categoria is None else categoria,
+            "Subcategoria Portal": self.config["subcategoria"],
+            "Categorria": "",
+            "Subcategoria": "",
+            "hash Descripcion": hash_empleo,
+            "fecha": date.today().strftime("%d/%m/%Y")
+        })
+        return registro
+
+    def _navegar(self, driver, url: str, esperar: bool = False) -> None:
+        """Open a posting in the current tab (without tab pipelining)"""
+        self.limiter.acquire()
+        try:
+            driver.get(url)
+            if esperar:
+                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "h1")))
+        except TimeoutException:
+            driver.execute_script("window.stop();")
+
+    def _agregar(self, area: str, pagina: int, i: int, url: str, hash_empleo: str, campos: Optional[Dict[str, Any]],
+                 categoria: Optional[str] = None) -> bool:
+        """Keep a posting unless it is a duplicate; True if it was new"""
+        # claim() además cubre la carrera entre dos países con el mismo aviso
+        if campos is None or not self.dedup.claim(hash_empleo):
+            self.duplicados += 1
+            debug_print(f"    [{self.code.upper()}] [DUPLICADO] {url}")
+            self.incremental.mark_seen(url, hash_empleo)
+            return False
+
+        self.empleos.append(self._registro(area, pagina, i, url, hash_empleo, campos, categoria))
+        self.incremental.mark_seen(url, hash_empleo)
+        self.total_jobs += 1
+        self.jobs_session += 1
+        debug_print(f"    [{self.code.upper()}] {i} - {campos['titulo']}")
+        return True
+
+    def _procesar_empleo(self, driver, area: str, pagina: int, i: int, url: str) -> bool:
+        """Extract the posting the driver is on; True if it was new"""
+        hash_empleo, campos = self.config["extractor"](driver, self.dedup.contains, self.tarjetas.get(url))
+        # Del sitemap no sabemos el área: se toma de la miga de pan del detalle
+        categoria = categoria_breadcrumb(driver, self.config["areas"]) if area == AREA_SITEMAP and campos else None
+        return self._agregar(area, pagina, i, url, hash_empleo, campos, categoria)
+
+    def _procesar_parseado(self, contexto: Tuple[str, int, int, str], campos: Optional[Dict[str, Optional[str]]]) -> bool:
+        """Same as _procesar_empleo with the fields parsed by the lxml workers"""
+        area, pagina, i, url = contexto
+        if campos is None:
+            log(self.code, f"[Error parseando] {url}")
+            return False
+        categoria = categoria_de_enlace(campos.get("categoria"), self.config["areas"]) if area == AREA_SITEMAP else None
+        hash_empleo, campos = self.config["parser"](campos, self.dedup.contains)
+        return self._agregar(area, pagina, i, url, hash_empleo, campos, categoria)
+
+    def procesar_empleos(self, driver, area: str, pagina: int, links: List[str]) -> int:
+        """Open every posting of the list and keep the new ones. Returns how many were new"""
+        nuevos = 0
+        # Con pestañas la página ya viene cargada (y el ritmo lo controla el pipeline)
+        for i, url in self.tabs.iterate(driver, links):
+            if self.stop.is_set():
+                break
+            try:
+                if not self.tabs.enabled:
+                    self._navegar(driver, url, esperar=self.parse_pool is not None)
+                if self.parse_pool:
+                    # Mientras se parsea este HTML el navegador ya va al próximo empleo
+                    for contexto, campos in self.parse_pool.submit(driver.page_source, (area, pagina, i, url)):
+                        nuevos += self._procesar_parseado(contexto, campos)
+                else:
+                    nuevos += self._procesar_empleo(driver, area, pagina, i, url)
+            except WebDriverException as e:
+                debug_print(f"    [{self.code.upper()}] Error en empleo {i+1}: {e}")
+        if self.parse_pool:
+            # Esperar lo pendiente antes de cerrar la página (el conteo alimenta frontier/incremental)
+            for contexto, campos in self.parse_pool.drain():
+                nuevos += self._procesar_parseado(contexto, campos)
+        return nuevos
+
+    # -------------------------------------------------------------------------
+    # Áreas
+    # -------------------------------------------------------------------------
+    def _guardar_checkpoint(self, area_index: int, pagina: int) -> None:
+        self.checkpoint.save_checkpoint(ComputrabajoCheckpoint.create_checkpoint_data(
+            area_index, pagina, list(self.areas_completed), self.total_jobs))
+
+    def _guardar(self, area: str) -> None:
+        if not self.empleos:
+            return
+        nombre_archivo, total = guardar_datos_incremental(self.empleos, self.archivo_base, area)
+        log(self.code, f"Guardado: {nombre_archivo} ({len(self.empleos)} nuevos, {total} total)")
+        self.empleos = []
+
+    def _liberar(self, driver, roto: bool) -> None:
+        """Give the driver back to the pool without this country's extra tabs"""
+        if not roto:
+            self.tabs.close(driver)
+        self.pool.release(driver, broken=roto)
+
+    def scrape_area(self, driver, area_index: int, area: str, pagina_inicio: int,
+                    pagina_fin: Optional[int] = None, total: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Walk the pages of an area from pagina_inicio. With pagina_fin (a queue task) only that
+        range, returning the follow-up range {"next_page", "payload"} when pages are left.
+        """
+        if total is None and self.completo:
+            total = self.total_paginas(driver, area, self.total_conocido.get(area))
+            self.total_conocido[area] = total
+        elif total is None:
+            # Barrido rápido: sin buscar el total, solo las primeras páginas (las más nuevas)
+            total = min(self.paginas_rapidas, self.total_conocido.get(area, self.paginas_rapidas))
+        if total == 0:
+            log(self.code, f"{area}: sin empleos")
+            return None
+        if self.completo:
+            log(self.code, f"{area}: {total} páginas")
+
+        ultima = min(total, pagina_fin) if pagina_fin else total
+        siguiente = ultima + 1
+        for pagina in range(pagina_inicio, ultima + 1):
+            if self.stop.is_set():
+                siguiente = pagina
+                break
+            self.area_index, self.pagina = area_index, pagina
+            if self.completo and pagina_fin is None:
+                self._guardar_checkpoint(area_index, pagina)
+
+            links = self._abrir_listado(driver, area, pagina, timeout=10)
+            if not links:
+                log(self.code, f"{area} p{pagina}: sin enlaces")
+                if links is not None and not self.completo:
+                    break  # el área tiene menos páginas que el barrido rápido
+                continue
+            self.tarjetas.harvest(driver)
+
+            listados = len(links)
+            links = self.incremental.filter_urls(area, links)
+            nuevos = self.procesar_empleos(driver, area, pagina, links)
+            log(self.code, f"{area} p{pagina}/{total}: {listados} empleos, {nuevos} nuevos")
+            if self.stop.is_set():
+                # La página quedó a medias: el rango pendiente la repite
+                siguiente = pagina
+                break
+
+            self.frontier.record_page(area, pagina, nuevos)
+            if self.budget.after_page(area, pagina):
+                siguiente = pagina + 1
+                break
+            if self.incremental.page_done(area, pagina, listados, nuevos):
+                siguiente = total + 1
+                break
+
+        if pagina_fin and siguiente <= total:
+            return {"next_page": siguiente, "payload": {"total_paginas": total}}
+        return None
+
+    def scrape_sitemap(self) -> None:
+        """New postings from the sitemaps, in batches, instead of paginating listings"""
+        log(self.code, f"Descubrimiento por sitemap: {len(self.sitemap_urls)} empleos nuevos")
+        driver = self.pool.acquire(self.stop)
+        if driver is None:
+            return
+        roto = False
+        try:
+            for pagina, inicio in enumerate(range(0, len(self.sitemap_urls), EMPLEOS_POR_LOTE_SITEMAP), 1):
+                if self.stop.is_set():
+                    break
+                lote = self.sitemap_urls[inicio:inicio + EMPLEOS_POR_LOTE_SITEMAP]
+                nuevos = self.procesar_empleos(driver, AREA_SITEMAP, pagina, lote)
+                log(self.code, f"sitemap lote {pagina}: {len(lote)} empleos, {nuevos} nuevos")
+                if self.budget.after_page(AREA_SITEMAP, pagina):
+                    break
+        except WebDriverException as e:
+            log(self.code, f"Error crítico en el sitemap: {e}")
+            roto = True
+        finally:
+            self._liberar(driver, roto)
+        self._guardar(AREA_SITEMAP)
+        # Los sitemaps leídos se dan por procesados solo si se abrieron todos sus empleos
+        if not (roto or self.stop.is_set() or self.budget.exhausted):
+            self.sitemap.commit()
+
+    def run(self) -> None:
+        inicio = datetime.now()
+        nuevos_antes = self.jobs_session
+        hasta = parked_until(self.portal)
+        if hasta:
+            log(self.code, f"Estacionado hasta {hasta.strftime('%H:%M')} (demasiados errores seguidos)")
+            self.estacionado = True
+            return
+        try:
+            areas = self.areas
+            if self.sitemap_urls is not None:
+                self.scrape_sitemap()
+                areas = []
+            for area_index, area in enumerate(areas[self.start_index:], self.start_index):
+                if self.stop.is_set() or self.budget.exhausted:
+                    break
+                if area in self.areas_completed or not self.budget.allows_area(area):
+                    continue
+                if not self.breaker.allow(area):
+                    continue
+
+                driver = self.pool.acquire(self.stop)
+                if driver is None:
+                    break
+                log(self.code, f"ÁREA {area_index + 1}/{len(self.areas)}: {area}")
+                pagina_inicio = self.start_page if area_index == self.start_index else 1
+                roto = False
+                try:
+                    self.scrape_area(driver, area_index, area, pagina_inicio)
+                except PortalParked:
+                    self.estacionado = True
+                except CooldownInterrupted as e:
+                    # Como al llegar al deadline: se guarda y el checkpoint queda en la página en curso
+                    log(self.code, f"Pausa del circuito interrumpida ({e})")
+                    self.budget.exhausted = True
+                except WebDriverException as e:
+                    log(self.code, f"Error crítico en área {area}: {e}")
+                    roto = True
+                finally:
+                    self._liberar(driver, roto)
+
+                self._guardar(area)
+                with _IO_LOCK:
+                    self.incremental.finish_area(area)
+                    self.frontier.finish_area(area)
+                if self.estacionado:
+                    log(self.code, "Demasiados errores seguidos: el país queda estacionado por ahora")
+                    break
+                if self.stop.is_set() or self.budget.exhausted:
+                    break
+                self.areas_completed.add(area)
+
+            self.terminado = not (self.stop.is_set() or self.budget.exhausted or self.estacionado)
+        finally:
+            self._guardar("partial")
+            with _IO_LOCK:
+                self.incremental.save()
+                self.frontier.save()
+            if self.completo and self.terminado:
+                self.checkpoint.clear_checkpoint()
+            elif self.completo:
+                # Reanudar en la página que quedó a medias
+                self._guardar_checkpoint(self.area_index, self.pagina)
+
+            tipo = "completo" if self.completo else "rapido"
+            self.barridos[tipo] += 1
+            self.ultimo_barrido = {
+                "tipo": tipo,
+                "inicio": inicio.isoformat(timespec='seconds'),
+                "fin": datetime.now().isoformat(timespec='seconds'),
+                "empleos_nuevos": self.jobs_session - nuevos_antes,
+                "estado": self._estado_final()
+            }
+            if self.completo and self.terminado:
+                self.ultimo_completo = datetime.now()
+
+    def worker(self, cola_spec: str, worker_id: str) -> None:
+        """
+        Queue worker mode: lease (area, page range) tasks of this country until the queue is
+        drained. The output goes to output_jobs/workers/<worker_id>/ (merged with work_queue.py merge).
+        """
+        self.archivo_base = os.path.join(worker_output_dir(worker_id), self.config["archivo"])
+        cola = open_queue(cola_spec)
+        seed_areas(cola, self.portal, self.areas, self.args.paginas_por_tarea)
+
+        def procesar_tarea(tarea: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            area = tarea["area"]
+            driver = self.pool.acquire(self.stop)
+            if driver is None:
+                raise RuntimeError("interrumpido antes de empezar")
+            log(self.code, f"{area}: páginas {tarea['page_start']}-{tarea['page_end']}")
+            roto = False
+            try:
+                return self.scrape_area(driver, self.areas.index(area), area, tarea["page_start"],
+                                        pagina_fin=tarea["page_end"], total=tarea["payload"].get("total_paginas"))
+            except WebDriverException:
+                roto = True
+                raise
+            finally:
+                self._liberar(driver, roto)
+                self._guardar(area)
+                with _IO_LOCK:
+                    self.incremental.finish_area(area)
+                    self.frontier.finish_area(area)
+
+        try:
+            run_worker(cola, self.portal, procesar_tarea, worker_id=worker_id, visibility=self.args.visibilidad,
+                       pages_per_task=self.args.paginas_por_tarea,
+                       should_stop=lambda: self.stop.is_set() or self.budget.exhausted)
+            self.terminado = not self.stop.is_set()
+        except PortalParked:
+            self.estacionado = True
+        except CooldownInterrupted as e:
+            log(self.code, f"Pausa del circuito interrumpida ({e})")
+        finally:
+            self._guardar("partial")
+            with _IO_LOCK:
+                self.incremental.save()
+                self.frontier.save()
+
+    def daemon(self, cada: timedelta, completo_cada: timedelta, salud: "DaemonHealth", politica: str = "auto") -> None:
+        """
+        Sweep until stop is set: a full sweep when one is due (or a checkpoint is left from
+        an interrupted one), otherwise a quick sweep, then sleep until the next one is due.
+        A parked country waits out its pause with a fresh circuit breaker. `politica` is the
+        resume policy of the first full sweep; later ones always resume.
+        """
+        ahora = datetime.now()
+        self.ultimo_completo = salud.ultimo_completo(self.code)
+        pendiente = self.checkpoint.has_checkpoint() and politica != "fresh"
+        self.proximo_completo = ahora if pendiente or not self.ultimo_completo else self.ultimo_completo + completo_cada
+        self.proximo_rapido = ahora
+
+        while not self.stop.is_set():
+            hasta = parked_until(self.portal)
+            if hasta:
+                self.estado = "estacionado"
+                salud.write()
+                log(self.code, f"Estacionado hasta {hasta.strftime('%H:%M')}")
+                if self.stop.wait((hasta - datetime.now()).total_seconds()):
+                    break
+                self.breaker = CircuitBreaker(self.portal, should_stop=self.stop.is_set)
+                continue
+
+            completo = datetime.now() >= self.proximo_completo
+            self.estado = "barrido completo" if completo else "barrido rapido"
+            salud.write()
+            log(self.code, f"Inicio de barrido {'completo' if completo else 'rápido'}")
+            self.preparar(completo=completo, politica=politica)
+            politica = "auto"
+            self.run()
+
+            fin = datetime.now()
+            if completo and self.terminado:
+                self.proximo_completo = fin + completo_cada
+            self.proximo_rapido = fin + cada
+            self.estado = "esperando"
+            log(self.code, f"Barrido terminado: {self.ultimo_barrido['empleos_nuevos']} empleos nuevos, "
+                           f"próximo a las {min(self.proximo_rapido, self.proximo_completo).strftime('%H:%M')}")
+            salud.write()
+            espera = (min(self.proximo_rapido, self.proximo_completo) - datetime.now()).total_seconds()
+            self.stop.wait(max(0.0, espera))
+        self.estado = "detenido"
+
+    def _estado_final(self) -> str:
+        return "ESTACIONADO" if self.estacionado else ("completo" if self.terminado else "interrumpido")
+
+    def metrics(self) -> Dict[str, Any]:
+        def iso(valor: Optional[datetime]) -> Optional[str]:
+            return valor.isoformat(timespec='seconds') if valor else None
+
+        limiter = self.limiter.stats()
+        return {
+            "pais": self.config["nombre"],
+            "estado": self.estado,
+            "proximo_rapido": iso(self.proximo_rapido),
+            "proximo_completo": iso(self.proximo_completo),
+            "ultimo_completo": iso(self.ultimo_completo),
+            "barridos": dict(self.barridos),
+            "ultimo_barrido": self.ultimo_barrido,
+            "empleos_nuevos": self.jobs_session,
+            "duplicados": self.duplicados,
+            "navegaciones": limiter["requests"],
+            "circuito": dict(self.breaker.stats),
+        }
+
+    def summary(self) -> str:
+        estado = self._estado_final()
+        limiter = self.limiter.stats()
+        resumen = (f"{self.config['nombre']}: {self.jobs_session} empleos nuevos, {self.duplicados} duplicados, "
+                   f"{limiter['requests']} navegaciones ({estado}) | {self.breaker.summary()}")
+        if self.tarjetas.enabled:
+            resumen += f" | {self.tarjetas.summary()}"
+        return resumen
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    global DEBUG
+
+    parser = argparse.ArgumentParser(description='Motor multi-país de Computrabajo')
+    seleccion = parser.add_mutually_exclusive_group()
+    seleccion.add_argument('--paises', nargs='+', choices=list(COUNTRY_CONFIG), default=list(COUNTRY_CONFIG),
+                           help='Países a recorrer en paralelo (default: todos)')
+    seleccion.add_argument('--pais', choices=list(COUNTRY_CONFIG),
+                           help='Un solo país (es lo que corren Computrabajo.py, Computrabajo_MX.py y Computrabajo_CO.py)')
+    parser.add_argument('--drivers', type=int, default=None,
+                        help='Navegadores compartidos entre los países (default: uno por país)')
+    parser.add_argument('--reiniciar', action='store_true',
+                        help='Ignorar los checkpoints y empezar cada país desde la primera área (igual que --resume fresh)')
+    parser.add_argument('--start-from', type=str, default=None,
+                        help='Sin checkpoint que reanudar: empezar desde la primera área que contenga este texto')
+    parser.add_argument('--debug', action='store_true', help='Activar mensajes de debug')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Quedarse corriendo con navegadores e índices en memoria: barridos rápidos y completos periódicos')
+    parser.add_argument('--cada', type=float, default=None,
+                        help='Modo daemon: minutos entre barridos rápidos (default: la cadencia de cada país)')
+    parser.add_argument('--completo-cada', type=float, default=HORAS_COMPLETO,
+                        help=f'Modo daemon: horas entre barridos completos (default: {HORAS_COMPLETO})')
+    parser.add_argument('--paginas-rapidas', type=int, default=PAGINAS_RAPIDAS,
+                        help=f'Modo daemon: páginas por área en el barrido rápido (default: {PAGINAS_RAPIDAS})')
+    parser.add_argument('--estado', type=str, default=HEALTH_FILE,
+                        help=f'Modo daemon: archivo de salud/métricas (default: {HEALTH_FILE})')
+    add_resume_arguments(parser)
+    add_incremental_arguments(parser)
+    add_frontier_arguments(parser)
+    add_parse_arguments(parser)
+    add_sitemap_arguments(parser)
+    add_tab_arguments(parser)
+    add_card_arguments(parser)
+    add_queue_arguments(parser)
+    args = parser.parse_args(argv)
+    DEBUG = args.debug
+    if args.reiniciar:
+        args.resume = 'fresh'
+    if args.cola and args.daemon:
+        parser.error('--cola no se usa con --daemon')
+
+    paises = [args.pais] if args.pais else list(dict.fromkeys(args.paises))
+    pool = DriverPool(args.drivers or len(paises))
+    dedup = SharedDedup()
+    print(f"Cargados {dedup.load_today()} hashes existentes")
+    stop = threading.Event()
+
+    def signal_handler(sig, frame):
+        if stop.is_set():
+            print("\nSegunda interrupción: saliendo sin esperar")
+            sys.exit(1)
+        print("\nInterrupción detectada (CTRL+C): terminando el empleo en curso y guardando checkpoints...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, signal_handler)
+
+    crawls = [CountryCrawl(code, pool, dedup, args, stop) for code in paises]
+    print(f"Computrabajo {', '.join(c.code.upper() for c in crawls)} con {pool.size} navegador(es)")
+    salud = None
+    if args.daemon:
+        signal.signal(signal.SIGTERM, signal_handler)
+        salud = DaemonHealth(args.estado, pool, dedup)
+        salud.crawls = crawls
+        completo_cada = timedelta(hours=args.completo_cada)
+        # Los hilos no pueden preguntar por consola: "ask" reanuda
+        politica = 'auto' if args.resume == 'ask' else args.resume
+        print("Modo daemon: barridos rápidos cada "
+              + ", ".join(f"{c.code.upper()} {args.cada or c.config['cadencia']:g} min" for c in crawls)
+              + f", completos cada {args.completo_cada:g} h. Estado en {args.estado}")
+        threads = [threading.Thread(target=crawl.daemon, name=f"computrabajo-{crawl.code}", daemon=True,
+                                    args=(timedelta(minutes=args.cada or crawl.config['cadencia']), completo_cada,
+                                          salud, politica))
+                   for crawl in crawls]
+    elif args.cola:
+        worker_id = args.worker_id or default_worker_id()
+        for crawl in crawls:
+            crawl.preparar(completo=True, cola=True)
+        threads = [threading.Thread(target=crawl.worker, name=f"computrabajo-{crawl.code}", daemon=True,
+                                    args=(args.cola, worker_id))
+                   for crawl in crawls]
+    else:
+        for crawl in crawls:
+            crawl.preparar(completo=True, politica=args.resume)
+        threads = [threading.Thread(target=crawl.run, name=f"computrabajo-{crawl.code}", daemon=True)
+                   for crawl in crawls]
+    for thread in threads:
+        thread.start()
+    try:
+        # join con timeout para que el hilo principal siga atendiendo CTRL+C
+        ultimo_latido = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+            if salud and time.monotonic() - ultimo_latido >= 30:
+                salud.write()
+                ultimo_latido = time.monotonic()
+    finally:
+        pool.close()
+        for crawl in crawls:
+            if crawl.parse_pool:
+                crawl.parse_pool.close()
+        if salud:
+            salud.estado = "detenido"
+            salud.write()
+
+    print(f"\n{'='*60}")
+    print("Resumen por país:")
+    for crawl in crawls:
+        print(f"  - {crawl.summary()}")
+    print(f"Total empleos nuevos: {sum(c.jobs_session for c in crawls)}")
+    print(f"{'='*60}")
+
+    # Todos los países estacionados: ScraperMaestro libera el lugar y reintenta más tarde
+    if not args.daemon and all(crawl.estacionado for crawl in crawls):
+        sys.exit(EXIT_PARKED)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier for Web Scrapers
+Records, for each (portal, area, page band), how many new (non-duplicate) jobs
+per minute the crawl produced, and orders the areas of the next run so the
+highest-yield work is done first. If a run is cut short (time limit, block)
+what was collected is the most valuable part.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+STATS_FILE = "crawl_yield.json"
+DEFAULT_PAGE_SECONDS = 60.0  # costo supuesto de una página cuando el portal no tiene historial
+
+
+class CrawlFrontier:
+    def __init__(self, portal: str, stats_dir: str = "checkpoints", band_size: int = 5,
+                 alpha: float = 0.5, enabled: bool = True):
+        """
+        band_size: listing pages per band (page 1-5 -> band 0, 6-10 -> band 1, ...)
+        alpha: weight of the latest run in the moving averages
+        enabled: when False areas keep their hardcoded order (stats are still recorded)
+        """
+        self.portal = portal
+        self.stats_dir = stats_dir
+        self.stats_file = os.path.join(stats_dir, STATS_FILE)
+        self.order_file = os.path.join(stats_dir, f"{portal}_frontier_order.json")
+        self.band_size = band_size
+        self.alpha = alpha
+        self.enabled = enabled
+
+        # Acumulado de la corrida actual: {area: {band: {"new": n, "seconds": s, "pages": p}}}
+        self._pending: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._last_mark = time.monotonic()
+
+        os.makedirs(stats_dir, exist_ok=True)
+
+    @classmethod
+    def from_args(cls, portal: str, args) -> "CrawlFrontier":
+        return cls(portal, enabled=(args.orden == 'rendimiento'))
+
+    # -------------------------------------------------------------------------
+    # Persistencia
+    # -------------------------------------------------------------------------
+    def _load_all(self) -> Dict[str, Any]:
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _portal_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        return self._load_all().get(self.portal, {})
+
+    def save(self) -> None:
+        """Fold the current run into the moving averages and write them"""
+        if not self._pending:
+            return
+        stats = self._load_all()
+        portal_stats = stats.setdefault(self.portal, {})
+
+        for area, bands in self._pending.items():
+            area_stats = portal_stats.setdefault(area, {})
+            for band, run in bands.items():
+                previous = area_stats.get(band)
+                if previous is None:
+                    area_stats[band] = {"new": run["new"], "seconds": run["seconds"], "pages": run["pages"], "runs": 1}
+                else:
+                    for field in ("new", "seconds", "pages"):
+                        old = previous.get(field, self.band_size if field == "pages" else 0)
+                        previous[field] = self.alpha * run[field] + (1 - self.alpha) * old
+                    previous["runs"] = previous.get("runs", 0) + 1
+                area_stats[band]["updated"] = datetime.now().isoformat()
+        self._pending = {}
+
+        tmp_file = self.stats_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.stats_file)
+
+    # -------------------------------------------------------------------------
+    # Registro
+    # -------------------------------------------------------------------------
+    def band_of(self, page: int) -> str:
+        return str(max(0, page - 1) // self.band_size)
+
+    def record_page(self, area: str, page: int, new_jobs: int) -> None:
+        """
+        Register a finished listing page. The time charged to the page is the
+        time since the previous page (or area), so area overhead is included.
+        """
+        now = time.monotonic()
+        seconds = now - self._last_mark
+        self._last_mark = now
+
+        band = self._pending.setdefault(area, {}).setdefault(self.band_of(page), {"new": 0, "seconds": 0.0, "pages": 0})
+        band["new"] += new_jobs
+        band["seconds"] += seconds
+        band["pages"] += 1
+
+    def finish_area(self, area: str) -> None:
+        self._last_mark = time.monotonic()
+        self.save()
+
+    def saved_order(self) -> Optional[List[str]]:
+        """Area order of the last run (the one checkpoint indexes point to), None if unknown"""
+        try:
+            with open(self.order_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def remaining_seconds(self, areas: List[str], first_page: int = 1) -> Optional[float]:
+        """
+        Estimated seconds to walk `areas` (the first one from `first_page`) at their recorded
+        pace. Areas without history count as the portal's average area; None without history.
+        """
+        stats = self._portal_stats()
+        per_area = [sum(b["seconds"] for b in bands.values()) for bands in stats.values() if bands]
+        if not per_area:
+            return None
+        average = sum(per_area) / len(per_area)
+        skipped_bands = max(0, first_page - 1) // self.band_size
+        total = 0.0
+        for i, area in enumerate(areas):
+            bands = stats.get(area)
+            if not bands:
+                total += average
+                continue
+            total += sum(b["seconds"] for band, b in bands.items() if i > 0 or int(band) >= skipped_bands)
+        return round(total, 1)
+
+    def reset_clock(self) -> None:
+        """Start timing from now, so idle time (e.g. between daemon sweeps) is not charged to a page"""
+        self._last_mark = time.monotonic()
+
+    # -------------------------------------------------------------------------
+    # Planificación
+    # -------------------------------------------------------------------------
+    def area_yield(self, area: str, stats: Optional[Dict[str, Any]] = None) -> float:
+        """Historical new jobs per minute for an area (inf if never crawled)"""
+        stats = self._portal_stats() if stats is None else stats
+        bands = stats.get(area)
+        if not bands:
+            return math.inf
+        new = sum(b["new"] for b in bands.values())
+        seconds = sum(b["seconds"] for b in bands.values())
+        return new / (seconds / 60) if seconds > 0 else math.inf
+
+    def band_yields(self, area: str) -> Dict[int, float]:
+        """New jobs per minute for each page band of an area"""
+        bands = self._portal_stats().get(area, {})
+        return {int(band): (b["new"] / (b["seconds"] / 60) if b["seconds"] > 0 else 0.0)
+                for band, b in bands.items()}
+
+    def order_areas(self, items: List[Any], key: Optional[Callable[[Any], str]] = None,
+                    resume: bool = False) -> List[Any]:
+        """
+        Return items sorted by historical yield (best first). Areas never crawled
+        go first so they get measured. When resuming, the order of the interrupted
+        run is reused so checkpoint indexes keep pointing to the same areas.
+        """
+        key = key or (lambda item: item)
+        names = [key(item) for item in items]
+
+        if resume and os.path.exists(self.order_file):
+            try:
+                with open(self.order_file, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                if sorted(saved) == sorted(names):
+                    position = {name: i for i, name in enumerate(saved)}
+                    return sorted(items, key=lambda item: position[key(item)])
+            except (ValueError, KeyError):
+                pass
+
+        if self.enabled:
+            stats = self._portal_stats()
+            # sorted es estable: a igual rendimiento se respeta el orden original
+            items = sorted(items, key=lambda item: -self.area_yield(key(item), stats))
+            if stats:
+                top = ", ".join(f"{key(item)} ({self.area_yield(key(item), stats):.1f}/min)"
+                                for item in items[:3])
+                print(f"Orden por rendimiento histórico: {top}...")
+
+        with open(self.order_file, 'w', encoding='utf-8') as f:
+            json.dump([key(item) for item in items], f, ensure_ascii=False)
+        return items
+
+
+def parse_deadline(value: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    "06:30" -> next occurrence of that time, "+90m" / "+2h" -> relative to now,
+    "2026-01-30T06:30" -> absolute (ISO format)
+    """
+    if not value:
+        return None
+    now = now or datetime.now()
+    relative = re.fullmatch(r'\+(\d+(?:\.\d+)?)([hm])', value.strip())
+    if relative:
+        amount = float(relative.group(1))
+        return now + (timedelta(hours=amount) if relative.group(2) == 'h' else timedelta(minutes=amount))
+    clock = re.fullmatch(r'(\d{1,2}):(\d{2})', value.strip())
+    if clock:
+        deadline = now.replace(hour=int(clock.group(1)), minute=int(clock.group(2)), second=0, microsecond=0)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+    return datetime.fromisoformat(value.strip())
+
+
+class CrawlBudget:
+    def __init__(self, frontier: CrawlFrontier, deadline: Optional[datetime] = None, safety: float = 120.0):
+        """
+        deadline: time by which the scraper must have finished (None = no budget)
+        safety: seconds kept in reserve to save output and checkpoints
+        """
+        self.frontier = frontier
+        self.deadline = deadline
+        self.safety = safety
+        self.exhausted = False
+        self.caps: Dict[str, Optional[int]] = {}
+
+    @classmethod
+    def from_args(cls, frontier: CrawlFrontier, args) -> "CrawlBudget":
+        budget = cls(frontier, parse_deadline(args.deadline))
+        if budget.enabled:
+            print(f"Deadline: {budget.deadline.strftime('%Y-%m-%d %H:%M')} ({budget.remaining() / 60:.0f} min disponibles)")
+        return budget
+
+    @property
+    def enabled(self) -> bool:
+        return self.deadline is not None
+
+    def remaining(self) -> float:
+        return (self.deadline - datetime.now()).total_seconds() if self.enabled else math.inf
+
+    def page_cost(self, area: str, stats: Optional[Dict[str, Any]] = None) -> float:
+        """Estimated seconds per listing page (area history, else portal average)"""
+        stats = self.frontier._portal_stats() if stats is None else stats
+        for bands in (stats.get(area, {}).values(), [b for a in stats.values() for b in a.values()]):
+            seconds = sum(b["seconds"] for b in bands)
+            pages = sum(b.get("pages", self.frontier.band_size) for b in bands)
+            if pages > 0 and seconds > 0:
+                return seconds / pages
+        return DEFAULT_PAGE_SECONDS
+
+    def plan(self, items: List[Any], key: Optional[Callable[[Any], str]] = None) -> Dict[str, Optional[int]]:
+        """
+        Decide how many pages of each area fit before the deadline. Greedy over page bands by
+        new jobs per second, always taking the bands of an area in order (listings go newest
+        first). Areas never crawled get their first band as exploration. Areas whose known bands
+        all fit are left uncapped (the incremental rule or the deadline stops them).
+        Returns {area: max pages} where None = no cap and 0 = skip the area.
+        """
+        if not self.enabled:
+            return {}
+        key = key or (lambda item: item)
+        stats = self.frontier._portal_stats()
+        band_size = self.frontier.band_size
+        budget = self.remaining() - self.safety
+
+        def band_entry(area: str, band: int):
+            known = stats.get(area, {}).get(str(band))
+            if known:
+                cost = max(known["seconds"], 1.0)
+                return (-known["new"] / cost, area, band, cost)
+            if band == 0:
+                return (-math.inf, area, band, self.page_cost(area, stats) * band_size)
+            return None
+
+        heap = [entry for entry in (band_entry(key(item), 0) for item in items) if entry]
+        heapq.heapify(heap)
+        taken = {key(item): 0 for item in items}
+        while heap:
+            _, area, band, cost = heapq.heappop(heap)
+            if cost > budget:
+                continue
+            budget -= cost
+            taken[area] = band + 1
+            following = band_entry(area, band + 1)
+            if following:
+                heapq.heappush(heap, following)
+
+        self.caps = {}
+        for area, bands in taken.items():
+            known_bands = len(stats.get(area, {}))
+            self.caps[area] = None if known_bands and bands >= known_bands else bands * band_size
+
+        skipped = [area for area, cap in self.caps.items() if cap == 0]
+        capped = {area: cap for area, cap in self.caps.items() if cap}
+        print(f"Plan para el deadline: {len(self.caps) - len(skipped)}/{len(self.caps)} áreas"
+              + (f", con tope de páginas: {capped}" if capped else "")
+              + (f", fuera de presupuesto: {', '.join(skipped)}" if skipped else ""))
+        return self.caps
+
+    def allows_area(self, area: str) -> bool:
+        """False once the deadline is reached or when the plan left no pages for the area"""
+        if self.exhausted:
+            return False
+        if self.caps.get(area, None) == 0:
+            print(f"Deadline: se saltea '{area}' (no entra en el presupuesto)")
+            return False
+        return True
+
+    def after_page(self, area: str, page: int) -> bool:
+        """Call after each listing page. True = stop the area here"""
+        if not self.enabled:
+            return False
+        if self.remaining() < self.page_cost(area) + self.safety:
+            if not self.exhausted:
+                print(f"Deadline alcanzado: se corta '{area}' en la página {page} y se guarda el progreso")
+            self.exhausted = True
+            return True
+        cap = self.caps.get(area)
+        if cap and page >= cap:
+            print(f"Deadline: '{area}' llegó a su tope de {cap} páginas")
+            return True
+        return False
+
+
+def add_frontier_arguments(parser) -> None:
+    """Common CLI flags for area ordering and the deadline budget"""
+    parser.add_argument('--orden', choices=['rendimiento', 'fijo'], default='rendimiento',
+                        help='rendimiento: primero las áreas con más empleos nuevos por minuto; fijo: orden del código')
+    parser.add_argument('--deadline', type=str, default=None,
+                        help='Hora límite para terminar: "06:30", "+2h", "+90m" o ISO "2026-01-30T06:30"')
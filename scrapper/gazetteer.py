@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Location Gazetteer
+Offline country -> province -> city table with aliases, used to normalise the
+free-text `ubicacion` of every job once, at unify time (unify_jobs.py adds
+ubicacion_pais, ubicacion_provincia and ubicacion_ciudad), instead of each
+consumer substring-scanning or re-splitting it. All aliases are compiled into
+one regular expression built from a character trie, so a location is scanned
+once whatever the size of the table. Results are memoised by raw string (and
+country hint) in memory and in a persistent JSON memo that is discarded when
+the table or the resolution rules change.
+
+Usage:
+    python gazetteer.py "Palermo, Capital Federal" [--pais Argentina]
+    python gazetteer.py --memo    # entries of the persistent memo
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MEMO = "checkpoints/location_memo.json"
+
+COUNTRY, PROVINCE, CITY = "pais", "provincia", "ciudad"
+
+# País -> (alias, {provincia -> (alias, {ciudad -> alias})}). El nombre canónico siempre es alias
+GAZETTEER: Dict[str, Tuple[List[str], Dict[str, Tuple[List[str], Dict[str, List[str]]]]]] = {
+    "Argentina": (["republica argentina"], {
+        "Ciudad Autónoma de Buenos Aires": (["caba", "capital federal", "ciudad de buenos aires", "cap fed"], {
+            "Ciudad Autónoma de Buenos Aires": ["palermo", "belgrano", "recoleta", "microcentro", "puerto madero",
+                                                "caballito", "nunez", "villa urquiza", "retiro", "balvanera",
+                                                "almagro", "flores", "san telmo", "villa crespo", "colegiales"],
+        }),
+        "Buenos Aires": (["provincia de buenos aires", "pba", "bs as", "bsas", "gba", "gran buenos aires",
+                          "conurbano"], {
+            "La Plata": [], "Mar del Plata": [], "Bahía Blanca": [], "Tandil": [], "Vicente López": ["olivos"],
+            "San Isidro": ["martinez"], "Tigre": [], "Pilar": [], "Morón": [], "Quilmes": [], "Lanús": [],
+            "Avellaneda": [], "Lomas de Zamora": [], "La Matanza": ["san justo"], "General San Martín": ["san martin"],
+            "Tres de Febrero": ["caseros"], "Escobar": [], "Merlo": [], "Moreno": [], "Zárate": [], "Campana": [],
+            "Luján": [], "Olavarría": [], "Junín": [], "Pergamino": [], "San Nicolás de los Arroyos": [],
+            "Ezeiza": [], "Esteban Echeverría": ["monte grande"], "Berazategui": [], "Florencio Varela": [],
+            "Malvinas Argentinas": [], "San Fernando": [], "Hurlingham": [], "Ituzaingó": [],
+        }),
+        "Córdoba": ([], {"Córdoba": ["cordoba capital"], "Río Cuarto": [], "Villa María": [], "Villa Carlos Paz": []}),
+        "Santa Fe": ([], {"Rosario": [], "Santa Fe": ["santa fe capital"], "Rafaela": [], "Venado Tuerto": []}),
+        "Mendoza": ([], {"Mendoza": ["mendoza capital"], "Godoy Cruz": [], "Guaymallén": [], "San Rafael": [],
+                         "Luján de Cuyo": []}),
+        "Tucumán": ([], {"San Miguel de Tucumán": [], "Yerba Buena": []}),
+        "Salta": ([], {"Salta": ["salta capital"]}),
+        "Jujuy": ([], {"San Salvador de Jujuy": []}),
+        "San Juan": ([], {"San Juan": ["san juan capital"]}),
+        "San Luis": ([], {"San Luis": ["san luis capital"], "Villa Mercedes": []}),
+        "Neuquén": ([], {"Neuquén": ["neuquen capital"], "San Martín de los Andes": []}),
+        "Río Negro": ([], {"Viedma": [], "San Carlos de Bariloche": ["bariloche"], "General Roca": [], "Cipolletti": []}),
+        "Chubut": ([], {"Rawson": [], "Comodoro Rivadavia": [], "Trelew": [], "Puerto Madryn": []}),
+        "Santa Cruz": ([], {"Río Gallegos": [], "Caleta Olivia": []}),
+        "Tierra del Fuego": ([], {"Ushuaia": [], "Río Grande": []}),
+        "La Pampa": ([], {"Santa Rosa": [], "General Pico": []}),
+        "Entre Ríos": ([], {"Paraná": [], "Concordia": [], "Gualeguaychú": []}),
+        "Corrientes": ([], {"Corrientes": ["corrientes capital"], "Goya": []}),
+        "Misiones": ([], {"Posadas": [], "Oberá": [], "Puerto Iguazú": []}),
+        "Chaco": ([], {"Resistencia": [], "Presidencia Roque Sáenz Peña": []}),
+        "Formosa": ([], {"Formosa": ["formosa capital"]}),
+        "Santiago del Estero": ([], {"Santiago del Estero": [], "La Banda": []}),
+        "Catamarca": ([], {"San Fernando del Valle de Catamarca": []}),
+        "La Rioja": ([], {"La Rioja": ["la rioja capital"]}),
+    }),
+    "México": (["mexico", "estados unidos mexicanos"], {
+        "Ciudad de México": (["cdmx", "distrito federal", "df", "ciudad de mexico"], {
+            "Ciudad de México": ["cuauhtemoc", "miguel hidalgo", "benito juarez", "coyoacan", "alvaro obregon",
+                                 "tlalpan", "iztapalapa", "azcapotzalco", "polanco", "santa fe cdmx"],
+        }),
+        "Estado de México": (["edomex", "edo mex", "estado de mexico", "mexico estado"], {
+            "Toluca": [], "Naucalpan": [], "Tlalnepantla": [], "Ecatepec": [], "Nezahualcóyotl": [],
+            "Cuautitlán Izcalli": [], "Huixquilucan": [], "Atizapán": [],
+        }),
+        "Jalisco": ([], {"Guadalajara": [], "Zapopan": [], "Tlaquepaque": [], "Puerto Vallarta": []}),
+        "Nuevo León": ([], {"Monterrey": [], "San Pedro Garza García": [], "Apodaca": [], "Guadalupe": [],
+                            "San Nicolás de los Garza": [], "Santa Catarina": []}),
+        "Puebla": ([], {"Puebla": ["puebla de zaragoza"]}),
+        "Querétaro": ([], {"Querétaro": ["santiago de queretaro"]}),
+        "Guanajuato": ([], {"León": [], "Irapuato": [], "Celaya": [], "Guanajuato": []}),
+        "Baja California": ([], {"Tijuana": [], "Mexicali": [], "Ensenada": []}),
+        "Baja California Sur": ([], {"La Paz": [], "Los Cabos": ["cabo san lucas"]}),
+        "Chihuahua": ([], {"Chihuahua": [], "Ciudad Juárez": []}),
+        "Coahuila": (["coahuila de zaragoza"], {"Saltillo": [], "Torreón": []}),
+        "Sonora": ([], {"Hermosillo": []}),
+        "Sinaloa": ([], {"Culiacán": [], "Mazatlán": []}),
+        "Tamaulipas": ([], {"Reynosa": [], "Tampico": [], "Matamoros": [], "Nuevo Laredo": []}),
+        "Veracruz": (["veracruz de ignacio de la llave"], {"Veracruz": [], "Xalapa": [], "Coatzacoalcos": []}),
+        "Yucatán": ([], {"Mérida": []}),
+        "Quintana Roo": ([], {"Cancún": [], "Playa del Carmen": []}),
+        "San Luis Potosí": ([], {"San Luis Potosí": []}),
+        "Aguascalientes": ([], {"Aguascalientes": []}),
+        "Michoacán": ([], {"Morelia": []}),
+        "Morelos": ([], {"Cuernavaca": []}),
+        "Hidalgo": ([], {"Pachuca": []}),
+        "Oaxaca": ([], {"Oaxaca": []}),
+        "Chiapas": ([], {"Tuxtla Gutiérrez": []}),
+        "Tabasco": ([], {"Villahermosa": []}),
+        "Guerrero": ([], {"Acapulco": []}),
+        "Durango": ([], {"Durango": []}),
+        "Zacatecas": ([], {"Zacatecas": []}),
+        "Nayarit": ([], {"Tepic": []}),
+        "Colima": ([], {"Colima": [], "Manzanillo": []}),
+        "Tlaxcala": ([], {"Tlaxcala": []}),
+        "Campeche": ([], {"Campeche": []}),
+    }),
+    "Colombia": ([], {
+        "Bogotá D.C.": (["bogota dc", "distrito capital", "cundinamarca bogota"], {"Bogotá": ["santa fe de bogota"]}),
+        "Antioquia": ([], {"Medellín": [], "Envigado": [], "Itagüí": [], "Bello": [], "Rionegro": []}),
+        "Valle del Cauca": (["valle"], {"Cali": ["santiago de cali"], "Palmira": [], "Buenaventura": []}),
+        "Atlántico": ([], {"Barranquilla": [], "Soledad": []}),
+        "Bolívar": ([], {"Cartagena": ["cartagena de indias"]}),
+        "Santander": ([], {"Bucaramanga": [], "Floridablanca": []}),
+        "Cundinamarca": ([], {"Soacha": [], "Chía": [], "Zipaquirá": [], "Funza": [], "Mosquera": []}),
+        "Risaralda": ([], {"Pereira": [], "Dosquebradas": []}),
+        "Caldas": ([], {"Manizales": []}),
+        "Quindío": ([], {"Armenia": []}),
+        "Tolima": ([], {"Ibagué": []}),
+        "Norte de Santander": ([], {"Cúcuta": []}),
+        "Meta": ([], {"Villavicencio": []}),
+        "Huila": ([], {"Neiva": []}),
+        "Nariño": ([], {"Pasto": []}),
+        "Magdalena": ([], {"Santa Marta": []}),
+        "Córdoba (Colombia)": (["cordoba colombia"], {"Montería": []}),
+        "Boyacá": ([], {"Tunja": []}),
+    }),
+    "Brasil": (["brazil"], {
+        "São Paulo": (["estado de sao paulo"], {"São Paulo": ["sao paulo capital"], "Campinas": [], "Santos": [],
+                                                "Guarulhos": [], "Osasco": [], "São Bernardo do Campo": [],
+                                                "Santo André": [], "Barueri": [], "Sorocaba": [],
+                                                "Ribeirão Preto": [], "São José dos Campos": [], "Jundiaí": []}),
+        "Rio de Janeiro": (["estado do rio de janeiro"], {"Rio de Janeiro": [], "Niterói": [], "Duque de Caxias": []}),
+        "Minas Gerais": ([], {"Belo Horizonte": [], "Uberlândia": [], "Contagem": [], "Juiz de Fora": []}),
+        "Paraná": (["parana brasil"], {"Curitiba": [], "Londrina": [], "Maringá": []}),
+        "Rio Grande do Sul": ([], {"Porto Alegre": [], "Caxias do Sul": []}),
+        "Santa Catarina": ([], {"Florianópolis": [], "Joinville": [], "Blumenau": []}),
+        "Bahia": ([], {"Salvador": []}),
+        "Pernambuco": ([], {"Recife": []}),
+        "Ceará": ([], {"Fortaleza": []}),
+        "Distrito Federal (Brasil)": (["distrito federal brasil"], {"Brasília": []}),
+        "Goiás": ([], {"Goiânia": []}),
+        "Pará": ([], {"Belém": []}),
+        "Amazonas": ([], {"Manaus": []}),
+        "Espírito Santo": ([], {"Vitória": []}),
+    }),
+    # Solo país: alcanza para reconocer empleos de otros países
+    "Chile": ([], {"Región Metropolitana": (["rm"], {"Santiago de Chile": ["santiago"]})}),
+    "Uruguay": ([], {"Montevideo": ([], {"Montevideo": []})}),
+    "Paraguay": ([], {"Asunción": ([], {"Asunción": []})}),
+    "Bolivia": ([], {}),
+    "Perú": ([], {"Lima": ([], {"Lima": []})}),
+    "Ecuador": ([], {"Pichincha": ([], {"Quito": []}), "Guayas": ([], {"Guayaquil": []})}),
+    "Venezuela": ([], {"Distrito Capital (Venezuela)": ([], {"Caracas": []})}),
+    "Costa Rica": ([], {}),
+    "Panamá": ([], {}),
+    "Guatemala": ([], {}),
+    "Honduras": ([], {}),
+    "El Salvador": ([], {}),
+    "República Dominicana": (["dominicana"], {}),
+    "España": (["spain"], {"Comunidad de Madrid": (["madrid comunidad"], {"Madrid": []}),
+                           "Cataluña": (["catalunya"], {"Barcelona": []})}),
+    "Estados Unidos": (["united states", "usa", "eeuu", "ee uu"], {}),
+    "Canadá": ([], {}),
+    "Reino Unido": (["united kingdom", "uk"], {}),
+    "Portugal": ([], {}),
+    "Italia": (["italy"], {}),
+    "Francia": (["france"], {}),
+    "Alemania": (["germany"], {}),
+}
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase, no accents, only letters/digits separated by single spaces"""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM_RE.sub(" ", text).strip()
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """One regular expression for all `words`, factored by common prefixes (a trie)"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        # Palabra que termina acá pero que también sigue: lo más largo primero, si no hay límite de palabra retrocede
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+# Entrada: (nivel, país, provincia, ciudad)
+Entry = Tuple[str, str, Optional[str], Optional[str]]
+
+
+def _compile() -> Tuple[Dict[str, List[Entry]], "re.Pattern"]:
+    aliases: Dict[str, List[Entry]] = {}
+
+    def add(names: List[str], entry: Entry) -> None:
+        for name in names:
+            key = normalize(name)
+            if key and entry not in aliases.setdefault(key, []):
+                aliases[key].append(entry)
+
+    for country, (country_aliases, provinces) in GAZETTEER.items():
+        add([country] + country_aliases, (COUNTRY, country, None, None))
+        for province, (province_aliases, cities) in provinces.items():
+            # "Córdoba (Colombia)": el nombre que se busca es el de antes del paréntesis
+            add([province.split(" (")[0]] + province_aliases, (PROVINCE, country, province, None))
+            for city, city_aliases in cities.items():
+                add([city] + city_aliases, (CITY, country, province, city))
+    return aliases, re.compile(r"\b" + _trie_pattern(list(aliases)) + r"\b")
+
+
+_ALIASES, _AUTOMATON = _compile()
+# Distritos que son una sola ciudad: nombrar el distrito es nombrar la ciudad
+SINGLE_CITY_DISTRICTS = {
+    ("Argentina", "Ciudad Autónoma de Buenos Aires"),
+    ("México", "Ciudad de México"),
+    ("Colombia", "Bogotá D.C."),
+    ("Brasil", "Distrito Federal (Brasil)"),
+    ("Venezuela", "Distrito Capital (Venezuela)"),
+    ("Paraguay", "Asunción"),
+}
+# Cambia con la tabla y con las reglas de resolve(), así la memoria de corridas anteriores se descarta
+RESOLVER_REVISION = 2
+GAZETTEER_VERSION = hashlib.sha1(json.dumps([RESOLVER_REVISION, GAZETTEER, sorted(SINGLE_CITY_DISTRICTS)],
+                                            sort_keys=True).encode("utf-8")).hexdigest()[:12]
+_COUNTRY_NAMES = {normalize(entry[1]): entry[1] for entries in _ALIASES.values() for entry in entries}
+_LEVEL_RANK = {CITY: 0, PROVINCE: 1, COUNTRY: 2}
+
+
+def resolve(raw: Optional[str], country_hint: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Canonical {pais, provincia, ciudad} of a free-text location (None where unknown).
+    An explicit country in the text wins over country_hint (the job's "Pais"); ambiguous names
+    (San Juan, Córdoba, Santa Rosa...) are resolved with the country and province also found.
+    A name shared by a province and its capital (Mendoza, Córdoba...) counts as the province
+    unless the province is also named elsewhere in the text ("Mendoza, Mendoza"), and a named
+    province discards cities of other provinces, so the city is only filled from a city-level
+    match or a single-city district.
+    """
+    text = normalize(raw)
+    matches = [_ALIASES[match.group(0)] for match in _AUTOMATON.finditer(text)]
+    entries = []
+    for i, match_entries in enumerate(matches):
+        named = {(entry[1], entry[2]) for entry in match_entries if entry[0] == PROVINCE}
+        for entry in match_entries:
+            if entry[0] == CITY and (entry[1], entry[2]) in named and not any(
+                    (entry[1], entry[2]) == (other[1], other[2]) and other[0] == PROVINCE
+                    for j, other_entries in enumerate(matches) if j != i for other in other_entries):
+                continue
+            entries.append(entry)
+    countries = [entry[1] for entry in entries if entry[0] == COUNTRY]
+    country = countries[0] if countries else _COUNTRY_NAMES.get(normalize(country_hint))
+    if country is None and entries:
+        country = min(entries, key=lambda entry: _LEVEL_RANK[entry[0]])[1]
+    entries = [entry for entry in entries if entry[1] == country]
+    provinces = {entry[2] for entry in entries if entry[0] == PROVINCE}
+    cities = [entry for entry in entries if entry[0] == CITY]
+    # Con una provincia nombrada solo cuentan sus ciudades ("San Martín, Mendoza" no es el de Buenos Aires)
+    if provinces:
+        cities = [entry for entry in cities if entry[2] in provinces]
+    if cities:
+        return {COUNTRY: country, PROVINCE: cities[0][2], CITY: cities[0][3]}
+    province = next((entry[2] for entry in entries if entry[0] == PROVINCE), None)
+    # Distritos que son una sola ciudad (CABA, CDMX, Bogotá D.C.); el resto de las provincias queda sin ciudad
+    city = next(iter(GAZETTEER[country][1][province][1])) if (country, province) in SINGLE_CITY_DISTRICTS else None
+    return {COUNTRY: country, PROVINCE: province, CITY: city}
+
+
+class Gazetteer:
+    def __init__(self, memo_path: Optional[str] = DEFAULT_MEMO):
+        """
+        memo_path: persistent memo (raw string + country hint -> location); None keeps it in memory only.
+        The memo is discarded when the gazetteer table changed since it was written.
+        """
+        self.memo_path = memo_path
+        self._memo: Dict[str, List[Optional[str]]] = {}
+        self._dirty = False
+        self.stats = {"lookups": 0, "memo_hits": 0}
+        if memo_path and os.path.exists(memo_path):
+            try:
+                with open(memo_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == GAZETTEER_VERSION:
+                    self._memo = data.get("entries", {})
+            except (OSError, ValueError):
+                self._memo = {}
+
+    def resolve(self, raw: Optional[str], country_hint: Optional[str] = None) -> Dict[str, Optional[str]]:
+        self.stats["lookups"] += 1
+        key = f"{country_hint or ''}|{raw or ''}"
+        cached = self._memo.get(key)
+        if cached is not None:
+            self.stats["memo_hits"] += 1
+            return dict(zip((COUNTRY, PROVINCE, CITY), cached))
+        location = resolve(raw, country_hint)
+        self._memo[key] = [location[COUNTRY], location[PROVINCE], location[CITY]]
+        self._dirty = True
+        return location
+
+    def normalize_job(self, job: Dict) -> Dict[str, Optional[str]]:
+        """Normalised location columns of a job: ubicacion_pais, ubicacion_provincia, ubicacion_ciudad"""
+        raw = job.get("ubicacion") or job.get("Ubicacion") or job.get("location") or ""
+        location = self.resolve(raw, job.get("Pais"))
+        return {f"ubicacion_{level}": value for level, value in location.items()}
+
+    def save(self) -> None:
+        """Write the persistent memo (atomically) if it has new entries"""
+        if not self.memo_path or not self._dirty:
+            return
+        if os.path.dirname(self.memo_path):
+            os.makedirs(os.path.dirname(self.memo_path), exist_ok=True)
+        tmp_path = self.memo_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": GAZETTEER_VERSION, "entries": self._memo}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.memo_path)
+        self._dirty = False
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"Ubicaciones normalizadas: {s['lookups']} ({s['memo_hits']} desde la memoria, {len(self._memo)} distintas)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Normalizar ubicaciones con el nomenclador')
+    parser.add_argument('ubicaciones', nargs='*', help='Textos de ubicación a normalizar')
+    parser.add_argument('--pais', type=str, default=None, help='País del empleo (desempata nombres repetidos)')
+    parser.add_argument('--memo', action='store_true', help='Mostrar la memoria persistente')
+    args = parser.parse_args()
+
+    gazetteer = Gazetteer()
+    if args.memo:
+        for key, location in sorted(gazetteer._memo.items()):
+            print(f"{key} -> {location}")
+    for raw in args.ubicaciones:
+        print(f"{raw} -> {json.dumps(resolve(raw, args.pais), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Incremental Crawl Helper for Web Scrapers
+Keeps a persistent per-portal index of known job URLs/hashes and implements the
+"stop when known" rule: listings are sorted newest first, so once K consecutive
+listing pages bring no new jobs the rest of the area is already in our data.
+
+The index is only loaded when something consults it (--incremental, sitemap
+discovery) and is written once at the end of the run. Output files newer than
+the saved index (runs without --incremental, or a run that died before saving)
+are folded in when it is loaded.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlsplit
+
+from jsonl_zstd import job_files, load_jobs
+
+STOPS_FILE = "incremental_stops.json"
+
+
+def normalize_url(url: str) -> str:
+    """Key used for known URLs: path only, without query/fragment or trailing slash"""
+    if not url:
+        return ""
+    return urlsplit(url.strip()).path.rstrip('/').lower()
+
+
+class SeenIndex:
+    """Known job URLs and description hashes for one portal, persisted between runs"""
+
+    def __init__(self, portal: str, domain: str, index_dir: str = "checkpoints", output_dir: str = "output_jobs"):
+        """
+        portal: index name (e.g. "zonajobs")
+        domain: substring of the job URLs that belong to this portal, used to bootstrap
+                the index from the existing output files
+        """
+        self.portal = portal
+        self.domain = domain
+        self.output_dir = output_dir
+        self.index_file = os.path.join(index_dir, f"{portal}_seen_index.json")
+        self.urls = set()
+        self.hashes = set()
+        self._dirty = False
+
+        os.makedirs(index_dir, exist_ok=True)
+        self.load()
+
+    def load(self) -> None:
+        if os.path.exists(self.index_file):
+            try:
+                saved_at = os.path.getmtime(self.index_file)
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.urls = set(data.get("urls", []))
+                self.hashes = set(data.get("hashes", []))
+                print(f" Índice de conocidos cargado: {len(self.urls)} URLs, {len(self.hashes)} hashes")
+                added = self.catch_up(saved_at)
+                if added:
+                    print(f" Índice de conocidos: {added} URLs de archivos posteriores al índice")
+                return
+            except Exception as e:
+                print(f" Error cargando índice de conocidos, se reconstruye: {e}")
+        self.bootstrap()
+
+    def bootstrap(self) -> None:
+        """Build the index from every output file (pending and already unified) of this portal"""
+        self.catch_up(0)
+        print(f" Índice de conocidos construido desde {self.output_dir}: {len(self.urls)} URLs")
+        self.save()
+
+    def catch_up(self, since: float) -> int:
+        """Add the jobs of this portal from output files modified after `since`; returns the new URLs"""
+        before = len(self.urls)
+        for directory in (self.output_dir, os.path.join(self.output_dir, "unified_jobs")):
+            for file_path in job_files(directory):
+                try:
+                    if os.path.getmtime(file_path) <= since:
+                        continue
+                    jobs = load_jobs(file_path)
+                except Exception:
+                    continue
+                for job in jobs:
+                    url = job.get("url", "") if isinstance(job, dict) else ""
+                    if self.domain in url:
+                        self.add(url, job.get("hash Descripcion"))
+        return len(self.urls) - before
+
+    def contains_url(self, url: str) -> bool:
+        return normalize_url(url) in self.urls
+
+    def contains_hash(self, job_hash: Optional[str]) -> bool:
+        return bool(job_hash) and job_hash in self.hashes
+
+    def add(self, url: Optional[str] = None, job_hash: Optional[str] = None) -> None:
+        key = normalize_url(url) if url else ""
+        if key and key not in self.urls:
+            self.urls.add(key)
+            self._dirty = True
+        if job_hash and job_hash not in self.hashes:
+            self.hashes.add(job_hash)
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty and os.path.exists(self.index_file):
+            return
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "portal": self.portal,
+                "updated": datetime.now().isoformat(),
+                "urls": sorted(self.urls),
+                "hashes": sorted(self.hashes)
+            }, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+        self._dirty = False
+
+
+class IncrementalCrawl:
+    def __init__(self, portal: str, domain: str, enabled: bool = False, k: int = 2, margin: int = 1,
+                 index_dir: str = "checkpoints"):
+        """
+        enabled: skip known URLs and apply the stop rule (the index is only loaded when enabled
+                 or when `index` is used directly, e.g. by sitemap discovery)
+        k: consecutive listing pages without new jobs before stopping an area
+        margin: safety margin, leading pages of each area that are always walked
+                (featured/pinned postings can make the first pages look old)
+        """
+        self.portal = portal
+        self.enabled = enabled
+        self.k = max(1, k)
+        self.margin = max(0, margin)
+        self.index_dir = index_dir
+        self.domain = domain
+        self._index: Optional[SeenIndex] = None
+        self._areas: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def index(self) -> SeenIndex:
+        """Seen-index of the portal, loaded (or built from output_jobs/) on first use"""
+        if self._index is None:
+            self._index = SeenIndex(self.portal, self.domain, index_dir=self.index_dir)
+        return self._index
+
+    @classmethod
+    def from_args(cls, portal: str, domain: str, args) -> "IncrementalCrawl":
+        return cls(portal, domain, enabled=args.incremental, k=args.incremental_k, margin=args.margen)
+
+    def _area(self, area: str) -> Dict[str, Any]:
+        return self._areas.setdefault(area, {"pages": 0, "consecutive_known": 0, "last_page": None,
+                                             "stopped": False, "skipped": 0})
+
+    def start_run(self) -> None:
+        """Forget the per-area counters before walking the areas again (long-running crawlers)"""
+        self._areas = {}
+
+    def filter_urls(self, area: str, urls: List[str]) -> List[str]:
+        """Drop the URLs we already have (only in incremental mode)"""
+        if not self.enabled:
+            return urls
+        nuevas = [u for u in urls if not self.index.contains_url(u)]
+        self._area(area)["skipped"] += len(urls) - len(nuevas)
+        return nuevas
+
+    def mark_seen(self, url: Optional[str], job_hash: Optional[str] = None) -> None:
+        # Sin índice cargado no hace falta: el próximo load lo recupera de los archivos de salida
+        if self.enabled or self._index is not None:
+            self.index.add(url, job_hash)
+
+    def page_done(self, area: str, page: int, listed: int, new_jobs: int) -> bool:
+        """
+        Register the result of a listing page. listed = jobs on the listing,
+        new_jobs = jobs that were neither known URLs nor duplicate hashes.
+        Returns True when the area should stop here.
+        """
+        state = self._area(area)
+        state["pages"] += 1
+        state["last_page"] = page
+
+        if listed > 0 and new_jobs == 0:
+            state["consecutive_known"] += 1
+        else:
+            state["consecutive_known"] = 0
+
+        if not self.enabled or state["pages"] <= self.margin:
+            return False
+        if state["consecutive_known"] >= self.k:
+            state["stopped"] = True
+            print(f" Modo incremental: {state['consecutive_known']} páginas seguidas sin empleos nuevos, "
+                  f"se corta '{area}' en la página {page}")
+            return True
+        return False
+
+    def finish_area(self, area: str) -> None:
+        """Record where the area stopped (the index is saved once, by save())"""
+        state = self._areas.get(area)
+        if not state or state["last_page"] is None:
+            return
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        stops_path = os.path.join(self.index_dir, STOPS_FILE)
+        try:
+            with open(stops_path, 'r', encoding='utf-8') as f:
+                stops = json.load(f)
+        except (FileNotFoundError, ValueError):
+            stops = {}
+
+        stops.setdefault(self.portal, {})[area] = {
+            "date": datetime.now().isoformat(),
+            "last_page": state["last_page"],
+            "stopped_early": state["stopped"],
+            "known_urls_skipped": state["skipped"],
+            "k": self.k,
+            "margin": self.margin
+        }
+        with open(stops_path, 'w', encoding='utf-8') as f:
+            json.dump(stops, f, ensure_ascii=False, indent=2)
+
+    def save(self) -> None:
+        if self._index is not None:
+            self._index.save()
+
+
+def add_incremental_arguments(parser) -> None:
+    """Common CLI flags for the incremental mode"""
+    parser.add_argument('--incremental', action='store_true',
+                        help='Saltar empleos ya conocidos y cortar cada área al llegar a páginas sin novedades')
+    parser.add_argument('--incremental-k', type=int, default=2,
+                        help='Páginas consecutivas sin empleos nuevos antes de cortar el área (default: 2)')
+    parser.add_argument('--margen', type=int, default=1,
+                        help='Margen de seguridad: páginas iniciales que siempre se recorren (default: 1)')
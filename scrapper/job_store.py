@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Canonical Job Store
+SQLite database (database/jobs.db) with every unified job, fed by
+unify_jobs.py, so consumers can answer simple questions (how many jobs per
+portal, last week's jobs of one country...) with an indexed query instead of
+loading all of all_jobs.json. all_jobs.json is still written by unify_jobs.py
+next to the store and is what the classifier and the visualizer read;
+`exportar` regenerates it (or a filtered subset) from the store. Uses WAL
+mode so readers never block the unification, and bulk inserts (executemany in
+batches inside one transaction). An edited posting (same portal + URL) keeps
+only its latest revision, as in all_jobs.json.
+
+Usage:
+    python job_store.py stats
+    python job_store.py importar ../database/all_jobs.json
+    python job_store.py exportar [--salida ../database/all_jobs.json] [--fuente Computrabajo] [--pais Argentina] [--desde 2026-01-01] [--hasta 2026-01-31]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from revision_store import posting_key
+
+DEFAULT_DB = "../database/jobs.db"
+# Empleos por executemany (también es el tope de parámetros de la consulta de hashes ya guardados)
+BATCH_SIZE = 500
+
+
+def iso_date(fecha: Optional[str]) -> Optional[str]:
+    """DD/MM/YYYY (the scrapers' format) -> YYYY-MM-DD, so dates sort and compare as text"""
+    if not fecha:
+        return None
+    try:
+        return datetime.strptime(fecha, "%d/%m/%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return fecha
+
+
+class JobStore:
+    def __init__(self, path: str = DEFAULT_DB, readonly: bool = False):
+        """
+        Like RevisionStore, writes stay in an open transaction until commit(), so unify_jobs.py
+        commits the store together with all_jobs.json. readonly opens the database for queries only.
+        """
+        self.path = path
+        self._pending: List[Dict[str, Any]] = []
+        self.stats = {"inserted": 0, "updated": 0, "replaced_revisions": 0}
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+            return
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        # WAL: los lectores (clasificador, visualizador) no se bloquean mientras se escribe
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                hash TEXT PRIMARY KEY,
+                posting TEXT,
+                id_interno TEXT,
+                fuente TEXT,
+                pais TEXT,
+                fecha TEXT,
+                url TEXT,
+                titulo TEXT,
+                empresa TEXT,
+                categoria_portal TEXT,
+                data TEXT NOT NULL,
+                added_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_fuente ON jobs (fuente);
+            CREATE INDEX IF NOT EXISTS jobs_pais ON jobs (pais);
+            CREATE INDEX IF NOT EXISTS jobs_fecha ON jobs (fecha);
+            CREATE INDEX IF NOT EXISTS jobs_url ON jobs (url);
+            CREATE INDEX IF NOT EXISTS jobs_posting ON jobs (posting);
+        """)
+        self._conn.commit()
+
+    def add(self, job: Dict[str, Any]) -> None:
+        """Queue a job (with its "hash Descripcion") for the next bulk insert (every BATCH_SIZE jobs and on commit())"""
+        self._pending.append(job)
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def add_many(self, jobs: Iterable[Dict[str, Any]]) -> None:
+        for job in jobs:
+            self.add(job)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        rows = []
+        revisions = []
+        for job in self._pending:
+            key = posting_key(job)
+            rows.append((job["hash Descripcion"], key, job.get("Id Interno"), job.get("Fuente"), job.get("Pais"),
+                         iso_date(job.get("fecha")), job.get("url"), job.get("titulo"), job.get("Empresa"),
+                         job.get("Categoria Portal"), json.dumps(job, ensure_ascii=False),
+                         datetime.now().isoformat()))
+            # Aviso editado: la revisión anterior deja de estar en la base
+            if key and (job.get("revision") or 1) > 1:
+                revisions.append((key, job["hash Descripcion"]))
+        self._pending = []
+        if revisions:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM jobs WHERE posting = ? AND hash != ?", revisions)
+            self.stats["replaced_revisions"] += self._conn.total_changes - before
+        hashes = [row[0] for row in rows]
+        existing = self._conn.execute(f"SELECT COUNT(*) FROM jobs WHERE hash IN ({','.join('?' * len(hashes))})",
+                                      hashes).fetchone()[0]
+        self._conn.executemany("""
+            INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (hash) DO UPDATE SET
+                posting = excluded.posting, id_interno = excluded.id_interno, fuente = excluded.fuente,
+                pais = excluded.pais, fecha = excluded.fecha, url = excluded.url, titulo = excluded.titulo,
+                empresa = excluded.empresa, categoria_portal = excluded.categoria_portal, data = excluded.data
+        """, rows)
+        self.stats["inserted"] += len(rows) - existing
+        self.stats["updated"] += existing
+
+    def _where(self, fuente: Optional[str] = None, pais: Optional[str] = None,
+               desde: Optional[str] = None, hasta: Optional[str] = None) -> Tuple[str, List[str]]:
+        clauses, params = [], []
+        for column, value in (("fuente", fuente), ("pais", pais)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if desde:
+            clauses.append("fecha >= ?")
+            params.append(desde)
+        if hasta:
+            clauses.append("fecha <= ?")
+            params.append(hasta)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_jobs(self, **filters: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Jobs in insertion order, optionally filtered by fuente, pais and fecha (desde/hasta, YYYY-MM-DD)"""
+        where, params = self._where(**filters)
+        for (data,) in self._conn.execute(f"SELECT data FROM jobs{where} ORDER BY rowid", params):
+            yield json.loads(data)
+
+    def count(self, **filters: Optional[str]) -> int:
+        where, params = self._where(**filters)
+        return self._conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+    def count_by(self, column: str) -> Dict[str, int]:
+        """Jobs per value of an indexed column (fuente, pais or fecha)"""
+        if column not in ("fuente", "pais", "fecha"):
+            raise ValueError(f"Columna no indexada: {column}")
+        return dict(self._conn.execute(f"SELECT {column}, COUNT(*) FROM jobs GROUP BY {column} ORDER BY COUNT(*) DESC"))
+
+    def contains(self, job_hash: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM jobs WHERE hash = ?", (job_hash,)).fetchone() is not None
+
+    def summary(self) -> Dict[str, Any]:
+        first, last = self._conn.execute("SELECT MIN(fecha), MAX(fecha) FROM jobs").fetchone()
+        return {"jobs": self.count(), "by_source": self.count_by("fuente"), "first_date": first, "last_date": last}
+
+    def commit(self) -> None:
+        self.flush()
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._pending = []
+        self._conn.rollback()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def export_json(store: JobStore, path: str, **filters: Optional[str]) -> int:
+    """
+    Write the jobs of the store (optionally filtered) as a JSON array with the layout of all_jobs.json,
+    or as compressed JSONL when path ends in .jsonl.zst
+    """
+    from unify_jobs import JsonArrayWriter
+    from jsonl_zstd import ZstdJsonlWriter, is_zstd
+
+    writer = ZstdJsonlWriter(path) if is_zstd(path) else JsonArrayWriter(path)
+    try:
+        for job in store.iter_jobs(**filters):
+            writer.write(job)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return writer.count
+
+
+def main():
+    from jsonl_zstd import open_jobs
+
+    parser = argparse.ArgumentParser(description='Base canónica de empleos (SQLite)')
+    parser.add_argument('--db', type=str, default=DEFAULT_DB, help=f'Base de empleos (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('stats', help='Empleos por fuente y rango de fechas')
+    importar = sub.add_parser('importar', help='Cargar empleos de un all_jobs.json (o .jsonl) existente')
+    importar.add_argument('archivo', type=str)
+    exportar = sub.add_parser('exportar', help='Generar all_jobs.json desde la base')
+    exportar.add_argument('--salida', type=str, default="../database/all_jobs.json",
+                          help='.json, o .jsonl.zst para exportar comprimido')
+    for flag in ('--fuente', '--pais'):
+        exportar.add_argument(flag, type=str, default=None)
+    exportar.add_argument('--desde', type=str, default=None, help='Fecha mínima (YYYY-MM-DD)')
+    exportar.add_argument('--hasta', type=str, default=None, help='Fecha máxima (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    store = JobStore(args.db, readonly=args.comando != 'importar')
+    if args.comando == 'stats':
+        print(json.dumps(store.summary(), indent=2, ensure_ascii=False))
+    elif args.comando == 'importar':
+        _, jobs = open_jobs(args.archivo)
+        store.add_many(job for job in (jobs or []) if job.get("hash Descripcion"))
+        store.commit()
+        print(f"{store.stats['inserted']} empleos nuevos, {store.stats['updated']} actualizados "
+              f"(total: {store.count()})")
+    elif args.comando == 'exportar':
+        total = export_json(store, args.salida, fuente=args.fuente, pais=args.pais, desde=args.desde, hasta=args.hasta)
+        print(f"{total} empleos exportados a {args.salida}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
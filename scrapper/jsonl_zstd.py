@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Compressed Job Files (seekable zstd over JSONL)
+The scrapers' per-area files are written with indent=4 and the unified_jobs/
+archive keeps every input forever, so most of the bytes on disk are
+whitespace and repeated keys. A .jsonl.zst file holds one job per line,
+compressed in independent zstd frames of FRAME_JOBS jobs each, followed by a
+seek table (the zstd seekable format: a skippable frame that plain zstd tools
+ignore, so `zstd -d` / `zstdcat` still read the file). Frames end on line
+boundaries, so any frame can be read and decoded on its own (read_frame), and
+new jobs are appended as new frames without recompressing the file.
+
+load_jobs / save_jobs read and write .json, .jsonl and .jsonl.zst alike, and
+open_jobs streams them (JSON arrays through ijson when it is installed); the
+scrapers write .jsonl.zst (JOBS_EXTENSION) when zstandard is installed and
+unify_jobs.py compresses what it moves to unified_jobs/.
+
+Usage:
+    python jsonl_zstd.py comprimir output_jobs/unified_jobs/ [--borrar]
+    python jsonl_zstd.py descomprimir archivo.jsonl.zst [--salida archivo.json]
+    python jsonl_zstd.py info archivo.jsonl.zst
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+ZSTD_EXTENSION = ".jsonl.zst"
+# Los scrapers guardan comprimido solo si pueden volver a leerlo
+JOBS_EXTENSION = ZSTD_EXTENSION if ZSTD_AVAILABLE else ".json"
+JOB_FILE_PATTERNS = ("*.json", "*.jsonl", "*" + ZSTD_EXTENSION)
+FRAME_JOBS = 1000
+LEVEL = 10
+
+# Formato seekable de zstd (contrib/seekable_format): frame salteable con una entrada
+# (tamaño comprimido, tamaño descomprimido) por frame y un pie de 9 bytes
+_SKIPPABLE_MAGIC = 0x184D2A5E
+_SEEKABLE_MAGIC = 0x8F92EAB1
+_FOOTER = struct.Struct("<IBI")
+_ENTRY = struct.Struct("<II")
+_HEADER = struct.Struct("<II")
+
+
+def is_zstd(path: str) -> bool:
+    return path.endswith(".zst")
+
+
+def _require_zstd() -> None:
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError("zstandard no instalado (pip install zstandard)")
+
+
+def _seek_table_bytes(frames: List[Tuple[int, int]]) -> bytes:
+    entries = b"".join(_ENTRY.pack(compressed, size) for compressed, size in frames)
+    footer = _FOOTER.pack(len(frames), 0, _SEEKABLE_MAGIC)
+    return _HEADER.pack(_SKIPPABLE_MAGIC, len(entries) + len(footer)) + entries + footer
+
+
+def read_seek_table(f) -> Optional[List[Tuple[int, int, int]]]:
+    """(offset, compressed size, decompressed size) of each frame of an open file, or None if it has no seek table"""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    if size < _HEADER.size + _FOOTER.size:
+        return None
+    f.seek(size - _FOOTER.size)
+    count, descriptor, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+    entry_size = _ENTRY.size + (4 if descriptor & 0x80 else 0)
+    table_size = _HEADER.size + count * entry_size + _FOOTER.size
+    if magic != _SEEKABLE_MAGIC or table_size > size:
+        return None
+    f.seek(size - table_size)
+    skippable, _ = _HEADER.unpack(f.read(_HEADER.size))
+    if skippable != _SKIPPABLE_MAGIC:
+        return None
+    frames = []
+    offset = 0
+    for _ in range(count):
+        compressed, decompressed = _ENTRY.unpack(f.read(entry_size)[:_ENTRY.size])
+        frames.append((offset, compressed, decompressed))
+        offset += compressed
+    return frames
+
+
+def decompress(raw: bytes) -> bytes:
+    """Whole content of a .zst file already in memory (every frame; the seek table is skipped)"""
+    _require_zstd()
+    return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw), read_across_frames=True).read()
+
+
+def iter_jobs(path: str) -> Iterator[Dict[str, Any]]:
+    """Jobs of a .jsonl.zst file, decompressed in streaming (also reads zstd files without a seek table)"""
+    _require_zstd()
+    with open(path, 'rb') as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        for line in io.TextIOWrapper(reader, encoding='utf-8'):
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_frame(path: str, frame: int) -> List[Dict[str, Any]]:
+    """Jobs of one frame, read with a seek and without decompressing the frames before it"""
+    _require_zstd()
+    with open(path, 'rb') as f:
+        frames = read_seek_table(f)
+        if frames is None:
+            raise ValueError(f"{path} no tiene tabla de frames (formato seekable)")
+        offset, compressed, _ = frames[frame]
+        f.seek(offset)
+        data = zstandard.ZstdDecompressor().decompress(f.read(compressed))
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+class ZstdJsonlWriter:
+    """
+    Same interface as unify_jobs.JsonArrayWriter (write / close / abort, count, appended) for
+    .jsonl.zst files: one job per line, a zstd frame every frame_jobs jobs and the seek table
+    at the end. The file is written under a temporary name and only replaces `path` on close().
+    append=True adds frames to the existing file in place (only the seek table is rewritten);
+    abort() restores the original end.
+    """
+    def __init__(self, path: str, append: bool = False, level: int = LEVEL, frame_jobs: int = FRAME_JOBS):
+        _require_zstd()
+        self.path = path
+        self.count = 0
+        self.appended = 0
+        self.tmp_path = None
+        self._frame_jobs = frame_jobs
+        self._compressor = zstandard.ZstdCompressor(level=level, write_content_size=True)
+        self._lines: List[bytes] = []
+        self._frames: List[Tuple[int, int]] = []
+        self._old_table = None
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self._f = open(path, 'r+b')
+            frames = read_seek_table(self._f)
+            if frames is None:
+                self._f.close()
+                raise ValueError(f"{path} no tiene tabla de frames (formato seekable)")
+            self._frames = [(compressed, size) for _, compressed, size in frames]
+            self._table_pos = sum(compressed for compressed, _ in self._frames)
+            self._f.seek(self._table_pos)
+            self._old_table = self._f.read()
+            self._f.seek(self._table_pos)
+            self._f.truncate()
+        else:
+            self.tmp_path = path + ".tmp"
+            self._f = open(self.tmp_path, 'wb')
+
+    def _flush_frame(self) -> None:
+        if not self._lines:
+            return
+        data = b"".join(self._lines)
+        frame = self._compressor.compress(data)
+        self._f.write(frame)
+        self._frames.append((len(frame), len(data)))
+        self._lines = []
+
+    def write(self, item: Dict[str, Any]) -> None:
+        self._lines.append((json.dumps(item, ensure_ascii=False) + "\n").encode('utf-8'))
+        self.count += 1
+        self.appended += 1
+        if len(self._lines) >= self._frame_jobs:
+            self._flush_frame()
+
+    def close(self) -> None:
+        self._flush_frame()
+        self._f.write(_seek_table_bytes(self._frames))
+        self._f.close()
+        if self.tmp_path:
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        if self.tmp_path:
+            self._f.close()
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+            return
+        # Append en el lugar: volver a dejar la tabla original
+        if self._f.closed:
+            self._f = open(self.path, 'r+b')
+        self._f.seek(self._table_pos)
+        self._f.truncate()
+        self._f.write(self._old_table)
+        self._f.close()
+
+
+def job_files(directory: str) -> List[str]:
+    """Job files (.json, .jsonl, .jsonl.zst) directly inside a directory"""
+    return sorted(path for pattern in JOB_FILE_PATTERNS for path in glob.glob(os.path.join(directory, pattern)))
+
+
+def load_jobs(path: str) -> List[Dict[str, Any]]:
+    """All jobs of a .json (array or single object), .jsonl or .jsonl.zst file"""
+    if is_zstd(path):
+        return list(iter_jobs(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+def open_jobs(file_path: str) -> Tuple[Optional[str], Optional[Iterator[Dict[str, Any]]]]:
+    """
+    Jobs of an input file as an iterator, without loading the file whole when possible:
+    .jsonl line by line (.jsonl.zst decompressed in streaming), JSON arrays with ijson.
+    A single object counts as one job.
+    Returns (kind, iterator) with kind "array", "object" or "jsonl", or (None, None)
+    when the top level is something else. Malformed JSON raises json.JSONDecodeError
+    (ijson.JSONError for arrays read with ijson), possibly after some jobs were already yielded.
+    """
+    if is_zstd(file_path):
+        return "jsonl", iter_jobs(file_path)
+    if file_path.endswith(".jsonl"):
+        def lines():
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        return "jsonl", lines()
+
+    with open(file_path, 'rb') as f:
+        head = f.read(64).lstrip(b"\xef\xbb\xbf \t\r\n")[:1]
+    if head == b"[" and IJSON_AVAILABLE:
+        def items():
+            with open(file_path, 'rb') as f:
+                yield from ijson.items(f, 'item', use_float=True)
+        return "array", items()
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return "array", iter(data)
+    if isinstance(data, dict):
+        return "object", iter([data])
+    return None, None
+
+
+def save_jobs(path: str, jobs: List[Dict[str, Any]], indent: int = 4) -> None:
+    """Write jobs replacing `path` (through a .tmp file), in the format given by its extension"""
+    if is_zstd(path):
+        writer = ZstdJsonlWriter(path)
+        try:
+            for job in jobs:
+                writer.write(job)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            for job in jobs:
+                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        else:
+            json.dump(jobs, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def compressed_path_for(path: str) -> str:
+    """x.json / x.jsonl -> x.jsonl.zst"""
+    for extension in (".jsonl", ".json"):
+        if path.endswith(extension):
+            return path[:-len(extension)] + ZSTD_EXTENSION
+    return path + ZSTD_EXTENSION
+
+
+def compress_file(path: str, dest_dir: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Write `path` as .jsonl.zst (next to it, or in dest_dir) and remove the original.
+    Returns (new path, jobs). Files already compressed are only moved.
+    """
+    target = os.path.join(dest_dir or os.path.dirname(path), os.path.basename(compressed_path_for(path)))
+    if is_zstd(path):
+        os.replace(path, target)
+        return target, -1
+    kind, jobs = open_jobs(path)
+    if kind is None:
+        raise ValueError(f"{path} no es un array, objeto o JSONL de empleos")
+    writer = ZstdJsonlWriter(target)
+    try:
+        for job in jobs or []:
+            writer.write(job)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    os.remove(path)
+    return target, writer.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archivos de empleos comprimidos (JSONL + zstd seekable)')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    comprimir = sub.add_parser('comprimir', help='Convertir .json / .jsonl a .jsonl.zst')
+    comprimir.add_argument('rutas', nargs='+', help='Archivos o carpetas (sin subcarpetas)')
+    comprimir.add_argument('--borrar', action='store_true', help='Borrar los originales (sin esto solo muestra qué haría)')
+    descomprimir = sub.add_parser('descomprimir', help='Convertir un .jsonl.zst a .json (array, indent=2)')
+    descomprimir.add_argument('archivo', type=str)
+    descomprimir.add_argument('--salida', type=str, default=None)
+    info = sub.add_parser('info', help='Frames, empleos y tasa de compresión')
+    info.add_argument('archivo', type=str)
+    args = parser.parse_args()
+
+    if not ZSTD_AVAILABLE:
+        print("ERROR: zstandard no instalado (pip install zstandard)")
+        raise SystemExit(1)
+
+    if args.comando == 'comprimir':
+        archivos = []
+        for ruta in args.rutas:
+            archivos += [a for a in job_files(ruta) if not is_zstd(a)] if os.path.isdir(ruta) else [ruta]
+        antes = despues = 0
+        for archivo in archivos:
+            tamano = os.path.getsize(archivo)
+            if not args.borrar:
+                print(f"[dry-run] {archivo} ({tamano / (1024*1024):.2f} MB)")
+                continue
+            destino, empleos = compress_file(archivo)
+            antes += tamano
+            despues += os.path.getsize(destino)
+            print(f"{archivo} -> {destino}: {empleos} empleos, {tamano / (1024*1024):.2f} -> "
+                  f"{os.path.getsize(destino) / (1024*1024):.2f} MB")
+        if args.borrar and archivos:
+            print(f"\n{len(archivos)} archivos: {antes / (1024*1024):.1f} -> {despues / (1024*1024):.1f} MB")
+    elif args.comando == 'descomprimir':
+        salida = args.salida or args.archivo[:-len(ZSTD_EXTENSION)] + ".json"
+        save_jobs(salida, list(iter_jobs(args.archivo)), indent=2)
+        print(f"{args.archivo} -> {salida}")
+    elif args.comando == 'info':
+        with open(args.archivo, 'rb') as f:
+            frames = read_seek_table(f)
+        tamano = os.path.getsize(args.archivo)
+        empleos = sum(1 for _ in iter_jobs(args.archivo))
+        if frames is None:
+            print(f"{args.archivo}: sin tabla de frames (zstd común), {empleos} empleos, {tamano / (1024*1024):.2f} MB")
+            return
+        original = sum(size for _, _, size in frames)
+        print(f"{args.archivo}: {len(frames)} frames, {empleos} empleos, {tamano / (1024*1024):.2f} MB "
+              f"({original / (1024*1024):.2f} MB sin comprimir, x{original / max(tamano, 1):.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Guest Client
+HTTP adapter for the public (logged-out) LinkedIn job endpoints:
+  - jobs-guest/jobs/api/seeMoreJobPostings/search  -> HTML fragment with job cards, paginated by offset
+  - jobs-guest/jobs/api/jobPosting/<id>             -> HTML fragment with the full posting
+Uses a pooled requests.Session and the shared rate limiter. Returns None on any failure so the
+caller can fall back to the browser; after MAX_FAILURES consecutive failures the client reports
+itself as `disabled` and the caller switches to the browser for the rest of the run.
+Fragments are parsed with lxml, so cards with nested lists are split correctly.
+"""
+
+import html
+import re
+from typing import Dict, List, Optional, Any
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+GUEST_AVAILABLE = REQUESTS_AVAILABLE and LXML_AVAILABLE
+
+from rate_limiter import get_rate_limiter
+
+GUEST_BASE = "https://www.linkedin.com/jobs-guest/jobs/api"
+SEARCH_URL = GUEST_BASE + "/seeMoreJobPostings/search"
+POSTING_URL = GUEST_BASE + "/jobPosting/{job_id}"
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# Fallos seguidos (red, 429, status != 200) antes de pasar al navegador por el resto de la corrida
+MAX_FAILURES = 5
+
+_JOB_ID_RE = re.compile(r'urn:li:jobPosting:(\d+)')
+_URL_ID_RE = re.compile(r'-(\d+)(?:\?|$)')
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLOCK_END_RE = re.compile(r'<br\s*/?>|</(?:p|li|ul|ol|h\d)>', re.I)
+
+
+def _html_to_text(fragment: str) -> str:
+    """Strip tags keeping paragraph/list breaks"""
+    text = _BLOCK_END_RE.sub('\n', fragment)
+    text = html.unescape(_TAG_RE.sub('', text))
+    lines = [re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+
+def _parse(fragment: str):
+    """lxml tree of a guest fragment (a bare list of <li> cards or a posting)"""
+    return lxml.html.fragment_fromstring(fragment, create_parent='div')
+
+
+def _by_class(element, tag: str, css_class: str) -> list:
+    return element.xpath(f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+
+
+def _first_by_class(element, tag: str, css_class: str) -> str:
+    """Text of the first <tag class="...css_class..."> descendant"""
+    found = _by_class(element, tag, css_class)
+    if not found:
+        return ""
+    return _html_to_text(lxml.html.tostring(found[0], encoding='unicode', with_tail=False))
+
+
+class LinkedInGuestClient:
+    def __init__(self, rate: float = 0.5, pool_size: int = 4, timeout: int = 15):
+        if not GUEST_AVAILABLE:
+            raise ImportError("requests y lxml son necesarios (pip install requests lxml)")
+
+        self.timeout = timeout
+        self.limiter = get_rate_limiter("linkedin", rate=rate, jitter=0.5)
+
+        retry = Retry(total=3, backoff_factor=1.0, status_forcelist=[500, 502, 503, 504],
+                      allowed_methods=["GET"], respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "es-AR,es;q=0.9,en;q=0.8",
+            "Accept": "text/html,application/xhtml+xml"
+        })
+        self.failures = 0
+
+    @property
+    def disabled(self) -> bool:
+        """True once MAX_FAILURES requests in a row failed"""
+        return self.failures >= MAX_FAILURES
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        self.limiter.acquire()
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException:
+            self.failures += 1
+            return None
+
+        if response.status_code == 429:
+            # LinkedIn limita a los invitados: bajar el ritmo para todos los que usan el limitador
+            self.limiter.penalize()
+            self.failures += 1
+            return None
+        if response.status_code != 200:
+            self.failures += 1
+            return None
+
+        self.limiter.reward()
+        self.failures = 0
+        return response.text
+
+    def search_batch(self, area_code: str, start: int, geo_id: str = "100446943",
+                     location: str = "Argentina") -> Optional[List[Dict[str, str]]]:
+        """
+        One call to the guest search endpoint at offset `start`
+        Returns list of cards {id, url, titulo, empresa, ubicacion, fecha_publicacion}, [] at the end
+        of the results, or None if the request failed
+        """
+        params = {"f_F": area_code, "geoId": geo_id, "location": location, "start": start}
+        fragment = self._get(SEARCH_URL, params)
+        if fragment is None:
+            return None
+
+        if not fragment.strip():
+            return []
+
+        cards = []
+        # Solo los <li> de primer nivel: una tarjeta puede traer listas anidadas
+        for card in _parse(fragment).xpath('./li'):
+            links = _by_class(card, "a", "base-card__full-link")
+            if not links or not links[0].get('href'):
+                continue
+            url = links[0].get('href').split('?')[0]
+            if '/jobs/view/' not in url:
+                continue
+
+            urns = card.xpath('.//@data-entity-urn')
+            job_id = (_JOB_ID_RE.search(urns[0]) if urns else None) or _URL_ID_RE.search(url)
+            if not job_id:
+                continue
+
+            fecha = card.xpath('.//time/@datetime')
+            cards.append({
+                "id": job_id.group(1),
+                "url": url,
+                "titulo": _first_by_class(card, "h3", "base-search-card__title"),
+                "empresa": _first_by_class(card, "h4", "base-search-card__subtitle"),
+                "ubicacion": _first_by_class(card, "span", "job-search-card__location"),
+                "fecha_publicacion": fecha[0] if fecha else ""
+            })
+        return cards
+
+    def search_page(self, area_code: str, start: int, page_size: int = 25) -> Optional[List[Dict[str, str]]]:
+        """
+        Collect one listing page (page_size jobs) walking the offset, since the guest
+        endpoint returns fewer cards per call than the web listing
+        """
+        cards: List[Dict[str, str]] = []
+        seen = set()
+        offset = start
+        while len(cards) < page_size:
+            batch = self.search_batch(area_code, offset)
+            if batch is None:
+                # Si ya teníamos tarjetas devolvemos lo parcial; si no, que decida el fallback
+                return cards if cards else None
+            if not batch:
+                break
+            for card in batch:
+                if card["id"] not in seen:
+                    seen.add(card["id"])
+                    cards.append(card)
+            offset += len(batch)
+        return cards[:page_size]
+
+    def fetch_job(self, job_id: str) -> Optional[Dict[str, str]]:
+        """
+        Fetch the posting fragment and return the same dict shape as
+        LinkedIn.extract_job_details, or None if it could not be parsed
+        """
+        fragment = self._get(POSTING_URL.format(job_id=job_id))
+        if not fragment:
+            return None
+
+        posting = _parse(fragment)
+        descripcion = _first_by_class(posting, "div", "show-more-less-html__markup")
+        if not descripcion:
+            return None
+
+        categoria_portal = ""
+        subcategoria_portal = ""
+        for item in _by_class(posting, "li", "description__job-criteria-item"):
+            header = _first_by_class(item, "h3", "description__job-criteria-subheader").lower()
+            value = _first_by_class(item, "span", "description__job-criteria-text")
+            if 'función' in header or 'function' in header:
+                categoria_portal = value
+            elif 'sector' in header or 'industries' in header:
+                subcategoria_portal = value
+
+        return {
+            'titulo': (_first_by_class(posting, "h2", "top-card-layout__title")
+                       or _first_by_class(posting, "h1", "top-card-layout__title")
+                       or "Título no disponible"),
+            'empresa': _first_by_class(posting, "a", "topcard__org-name-link") or "NA/NA",
+            'ubicacion': _first_by_class(posting, "span", "topcard__flavor--bullet") or "Argentina",
+            'descripcion': descripcion,
+            'categoria_portal': categoria_portal,
+            'subcategoria_portal': subcategoria_portal
+        }
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Listing Card Harvesting for Web Scrapers
+Listing pages already show the title, company and location of every posting.
+One execute_script call reads all the cards of the page at once (instead of a
+WebDriver round-trip per element) and keeps the fields by job URL, so on the
+detail page the scraper only waits for what the card does not show: the
+description and the requirements. Missing card fields fall back to the detail page.
+"""
+
+from typing import Dict, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from incremental import normalize_url
+
+# Reglas por portal: selector de la tarjeta, del link dentro de ella ("" = la tarjeta es el link)
+# y selectores CSS por campo en orden de preferencia (relativos a la tarjeta). Sin selectores
+# genéricos ("h3", "p"): tomarían otro texto de la tarjeta; un campo sin match se lee del detalle
+CARD_RULES: Dict[str, Dict] = {
+    "computrabajo": {
+        "card": "article.box_offer",
+        "link": "a.js-o-link",
+        "fields": {
+            "titulo": ["h2 a.js-o-link", "h2"],
+            "empresa": ["a[offer-grid-article-company-url]", "p.dFlex a.fc_base", "p.dFlex"],
+            "ubicacion": ["p.fs16 span.mr10", "p.fs16 > span"],
+        },
+    },
+    "zonajobs": {
+        "card": "#listado-avisos > div > a",
+        "link": "",
+        "fields": {
+            "titulo": ["h2"],
+            "empresa": ["h3[class*='company']", "[class*='CompanyName']"],
+            "ubicacion": ["[class*='location'] h3", "[class*='Location']"],
+        },
+    },
+    "catho_br": {
+        "card": "article",
+        "link": "a[href*='/vagas/']",
+        "fields": {
+            "titulo": ["h2 a", "h2"],
+            "empresa": ["[class*='company']", "[class*='Company']"],
+            "ubicacion": ["a[href*='/por-local/']", "[class*='location']", "[class*='Location']"],
+        },
+    },
+}
+
+# Textos de relleno que algunos portales muestran mientras cargan la tarjeta
+_PLACEHOLDERS = ("loading", "cargando", "carregando")
+
+_HARVEST_JS = """
+const rules = arguments[0];
+const out = [];
+document.querySelectorAll(rules.card).forEach(card => {
+    const link = rules.link ? card.querySelector(rules.link) : card;
+    if (!link || !link.href) return;
+    const fields = {};
+    for (const [name, selectors] of Object.entries(rules.fields)) {
+        for (const selector of selectors) {
+            const el = card.querySelector(selector);
+            const text = el ? (el.innerText || el.textContent || "").trim() : "";
+            if (text) { fields[name] = text.split("\\n")[0].trim(); break; }
+        }
+    }
+    out.push([link.href, fields]);
+});
+return out;
+"""
+
+
+class ListingCards:
+    def __init__(self, portal: str, enabled: bool = True):
+        """
+        portal: key in CARD_RULES (portals without rules never return card fields)
+        enabled: when False harvest() is a no-op and every field comes from the detail page
+        """
+        self.portal = portal
+        self.rules = CARD_RULES.get(portal)
+        self.enabled = enabled and self.rules is not None
+        self._cards: Dict[str, Dict[str, str]] = {}
+        self.stats = {"cards": 0, "lookups": 0, "hits": 0}
+
+    @classmethod
+    def from_args(cls, portal: str, args) -> "ListingCards":
+        return cls(portal, enabled=not args.sin_tarjetas)
+
+    def harvest(self, driver) -> int:
+        """Read every card of the listing page the driver is on. Returns how many were read"""
+        self._cards = {}
+        if not self.enabled:
+            return 0
+        try:
+            rows = driver.execute_script(_HARVEST_JS, self.rules) or []
+        except WebDriverException:
+            return 0
+        for href, fields in rows:
+            clean = {name: value for name, value in (fields or {}).items()
+                     if value and not value.lower().startswith(_PLACEHOLDERS)}
+            key = normalize_url(href)
+            # Tarjetas destacadas repetidas: quedarse con la que trae más campos
+            if len(clean) >= len(self._cards.get(key, {})):
+                self._cards[key] = clean
+        self.stats["cards"] += len(self._cards)
+        return len(self._cards)
+
+    def get(self, url: Optional[str]) -> Dict[str, str]:
+        """Card fields of a job (empty dict if the card was not found)"""
+        if not self.enabled or not url:
+            return {}
+        self.stats["lookups"] += 1
+        fields = self._cards.get(normalize_url(url), {})
+        if fields:
+            self.stats["hits"] += 1
+        return fields
+
+    def summary(self) -> str:
+        s = self.stats
+        if not self.enabled:
+            return "Tarjetas de listado: desactivado"
+        return f"Tarjetas de listado: {s['cards']} leídas, {s['hits']}/{s['lookups']} empleos con datos del listado"
+
+
+def add_card_arguments(parser) -> None:
+    """Common CLI flag for listing-card harvesting"""
+    parser.add_argument('--sin-tarjetas', action='store_true',
+                        help='No tomar título/empresa/ubicación de las tarjetas del listado (todo se lee del detalle)')
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection (MinHash + LSH)
+Exact dedup (SHA-256 of the description) misses the same job reposted with a
+new date line or syndicated to another portal with small formatting changes.
+Descriptions are normalised (lowercase, no accents, no digits or punctuation),
+split into word shingles and summarised in a MinHash signature; the signature
+is split into bands and jobs sharing a band bucket are candidates, confirmed
+when the estimated Jaccard similarity reaches the threshold. Each job is
+hashed once per shingle (one-permutation hashing with densification instead
+of one hash per permutation), so building the index is linear in the corpus.
+
+unify_jobs.py --casi-duplicados [umbral] keeps the first job of each cluster.
+
+Usage:
+    python near_duplicates.py [--entrada ../database/all_jobs.json] [--umbral 0.85] [--mostrar 10]
+"""
+
+import argparse
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.85
+NUM_PERM = 128
+SHINGLE_SIZE = 4
+_MAX_HASH = (1 << 64) - 1
+
+_NON_WORD_RE = re.compile(r"[^a-z\s]+")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents, drop digits and punctuation (dates, counters, bullets) and collapse spaces"""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES_RE.sub(" ", _NON_WORD_RE.sub(" ", text)).strip()
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    return job.get("descripcion", "") or job.get("description", "") or ""
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm whose S-curve (1/bands)^(1/rows) is the closest
+    one at or below the threshold: pairs above it almost always collide in some band.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(b, r) for b, r in options if (1 / b) ** (1 / r) <= threshold] or options[:1]
+    return max(below, key=lambda br: (1 / br[0]) ** (1 / br[1]))
+
+
+class MinHashLSH:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = NUM_PERM,
+                 shingle_size: int = SHINGLE_SIZE):
+        """
+        threshold: minimum estimated Jaccard similarity of the shingle sets to call two jobs near duplicates
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"El umbral debe estar entre 0 y 1 (recibido: {threshold})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of a text, or None when it is too short to compare"""
+        words = normalize_text(text).split()
+        if len(words) < self.shingle_size:
+            return None
+        bins: List[Optional[int]] = [None] * self.num_perm
+        for i in range(len(words) - self.shingle_size + 1):
+            shingle = " ".join(words[i:i + self.shingle_size]).encode("utf-8")
+            value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+            slot, value = value % self.num_perm, value // self.num_perm
+            if bins[slot] is None or value < bins[slot]:
+                bins[slot] = value
+        # Densificación: un bin vacío toma el valor del siguiente bin lleno, corrido según la distancia
+        signature = []
+        for slot in range(self.num_perm):
+            distance = 0
+            while bins[(slot + distance) % self.num_perm] is None:
+                distance += 1
+            signature.append((bins[(slot + distance) % self.num_perm] + distance * 0x9E3779B97F4A7C15) & _MAX_HASH)
+        return tuple(signature)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity: fraction of equal signature positions"""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def query(self, signature: Tuple[int, ...]) -> Optional[Tuple[Hashable, float]]:
+        """Most similar indexed key at or above the threshold, as (key, similarity), or None"""
+        best = None
+        seen = set()
+        for band, key in self._band_keys(signature):
+            for candidate in self._buckets[band].get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = self.similarity(signature, self._signatures[candidate])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (candidate, score)
+        return best
+
+    def insert(self, key: Hashable, signature: Tuple[int, ...]) -> None:
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(key)
+
+    def remove(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        """Drop a key from the index; returns its signature (None if it was not indexed)"""
+        signature = self._signatures.pop(key, None)
+        if signature is not None:
+            for band, band_key in self._band_keys(signature):
+                bucket = self._buckets[band][band_key]
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+        return signature
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def near_duplicate_clusters(jobs: Iterable[Dict[str, Any]], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """
+    Clusters (lists of positions, first one = representative) of near-duplicate jobs.
+    Each job joins the cluster of its most similar earlier job.
+    """
+    lsh = MinHashLSH(threshold)
+    cluster_of: Dict[int, int] = {}
+    clusters: Dict[int, List[int]] = {}
+    for position, job in enumerate(jobs):
+        signature = lsh.signature(job_text(job))
+        if signature is None:
+            continue
+        match = lsh.query(signature)
+        if match:
+            root = cluster_of[match[0]]
+            cluster_of[position] = root
+            clusters.setdefault(root, [root]).append(position)
+        else:
+            cluster_of[position] = position
+        lsh.insert(position, signature)
+    return list(clusters.values())
+
+
+def main():
+    from jsonl_zstd import open_jobs
+
+    parser = argparse.ArgumentParser(description='Detectar empleos casi duplicados (MinHash + LSH)')
+    parser.add_argument('--entrada', type=str, default="../database/all_jobs.json")
+    parser.add_argument('--umbral', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Similitud mínima (Jaccard estimado) entre descripciones (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--mostrar', type=int, default=10, help='Clusters a mostrar (los más grandes)')
+    args = parser.parse_args()
+
+    _, jobs = open_jobs(args.entrada)
+    jobs = list(jobs or [])
+    clusters = near_duplicate_clusters(jobs, args.umbral)
+    redundant = sum(len(cluster) - 1 for cluster in clusters)
+    bands, rows = lsh_params(args.umbral)
+    print(f"{len(jobs)} empleos, {len(clusters)} grupos de casi duplicados, {redundant} empleos redundantes "
+          f"(umbral {args.umbral}, {bands} bandas x {rows} filas)")
+    for cluster in sorted(clusters, key=len, reverse=True)[:args.mostrar]:
+        first = jobs[cluster[0]]
+        print(f"\n{len(cluster)} empleos: {first.get('titulo', 'Sin título')[:60]}")
+        for position in cluster:
+            job = jobs[position]
+            print(f"   - {job.get('Fuente', 'Unknown')}: {job.get('url', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Parse Pipeline for Web Scrapers
+Decouples fetching from parsing: the scraper only navigates and grabs the page
+HTML (driver.page_source or an HTTP body), and a pool of worker processes
+extracts the fields with lxml using per-portal XPath/CSS rules. The browser
+keeps loading the next posting while the previous ones are parsed on other cores.
+"""
+
+import multiprocessing
+import os
+import re
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# CSS necesita cssselect; las reglas XPath funcionan sin él
+try:
+    from lxml.cssselect import CSSSelector
+    CSS_AVAILABLE = True
+except ImportError:
+    CSS_AVAILABLE = False
+
+# Reglas por portal: campo -> selectores en orden de preferencia (se usa el primero que encuentra algo).
+# Los que empiezan con "/" o "(" son XPath, el resto CSS.
+PORTAL_RULES: Dict[str, Dict[str, List[str]]] = {
+    "computrabajo": {
+        "titulo": ["//h1"],
+        "descripcion": ["/html/body/main/div[2]/div/div[2]/div[4]/p[1]"],
+        "requisitos": ["//*[contains(text(),'Requerimientos')]/following::ul[1]"],
+        "empresa_ubicacion": ["/html/body/main/div[1]/p"],
+        "categoria": ["//*[contains(@class,'breadcrumb')]//a[contains(@href,'/trabajo-de-')]/@href"],
+    },
+}
+
+_BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "br", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section", "article"}
+_SPACES_RE = re.compile(r'[ \t\xa0]+')
+
+# Selectores compilados por proceso (cada worker compila una vez)
+_COMPILED: Dict[str, Any] = {}
+
+
+def _compile(selector: str):
+    compiled = _COMPILED.get(selector)
+    if compiled is None:
+        if selector.startswith(("/", "(")):
+            compiled = lxml.html.etree.XPath(selector)
+        elif CSS_AVAILABLE:
+            compiled = CSSSelector(selector)
+        else:
+            raise ValueError(f"Selector CSS sin cssselect instalado: {selector}")
+        _COMPILED[selector] = compiled
+    return compiled
+
+
+def element_text(element) -> str:
+    """Visible-ish text of an element: one line per block element, like WebElement.text"""
+    parts: List[str] = []
+
+    def walk(node):
+        if not isinstance(node.tag, str) or node.tag in ("script", "style"):
+            if node.tail:
+                parts.append(node.tail)
+            return
+        block = node.tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+        if block:
+            parts.append("\n")
+        if node.tail and node is not element:
+            parts.append(node.tail)
+
+    walk(element)
+    lines = [_SPACES_RE.sub(' ', line).strip() for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def parse_page(portal: str, html: str) -> Dict[str, Optional[str]]:
+    """
+    Extract the fields of one page with the portal rules. Missing fields are None.
+    Runs in the worker processes, so it only takes/returns picklable values.
+    """
+    rules = PORTAL_RULES[portal]
+    doc = lxml.html.fromstring(html)
+    fields: Dict[str, Optional[str]] = {}
+    for field, selectors in rules.items():
+        fields[field] = None
+        for selector in selectors:
+            matches = _compile(selector)(doc)
+            if matches:
+                first = matches[0]
+                text = element_text(first) if hasattr(first, "tag") else str(first).strip()
+                if text:
+                    fields[field] = text
+                    break
+    return fields
+
+
+def _init_worker() -> None:
+    # CTRL+C lo maneja el scraper (guarda checkpoint); los workers solo terminan con el pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _pool_context():
+    """
+    The scrapers are module-level scripts: with "spawn"/"forkserver" the workers would
+    re-import __main__ and run the scraper again, so only "fork" is safe.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+class ParsePool:
+    def __init__(self, portal: str, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        workers: parser processes (default: all cores but one, the browser needs CPU too)
+        max_pending: pages waiting to be parsed before submit() blocks (backpressure)
+        """
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml no está instalado (pip install lxml)")
+        if portal not in PORTAL_RULES:
+            raise KeyError(f"No hay reglas de parseo para {portal}")
+        context = _pool_context()
+        if context is None:
+            raise RuntimeError("El parseo en procesos requiere el start method 'fork' (Linux/macOS)")
+
+        self.portal = portal
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or self.workers * 4
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=_init_worker)
+        self._pending: deque = deque()
+        self.parsed = 0
+        self.errors = 0
+
+    def submit(self, html: str, context: Any) -> List[Tuple[Any, Optional[Dict[str, Optional[str]]]]]:
+        """
+        Queue a page for parsing. Returns the results that are already finished, in
+        submission order, as (context, fields) with fields None if parsing failed.
+        """
+        self._pending.append((self.executor.submit(parse_page, self.portal, html), context))
+        return self._collect(block=len(self._pending) >= self.max_pending)
+
+    def _collect(self, block: bool = False, all_pending: bool = False) -> List[Tuple[Any, Optional[Dict[str, Optional[str]]]]]:
+        results = []
+        while self._pending:
+            future, context = self._pending[0]
+            if not (future.done() or block or all_pending):
+                break
+            self._pending.popleft()
+            block = False
+            try:
+                results.append((context, future.result()))
+                self.parsed += 1
+            except Exception:
+                results.append((context, None))
+                self.errors += 1
+        return results
+
+    def drain(self) -> List[Tuple[Any, Optional[Dict[str, Optional[str]]]]]:
+        """Wait for every page still being parsed"""
+        return self._collect(all_pending=True)
+
+    def close(self) -> None:
+        for future, _ in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self.executor.shutdown(wait=True)
+
+
+def create_parse_pool(portal: str, workers: int) -> Optional[ParsePool]:
+    """ParsePool if enabled (workers > 0) and lxml is available, else None (inline parsing)"""
+    if workers <= 0:
+        return None
+    if not LXML_AVAILABLE:
+        print("lxml no disponible: se parsea en el proceso del navegador")
+        return None
+    if _pool_context() is None:
+        print("Parseo en procesos no soportado en esta plataforma: se parsea en el proceso del navegador")
+        return None
+    pool = ParsePool(portal, workers=workers)
+    print(f"Parseo desacoplado: {pool.workers} procesos con lxml")
+    return pool
+
+
+def add_parse_arguments(parser) -> None:
+    """Common CLI flag for the decoupled parse stage"""
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Procesos que parsean el HTML con lxml mientras el navegador sigue navegando (0 = desactivado)')
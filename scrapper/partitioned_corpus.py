@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Partitioned Corpus
+The unified corpus written as a dataset partitioned by portal and month
+(database/corpus/fuente=<Fuente>/fecha=YYYY-MM/part-0.jsonl.zst, Hive-style
+directory names) with a small catalog (_catalog.json: jobs, bytes and date
+range of every partition). Consumers that only need some portals or months
+(process_jobs.py --fuente/--desde/--hasta, the visualizer's corpus filters)
+read the catalog and open only the matching partitions instead of globbing
+output_jobs/ or loading all of all_jobs.json.
+
+unify_jobs.py builds it from all_jobs.json the first time and afterwards only
+adds the jobs each run emits (update): they are appended to their partitions
+(new zstd frames or lines, nothing is recompressed), only the partitions that
+held a superseded revision of an edited posting are rewritten, and the catalog
+entries of the touched partitions are updated (--sin-particiones skips it).
+`construir` rebuilds the whole corpus, written next to the old one and swapped
+in at the end. Partitions are .jsonl.zst (jsonl_zstd.py) when zstandard is
+installed, .jsonl otherwise.
+
+Usage:
+    python partitioned_corpus.py construir [--entrada ../database/all_jobs.json]
+    python partitioned_corpus.py catalogo [--fuente Computrabajo] [--desde 2026-01] [--hasta 2026-03]
+    python partitioned_corpus.py exportar --salida semana.json --fuente Computrabajo --desde 2026-10-12
+"""
+
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from job_store import iso_date
+from jsonl_zstd import ZSTD_AVAILABLE, ZstdJsonlWriter, is_zstd, iter_jobs as iter_zstd_jobs
+
+DEFAULT_ROOT = "../database/corpus"
+CATALOG_FILE = "_catalog.json"
+# Partición de los empleos sin fuente o sin fecha reconocible
+UNKNOWN = "desconocida"
+PART_FILE = "part-0" + (".jsonl.zst" if ZSTD_AVAILABLE else ".jsonl")
+
+
+def partition_of(job: Dict[str, Any]) -> Tuple[str, str]:
+    """(fuente, YYYY-MM) of a job"""
+    fecha = iso_date(job.get("fecha")) or ""
+    month = fecha[:7] if len(fecha) >= 7 and fecha[4] == "-" else UNKNOWN
+    return job.get("Fuente") or UNKNOWN, month
+
+
+def partition_dir(fuente: str, month: str) -> str:
+    """Hive-style relative directory; the value is escaped so any portal name is a valid path"""
+    return os.path.join(f"fuente={quote(fuente, safe=' ')}", f"fecha={month}")
+
+
+class _JsonlWriter:
+    """
+    Plain .jsonl partition, with the writer interface of ZstdJsonlWriter: written under a
+    temporary name, or appended in place with append=True (abort() truncates back)
+    """
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.count = 0
+        self.appended = 0
+        self.tmp_path = None if append else path + ".tmp"
+        self._f = open(path if append else self.tmp_path, 'ab' if append else 'wb')
+        self._start = self._f.tell()
+
+    def write(self, item: Dict[str, Any]) -> None:
+        self._f.write((json.dumps(item, ensure_ascii=False) + "\n").encode('utf-8'))
+        self.count += 1
+        self.appended += 1
+
+    def close(self) -> None:
+        self._f.close()
+        if self.tmp_path:
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        if self.tmp_path:
+            self._f.close()
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+            return
+        # Append en el lugar: volver a dejar el final original
+        if self._f.closed:
+            self._f = open(self.path, 'r+b')
+        self._f.truncate(self._start)
+        self._f.close()
+
+
+def _open_writer(path: str, append: bool = False):
+    return ZstdJsonlWriter(path, append=append) if is_zstd(path) else _JsonlWriter(path, append=append)
+
+
+def _read_partition(path: str) -> Iterator[Dict[str, Any]]:
+    return iter_zstd_jobs(path) if is_zstd(path) else _iter_jsonl(path)
+
+
+def _merge_dates(dates: List[Optional[str]], fecha: Optional[str]) -> List[Optional[str]]:
+    if not fecha:
+        return dates
+    first, last = dates
+    return [min(first or fecha, fecha), max(last or fecha, fecha)]
+
+
+def _write_catalog(root: str, catalog: Dict[str, Any]) -> None:
+    tmp_path = os.path.join(root, CATALOG_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(root, CATALOG_FILE))
+
+
+def build(jobs: Iterable[Dict[str, Any]], root: str = DEFAULT_ROOT, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write the jobs as a partitioned dataset under `root` and return its catalog.
+    Everything goes to <root>.tmp first; the old corpus is replaced only when the new one is complete.
+    """
+    tmp_root = root.rstrip("/\\") + ".tmp"
+    if os.path.exists(tmp_root):
+        shutil.rmtree(tmp_root)
+    writers: Dict[Tuple[str, str], Any] = {}
+    dates: Dict[Tuple[str, str], List[str]] = {}
+    try:
+        for job in jobs:
+            key = partition_of(job)
+            writer = writers.get(key)
+            if writer is None:
+                directory = os.path.join(tmp_root, partition_dir(*key))
+                os.makedirs(directory, exist_ok=True)
+                writer = writers[key] = _open_writer(os.path.join(directory, PART_FILE))
+                dates[key] = [None, None]
+            writer.write(job)
+            dates[key] = _merge_dates(dates[key], iso_date(job.get("fecha")))
+        for writer in writers.values():
+            writer.close()
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        raise
+
+    partitions = []
+    for (fuente, month), writer in sorted(writers.items()):
+        relative = os.path.join(partition_dir(fuente, month), PART_FILE)
+        partitions.append({"fuente": fuente, "mes": month, "path": relative.replace(os.sep, "/"),
+                           "jobs": writer.count, "bytes": os.path.getsize(os.path.join(tmp_root, relative)),
+                           "first_date": dates[(fuente, month)][0], "last_date": dates[(fuente, month)][1]})
+    catalog = {"built_at": datetime.now().isoformat(), "source": source,
+               "jobs": sum(p["jobs"] for p in partitions), "partitions": partitions}
+    os.makedirs(tmp_root, exist_ok=True)
+    _write_catalog(tmp_root, catalog)
+
+    # Cambio de corpus: el viejo queda a un lado hasta que el nuevo está en su lugar
+    old_root = root.rstrip("/\\") + ".old"
+    if os.path.exists(old_root):
+        shutil.rmtree(old_root)
+    if os.path.exists(root):
+        os.rename(root, old_root)
+    os.rename(tmp_root, root)
+    shutil.rmtree(old_root, ignore_errors=True)
+    return catalog
+
+
+def update(jobs: Iterable[Dict[str, Any]], root: str = DEFAULT_ROOT,
+           removed: Optional[Dict[str, Dict[str, Any]]] = None, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Add the jobs of one unification to an existing corpus and return the updated catalog.
+    removed: hash -> job stub (Fuente and fecha, enough for partition_of) of superseded revisions;
+    only their partitions are rewritten without them. The new jobs are appended to their
+    partitions in place (a failure restores every appended partition) and the catalog entries
+    of the touched partitions are updated. Cost proportional to the new jobs and the rewritten partitions.
+    """
+    catalog = load_catalog(root)
+    if catalog is None:
+        raise FileNotFoundError(f"No hay catálogo de particiones en {root} (correr construir)")
+    entries = {(p["fuente"], p["mes"]): p for p in catalog["partitions"]}
+
+    # Revisiones reemplazadas: se reescriben solo las particiones donde estaban
+    removed = removed or {}
+    for key in sorted({partition_of(stub) for stub in removed.values()}):
+        entry = entries.get(key)
+        if entry is None:
+            continue
+        path = os.path.join(root, entry["path"])
+        writer = _open_writer(path)
+        dates: List[Optional[str]] = [None, None]
+        try:
+            for job in _read_partition(path):
+                if job.get("hash Descripcion") in removed:
+                    continue
+                writer.write(job)
+                dates = _merge_dates(dates, iso_date(job.get("fecha")))
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        if writer.count == 0:
+            # Partición vacía: sale del catálogo
+            os.remove(path)
+            os.removedirs(os.path.dirname(path))
+            del entries[key]
+            continue
+        entry.update({"jobs": writer.count, "bytes": os.path.getsize(path),
+                      "first_date": dates[0], "last_date": dates[1]})
+
+    writers: Dict[Tuple[str, str], Any] = {}
+    dates_by_key: Dict[Tuple[str, str], List[Optional[str]]] = {}
+    try:
+        for job in jobs:
+            key = partition_of(job)
+            writer = writers.get(key)
+            if writer is None:
+                entry = entries.get(key)
+                if entry is None:
+                    relative = os.path.join(partition_dir(*key), PART_FILE)
+                    entry = entries[key] = {"fuente": key[0], "mes": key[1], "path": relative.replace(os.sep, "/"),
+                                            "jobs": 0, "bytes": 0, "first_date": None, "last_date": None}
+                path = os.path.join(root, entry["path"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                writer = writers[key] = _open_writer(path, append=True)
+                dates_by_key[key] = [entry["first_date"], entry["last_date"]]
+            writer.write(job)
+            dates_by_key[key] = _merge_dates(dates_by_key[key], iso_date(job.get("fecha")))
+        for writer in writers.values():
+            writer.close()
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+
+    for key, writer in writers.items():
+        entry = entries[key]
+        entry.update({"jobs": entry["jobs"] + writer.appended, "bytes": os.path.getsize(writer.path),
+                      "first_date": dates_by_key[key][0], "last_date": dates_by_key[key][1]})
+    catalog["partitions"] = [entries[key] for key in sorted(entries)]
+    catalog["jobs"] = sum(p["jobs"] for p in catalog["partitions"])
+    catalog["updated_at"] = datetime.now().isoformat()
+    if source:
+        catalog["source"] = source
+    _write_catalog(root, catalog)
+    return catalog
+
+
+def load_catalog(root: str = DEFAULT_ROOT) -> Optional[Dict[str, Any]]:
+    path = os.path.join(root, CATALOG_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def select_partitions(catalog: Dict[str, Any], fuentes: Optional[Sequence[str]] = None,
+                      desde: Optional[str] = None, hasta: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Catalog entries matching the filters. desde / hasta are YYYY-MM or YYYY-MM-DD (inclusive) and
+    prune by month; partitions without a known month only match when there is no date filter.
+    """
+    selected = []
+    for partition in catalog.get("partitions", []):
+        if fuentes and partition["fuente"] not in fuentes:
+            continue
+        month = partition["mes"]
+        if (desde or hasta) and month == UNKNOWN:
+            continue
+        if desde and month < desde[:7]:
+            continue
+        if hasta and month > hasta[:7]:
+            continue
+        selected.append(partition)
+    return selected
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_jobs(root: str = DEFAULT_ROOT, fuentes: Optional[Sequence[str]] = None,
+              desde: Optional[str] = None, hasta: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Jobs of the matching partitions only; a day-precision desde / hasta also filters the jobs of the edge months"""
+    catalog = load_catalog(root)
+    if catalog is None:
+        raise FileNotFoundError(f"No hay catálogo de particiones en {root} (correr unify_jobs.py)")
+    for partition in select_partitions(catalog, fuentes, desde, hasta):
+        path = os.path.join(root, partition["path"])
+        for job in _read_partition(path):
+            fecha = iso_date(job.get("fecha")) or ""
+            if desde and len(desde) > 7 and fecha < desde:
+                continue
+            if hasta and len(hasta) > 7 and fecha > hasta:
+                continue
+            yield job
+
+
+def main():
+    from jsonl_zstd import open_jobs
+    from unify_jobs import JsonArrayWriter
+
+    parser = argparse.ArgumentParser(description='Corpus particionado por fuente y mes')
+    parser.add_argument('--raiz', type=str, default=DEFAULT_ROOT, help=f'Carpeta del corpus (default: {DEFAULT_ROOT})')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    construir = sub.add_parser('construir', help='Rehacer el corpus desde all_jobs.json')
+    construir.add_argument('--entrada', type=str, default="../database/all_jobs.json")
+    catalogo = sub.add_parser('catalogo', help='Particiones (filtradas) con empleos, tamaño y fechas')
+    exportar = sub.add_parser('exportar', help='Escribir los empleos de las particiones elegidas como JSON')
+    exportar.add_argument('--salida', type=str, required=True)
+    for command in (catalogo, exportar):
+        command.add_argument('--fuente', type=str, action='append', default=None, help='Se puede repetir')
+        command.add_argument('--desde', type=str, default=None, help='YYYY-MM o YYYY-MM-DD')
+        command.add_argument('--hasta', type=str, default=None, help='YYYY-MM o YYYY-MM-DD')
+    args = parser.parse_args()
+
+    if args.comando == 'construir':
+        _, jobs = open_jobs(args.entrada)
+        catalog = build(jobs or [], args.raiz, source=args.entrada)
+        print(f"{catalog['jobs']} empleos en {len(catalog['partitions'])} particiones ({args.raiz})")
+    elif args.comando == 'catalogo':
+        catalog = load_catalog(args.raiz)
+        if catalog is None:
+            print(f"No hay catálogo en {args.raiz}")
+            raise SystemExit(1)
+        partitions = select_partitions(catalog, args.fuente, args.desde, args.hasta)
+        for p in partitions:
+            print(f"{p['fuente']:<25} {p['mes']:<12} {p['jobs']:>8,} empleos  {p['bytes'] / 1024:>9.1f} KB  "
+                  f"{p['first_date'] or '-'} .. {p['last_date'] or '-'}")
+        print(f"\n{len(partitions)} de {len(catalog['partitions'])} particiones, "
+              f"{sum(p['jobs'] for p in partitions):,} de {catalog['jobs']:,} empleos (construido {catalog['built_at'][:16]})")
+    elif args.comando == 'exportar':
+        writer = ZstdJsonlWriter(args.salida) if is_zstd(args.salida) else JsonArrayWriter(args.salida)
+        try:
+            for job in iter_jobs(args.raiz, args.fuente, args.desde, args.hasta):
+                writer.write(job)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        print(f"{writer.count} empleos exportados a {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
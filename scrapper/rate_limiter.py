@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter for Web Scrapers
+Shared token-bucket limiter so every request to a portal (HTTP or browser) goes through the same pacing
+"""
+
+import random
+import threading
+import time
+from typing import Dict
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0, max_interval: float = 60.0):
+        """
+        rate: requests per second allowed on average
+        burst: how many requests can go out back to back
+        jitter: extra random delay (seconds) added on top of each wait
+        max_interval: upper bound for the interval after repeated penalties
+        """
+        self.base_interval = 1.0 / rate
+        self.interval = self.base_interval
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self.max_interval = max_interval
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_waited = 0.0
+        self.total_requests = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        self._tokens = min(self.burst, self._tokens + elapsed / self.interval)
+        self._last = now
+
+    def acquire(self) -> float:
+        """Block until a request is allowed. Returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0
+            if self._tokens < 1:
+                wait = (1 - self._tokens) * self.interval
+            self._tokens -= 1
+            if self.jitter:
+                wait += random.uniform(0, self.jitter)
+            self.total_waited += wait
+            self.total_requests += 1
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, factor: float = 2.0) -> None:
+        """Slow down after a 429/ban signal from the portal"""
+        with self._lock:
+            self.interval = min(self.max_interval, self.interval * factor)
+            self._tokens = 0.0
+
+    def reward(self, factor: float = 0.9) -> None:
+        """Move back towards the base pace after a successful request"""
+        with self._lock:
+            self.interval = max(self.base_interval, self.interval * factor)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.total_requests,
+            "waited_seconds": round(self.total_waited, 2),
+            "current_interval": round(self.interval, 2)
+        }
+
+
+# Registro por proceso: todos los módulos que pidan el mismo nombre comparten limitador
+_LIMITERS: Dict[str, RateLimiter] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float = 0.5, burst: int = 1, jitter: float = 0.0) -> RateLimiter:
+    """
+    Get (or create) the shared limiter for a portal
+    Parameters are only used the first time the limiter is created
+    """
+    with _REGISTRY_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = RateLimiter(rate, burst=burst, jitter=jitter)
+            _LIMITERS[name] = limiter
+        return limiter
+
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Posting Revision Store
+Keeps one entry per posting (portal + URL) with its revision history, so an
+edited posting becomes a new revision of the same job instead of a second
+"unique" job. Only the latest text is stored in full; every older revision
+keeps its content hash and a compact word-level diff that rebuilds it from the
+next one. unify_jobs.py records every job it reads and emits the latest
+revision of each posting; postings whose content did not change since the
+last unification are not emitted again.
+
+Usage:
+    python revision_store.py stats
+    python revision_store.py historial <url> [--fuente Computrabajo]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+from incremental import normalize_url
+
+DEFAULT_DB = "checkpoints/revisions.db"
+
+NEW = "new"
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+
+# Palabras y separadores: al unir los tokens se recupera el texto exacto
+_TOKEN_RE = re.compile(r'(\s+)')
+
+
+def posting_key(job: Dict[str, Any]) -> Optional[str]:
+    """Portal + normalized URL, or None for jobs without URL (those are only deduplicated by hash)"""
+    url = job.get("url")
+    if not url:
+        return None
+    return f"{job.get('Fuente', 'Unknown')}|{normalize_url(url)}"
+
+
+def make_diff(new_text: str, old_text: str) -> List[Any]:
+    """
+    Compact diff that rebuilds old_text from new_text: [start, end] copies a run of
+    tokens of the new text, a string is literal text of the old one.
+    """
+    new_tokens = _TOKEN_RE.split(new_text)
+    old_tokens = _TOKEN_RE.split(old_text)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, new_tokens, old_tokens, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(old_tokens[j1:j2]))
+    return ops
+
+
+def apply_diff(new_text: str, ops: List[Any]) -> str:
+    new_tokens = _TOKEN_RE.split(new_text)
+    return "".join("".join(new_tokens[op[0]:op[1]]) if isinstance(op, list) else op for op in ops)
+
+
+class RevisionStore:
+    def __init__(self, path: str = DEFAULT_DB):
+        """
+        Changes are kept in an open transaction until commit(), so a unification
+        that fails before writing its output does not mark postings as emitted.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS postings (
+                key TEXT PRIMARY KEY,
+                latest_hash TEXT NOT NULL,
+                latest_text TEXT NOT NULL,
+                revisions INTEGER NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS revisions (
+                key TEXT NOT NULL,
+                rev INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                seen TEXT NOT NULL,
+                diff TEXT,
+                PRIMARY KEY (key, rev)
+            );
+        """)
+        self._conn.commit()
+        self.stats = {NEW: 0, UNCHANGED: 0, CHANGED: 0}
+
+    def record(self, key: str, text: str, content_hash: str, seen: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Register the current content of a posting. Returns (status, revision) where status
+        is "new", "unchanged" (same hash as the latest revision) or "changed".
+        """
+        seen = seen or datetime.now().strftime("%d/%m/%Y")
+        text = text or ""
+        row = self._conn.execute("SELECT latest_hash, latest_text, revisions FROM postings WHERE key = ?",
+                                 (key,)).fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO postings VALUES (?, ?, ?, 1, ?, ?)", (key, content_hash, text, seen, seen))
+            self._conn.execute("INSERT INTO revisions VALUES (?, 1, ?, ?, NULL)", (key, content_hash, seen))
+            self.stats[NEW] += 1
+            return NEW, 1
+
+        if row["latest_hash"] == content_hash:
+            self._conn.execute("UPDATE postings SET last_seen = ? WHERE key = ?", (seen, key))
+            self.stats[UNCHANGED] += 1
+            return UNCHANGED, row["revisions"]
+
+        # La revisión que era la última guarda el diff para reconstruirse desde la nueva
+        revision = row["revisions"] + 1
+        diff = json.dumps(make_diff(text, row["latest_text"]), ensure_ascii=False)
+        self._conn.execute("UPDATE revisions SET diff = ? WHERE key = ? AND rev = ?", (diff, key, row["revisions"]))
+        self._conn.execute("INSERT INTO revisions VALUES (?, ?, ?, ?, NULL)", (key, revision, content_hash, seen))
+        self._conn.execute("UPDATE postings SET latest_hash = ?, latest_text = ?, revisions = ?, last_seen = ? WHERE key = ?",
+                           (content_hash, text, revision, seen, key))
+        self.stats[CHANGED] += 1
+        return CHANGED, revision
+
+    def history(self, key: str) -> List[Dict[str, Any]]:
+        """Every revision of a posting, newest first, with its text rebuilt"""
+        row = self._conn.execute("SELECT latest_text FROM postings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return []
+        text = row["latest_text"]
+        result = []
+        for rev in self._conn.execute("SELECT rev, hash, seen, diff FROM revisions WHERE key = ? ORDER BY rev DESC", (key,)):
+            if rev["diff"] is not None:
+                text = apply_diff(text, json.loads(rev["diff"]))
+            result.append({"revision": rev["rev"], "hash": rev["hash"], "fecha": rev["seen"], "texto": text})
+        return result
+
+    def revision_hashes(self, key: str, before: int) -> List[Tuple[str, str]]:
+        """(content hash, date seen) of the revisions of a posting older than `before`"""
+        return [(row["hash"], row["seen"]) for row in
+                self._conn.execute("SELECT hash, seen FROM revisions WHERE key = ? AND rev < ?", (key, before))]
+
+    def find(self, url: str, source: Optional[str] = None) -> List[str]:
+        """Keys of the postings with this URL (in every portal unless `source` is given)"""
+        path = normalize_url(url)
+        if source:
+            return [f"{source}|{path}"]
+        return [row[0] for row in self._conn.execute("SELECT key FROM postings WHERE key LIKE ?", (f"%|{path}",))]
+
+    def summary(self) -> Dict[str, int]:
+        postings, edited = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(revisions > 1), 0) FROM postings").fetchone()
+        revisions = self._conn.execute("SELECT COUNT(*) FROM revisions").fetchone()[0]
+        return {"postings": postings, "edited_postings": edited, "revisions": revisions}
+
+    def savepoint(self) -> None:
+        """Mark the start of one input file, so a file that turns out to be invalid can be undone alone"""
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+        self._conn.execute("SAVEPOINT input_file")
+        self._stats_mark = dict(self.stats)
+
+    def release_savepoint(self) -> None:
+        self._conn.execute("RELEASE SAVEPOINT input_file")
+
+    def rollback_savepoint(self) -> None:
+        self._conn.execute("ROLLBACK TO SAVEPOINT input_file")
+        self._conn.execute("RELEASE SAVEPOINT input_file")
+        self.stats = self._stats_mark
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Historial de revisiones de avisos')
+    parser.add_argument('--db', type=str, default=DEFAULT_DB, help=f'Base de revisiones (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('stats', help='Avisos, avisos editados y revisiones guardadas')
+    historial = sub.add_parser('historial', help='Mostrar las revisiones de un aviso')
+    historial.add_argument('url', type=str)
+    historial.add_argument('--fuente', type=str, default=None, help='"Fuente" del aviso (default: buscar en todas)')
+    args = parser.parse_args()
+
+    store = RevisionStore(args.db)
+    if args.comando == 'stats':
+        print(json.dumps(store.summary(), indent=2))
+    elif args.comando == 'historial':
+        for key in store.find(args.url, args.fuente):
+            print(f"{key}:")
+            for rev in store.history(key):
+                print(f"  Revisión {rev['revision']} ({rev['fecha']}, {rev['hash'][:8]}): {rev['texto'][:200]}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Sitemap Discovery for Web Scrapers
+Finds job URLs from the portal's XML sitemaps instead of paginating category listings.
+Sitemap indexes are streamed with an incremental parser (iterparse, elements cleared as
+they are read), child sitemaps whose <lastmod> did not change since the last run are
+skipped, and only URLs missing from the seen-index are returned. Returns None on any
+failure so the caller can fall back to listing pagination.
+"""
+
+import gzip
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+from incremental import SeenIndex, normalize_url
+from rate_limiter import get_rate_limiter
+
+STATE_FILE = "sitemap_state.json"
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# Portales con sitemap: robots.txt (de donde salen los sitemaps declarados) y patrón de URL de empleo.
+# "sitemaps" permite fijar URLs a mano si robots.txt no las declara.
+SITEMAP_CONFIG: Dict[str, Dict] = {
+    "computrabajo": {
+        "robots": "https://ar.computrabajo.com/robots.txt",
+        "sitemaps": [],
+        "job_pattern": r'/ofertas-de-trabajo/oferta-de-trabajo-de-',
+    },
+}
+
+_SITEMAP_LINE_RE = re.compile(r'^\s*sitemap\s*:\s*(\S+)', re.I | re.M)
+
+
+def _local(tag: str) -> str:
+    """Tag name without the sitemap namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_lastmod(value: Optional[str]) -> Optional[date]:
+    """<lastmod> is W3C datetime; day precision is enough to compare runs"""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+class SitemapDiscovery:
+    def __init__(self, portal: str, index: SeenIndex, max_age_days: int = 30, rate: float = 1.0,
+                 state_dir: str = "checkpoints", timeout: int = 30):
+        """
+        portal: key in SITEMAP_CONFIG
+        index: seen-index of the portal (IncrementalCrawl.index), URLs in it are not returned
+        max_age_days: URLs whose lastmod is older than this are ignored (expired postings)
+        """
+        self.portal = portal
+        self.config = SITEMAP_CONFIG.get(portal)
+        self.index = index
+        self.max_age_days = max_age_days
+        self.timeout = timeout
+        self.limiter = get_rate_limiter(f"{portal}_sitemap", rate=rate, jitter=0.3)
+        self.state_file = os.path.join(state_dir, STATE_FILE)
+        self._pending_state: Dict[str, str] = {}
+        self.stats = {"sitemaps": 0, "skipped_sitemaps": 0, "urls": 0, "known": 0, "old": 0, "new": 0}
+
+        os.makedirs(state_dir, exist_ok=True)
+        self._state = self._load_state()
+        self.session = None
+        if REQUESTS_AVAILABLE:
+            self.session = requests.Session()
+            self.session.headers.update({"User-Agent": USER_AGENT})
+
+    def _load_state(self) -> Dict:
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f" Error cargando estado de sitemaps, se ignora: {e}")
+        return {}
+
+    def _sitemap_lastmods(self) -> Dict[str, str]:
+        return self._state.get(self.portal, {}).get("sitemaps", {})
+
+    def _open(self, url: str):
+        """Streamed response body (decompressed) ready for iterparse"""
+        self.limiter.acquire()
+        response = self.session.get(url, stream=True, timeout=self.timeout)
+        if response.status_code == 429:
+            self.limiter.penalize()
+        response.raise_for_status()
+        response.raw.decode_content = True
+        content_type = response.headers.get("Content-Type", "")
+        if url.endswith(".gz") or "gzip" in content_type:
+            return gzip.GzipFile(fileobj=response.raw)
+        return response.raw
+
+    def _root_sitemaps(self) -> List[str]:
+        sitemaps = list(self.config.get("sitemaps", []))
+        robots = self.config.get("robots")
+        if robots:
+            self.limiter.acquire()
+            response = self.session.get(robots, timeout=self.timeout)
+            if response.status_code == 200:
+                sitemaps += [s for s in _SITEMAP_LINE_RE.findall(response.text) if s not in sitemaps]
+        return sitemaps
+
+    def _iter_entries(self, url: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """
+        Yield (kind, loc, lastmod) for every <sitemap> (kind "sitemap") or <url> (kind "url")
+        entry, clearing each element once read so memory stays flat on huge files.
+        """
+        stream = self._open(url)
+        loc = lastmod = None
+        try:
+            for _, elem in ET.iterparse(stream, events=("end",)):
+                tag = _local(elem.tag)
+                if tag == "loc":
+                    loc = (elem.text or "").strip()
+                elif tag == "lastmod":
+                    lastmod = (elem.text or "").strip()
+                elif tag in ("url", "sitemap"):
+                    if loc:
+                        yield tag, loc, lastmod
+                    loc = lastmod = None
+                    elem.clear()
+        finally:
+            stream.close()
+
+    def _walk(self, url: str, pattern, cutoff: date, seen: set, found: List[str], depth: int = 0) -> None:
+        self.stats["sitemaps"] += 1
+        children: List[Tuple[str, Optional[str]]] = []
+        for kind, loc, lastmod in self._iter_entries(url):
+            if kind == "sitemap":
+                if depth >= 3:
+                    continue
+                # Sitemap hijo sin cambios desde la última corrida: todo lo que tiene ya fue visto
+                previous = self._sitemap_lastmods().get(loc)
+                if lastmod and previous == lastmod:
+                    self.stats["skipped_sitemaps"] += 1
+                    continue
+                lastmod_date = _parse_lastmod(lastmod)
+                if lastmod_date and lastmod_date < cutoff:
+                    self.stats["skipped_sitemaps"] += 1
+                    continue
+                children.append((loc, lastmod))
+                continue
+
+            if not pattern.search(loc):
+                continue
+            self.stats["urls"] += 1
+            lastmod_date = _parse_lastmod(lastmod)
+            if lastmod_date and lastmod_date < cutoff:
+                self.stats["old"] += 1
+                continue
+            key = normalize_url(loc)
+            if key in seen or self.index.contains_url(loc):
+                self.stats["known"] += 1
+                continue
+            seen.add(key)
+            found.append(loc)
+
+        # Los hijos se leen después de cerrar el índice (no dejar la conexión abierta mientras tanto)
+        for loc, lastmod in children:
+            self._walk(loc, pattern, cutoff, seen, found, depth + 1)
+            if lastmod:
+                self._pending_state[loc] = lastmod
+
+    def discover(self) -> Optional[List[str]]:
+        """New job URLs from the sitemaps, or None if this portal has to use listing pagination"""
+        if not self.config:
+            print(f" {self.portal}: sin sitemap configurado, se usa paginación de listados")
+            return None
+        if not REQUESTS_AVAILABLE:
+            print(" requests no está instalado: se usa paginación de listados")
+            return None
+
+        pattern = re.compile(self.config["job_pattern"])
+        cutoff = date.today() - timedelta(days=self.max_age_days)
+        found: List[str] = []
+        try:
+            roots = self._root_sitemaps()
+            if not roots:
+                print(f" {self.portal}: no se encontraron sitemaps, se usa paginación de listados")
+                return None
+            for root in roots:
+                self._walk(root, pattern, cutoff, set(), found)
+        except (requests.RequestException, ET.ParseError, OSError, EOFError) as e:
+            print(f" Error leyendo sitemaps ({e}): se usa paginación de listados")
+            self._pending_state = {}
+            return None
+
+        s = self.stats
+        s["new"] = len(found)
+        print(f" Sitemaps: {s['sitemaps']} leídos, {s['skipped_sitemaps']} sin cambios | "
+              f"URLs de empleo: {s['urls']}, conocidas {s['known']}, viejas {s['old']}, nuevas {len(found)}")
+        return found
+
+    def commit(self) -> None:
+        """
+        Persist the lastmod of the child sitemaps that were read. Call it only after the
+        discovered URLs were processed, so an interrupted run reads them again next time.
+        """
+        if not self._pending_state:
+            return
+        portal_state = self._state.setdefault(self.portal, {"sitemaps": {}})
+        portal_state.setdefault("sitemaps", {}).update(self._pending_state)
+        portal_state["updated"] = datetime.now().isoformat()
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.state_file)
+        self._pending_state = {}
+
+
+def add_sitemap_arguments(parser) -> None:
+    """Common CLI flags for sitemap discovery"""
+    parser.add_argument('--descubrimiento', choices=['listado', 'sitemap'], default='listado',
+                        help='Cómo encontrar URLs de empleos: paginando listados (default) o leyendo los sitemaps XML')
+    parser.add_argument('--sitemap-dias', type=int, default=30,
+                        help='Ignorar URLs del sitemap con lastmod más viejo que N días (default: 30)')
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tab Pipeline for Web Scrapers
+Keeps 2-3 extra browser tabs per driver so the next job detail pages are already
+loading while the current one is being extracted. The listing stays in the main tab.
+Loads are started with a non-blocking location change and paced with the shared
+rate limiter, so the portal never sees more than `depth` pages in flight nor
+navigations closer than its usual pacing.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from rate_limiter import get_rate_limiter
+
+MAX_DEPTH = 3
+
+
+class TabPipeline:
+    def __init__(self, portal: str, depth: int = 1, interval: float = 1.0, ready: Optional[Tuple[str, str]] = None,
+                 timeout: float = 10.0):
+        """
+        depth: detail pages in flight per driver, each in its own tab next to the listing tab
+               (1 = disabled, the caller navigates as always; max 3)
+        interval: average seconds between navigation starts (the portal's usual pacing)
+        ready: locator that marks a detail page as usable (e.g. (By.TAG_NAME, "h1")),
+               default is document.readyState == "complete"
+        """
+        self.depth = max(1, min(depth, MAX_DEPTH))
+        self.enabled = self.depth > 1
+        self.ready = ready
+        self.timeout = timeout
+        self.limiter = get_rate_limiter(f"{portal}_detalle", rate=1.0 / max(interval, 0.1), jitter=0.3)
+        self._session = None
+        self._main = None
+        self._tabs = []
+        self.driver = None
+        self.prefetched = 0
+        self.waited = 0.0
+
+    def _ensure_tabs(self, driver) -> None:
+        """Open the extra tabs once per driver (a recreated driver gets new ones)"""
+        if self._session == driver.session_id:
+            return
+        self._session = driver.session_id
+        self._main = driver.current_window_handle
+        self._tabs = [self._main]
+        for _ in range(self.depth):
+            driver.switch_to.new_window('tab')
+            self._tabs.append(driver.current_window_handle)
+        driver.switch_to.window(self._main)
+
+    def _start(self, driver, handle: str, url: str) -> bool:
+        """Begin loading url in handle without waiting for it"""
+        self.limiter.acquire()
+        try:
+            driver.switch_to.window(handle)
+            driver.execute_script("window.location.href = arguments[0];", url)
+            return True
+        except WebDriverException:
+            return False
+
+    def _wait(self, driver) -> None:
+        start = time.time()
+        try:
+            if self.ready:
+                WebDriverWait(driver, self.timeout).until(EC.presence_of_element_located(self.ready))
+            else:
+                WebDriverWait(driver, self.timeout).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete")
+        except TimeoutException:
+            pass
+        self.waited += time.time() - start
+
+    def iterate(self, driver, items: Iterable[Any], url_of: Callable[[Any], str] = lambda item: item,
+                health: Optional[Callable[[Any], Any]] = None) -> Iterator[Tuple[int, Any]]:
+        """
+        Yield (i, item) like enumerate(items). When enabled, the driver is already on the
+        item's page (loaded in its tab) at each yield and the following items are loading
+        in the other tabs; when disabled nothing is navigated.
+        health: session check run before each item that returns the driver to use (the same
+                one, or a new one if the session was lost, e.g. recrear_driver_si_necesario).
+                The driver to use at each yield is `self.driver`.
+        """
+        self.driver = driver
+        if not self.enabled:
+            for i, item in enumerate(items):
+                if health:
+                    self.driver = health(self.driver)
+                yield i, item
+            return
+
+        self._ensure_tabs(driver)
+        pending = deque(enumerate(items))
+        in_flight = deque()
+        free = deque(self._tabs[1:])
+
+        def fill():
+            while free and pending:
+                nxt = pending.popleft()
+                handle = free.popleft()
+                started = self._start(self.driver, handle, url_of(nxt[1]))
+                in_flight.append((nxt, handle, started))
+
+        try:
+            fill()
+            while in_flight:
+                if health:
+                    nuevo = health(self.driver)
+                    if nuevo is not self.driver:
+                        # Sesión recreada: lo que estaba cargando se vuelve a pedir en las pestañas nuevas
+                        pending.extendleft(reversed([entry for entry, _, _ in in_flight]))
+                        in_flight.clear()
+                        self.driver = nuevo
+                        self._ensure_tabs(nuevo)
+                        free.clear()
+                        free.extend(self._tabs[1:])
+                        fill()
+                (i, item), handle, started = in_flight.popleft()
+                self.driver.switch_to.window(handle)
+                if started:
+                    self.prefetched += 1
+                else:
+                    # No se pudo arrancar en segundo plano: navegar como siempre
+                    self.driver.get(url_of(item))
+                self._wait(self.driver)
+                yield i, item
+                free.append(handle)
+                fill()
+        finally:
+            # El listado sigue en la pestaña principal; las demás pueden quedar cargando
+            try:
+                for handle in self._tabs[1:]:
+                    self.driver.switch_to.window(handle)
+                    self.driver.execute_script("window.stop();")
+                self.driver.switch_to.window(self._main)
+            except WebDriverException:
+                pass
+
+    def close(self, driver) -> None:
+        """Close the extra tabs"""
+        if not self.enabled or self._session != getattr(driver, "session_id", None):
+            return
+        try:
+            for handle in self._tabs[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(self._main)
+        except WebDriverException:
+            pass
+        self._session = None
+        self._tabs = []
+
+
+def add_tab_arguments(parser) -> None:
+    """Common CLI flag for tab pipelining"""
+    parser.add_argument('--pestanas', type=int, default=1,
+                        help=f'Pestañas por navegador: con 2-{MAX_DEPTH} se precarga el próximo empleo mientras se extrae el actual (default: 1)')
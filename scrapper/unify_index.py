@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Persistent Unify Index
+State of the incremental unification (unify_jobs.py --incremental): the hash of
+every job already in database/all_jobs.json and a manifest of the input files
+already merged (path, size, mtime and content hash). A run only reads input
+files whose content is not in the manifest and appends the jobs whose hash is
+not in the index, so the daily cost is proportional to the new data.
+
+Usage:
+    python unify_index.py stats
+    python unify_index.py reconstruir [--all-jobs ../database/all_jobs.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_DB = "../database/unify_index.db"
+
+
+def file_fingerprint(path: str, chunk_size: int = 1 << 20) -> Dict[str, Any]:
+    """Size, mtime and SHA-256 of the content of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest.hexdigest()}
+
+
+class UnifyIndex:
+    def __init__(self, path: str = DEFAULT_DB):
+        """
+        Like RevisionStore, changes stay in an open transaction until commit(), so a run
+        that fails before appending to all_jobs.json leaves the index as it was.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS hashes (
+                hash TEXT PRIMARY KEY
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS manifest (
+                sha256 TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                jobs INTEGER NOT NULL,
+                merged_at TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def contains(self, job_hash: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM hashes WHERE hash = ?", (job_hash,)).fetchone() is not None
+
+    def add(self, job_hash: str) -> None:
+        self._conn.execute("INSERT OR IGNORE INTO hashes VALUES (?)", (job_hash,))
+
+    def add_many(self, hashes: Iterable[str]) -> None:
+        self._conn.executemany("INSERT OR IGNORE INTO hashes VALUES (?)", ((h,) for h in hashes))
+
+    def remove_many(self, hashes: Iterable[str]) -> None:
+        self._conn.executemany("DELETE FROM hashes WHERE hash = ?", ((h,) for h in hashes))
+
+    def merged(self, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Manifest entry of a file with the same content, or None if it was never merged"""
+        row = self._conn.execute("SELECT path, size, mtime, jobs, merged_at FROM manifest WHERE sha256 = ?",
+                                 (fingerprint["sha256"],)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("path", "size", "mtime", "jobs", "merged_at"), row))
+
+    def record_file(self, path: str, fingerprint: Dict[str, Any], jobs: int) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?)",
+                           (fingerprint["sha256"], path, fingerprint["size"], fingerprint["mtime"], jobs,
+                            datetime.now().isoformat()))
+
+    def is_empty(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM hashes LIMIT 1").fetchone() is None
+
+    def summary(self) -> Dict[str, int]:
+        hashes = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        files, jobs = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(jobs), 0) FROM manifest").fetchone()
+        return {"hashes": hashes, "files_merged": files, "jobs_from_files": jobs}
+
+    def reset(self) -> None:
+        self._conn.execute("DELETE FROM hashes")
+        self._conn.execute("DELETE FROM manifest")
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def main():
+    from jsonl_zstd import open_jobs
+    from unify_jobs import job_hash_of
+
+    parser = argparse.ArgumentParser(description='Índice persistente de la unificación incremental')
+    parser.add_argument('--db', type=str, default=DEFAULT_DB, help=f'Base del índice (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('stats', help='Hashes indexados y archivos ya unificados')
+    reconstruir = sub.add_parser('reconstruir', help='Rehacer el índice de hashes desde all_jobs.json (vacía el manifiesto)')
+    reconstruir.add_argument('--all-jobs', type=str, default="../database/all_jobs.json")
+    args = parser.parse_args()
+
+    index = UnifyIndex(args.db)
+    if args.comando == 'stats':
+        print(json.dumps(index.summary(), indent=2))
+    elif args.comando == 'reconstruir':
+        index.reset()
+        _, jobs = open_jobs(args.all_jobs)
+        index.add_many(job_hash_of(job, idx) for idx, job in enumerate(jobs or []))
+        index.commit()
+        print(json.dumps(index.summary(), indent=2))
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,97 @@
 """
 Job Unifier Script v2 - With Deduplication
 Reads all JSON files from output_jobs, removes duplicates using hash, and creates all_jobs.json
+Postings already unified with the same content are skipped and an edited posting
+replaces its previous revision (revision_store.py)
+
+Memory stays flat as the corpus grows: input files are parsed incrementally
+(JSONL line by line, JSON arrays with ijson when it is installed), only the
+hash index is kept in memory, kept jobs are spilled to a temporary JSONL file
+and all_jobs.json is written from it one job at a time.
+
+With --incremental all_jobs.json is not rebuilt: input files whose content was
+already merged are skipped (manifest in unify_index.py), jobs are deduplicated
+against a persistent hash index of the whole database and only the new ones
+are appended, so the daily cost is proportional to the new data. When a posting
+was edited since an earlier run, its old revision leaves the index and that run
+rewrites all_jobs.json without it (streaming the existing file).
+
+With several workers (--workers, default: one per core) reading, decoding
+(orjson when installed) and validating each input file runs in a process
+pool, a bounded window of files ahead of the parent, which only merges the
+jobs into the dedup index in file order, so the result is the same as the
+serial path (--workers 1, the streaming reader above).
+
+all_jobs.json is also exported as all_jobs.parquet (--columnar arrow for an
+Arrow IPC file, --columnar no to skip it) when pyarrow is installed, so later
+stages can read only the columns they need (columnar_export.py). The export
+costs a pass over the whole corpus, so --incremental skips it unless
+--columnar is given; readers see the older export as stale and use the JSON.
+
+Every emitted job is also stored in the canonical SQLite job store
+(database/jobs.db, job_store.py), committed together with all_jobs.json;
+--sin-base skips it.
+
+With --casi-duplicados [umbral] jobs whose description is a near duplicate
+(MinHash + LSH, near_duplicates.py) of one already kept in this run are
+dropped too, so each cluster keeps its first job.
+
+Each emitted job gets normalised location columns (ubicacion_pais,
+ubicacion_provincia, ubicacion_ciudad) from the offline gazetteer
+(gazetteer.py), resolved once per distinct raw location and memoised across
+runs; --sin-ubicaciones skips it.
+
+Input files may also be compressed (.jsonl.zst, jsonl_zstd.py), and the
+processed files are archived in unified_jobs/ as .jsonl.zst when zstandard is
+installed (--sin-comprimir moves them as they are).
+
+The emitted jobs are also added to a corpus partitioned by portal and month
+(database/corpus/fuente=.../fecha=YYYY-MM/, partitioned_corpus.py) with a
+partition catalog, so consumers can read only the partitions they need. It is
+built from all_jobs.json the first time; afterwards each run only appends its
+jobs and drops superseded revisions, so the corpus keeps the jobs of earlier
+runs; --sin-particiones skips it.
 """
 
 import json
-import glob
 import os
 import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import hashlib
+import re
+
+from work_queue import merge_worker_outputs
+from revision_store import RevisionStore, posting_key, UNCHANGED, CHANGED
+from unify_index import UnifyIndex, file_fingerprint
+from job_store import JobStore
+from near_duplicates import MinHashLSH, DEFAULT_THRESHOLD, job_text
+from gazetteer import Gazetteer
+from jsonl_zstd import ZSTD_AVAILABLE, IJSON_AVAILABLE, is_zstd, decompress, job_files, compress_file, open_jobs
+from columnar_export import PYARROW_AVAILABLE, export_jobs, output_path_for, EXTENSIONS
+import partitioned_corpus
+
+if IJSON_AVAILABLE:
+    import ijson
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Enteros de 19 dígitos o más: pueden no entrar en 64 bits, y orjson no los devuelve como int
+_WIDE_INT_RE = re.compile(rb'(?<![\d.eE+-])-?\d{19,}(?![\d.eE])')
+
+class JsonFileError(ValueError):
+    """Malformed JSON reported by a parse worker"""
+
+JSON_ERRORS = (json.JSONDecodeError, JsonFileError) + ((ijson.JSONError,) if IJSON_AVAILABLE else ())
+
+class SkipFile(Exception):
+    """Input file left out without counting as an error (empty array or unexpected format)"""
 
 def generate_unique_id(job, index):
     """
@@ -35,8 +118,231 @@ def generate_unique_id(job, index):
     
     return f"{source}-{date_str}-{hash_short}"
 
-def unify_jobs():
-    """Unifica todos los archivos JSON de empleos en un solo archivo, eliminando duplicados"""
+def job_hash_of(job, idx):
+    """'hash Descripcion' of a job, computed from the description (or the URL) when missing"""
+    job_hash = job.get("hash Descripcion")
+    if job_hash:
+        return job_hash
+    desc = job.get("descripcion", "") or job.get("description", "")
+    if desc:
+        return hashlib.sha256(desc.encode('utf-8')).hexdigest()
+    # Use URL as fallback
+    url = job.get("url", str(idx))
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+def _loads(raw):
+    """
+    orjson when installed; anything it rejects, and anything with integers that may not fit
+    in 64 bits, goes through json so the result matches the serial path
+    """
+    if ORJSON_AVAILABLE and not _WIDE_INT_RE.search(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode('utf-8'))
+
+def parse_job_file(file_path):
+    """
+    Parse worker: read, decode and validate one input file.
+    Returns a dict with kind ("array", "object", "jsonl" or None for an unexpected top level),
+    jobs, the fingerprint of the content (size, mtime, sha256), seconds and, when it failed,
+    error (message) and json_error (True for malformed JSON).
+    """
+    start = time.perf_counter()
+    result = {"kind": None, "jobs": None, "error": None, "json_error": False, "size": 0}
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        result.update({"size": len(raw), "mtime": os.stat(file_path).st_mtime,
+                       "sha256": hashlib.sha256(raw).hexdigest()})
+        if is_zstd(file_path):
+            raw = decompress(raw)
+        if file_path.endswith((".jsonl", ".jsonl.zst")):
+            result["kind"] = "jsonl"
+            result["jobs"] = [_loads(line) for line in raw.splitlines() if line.strip()]
+        else:
+            data = _loads(raw)
+            if isinstance(data, list):
+                result["kind"], result["jobs"] = "array", data
+            elif isinstance(data, dict):
+                result["kind"], result["jobs"] = "object", [data]
+    except json.JSONDecodeError as e:
+        result["error"], result["json_error"] = str(e), True
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def parse_files(paths, workers):
+    """
+    Yields (path, parsed) in the order of `paths`. With workers > 1 the files are parsed by
+    parse_job_file in a process pool, at most 2 * workers files ahead of the consumer so memory
+    does not grow with the corpus; with one worker parsed is None (the caller streams the file).
+    """
+    if workers <= 1:
+        for path in paths:
+            yield path, None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        remaining = iter(paths)
+        for path in remaining:
+            pending.append((path, executor.submit(parse_job_file, path)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            path, future = pending.popleft()
+            following = next(remaining, None)
+            if following is not None:
+                pending.append((following, executor.submit(parse_job_file, following)))
+            yield path, future.result()
+
+def open_parsed(file_path, parsed):
+    """(kind, jobs) from a parse_job_file result, raising its error like open_jobs would"""
+    if parsed is None:
+        return open_jobs(file_path)
+    if parsed["json_error"]:
+        raise JsonFileError(parsed["error"])
+    if parsed["error"]:
+        raise Exception(parsed["error"])
+    if parsed["kind"] is None:
+        return None, None
+    return parsed["kind"], iter(parsed["jobs"])
+
+class JsonArrayWriter:
+    """
+    Writes a JSON array one element at a time with the same layout as
+    json.dump(items, f, ensure_ascii=False, indent=2). The file is written
+    under a temporary name and only replaces `path` on close().
+    append=True adds the elements to the existing array of `path` in place
+    (only the closing bracket is rewritten); abort() restores the original end.
+    """
+    def __init__(self, path, append=False):
+        self.path = path
+        self.count = 0
+        self.appended = 0
+        self.tmp_path = None
+        self._tail = None
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self._f = open(path, 'r+b')
+            self._f.seek(0, os.SEEK_END)
+            size = self._f.tell()
+            self._f.seek(max(0, size - 4096))
+            tail = self._f.read()
+            body = tail.rstrip()
+            if not body.endswith(b"]"):
+                self._f.close()
+                raise ValueError(f"{path} no termina en un array JSON")
+            body = body[:-1].rstrip()
+            self._tail_pos = size - len(tail) + len(body)
+            self._tail = tail[len(body):]
+            # Array vacío: el primer elemento abre la lista de nuevo
+            self.count = 0 if body.endswith(b"[") else 1
+            if self.count == 0:
+                self._tail_pos -= 1
+                self._tail = b"[" + self._tail
+            self._f.seek(self._tail_pos)
+            self._f.truncate()
+        else:
+            self.tmp_path = path + ".tmp"
+            self._f = open(self.tmp_path, 'wb')
+    
+    def write(self, item):
+        text = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._f.write((("[\n  " if self.count == 0 else ",\n  ") + text).encode('utf-8'))
+        self.count += 1
+        self.appended += 1
+    
+    def close(self):
+        self._f.write(b"\n]" if self.count else b"[]")
+        self._f.close()
+        if self.tmp_path:
+            os.replace(self.tmp_path, self.path)
+    
+    def abort(self):
+        if self.tmp_path:
+            self._f.close()
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+            return
+        # Append en el lugar: volver a dejar el final original
+        if self._f.closed:
+            self._f = open(self.path, 'r+b')
+        self._f.seek(self._tail_pos)
+        self._f.truncate()
+        self._f.write(self._tail)
+        self._f.close()
+
+def export_columnar(output_file, columnar):
+    """
+    Exporta all_jobs.json a Parquet / Arrow (columnar: "parquet", "arrow" o None para no exportar).
+    Si no se puede, se borra la exportación anterior para que nadie lea una copia desactualizada.
+    """
+    if not columnar:
+        return
+    stale = [output_path_for(output_file, fmt) for fmt in EXTENSIONS]
+    if not PYARROW_AVAILABLE:
+        print("pyarrow no instalado: no se exporta a Parquet/Arrow (pip install pyarrow)")
+    else:
+        columnar_file = output_path_for(output_file, columnar)
+        try:
+            _, jobs = open_jobs(output_file)
+            rows = export_jobs(jobs or [], columnar_file, columnar)
+            print(f"Exportación columnar: {columnar_file} ({rows} empleos, "
+                  f"{os.path.getsize(columnar_file) / (1024*1024):.1f} MB)")
+            stale.remove(columnar_file)
+        except Exception as e:
+            print(f"⚠️ Error exportando a {columnar}: {e}")
+    for path in stale:
+        if os.path.exists(path):
+            os.remove(path)
+            print(f"Exportación desactualizada eliminada: {path}")
+
+def export_partitions(output_file, particiones=True, nuevos=None, reemplazados=None):
+    """
+    Corpus particionado (fuente / mes) junto a all_jobs.json. Con nuevos (los empleos emitidos en
+    esta corrida) y un corpus ya armado solo se agregan a sus particiones y se quitan las revisiones
+    reemplazadas (hash -> fuente y fecha); sin corpus, o sin nuevos, se rehace desde all_jobs.json.
+    Si falla se borra, como la exportación columnar, para que nadie lea particiones desactualizadas.
+    """
+    if not particiones:
+        return
+    root = os.path.join(os.path.dirname(output_file), "corpus")
+    try:
+        if nuevos is not None and partitioned_corpus.load_catalog(root):
+            catalog = partitioned_corpus.update(nuevos, root, reemplazados, source=output_file)
+            print(f"Corpus particionado actualizado: {root} ({catalog['jobs']} empleos en "
+                  f"{len(catalog['partitions'])} particiones)")
+            return
+        _, jobs = open_jobs(output_file)
+        catalog = partitioned_corpus.build(jobs or [], root, source=output_file)
+        print(f"Corpus particionado: {root} ({catalog['jobs']} empleos en {len(catalog['partitions'])} particiones)")
+    except Exception as e:
+        print(f"⚠️ Error armando el corpus particionado: {e}")
+        if os.path.exists(root):
+            shutil.rmtree(root, ignore_errors=True)
+            print(f"Corpus desactualizado eliminado: {root} (se puede rehacer desde la base: "
+                  f"job_store.py exportar y partitioned_corpus.py construir)")
+
+def unify_jobs(revisiones=True, incremental=False, workers=None, columnar="parquet", base=True, casi_duplicados=None,
+               ubicaciones=True, comprimir=True, particiones=True):
+    """
+    Unifica todos los archivos JSON de empleos en un solo archivo, eliminando duplicados.
+    revisiones: usar el historial de revisiones por aviso (portal + URL) para emitir solo
+    la última revisión de cada aviso y saltear los que no cambiaron desde la unificación anterior
+    incremental: agregar a all_jobs.json solo los empleos nuevos (índice de hashes persistente)
+    y saltear los archivos cuyo contenido ya se unificó, en lugar de rehacerlo
+    workers: procesos que leen y decodifican los archivos (default: uno por núcleo; 1 = en serie, en streaming)
+    columnar: exportar además all_jobs.json a "parquet" o "arrow" (None = no exportar)
+    base: guardar los empleos en la base canónica (../database/jobs.db)
+    casi_duplicados: umbral de similitud (0-1) para descartar también los casi duplicados
+    de un empleo ya conservado en esta corrida (None = solo duplicados exactos)
+    ubicaciones: agregar ubicacion_pais / ubicacion_provincia / ubicacion_ciudad normalizadas (gazetteer.py)
+    comprimir: archivar los archivos procesados en unified_jobs/ como .jsonl.zst (jsonl_zstd.py)
+    particiones: agregar los empleos al corpus particionado por fuente y mes (../database/corpus/)
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
     # Path to output_jobs directory
     output_jobs_dir = "output_jobs"
     output_base_dir = "../database"
@@ -46,21 +352,29 @@ def unify_jobs():
     if not os.path.exists(output_jobs_dir):
         print(f"ERROR: Directorio {output_jobs_dir} no existe")
         return False
+    
+    # Traer primero la salida de los workers de la cola (output_jobs/workers/<worker_id>/)
+    if os.path.isdir(os.path.join(output_jobs_dir, "workers")):
+        merge_worker_outputs(dest=output_jobs_dir)
         
     if not os.path.exists(output_base_dir):
         os.makedirs(output_base_dir, exist_ok=True)
         print(f"Creado directorio: {output_base_dir}")
     
-    # Get all JSON files but exclude all_jobs.json to avoid duplicating
-    json_files = glob.glob(os.path.join(output_jobs_dir, "*.json"))
+    # Get all JSON/JSONL files (también .jsonl.zst) but exclude all_jobs.json to avoid duplicating
+    json_files = job_files(output_jobs_dir)
     json_files = [f for f in json_files if not os.path.basename(f) == "all_jobs.json"]
     
     if not json_files:
         print(f"ERROR: No se encontraron archivos JSON en {output_jobs_dir}")
         return False
     
-    # Use dict with hash as key for deduplication
-    jobs_by_hash = {}
+    # Índice de deduplicación: hash -> línea del spill con el empleo que queda. Los empleos
+    # en sí van al spill en disco; una revisión reemplazada solo sale del índice
+    index = {}
+    spill_path = os.path.join(output_base_dir, ".all_jobs_spill.jsonl")
+    spill = open(spill_path, 'w', encoding='utf-8')
+    spill_lines = 0
     processed_files_list = []
     processed_files_count = 0
     error_files = 0
@@ -68,93 +382,246 @@ def unify_jobs():
     duplicates_found = 0
     duplicates_by_source = {}
     
+    # Historial de revisiones: aviso -> hash de su última revisión emitida en esta corrida
+    store = RevisionStore() if revisiones else None
+    latest_by_key = {}
+    unchanged_found = 0
+    revisions_replaced = 0
+    
+    # Casi duplicados: firmas MinHash de los empleos conservados (y de los sin cambios) de esta corrida
+    near = MinHashLSH(casi_duplicados) if casi_duplicados else None
+    near_duplicates_found = 0
+    
+    # Ubicaciones normalizadas, con la memoria de textos ya resueltos en corridas anteriores
+    gazetteer = Gazetteer() if ubicaciones else None
+    
+    output_file = os.path.join(output_base_dir, "all_jobs.json")
+    
+    # Modo incremental: hashes de toda la base y manifiesto de archivos ya unificados
+    unify_index = None
+    files_already_merged = 0
+    # Revisiones anteriores de los avisos editados en esta corrida: hash -> fuente y fecha (su partición)
+    superseded = {}
+    if incremental:
+        unify_index = UnifyIndex(os.path.join(output_base_dir, "unify_index.db"))
+        if unify_index.is_empty() and os.path.exists(output_file):
+            print(f"Índice vacío: se indexan los hashes de {output_file}")
+            _, existing = open_jobs(output_file)
+            unify_index.add_many(job_hash_of(job, idx) for idx, job in enumerate(existing or []))
+    
     print(f"Encontrados {len(json_files)} archivos JSON (excluyendo all_jobs.json)")
     print(f"Directorio origen: {output_jobs_dir}")
     print(f"Directorio destino: {output_base_dir}")
+    if incremental:
+        print(f"Modo incremental: {unify_index.summary()['hashes']} empleos ya en la base")
+    if workers > 1:
+        print(f"Parseo en paralelo: {workers} procesos con {'orjson' if ORJSON_AVAILABLE else 'json'}")
+    elif not IJSON_AVAILABLE:
+        print("ijson no instalado: los .json se leen completos de a uno (pip install ijson para leerlos en streaming)")
     print("-" * 60)
     
-    for file_path in sorted(json_files):
-        try:
-            # Verificar tamaño del archivo antes de procesarlo
-            file_size = os.path.getsize(file_path)
-            if file_size < 100:
-                print(f"SALTADO: {os.path.basename(file_path)}: archivo demasiado pequeño ({file_size} bytes)")
+    parse_bytes = 0
+    parse_seconds = 0.0
+    started = time.perf_counter()
+    for file_path, parsed in parse_files(sorted(json_files), workers):
+        # Verificar tamaño del archivo antes de procesarlo
+        file_size = os.path.getsize(file_path)
+        if file_size < 100:
+            print(f"SALTADO: {os.path.basename(file_path)}: archivo demasiado pequeño ({file_size} bytes)")
+            continue
+        
+        if unify_index:
+            fingerprint = ({key: parsed[key] for key in ("size", "mtime", "sha256")}
+                           if parsed and "sha256" in parsed else file_fingerprint(file_path))
+            merged = unify_index.merged(fingerprint)
+            if merged:
+                # Mismo contenido que un archivo ya unificado: se mueve sin volver a leerlo
+                print(f"YA UNIFICADO: {os.path.basename(file_path)}: igual a {os.path.basename(merged['path'])} "
+                      f"({merged['merged_at'][:10]})")
+                files_already_merged += 1
+                processed_files_list.append(file_path)
                 continue
+        
+        # Cambios de este archivo en el índice: si el archivo resulta inválido a mitad de
+        # camino se deshacen y no cuenta ninguno de sus empleos (como con json.load)
+        added = []
+        removed = []
+        keys_before = {}
+        file_read = 0
+        file_jobs = 0
+        file_duplicates = 0
+        file_unchanged = 0
+        file_replaced = 0
+        file_near = 0
+        file_superseded = []
+        near_added = []
+        near_removed = []
+        file_duplicates_by_source = {}
+        if store:
+            store.savepoint()
+        file_started = time.perf_counter()
+        
+        try:
+            kind, jobs = open_parsed(file_path, parsed)
+            if kind is None:
+                print(f"ADVERTENCIA: {os.path.basename(file_path)} tiene formato inesperado")
+                raise SkipFile()
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            for idx, job in enumerate(jobs):
+                file_read += 1
                 
-                # Validar estructura de datos
-                jobs_list = []
-                if isinstance(data, list):
-                    if len(data) == 0:
-                        print(f"SALTADO: {os.path.basename(file_path)}: array vacío")
-                        continue
-                    jobs_list = data
-                elif isinstance(data, dict):
-                    jobs_list = [data]
-                else:
-                    print(f"ADVERTENCIA: {os.path.basename(file_path)} tiene formato inesperado")
+                # Get hash for deduplication (if no hash exists, generate one from description or URL)
+                job_hash = job_hash_of(job, idx)
+                job["hash Descripcion"] = job_hash
+                
+                # Check for duplicate (en modo incremental también contra toda la base)
+                if job_hash in index or (unify_index and unify_index.contains(job_hash)):
+                    file_duplicates += 1
+                    source = job.get("Fuente", "Unknown")
+                    file_duplicates_by_source[source] = file_duplicates_by_source.get(source, 0) + 1
                     continue
                 
-                file_jobs = 0
-                file_duplicates = 0
+                key = posting_key(job) if store else None
+                signature = near.signature(job_text(job)) if near is not None else None
+                if key:
+                    status, revision = store.record(key, job.get("descripcion", "") or job.get("description", ""),
+                                                    job_hash, job.get("fecha"))
+                    # Mismo contenido que la última revisión ya unificada: no se vuelve a clasificar
+                    if status == UNCHANGED:
+                        file_unchanged += 1
+                        # Sigue en la base: sus casi duplicados tampoco se emiten
+                        if signature and job_hash not in near:
+                            near.insert(job_hash, signature)
+                            near_added.append(job_hash)
+                        continue
                 
-                for idx, job in enumerate(jobs_list):
-                    total_jobs_read += 1
-                    
-                    # Get hash for deduplication
-                    job_hash = job.get("hash Descripcion")
-                    
-                    # If no hash exists, generate one from description
-                    if not job_hash:
-                        desc = job.get("descripcion", "") or job.get("description", "")
-                        if desc:
-                            job_hash = hashlib.sha256(desc.encode('utf-8')).hexdigest()
-                            job["hash Descripcion"] = job_hash
-                        else:
-                            # Use URL as fallback
-                            url = job.get("url", str(idx))
-                            job_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
-                            job["hash Descripcion"] = job_hash
-                    
-                    # Check for duplicate
-                    if job_hash in jobs_by_hash:
-                        duplicates_found += 1
-                        file_duplicates += 1
-                        source = job.get("Fuente", "Unknown")
-                        duplicates_by_source[source] = duplicates_by_source.get(source, 0) + 1
-                    else:
-                        # Generate unique Id Interno
-                        job["Id Interno"] = generate_unique_id(job, len(jobs_by_hash))
-                        jobs_by_hash[job_hash] = job
-                        file_jobs += 1
+                # Casi duplicado de un empleo ya conservado (no de la revisión anterior del mismo aviso)
+                if signature:
+                    match = near.query(signature)
+                    if match and match[0] != (latest_by_key.get(key) if key else None):
+                        file_near += 1
+                        continue
                 
-                status = "OK"
-                if file_duplicates > 0:
-                    status = f"OK ({file_duplicates} duplicados removidos)"
-                    
-                print(f"{status}: {os.path.basename(file_path)}: {file_jobs} empleos únicos de {len(jobs_list)}")
-                processed_files_list.append(file_path)
-                processed_files_count += 1
+                if key:
+                    job["revision"] = revision
+                    # Aviso editado dentro de esta misma tanda: queda solo la última revisión
+                    if key not in keys_before:
+                        keys_before[key] = latest_by_key.get(key)
+                    previous_hash = latest_by_key.get(key)
+                    if status == CHANGED and previous_hash in index:
+                        removed.append((previous_hash, index.pop(previous_hash)))
+                        file_replaced += 1
+                        if near is not None:
+                            near_removed.append((previous_hash, near.remove(previous_hash)))
+                    latest_by_key[key] = job_hash
+                    # Aviso editado desde una corrida anterior: su revisión vieja sale de la base y del corpus
+                    if status == CHANGED:
+                        file_superseded.extend((old_hash, {"Fuente": job.get("Fuente"), "fecha": seen})
+                                               for old_hash, seen in store.revision_hashes(key, revision)
+                                               if unify_index is None or unify_index.contains(old_hash))
+                
+                if gazetteer:
+                    job.update(gazetteer.normalize_job(job))
                 
-        except json.JSONDecodeError as e:
-            print(f"ERROR JSON en {os.path.basename(file_path)}: {e}")
-            error_files += 1
+                # Generate unique Id Interno
+                job["Id Interno"] = generate_unique_id(job, len(index))
+                spill.write(json.dumps(job, ensure_ascii=False) + "\n")
+                index[job_hash] = spill_lines
+                added.append(job_hash)
+                spill_lines += 1
+                file_jobs += 1
+                if signature:
+                    near.insert(job_hash, signature)
+                    near_added.append(job_hash)
+            
+            if kind == "array" and file_read == 0:
+                print(f"SALTADO: {os.path.basename(file_path)}: array vacío")
+                raise SkipFile()
+        
         except Exception as e:
-            print(f"ERROR procesando {os.path.basename(file_path)}: {e}")
-            error_files += 1
+            # Deshacer lo que el archivo alcanzó a agregar (las líneas del spill quedan muertas)
+            for job_hash in added:
+                index.pop(job_hash, None)
+            for job_hash, line in removed:
+                if job_hash not in added:
+                    index[job_hash] = line
+            for key, previous_hash in keys_before.items():
+                if previous_hash is None:
+                    latest_by_key.pop(key, None)
+                else:
+                    latest_by_key[key] = previous_hash
+            for job_hash in near_added:
+                near.remove(job_hash)
+            for job_hash, signature in near_removed:
+                if signature and job_hash not in added:
+                    near.insert(job_hash, signature)
+            if store:
+                store.rollback_savepoint()
+            if isinstance(e, JSON_ERRORS):
+                print(f"ERROR JSON en {os.path.basename(file_path)}: {e}")
+                error_files += 1
+            elif not isinstance(e, SkipFile):
+                print(f"ERROR procesando {os.path.basename(file_path)}: {e}")
+                error_files += 1
+            continue
+        
+        # Rendimiento del parseo: el del worker, o en serie el de leer y procesar el archivo
+        file_seconds = parsed["seconds"] if parsed else time.perf_counter() - file_started
+        parse_bytes += file_size
+        parse_seconds += file_seconds
+        
+        if store:
+            store.release_savepoint()
+        if unify_index:
+            unify_index.record_file(file_path, fingerprint, file_jobs)
+        total_jobs_read += file_read
+        duplicates_found += file_duplicates
+        unchanged_found += file_unchanged
+        revisions_replaced += file_replaced
+        superseded.update(file_superseded)
+        near_duplicates_found += file_near
+        for source, count in file_duplicates_by_source.items():
+            duplicates_by_source[source] = duplicates_by_source.get(source, 0) + count
+        
+        status = "OK"
+        if file_duplicates > 0:
+            status = f"OK ({file_duplicates} duplicados removidos)"
+        if file_unchanged > 0:
+            status += f" ({file_unchanged} sin cambios)"
+        if file_near > 0:
+            status += f" ({file_near} casi duplicados)"
+            
+        print(f"{status}: {os.path.basename(file_path)}: {file_jobs} empleos únicos de {file_read} "
+              f"[{file_size / (1024*1024):.2f} MB en {file_seconds:.2f}s, "
+              f"{file_size / (1024*1024) / max(file_seconds, 1e-6):.1f} MB/s]")
+        processed_files_list.append(file_path)
+        processed_files_count += 1
     
-    # Convert dict values to list
-    all_jobs = list(jobs_by_hash.values())
+    spill.close()
+    unique_jobs = len(index)
+    elapsed = time.perf_counter() - started
     
     print("-" * 60)
     print(f"Resumen del proceso:")
     print(f"   - Archivos procesados: {processed_files_count}")
+    if incremental:
+        print(f"   - Archivos ya unificados antes (salteados): {files_already_merged}")
     print(f"   - Archivos con error: {error_files}")
     print(f"   - Total empleos leídos: {total_jobs_read}")
     print(f"   - Duplicados eliminados: {duplicates_found}")
-    print(f"   - Empleos únicos finales: {len(all_jobs)}")
+    if near is not None:
+        print(f"   - Casi duplicados eliminados: {near_duplicates_found} (similitud >= {near.threshold})")
+    if store:
+        print(f"   - Avisos sin cambios desde la unificación anterior: {unchanged_found}")
+        print(f"   - Avisos editados: {store.stats[CHANGED]} ({revisions_replaced} revisiones reemplazadas en esta tanda)")
+        if incremental:
+            print(f"   - Revisiones anteriores quitadas de la base: {len(superseded)}")
+    print(f"   - Empleos únicos finales: {unique_jobs}")
+    if gazetteer:
+        print(f"   - {gazetteer.summary()}")
+    print(f"   - Lectura: {parse_bytes / (1024*1024):.1f} MB en {elapsed:.1f}s "
+          f"({parse_bytes / (1024*1024) / max(elapsed, 1e-6):.1f} MB/s, {workers} proceso(s); "
+          f"parseo sumado por archivo: {parse_seconds:.1f}s)")
     
     if duplicates_by_source:
         print(f"\n   Duplicados por fuente:")
@@ -162,13 +629,45 @@ def unify_jobs():
             print(f"      - {source}: {count}")
     
     # Write unified file to database directory
-    output_file = os.path.join(output_base_dir, "all_jobs.json")
-    
+    writer = None
+    job_store = None
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_jobs, f, ensure_ascii=False, indent=2)
+        if base:
+            job_store = JobStore(os.path.join(output_base_dir, "jobs.db"))
+            # Primera vez: la base arranca con lo que ya estaba en all_jobs.json
+            if job_store.count() == 0 and os.path.exists(output_file):
+                print(f"Base de empleos vacía: se importa {output_file}")
+                _, existing = open_jobs(output_file)
+                job_store.add_many(job for job in (existing or []) if job.get("hash Descripcion"))
+        
+        # Copiar del spill solo las líneas que siguen en el índice, en el orden en que se leyeron
+        alive = set(index.values())
+        if unify_index:
+            unify_index.remove_many(superseded)
+            unify_index.add_many(index.keys())
+        index = None
+        # Incremental sin avisos editados: se agrega al final; con editados se reescribe sin sus revisiones viejas
+        writer = JsonArrayWriter(output_file, append=incremental and not superseded)
+        kept = 0
+        if incremental and superseded and os.path.exists(output_file):
+            _, existing = open_jobs(output_file)
+            for idx, job in enumerate(existing or []):
+                if job_hash_of(job, idx) not in superseded:
+                    writer.write(job)
+            kept = writer.count
+        with open(spill_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f):
+                if line_number in alive:
+                    job = json.loads(line)
+                    writer.write(job)
+                    if job_store:
+                        job_store.add(job)
+        writer.close()
         
-        print(f"\nArchivo unificado creado: {output_file}")
+        if incremental:
+            print(f"\nEmpleos agregados a {output_file}: {writer.appended - kept} (total: {unify_index.summary()['hashes']})")
+        else:
+            print(f"\nArchivo unificado creado: {output_file}")
         print(f"Tamaño: {os.path.getsize(output_file) / (1024*1024):.1f} MB")
         
         # Save deduplication stats
@@ -177,28 +676,78 @@ def unify_jobs():
             "timestamp": datetime.now().isoformat(),
             "total_read": total_jobs_read,
             "duplicates_removed": duplicates_found,
-            "unique_jobs": len(all_jobs),
+            "unique_jobs": unique_jobs,
             "duplicates_by_source": duplicates_by_source,
-            "files_processed": processed_files_count
+            "unchanged_postings": unchanged_found,
+            "edited_postings": store.stats[CHANGED] if store else 0,
+            "near_duplicates_removed": near_duplicates_found,
+            "near_duplicate_threshold": casi_duplicados,
+            "locations_normalized": gazetteer.stats["lookups"] if gazetteer else 0,
+            "files_processed": processed_files_count,
+            "mode": "incremental" if incremental else "full",
+            "parse_workers": workers,
+            "parse_mb_per_second": round(parse_bytes / (1024*1024) / max(elapsed, 1e-6), 2)
         }
+        if incremental:
+            stats["files_already_merged"] = files_already_merged
+            stats["total_unique_jobs"] = unify_index.summary()["hashes"]
         with open(stats_file, 'w', encoding='utf-8') as f:
             json.dump(stats, f, ensure_ascii=False, indent=2)
         print(f"Estadísticas guardadas en: {stats_file}")
         
+        # La base, las revisiones y el índice quedan registrados recién con all_jobs.json escrito
+        if job_store:
+            job_store.commit()
+            print(f"Base de empleos: {job_store.stats['inserted']} nuevos, {job_store.stats['replaced_revisions']} "
+                  f"revisiones reemplazadas (total: {job_store.count()})")
+            job_store.close()
+            job_store = None
+        if store:
+            store.commit()
+            store.close()
+        if unify_index:
+            unify_index.commit()
+            unify_index.close()
+        if gazetteer:
+            gazetteer.save()
+        
+        if incremental and not columnar:
+            print("Exportación columnar salteada en modo incremental (--columnar parquet para rehacerla)")
+        export_columnar(output_file, columnar)
+        
+        def emitted():
+            with open(spill_path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f):
+                    if line_number in alive:
+                        yield json.loads(line)
+        
+        export_partitions(output_file, particiones, emitted(), superseded)
+        
         # Move processed JSON files to unified_jobs folder
         try:
             os.makedirs(processed_dir, exist_ok=True)
             moved_files = []
+            archive_before = archive_after = 0
+            compress = comprimir and ZSTD_AVAILABLE
             
             for file_path in processed_files_list:
                 filename = os.path.basename(file_path)
-                new_path = os.path.join(processed_dir, filename)
-                shutil.move(file_path, new_path)
+                if compress and not is_zstd(file_path):
+                    # El archivo crece para siempre: se guarda como JSONL comprimido
+                    archive_before += os.path.getsize(file_path)
+                    new_path, _ = compress_file(file_path, processed_dir)
+                    archive_after += os.path.getsize(new_path)
+                else:
+                    new_path = os.path.join(processed_dir, filename)
+                    shutil.move(file_path, new_path)
                 moved_files.append(filename)
             
             if moved_files:
                 print(f"Archivos movidos a unified_jobs/: {len(moved_files)}")
                 print(f"   - {', '.join(moved_files[:3])}{'...' if len(moved_files) > 3 else ''}")
+            if archive_before:
+                print(f"   - Comprimidos a .jsonl.zst: {archive_before / (1024*1024):.1f} MB -> "
+                      f"{archive_after / (1024*1024):.1f} MB")
         
         except Exception as e:
             print(f"⚠️ Error moviendo archivos a unified_jobs/: {e}")
@@ -207,10 +756,25 @@ def unify_jobs():
         
     except Exception as e:
         print(f"ERROR al guardar archivo unificado: {e}")
+        if writer:
+            writer.abort()
+        if store:
+            store.rollback()
+            store.close()
+        if unify_index:
+            unify_index.rollback()
+            unify_index.close()
+        if job_store:
+            job_store.rollback()
+            job_store.close()
         return False
+    
+    finally:
+        if os.path.exists(spill_path):
+            os.remove(spill_path)
 
 
-def clean_existing_all_jobs(filepath):
+def clean_existing_all_jobs(filepath, columnar="parquet", particiones=True):
     """
     Limpia un archivo all_jobs.json existente eliminando duplicados
     y regenerando Id Interno únicos
@@ -223,55 +787,50 @@ def clean_existing_all_jobs(filepath):
         print(f"ERROR: Archivo no encontrado: {filepath}")
         return False
     
+    writer = None
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            jobs = json.load(f)
-        
-        print(f"Empleos cargados: {len(jobs)}")
+        # Backup original (la limpieza lee del original y escribe en un temporal)
+        backup_path = filepath.replace(".json", f"_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        shutil.copy(filepath, backup_path)
+        print(f"Backup creado: {backup_path}")
         
-        # Deduplicate using hash
-        jobs_by_hash = {}
+        # Deduplicate using hash (solo los hashes quedan en memoria)
+        seen_hashes = set()
+        loaded = 0
         duplicates = 0
         
+        _, jobs = open_jobs(filepath)
+        if jobs is None:
+            print(f"ERROR: {filepath} no contiene una lista de empleos")
+            return False
+        writer = JsonArrayWriter(filepath)
         for idx, job in enumerate(jobs):
-            job_hash = job.get("hash Descripcion")
-            
-            if not job_hash:
-                desc = job.get("descripcion", "") or job.get("description", "")
-                if desc:
-                    job_hash = hashlib.sha256(desc.encode('utf-8')).hexdigest()
-                else:
-                    url = job.get("url", str(idx))
-                    job_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+            loaded += 1
+            job_hash = job_hash_of(job, idx)
             
-            if job_hash in jobs_by_hash:
+            if job_hash in seen_hashes:
                 duplicates += 1
             else:
                 # Regenerate unique Id Interno
-                job["Id Interno"] = generate_unique_id(job, len(jobs_by_hash))
+                job["Id Interno"] = generate_unique_id(job, len(seen_hashes))
                 job["hash Descripcion"] = job_hash
-                jobs_by_hash[job_hash] = job
-        
-        unique_jobs = list(jobs_by_hash.values())
+                seen_hashes.add(job_hash)
+                writer.write(job)
+        writer.close()
         
+        print(f"Empleos cargados: {loaded}")
         print(f"Duplicados encontrados: {duplicates}")
-        print(f"Empleos únicos: {len(unique_jobs)}")
-        
-        # Backup original
-        backup_path = filepath.replace(".json", f"_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        shutil.copy(filepath, backup_path)
-        print(f"Backup creado: {backup_path}")
-        
-        # Save cleaned file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(unique_jobs, f, ensure_ascii=False, indent=2)
-        
+        print(f"Empleos únicos: {len(seen_hashes)}")
         print(f"Archivo limpiado guardado: {filepath}")
         print(f"Tamaño: {os.path.getsize(filepath) / (1024*1024):.1f} MB")
+        export_columnar(filepath, columnar)
+        export_partitions(filepath, particiones)
         
         return True
         
     except Exception as e:
+        if writer:
+            writer.abort()
         print(f"ERROR: {e}")
         return False
 
@@ -283,18 +842,44 @@ if __name__ == "__main__":
     print("UNIFICADOR DE EMPLEOS v2 - CON DEDUPLICACIÓN")
     print("=" * 60)
     
+    columnar = sys.argv[sys.argv.index("--columnar") + 1] if "--columnar" in sys.argv else "parquet"
+    if columnar not in EXTENSIONS and columnar != "no":
+        print(f"ERROR: --columnar debe ser parquet, arrow o no (recibido: {columnar})")
+        exit(1)
+    columnar = None if columnar == "no" else columnar
+    
     # Check for clean mode
     if len(sys.argv) > 1 and sys.argv[1] == "--clean":
-        if len(sys.argv) > 2:
-            clean_existing_all_jobs(sys.argv[2])
+        if len(sys.argv) > 2 and not sys.argv[2].startswith("--"):
+            clean_existing_all_jobs(sys.argv[2], columnar, "--sin-particiones" not in sys.argv)
         else:
             # Default path
-            clean_existing_all_jobs("../database/all_jobs.json")
+            clean_existing_all_jobs("../database/all_jobs.json", columnar, "--sin-particiones" not in sys.argv)
     else:
         print("\nIniciando unificación de empleos...")
         print("-" * 60)
         
-        success = unify_jobs()
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+        # --casi-duplicados [umbral]: sin valor usa el umbral por defecto
+        casi_duplicados = None
+        if "--casi-duplicados" in sys.argv:
+            casi_duplicados = DEFAULT_THRESHOLD
+            position = sys.argv.index("--casi-duplicados") + 1
+            if position < len(sys.argv) and not sys.argv[position].startswith("--"):
+                casi_duplicados = float(sys.argv[position])
+        incremental = "--incremental" in sys.argv
+        # La exportación columnar recorre todo el corpus: en modo incremental solo si se pide
+        if incremental and "--columnar" not in sys.argv:
+            columnar = None
+        success = unify_jobs(revisiones="--sin-revisiones" not in sys.argv,
+                             incremental=incremental,
+                             workers=workers,
+                             columnar=columnar,
+                             base="--sin-base" not in sys.argv,
+                             casi_duplicados=casi_duplicados,
+                             ubicaciones="--sin-ubicaciones" not in sys.argv,
+                             comprimir="--sin-comprimir" not in sys.argv,
+                             particiones="--sin-particiones" not in sys.argv)
         
         if success:
             print("=" * 60)
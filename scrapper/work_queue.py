@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Work Queue for Distributed Scraping
+Splits a crawl into (portal, area, page range) tasks that workers on several
+machines/containers lease from a shared queue. A lease expires after a
+visibility timeout unless it is extended or acknowledged, so the task of a
+dead worker goes back to the queue.
+
+Backends (same interface):
+  - SQLiteWorkQueue: single host, several processes (SQLite file locking)
+  - HTTPWorkQueue:   network client for a queue exposed with `work_queue.py serve`
+  - MemoryWorkQueue: in-process stand-in, for tests and dry runs
+
+Workers write to output_jobs/workers/<worker_id>/ and merge_worker_outputs()
+folds those files back into output_jobs/ without duplicates.
+"""
+
+import argparse
+import glob
+import hmac
+import ipaddress
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from jsonl_zstd import job_files, load_jobs, save_jobs
+
+DEFAULT_QUEUE = "sqlite:checkpoints/work_queue.db"
+WORKERS_DIR = os.path.join("output_jobs", "workers")
+
+
+def make_task(portal: str, area: str, page_start: int, page_end: int, batch: str,
+              payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build a task. The id is deterministic so re-enqueueing the same range
+    (two workers seeding, a follow-up put twice) is a no-op
+    """
+    return {
+        "id": f"{portal}|{batch}|{area}|{page_start}",
+        "portal": portal,
+        "area": area,
+        "page_start": page_start,
+        "page_end": page_end,
+        "batch": batch,
+        "payload": payload or {}
+    }
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """Queue interface shared by every backend"""
+
+    max_attempts = 3
+
+    def put(self, tasks: List[Dict[str, Any]]) -> int:
+        """Enqueue tasks (ignoring ids that already exist). Returns how many were added"""
+        raise NotImplementedError
+
+    def lease(self, portal: str, worker_id: str, visibility: float) -> Optional[Dict[str, Any]]:
+        """Take the next pending (or expired) task of a portal. The returned task carries a lease token"""
+        raise NotImplementedError
+
+    def extend(self, task_id: str, token: str, visibility: float) -> bool:
+        raise NotImplementedError
+
+    def ack(self, task_id: str, token: str) -> bool:
+        """Mark the task done. False if the lease was lost (expired and taken by another worker)"""
+        raise NotImplementedError
+
+    def nack(self, task_id: str, token: str) -> bool:
+        """Give the task back (it is marked failed after max_attempts)"""
+        raise NotImplementedError
+
+    def stats(self, portal: Optional[str] = None) -> Dict[str, int]:
+        """Task count per status: pending, leased, done, failed"""
+        raise NotImplementedError
+
+
+# =============================================================================
+# Backend SQLite (un host, varios procesos)
+# =============================================================================
+class SQLiteWorkQueue(WorkQueue):
+    def __init__(self, path: str = "checkpoints/work_queue.db"):
+        """
+        The database must be on a local disk: SQLite locking is not reliable over NFS/SMB.
+        For several machines expose it with `python work_queue.py serve`
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                portal TEXT NOT NULL,
+                area TEXT NOT NULL,
+                page_start INTEGER NOT NULL,
+                page_end INTEGER NOT NULL,
+                batch TEXT NOT NULL,
+                payload TEXT NOT NULL DEFAULT '{}',
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                token TEXT,
+                lease_expires REAL,
+                worker TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_portal_status ON tasks (portal, status)")
+
+    def _row_to_task(self, row: sqlite3.Row) -> Dict[str, Any]:
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"] or "{}")
+        return task
+
+    def put(self, tasks: List[Dict[str, Any]]) -> int:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (id, portal, area, page_start, page_end, batch, payload, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(t["id"], t["portal"], t["area"], t["page_start"], t["page_end"], t["batch"],
+                  json.dumps(t.get("payload", {}), ensure_ascii=False), now, now) for t in tasks])
+            return cursor.rowcount
+
+    def lease(self, portal: str, worker_id: str, visibility: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE toma el lock de escritura: dos procesos no pueden tomar la misma tarea
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', token = NULL, updated = ? "
+                    "WHERE portal = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, portal, now, self.max_attempts))
+                row = self._conn.execute(
+                    "SELECT * FROM tasks WHERE portal = ? AND "
+                    "(status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                    "ORDER BY created, page_start LIMIT 1", (portal, now)).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                token = uuid.uuid4().hex
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'leased', token = ?, lease_expires = ?, worker = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    (token, now + visibility, worker_id, now, row["id"]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        task = self._row_to_task(row)
+        task.update({"token": token, "worker": worker_id, "attempts": row["attempts"] + 1})
+        return task
+
+    def _update_leased(self, sql: str, params: tuple) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(sql + " WHERE id = ? AND token = ? AND status = 'leased'", params)
+            return cursor.rowcount == 1
+
+    def extend(self, task_id: str, token: str, visibility: float) -> bool:
+        now = time.time()
+        return self._update_leased("UPDATE tasks SET lease_expires = ?, updated = ?",
+                                   (now + visibility, now, task_id, token))
+
+    def ack(self, task_id: str, token: str) -> bool:
+        return self._update_leased("UPDATE tasks SET status = 'done', token = NULL, updated = ?",
+                                   (time.time(), task_id, token))
+
+    def nack(self, task_id: str, token: str) -> bool:
+        return self._update_leased(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "token = NULL, updated = ?", (self.max_attempts, time.time(), task_id, token))
+
+    def stats(self, portal: Optional[str] = None) -> Dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        query = "SELECT status, COUNT(*) AS n FROM tasks"
+        params: tuple = ()
+        if portal:
+            query += " WHERE portal = ?"
+            params = (portal,)
+        with self._lock:
+            for row in self._conn.execute(query + " GROUP BY status", params):
+                counts[row["status"]] = row["n"]
+        return counts
+
+
+# =============================================================================
+# Backend en memoria (reemplazo local del backend de red)
+# =============================================================================
+class MemoryWorkQueue(WorkQueue):
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, tasks: List[Dict[str, Any]]) -> int:
+        added = 0
+        with self._lock:
+            for task in tasks:
+                if task["id"] not in self._tasks:
+                    self._tasks[task["id"]] = dict(task, status="pending", attempts=0, token=None,
+                                                   lease_expires=None, worker=None, created=time.time())
+                    added += 1
+        return added
+
+    def lease(self, portal: str, worker_id: str, visibility: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            candidates = []
+            for task in self._tasks.values():
+                if task["portal"] != portal:
+                    continue
+                expired = task["status"] == "leased" and task["lease_expires"] < now
+                if expired and task["attempts"] >= self.max_attempts:
+                    task.update(status="failed", token=None)
+                elif task["status"] == "pending" or expired:
+                    candidates.append(task)
+            if not candidates:
+                return None
+            task = min(candidates, key=lambda t: (t["created"], t["page_start"]))
+            task.update(status="leased", token=uuid.uuid4().hex, lease_expires=now + visibility,
+                        worker=worker_id, attempts=task["attempts"] + 1)
+            return dict(task)
+
+    def _leased(self, task_id: str, token: str) -> Optional[Dict[str, Any]]:
+        task = self._tasks.get(task_id)
+        if task and task["status"] == "leased" and task["token"] == token:
+            return task
+        return None
+
+    def extend(self, task_id: str, token: str, visibility: float) -> bool:
+        with self._lock:
+            task = self._leased(task_id, token)
+            if task:
+                task["lease_expires"] = time.time() + visibility
+            return task is not None
+
+    def ack(self, task_id: str, token: str) -> bool:
+        with self._lock:
+            task = self._leased(task_id, token)
+            if task:
+                task.update(status="done", token=None)
+            return task is not None
+
+    def nack(self, task_id: str, token: str) -> bool:
+        with self._lock:
+            task = self._leased(task_id, token)
+            if task:
+                task.update(status="failed" if task["attempts"] >= self.max_attempts else "pending", token=None)
+            return task is not None
+
+    def stats(self, portal: Optional[str] = None) -> Dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        with self._lock:
+            for task in self._tasks.values():
+                if portal is None or task["portal"] == portal:
+                    counts[task["status"]] += 1
+        return counts
+
+
+# =============================================================================
+# Backend de red: cliente HTTP + servidor que expone cualquier backend
+# =============================================================================
+QUEUE_METHODS = ("put", "lease", "extend", "ack", "nack", "stats")
+
+
+class HTTPWorkQueue(WorkQueue):
+    def __init__(self, base_url: str, token: Optional[str] = None, timeout: float = 30):
+        """token: shared secret sent as X-Queue-Token (default: env SCRAPER_QUEUE_TOKEN)"""
+        self.base_url = base_url.rstrip('/')
+        self.token = token or os.environ.get("SCRAPER_QUEUE_TOKEN")
+        self.timeout = timeout
+
+    def _call(self, method: str, **kwargs) -> Any:
+        request = urllib.request.Request(
+            f"{self.base_url}/{method}",
+            data=json.dumps(kwargs).encode('utf-8'),
+            headers={"Content-Type": "application/json", **({"X-Queue-Token": self.token} if self.token else {})},
+            method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))["result"]
+
+    def put(self, tasks):
+        return self._call("put", tasks=tasks)
+
+    def lease(self, portal, worker_id, visibility):
+        return self._call("lease", portal=portal, worker_id=worker_id, visibility=visibility)
+
+    def extend(self, task_id, token, visibility):
+        return self._call("extend", task_id=task_id, token=token, visibility=visibility)
+
+    def ack(self, task_id, token):
+        return self._call("ack", task_id=task_id, token=token)
+
+    def nack(self, task_id, token):
+        return self._call("nack", task_id=task_id, token=token)
+
+    def stats(self, portal=None):
+        return self._call("stats", portal=portal)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def serve_queue(queue: WorkQueue, host: str = "127.0.0.1", port: int = 8765, token: Optional[str] = None) -> None:
+    """
+    Expose a backend over HTTP (POST /<method> with JSON kwargs).
+    Anyone who can reach the port can lease and complete tasks, so binding a
+    non-loopback host requires a token (X-Queue-Token).
+    """
+    token = token or os.environ.get("SCRAPER_QUEUE_TOKEN")
+    if not token and not _is_loopback(host):
+        raise ValueError(f"Sin token no se expone la cola en {host}: usar --token o SCRAPER_QUEUE_TOKEN")
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if token and not hmac.compare_digest(self.headers.get("X-Queue-Token", "").encode(), token.encode()):
+                return self._reply(403, {"error": "token inválido"})
+            method = self.path.strip('/')
+            if method not in QUEUE_METHODS:
+                return self._reply(404, {"error": f"método desconocido: {method}"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                kwargs = json.loads(self.rfile.read(length) or b"{}")
+                self._reply(200, {"result": getattr(queue, method)(**kwargs)})
+            except Exception as e:
+                self._reply(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Cola de trabajo escuchando en http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def open_queue(spec: str = DEFAULT_QUEUE) -> WorkQueue:
+    """
+    spec: "sqlite:<path>", "http://host:port" / "https://..." or "memory:"
+    """
+    if spec.startswith(("http://", "https://")):
+        return HTTPWorkQueue(spec)
+    if spec.startswith("sqlite:"):
+        return SQLiteWorkQueue(spec[len("sqlite:"):])
+    if spec == "memory:":
+        return MemoryWorkQueue()
+    raise ValueError(f"Cola desconocida: {spec} (usar sqlite:<ruta>, http://host:puerto o memory:)")
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+class _Heartbeat(threading.Thread):
+    """Extends the lease while the task is being processed"""
+
+    def __init__(self, queue: WorkQueue, task: Dict[str, Any], visibility: float):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.task = task
+        self.visibility = visibility
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.visibility / 3):
+            try:
+                if not self.queue.extend(self.task["id"], self.task["token"], self.visibility):
+                    print(f"Lease perdido para {self.task['id']}")
+                    return
+            except Exception as e:
+                print(f"Error extendiendo lease: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def seed_areas(queue: WorkQueue, portal: str, areas: List[str], pages_per_task: int,
+               batch: Optional[str] = None) -> int:
+    """Enqueue the first page range of each area; later ranges are added by the workers"""
+    batch = batch or date.today().strftime("%Y%m%d")
+    return queue.put([make_task(portal, area, 1, pages_per_task, batch) for area in areas])
+
+
+def run_worker(queue: WorkQueue, portal: str, handler: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+               worker_id: Optional[str] = None, visibility: float = 1800, poll_interval: float = 30,
+               pages_per_task: int = 5, should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Lease tasks of a portal until the queue is drained.
+    handler(task) scrapes task["area"] from page_start to page_end and returns None when the
+    area is finished, or {"next_page": n, "payload": {...}} when there are pages left; the
+    follow-up range is enqueued before acknowledging. should_stop() is checked before each
+    lease (e.g. deadline reached). Returns the number of tasks completed.
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+
+    while not (should_stop and should_stop()):
+        task = queue.lease(portal, worker_id, visibility)
+        if task is None:
+            # Otros workers pueden seguir generando rangos: esperar mientras haya leases activos
+            if queue.stats(portal).get("leased", 0) == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        print(f"Tarea {task['area']} páginas {task['page_start']}-{task['page_end']} (intento {task['attempts']})")
+        heartbeat = _Heartbeat(queue, task, visibility)
+        heartbeat.start()
+        try:
+            pending = handler(task)
+        except BaseException as e:
+            heartbeat.stop()
+            queue.nack(task["id"], task["token"])
+            if not isinstance(e, Exception):
+                raise
+            print(f"Tarea {task['id']} devuelta a la cola: {e}")
+            continue
+        heartbeat.stop()
+
+        if pending:
+            next_page = pending["next_page"]
+            queue.put([make_task(portal, task["area"], next_page, next_page + pages_per_task - 1,
+                                 task["batch"], pending.get("payload"))])
+        if not queue.ack(task["id"], task["token"]):
+            print(f"Lease de {task['id']} vencido antes de terminar: otro worker puede repetirla (se deduplica al unir)")
+        completed += 1
+
+    s = queue.stats(portal)
+    print(f"Worker {worker_id}: {completed} tareas completadas. Cola {portal}: {s}")
+    return completed
+
+
+def worker_output_dir(worker_id: str) -> str:
+    path = os.path.join(WORKERS_DIR, worker_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def add_queue_arguments(parser) -> None:
+    """Common CLI flags for the queue worker mode"""
+    parser.add_argument('--cola', type=str, help=f'Modo worker: tomar tareas de la cola (ej: {DEFAULT_QUEUE}, http://host:8765)')
+    parser.add_argument('--worker-id', type=str, default=None, help='Identificador del worker (default: host-pid)')
+    parser.add_argument('--paginas-por-tarea', type=int, default=5, help='Páginas por tarea de la cola (default: 5)')
+    parser.add_argument('--visibilidad', type=int, default=1800,
+                        help='Segundos que una tarea queda reservada sin heartbeat antes de volver a la cola (default: 1800)')
+
+
+# =============================================================================
+# Unión de resultados
+# =============================================================================
+def _job_key(job: Dict[str, Any]) -> Optional[str]:
+    return job.get("hash Descripcion") or job.get("url") or None
+
+
+def merge_worker_outputs(sources: Optional[List[str]] = None, dest: str = "output_jobs") -> Dict[str, int]:
+    """
+    Fold worker output files into dest keeping the same file names. Jobs whose hash (or url)
+    is already in any dest file are skipped. Merged source files are moved to <source>/merged/.
+    """
+    if sources is None:
+        sources = [d for d in glob.glob(os.path.join(WORKERS_DIR, "*")) if os.path.isdir(d)]
+
+    seen = set()
+    for file_path in job_files(dest):
+        try:
+            seen.update(k for k in map(_job_key, load_jobs(file_path)) if k)
+        except Exception:
+            continue
+
+    stats = {"files": 0, "added": 0, "duplicates": 0}
+    for source in sources:
+        merged_dir = os.path.join(source, "merged")
+        for file_path in job_files(source):
+            try:
+                jobs = load_jobs(file_path)
+            except Exception as e:
+                print(f"No se pudo leer {file_path}: {e}")
+                continue
+
+            nuevos = []
+            for job in jobs:
+                key = _job_key(job)
+                if key and key in seen:
+                    stats["duplicates"] += 1
+                    continue
+                if key:
+                    seen.add(key)
+                nuevos.append(job)
+
+            target = os.path.join(dest, os.path.basename(file_path))
+            existentes = load_jobs(target) if os.path.exists(target) else []
+            save_jobs(target, existentes + nuevos, indent=2)
+
+            os.makedirs(merged_dir, exist_ok=True)
+            shutil.move(file_path, os.path.join(merged_dir, os.path.basename(file_path)))
+            stats["files"] += 1
+            stats["added"] += len(nuevos)
+
+    if stats["files"]:
+        print(f"Unidos {stats['files']} archivos de workers: {stats['added']} empleos nuevos, "
+              f"{stats['duplicates']} duplicados descartados")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cola de trabajo para scraping distribuido')
+    parser.add_argument('--cola', type=str, default=DEFAULT_QUEUE, help=f'Backend de la cola (default: {DEFAULT_QUEUE})')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    serve = sub.add_parser('serve', help='Exponer la cola por HTTP para workers en otras máquinas')
+    serve.add_argument('--host', default='127.0.0.1',
+                       help='Interfaz (default: 127.0.0.1); otra que no sea loopback requiere --token')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--token', type=str, default=None,
+                       help='Secreto que deben mandar los workers (default: env SCRAPER_QUEUE_TOKEN)')
+
+    stats = sub.add_parser('stats', help='Mostrar el estado de la cola')
+    stats.add_argument('--portal', type=str, default=None)
+
+    merge = sub.add_parser('merge', help='Unir la salida de los workers en output_jobs/')
+    merge.add_argument('fuentes', nargs='*', help=f'Directorios de salida de workers (default: {WORKERS_DIR}/*)')
+
+    args = parser.parse_args()
+
+    if args.comando == 'serve':
+        try:
+            serve_queue(open_queue(args.cola), args.host, args.port, args.token)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.comando == 'stats':
+        print(json.dumps(open_queue(args.cola).stats(args.portal), indent=2))
+    elif args.comando == 'merge':
+        merge_worker_outputs(args.fuentes or None)
+
+
+if __name__ == "__main__":
+    main()
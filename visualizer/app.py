@@ -10,6 +10,25 @@ import numpy as np
 import json
 import networkx as nx
 
+# Exportación columnar de all_jobs.json (scrapper/unify_jobs.py): se leen solo las columnas necesarias
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Corpus particionado (scrapper/partitioned_corpus.py): particiones .jsonl.zst por fuente y mes
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Columnas de all_jobs.json que usan las estadísticas básicas
+BASIC_STATS_COLUMNS = ["Fuente", "Empresa", "Pais"]
+
 # Configuración de la página
 st.set_page_config(
     page_title="Visualizador PIDAE - Análisis de Empleos",
@@ -110,6 +129,10 @@ def load_all_csv_files(directory):
                     map_col('fuente', 'fuente_origen')
                     map_col('fuente_clasificacion', 'metodo_clasificacion')
                     map_col('metodo', 'metodo_clasificacion')
+
+                    # Ubicación: 'Ciudad' viene normalizada desde la unificación (gazetteer.py)
+                    map_col('ubicacion', 'ubicacion')
+                    map_col('ciudad', 'ciudad')
                     
                     # Mapear columnas a nombres más amigables
                     if 'categoria_tipo' in df.columns:
@@ -313,6 +336,9 @@ def main():
     if st.sidebar.button("Recargar datos"):
         st.cache_data.clear()
     
+    # Fuentes y meses del corpus particionado: se leen solo esas particiones
+    particiones = corpus_partition_filters(results_dir)
+    
     # Cargar todos los archivos CSV
     with st.spinner("Cargando datos..."):
         df, num_files = load_all_csv_files(results_dir)
@@ -328,8 +354,8 @@ def main():
         st.info("Los datos están sin clasificar. Mostrando estadísticas básicas del archivo unificado...")
         
         # Mostrar estadísticas básicas de all_jobs.json
-        jobs_data = load_jobs_json(results_dir)
-        if jobs_data:
+        jobs_data = load_jobs_frame(results_dir, BASIC_STATS_COLUMNS, particiones)
+        if not jobs_data.empty:
             show_basic_stats(jobs_data)
         else:
             st.error("No se encontró all_jobs.json. Ejecutar primero unify_jobs.py")
@@ -406,7 +432,7 @@ def main():
         st.sidebar.metric("Habilidades únicas", f"{filtered_df['habilidad_detectada'].nunique():,}")
     
     # Mostrar dashboard integral con datos filtrados
-    display_integrated_dashboard(filtered_df, df, results_dir)
+    display_integrated_dashboard(filtered_df, df, results_dir, particiones)
 
 @st.cache_data
 def load_jobs_json(directory):
@@ -431,22 +457,123 @@ def load_jobs_json(directory):
             return []
     return []
 
-def show_basic_stats(jobs):
+def columnar_jobs_file(directory):
+    """all_jobs.parquet / all_jobs.arrow exportado junto a all_jobs.json, si está al día (None si no)"""
+    if not PYARROW_AVAILABLE:
+        return None
+    json_file = os.path.join(directory, "all_jobs.json")
+    for name in ("all_jobs.parquet", "all_jobs.arrow"):
+        path = os.path.join(directory, name)
+        if os.path.exists(path) and (not os.path.exists(json_file)
+                                     or os.path.getmtime(path) >= os.path.getmtime(json_file)):
+            return path
+    return None
+
+def load_corpus_catalog(directory):
+    """Catálogo del corpus particionado (corpus/_catalog.json junto a all_jobs.json), o None"""
+    path = os.path.join(directory, "corpus", "_catalog.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def corpus_partition_filters(directory):
+    """
+    Filtros de fuente y mes del corpus particionado en la barra lateral. Devuelve
+    (fuentes, desde, hasta) para leer solo esas particiones, o None si se eligió todo el corpus.
+    """
+    catalog = load_corpus_catalog(directory)
+    if not catalog or not catalog.get('partitions'):
+        return None
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("Corpus particionado")
+    fuentes = sorted({p['fuente'] for p in catalog['partitions']})
+    elegidas = st.sidebar.multiselect("Fuentes del corpus:", fuentes, default=fuentes)
+    meses = sorted({p['mes'] for p in catalog['partitions'] if p['mes'] != 'desconocida'})
+    desde, hasta = (meses[0], meses[-1]) if meses else (None, None)
+    if len(meses) > 1:
+        desde, hasta = st.sidebar.select_slider("Meses:", options=meses, value=(meses[0], meses[-1]))
+    todas = len(elegidas) == len(fuentes)
+    todos_los_meses = not meses or (desde, hasta) == (meses[0], meses[-1])
+    if todas and todos_los_meses:
+        return None
+    return (None if todas else tuple(elegidas),
+            None if todos_los_meses else desde,
+            None if todos_los_meses else hasta)
+
+def read_corpus_partition(path):
+    """Empleos de una partición (.jsonl, o .jsonl.zst con zstandard)"""
+    if path.endswith('.zst'):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard no instalado (pip install zstandard)")
+        import io
+        with open(path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            return [json.loads(line) for line in io.TextIOWrapper(reader, encoding='utf-8') if line.strip()]
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+@st.cache_data
+def load_corpus_frame(directory, particiones, columns=None):
+    """Empleos de las particiones que coinciden con (fuentes, desde, hasta) como DataFrame"""
+    fuentes, desde, hasta = particiones
+    catalog = load_corpus_catalog(directory)
+    rows = []
+    for partition in catalog['partitions']:
+        if fuentes is not None and partition['fuente'] not in fuentes:
+            continue
+        if (desde or hasta) and partition['mes'] == 'desconocida':
+            continue
+        if (desde and partition['mes'] < desde) or (hasta and partition['mes'] > hasta):
+            continue
+        for job in read_corpus_partition(os.path.join(directory, "corpus", partition['path'])):
+            rows.append({c: job.get(c) for c in columns} if columns else job)
+    return pd.DataFrame(rows, columns=list(columns) if columns else None)
+
+@st.cache_data
+def load_jobs_frame(directory, columns=None, particiones=None):
+    """
+    Empleos de all_jobs.json como DataFrame. Con la exportación columnar se leen solo
+    `columns` (memory-mapped); si no, se parsea all_jobs.json completo.
+    particiones: (fuentes, desde, hasta) para leer solo esas particiones del corpus particionado.
+    """
+    if particiones and load_corpus_catalog(directory):
+        try:
+            return load_corpus_frame(directory, particiones, columns)
+        except Exception as e:
+            st.warning(f"Error leyendo el corpus particionado, se usa all_jobs.json: {str(e)}")
+    path = columnar_jobs_file(directory)
+    if path:
+        try:
+            if path.endswith(".arrow"):
+                with pa.memory_map(path, "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                table = table.select([c for c in columns if c in table.column_names]) if columns else table
+            else:
+                names = pq.ParquetFile(path).schema_arrow.names
+                table = pq.read_table(path, columns=[c for c in columns if c in names] if columns else None,
+                                      memory_map=True)
+            return table.to_pandas()
+        except Exception as e:
+            st.warning(f"Error leyendo {os.path.basename(path)}, se usa all_jobs.json: {str(e)}")
+    return pd.DataFrame(load_jobs_json(directory))
+
+def show_basic_stats(df_jobs):
     """Mostrar estadísticas básicas de all_jobs.json"""
-    if not jobs:
+    if df_jobs.empty:
         st.warning("No se encontró all_jobs.json")
         return
     
-    st.success(f"Datos cargados: **{len(jobs):,} empleos** en all_jobs.json")
-    
-    # Crear DataFrame para análisis básico
-    df_jobs = pd.DataFrame(jobs)
+    st.success(f"Datos cargados: **{len(df_jobs):,} empleos** en all_jobs.json")
     
     # Métricas principales
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Empleos", f"{len(jobs):,}")
+        st.metric("Total Empleos", f"{len(df_jobs):,}")
     
     with col2:
         fuentes = df_jobs['Fuente'].value_counts() if 'Fuente' in df_jobs.columns else {}
@@ -503,7 +630,7 @@ def show_basic_stats(jobs):
     - `empleo_requisito_clasificados.csv`
     """)
 
-def display_integrated_dashboard(filtered_df, original_df=None, results_dir=None):
+def display_integrated_dashboard(filtered_df, original_df=None, results_dir=None, particiones=None):
     """Dashboard integrado con todas las estadísticas generales"""
     df = filtered_df
     
@@ -539,8 +666,8 @@ def display_integrated_dashboard(filtered_df, original_df=None, results_dir=None
     
     with col1:
         # Mostrar total de empleos procesados (si existe all_jobs.json)
-        jobs_json = load_jobs_json(results_dir)
-        if jobs_json:
+        jobs_json = load_jobs_frame(results_dir, ["Fuente"], particiones)
+        if not jobs_json.empty:
             total_processed_jobs = len(jobs_json)
             st.metric("📦 Empleos Procesados (all_jobs.json)", f"{total_processed_jobs:,}")
         else:
@@ -569,9 +696,9 @@ def display_integrated_dashboard(filtered_df, original_df=None, results_dir=None
         # default to previous expected path for backwards compatibility
         results_dir = "../Base de Datos Tablas"
 
-    jobs_json = load_jobs_json(results_dir)
+    jobs_json = load_jobs_frame(results_dir, ["Fuente"], particiones)
 
-    if jobs_json and isinstance(total_jobs, int):
+    if not jobs_json.empty and isinstance(total_jobs, int):
         missing_jobs = max(0, total_processed_jobs - total_jobs)
         st.caption(f"Empleos sin requisitos detectados: {missing_jobs:,} (diferencia entre all_jobs.json y CSV) | Empleos con registros: {total_jobs:,}")
 
@@ -1177,15 +1304,18 @@ def display_integrated_dashboard(filtered_df, original_df=None, results_dir=None
                 # --- Treemap visualization temporarily disabled. ---
     
     # Análisis por ubicación geográfica
-    if 'ubicacion' in df.columns:
+    if 'ubicacion' in df.columns or 'ciudad' in df.columns:
         st.markdown("### 🌍 Análisis Geográfico")
         col1, col2 = st.columns(2)
         
         with col1:
-            # Limpiar y agrupar ubicaciones
-            df['ubicacion_clean'] = df['ubicacion'].fillna('No especificada')
-            # Extraer ciudad principal
-            df['ciudad'] = df['ubicacion_clean'].str.split(',').str[0].str.strip()
+            if 'ciudad' in df.columns:
+                # Ciudad canónica; los empleos sin ciudad reconocida quedan agrupados
+                df['ciudad'] = df['ciudad'].replace('', np.nan).fillna('No especificada')
+            else:
+                # CSV anteriores a la normalización: ciudad principal del texto libre
+                df['ubicacion_clean'] = df['ubicacion'].fillna('No especificada')
+                df['ciudad'] = df['ubicacion_clean'].str.split(',').str[0].str.strip()
             
             top_cities = df['ciudad'].value_counts().head(15)
             